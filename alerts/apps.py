@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AlertsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'alerts'
+
+    def ready(self):
+        from .difusion import conectar_senales
+        conectar_senales()
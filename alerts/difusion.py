@@ -0,0 +1,298 @@
+"""
+Alertas en vivo por Server-Sent Events (``GET /api/alerts/alertas/stream/``).
+
+En lugar de que cada pantalla consulte el listado cada pocos segundos (una
+consulta paginada con COUNT por pantalla), cada proceso mantiene un
+``Difusor``: un único hilo que lee de la outbox (``sync.EventoCambio``) los
+eventos de alertas posteriores al último leído y los reparte entre las
+conexiones abiertas de ese proceso. Son una consulta por proceso y por
+intervalo, sin importar cuántas pantallas estén conectadas; el hilo solo
+corre mientras hay conexiones.
+
+La outbox es el canal entre procesos (workers de gunicorn o uvicorn): un
+cambio hecho en otro worker llega en el siguiente sondeo
+(``ALERTAS_STREAM_INTERVALO`` segundos). Un cambio hecho en el mismo
+proceso despierta al hilo al confirmarse su transacción (señal
+``eventos_registrados``) y llega de inmediato.
+
+Cada evento lleva su secuencia como ``id``: al reconectarse, el cliente
+envía ``Last-Event-ID`` (EventSource lo hace solo) y recibe lo que se
+perdió. La suscripción se registra antes de esa lectura y los eventos
+repetidos se descartan por secuencia, así que no quedan huecos entre ambas.
+Si se perdió más de ``REPETICION_MAXIMA`` eventos no se repiten: se envía un
+evento ``reinicio`` con la secuencia actual, el cliente recarga el listado y
+el flujo sigue desde ahí.
+
+Con ASGI el flujo es un generador asíncrono y una conexión abierta no ocupa
+un hilo; con WSGI cada conexión ocupa un hilo del worker mientras dure
+(``ALERTAS_STREAM_DURACION`` segundos, luego el cliente se reconecta).
+"""
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import deque
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DatabaseError, close_old_connections, transaction
+from django.http import StreamingHttpResponse
+
+from core.renderers import EventStreamRenderer
+
+logger = logging.getLogger(__name__)
+
+ETIQUETA = 'alerts.alertasistema'
+
+TAMANO_LECTURA = 1000
+
+# Lotes sin leer por conexión: un cliente más lento se desconecta y se recupera con Last-Event-ID
+MAXIMO_PENDIENTES = 100
+
+# Eventos perdidos que se repiten al reconectarse; más atrás se envía ``reinicio``
+REPETICION_MAXIMA = 500
+
+# Milisegundos que espera EventSource antes de reconectarse
+REINTENTO_MS = 3000
+
+
+def tipo_evento(evento):
+    """nueva, resuelta, reconocida, actualizada o eliminada."""
+    if evento['operacion'] == 'crear':
+        return 'nueva'
+    if evento['operacion'] == 'eliminar':
+        return 'eliminada'
+    if evento['datos'].get('resuelto'):
+        return 'resuelta'
+    if evento['datos'].get('reconocido'):
+        return 'reconocida'
+    return 'actualizada'
+
+
+def leer_eventos_alertas(desde, limite=TAMANO_LECTURA):
+    """Eventos de alertas de la outbox posteriores a la secuencia ``desde``."""
+    from sync.models import EventoCambio
+
+    return list(
+        EventoCambio.objects.filter(modelo=ETIQUETA, secuencia__gt=desde).order_by('secuencia')
+        .values('secuencia', 'id_registro', 'operacion', 'datos')[:limite]
+    )
+
+
+class Suscripcion:
+    """
+    Una conexión abierta: recibe lotes de eventos desde el hilo del
+    ``Difusor`` y los entrega al generador de la respuesta, síncrono
+    (``esperar``) o asíncrono (``esperar_async``).
+    """
+
+    def __init__(self, filtros=None):
+        self.filtros = filtros or {}
+        self.ultima = 0
+        self.desbordada = False
+        self._pendientes = deque()
+        self._condicion = threading.Condition()
+        self._loop = None
+        self._aviso = None
+
+    def acepta(self, evento):
+        datos = evento['datos']
+        return datos is None or all(datos.get(campo) in valores for campo, valores in self.filtros.items())
+
+    def nuevos(self, eventos):
+        """Eventos aún no enviados a este cliente que pasan sus filtros."""
+        resultado = []
+        for evento in eventos:
+            if evento['secuencia'] > self.ultima:
+                self.ultima = evento['secuencia']
+                if self.acepta(evento):
+                    resultado.append(evento)
+        return resultado
+
+    def entregar(self, eventos):
+        with self._condicion:
+            if len(self._pendientes) >= MAXIMO_PENDIENTES:
+                self.desbordada = True
+            else:
+                self._pendientes.append(eventos)
+            self._condicion.notify()
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._aviso.set)
+
+    def _tomar(self):
+        eventos = [evento for lote in self._pendientes for evento in lote]
+        self._pendientes.clear()
+        return eventos
+
+    def esperar(self, segundos):
+        """Eventos recibidos; espera hasta ``segundos`` si no hay (lista vacía al vencer)."""
+        with self._condicion:
+            if not self._pendientes:
+                self._condicion.wait(segundos)
+            return self._tomar()
+
+    async def esperar_async(self, segundos):
+        with self._condicion:
+            if self._loop is None:
+                self._loop, self._aviso = asyncio.get_running_loop(), asyncio.Event()
+            if self._pendientes:
+                return self._tomar()
+            self._aviso.clear()
+        try:
+            await asyncio.wait_for(self._aviso.wait(), segundos)
+        except asyncio.TimeoutError:
+            pass
+        with self._condicion:
+            return self._tomar()
+
+
+class Difusor:
+    """Lee los eventos de alertas de la outbox y los reparte a las suscripciones del proceso."""
+
+    def __init__(self):
+        # Débiles: una respuesta descartada sin llegar a iterarse no deja su suscripción colgada
+        self._suscripciones = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._despertar = threading.Event()
+        self._hilo = None
+        self.ultima = None
+
+    def suscribir(self, filtros=None):
+        from sync.cambios import estado_contador
+
+        suscripcion = Suscripcion(filtros)
+        with self._lock:
+            if self.ultima is None:
+                self.ultima = estado_contador()[0]
+            self._suscripciones.add(suscripcion)
+            self._asegurar_hilo()
+        return suscripcion
+
+    def cancelar(self, suscripcion):
+        with self._lock:
+            self._suscripciones.discard(suscripcion)
+
+    def avisar(self):
+        """Despierta al hilo para que lea sin esperar al próximo intervalo."""
+        self._despertar.set()
+
+    def _asegurar_hilo(self):
+        if self._hilo is None or not self._hilo.is_alive():
+            self._hilo = threading.Thread(target=self._bucle, name='difusor-alertas', daemon=True)
+            self._hilo.start()
+
+    def sondear(self):
+        """
+        Lee los eventos nuevos y los entrega a todas las suscripciones.
+
+        Returns:
+            int: Eventos leídos
+        """
+        eventos = leer_eventos_alertas(self.ultima)
+        if eventos:
+            self.ultima = eventos[-1]['secuencia']
+            with self._lock:
+                suscripciones = list(self._suscripciones)
+            for suscripcion in suscripciones:
+                suscripcion.entregar(eventos)
+        return len(eventos)
+
+    def _bucle(self):
+        while True:
+            self._despertar.wait(settings.ALERTAS_STREAM_INTERVALO)
+            self._despertar.clear()
+            with self._lock:
+                if not self._suscripciones:
+                    # Sin conexiones no se lee; la próxima suscripción parte desde el contador
+                    self._hilo = self.ultima = None
+                    return
+            try:
+                while self.sondear() >= TAMANO_LECTURA:
+                    pass
+            except DatabaseError:
+                logger.exception('Difusor de alertas: error leyendo la outbox')
+            finally:
+                close_old_connections()
+
+
+difusor = Difusor()
+
+
+def _avisar_al_confirmar(sender, **kwargs):
+    transaction.on_commit(difusor.avisar)
+
+
+def conectar_senales():
+    from sync.outbox import eventos_registrados
+    from .models import AlertaSistema
+
+    eventos_registrados.connect(_avisar_al_confirmar, sender=AlertaSistema, dispatch_uid='alerts.difusion.avisar')
+
+
+def _formatear(renderer, eventos):
+    return b''.join(
+        renderer.evento(tipo_evento(e), {'id_alerta': e['id_registro'], **(e['datos'] or {})}, e['secuencia'])
+        for e in eventos
+    )
+
+
+def _flujo(suscripcion, cabecera, iniciales, renderer):
+    fin = time.monotonic() + settings.ALERTAS_STREAM_DURACION
+    try:
+        yield cabecera + _formatear(renderer, suscripcion.nuevos(iniciales))
+        while time.monotonic() < fin and not suscripcion.desbordada:
+            eventos = suscripcion.nuevos(suscripcion.esperar(settings.ALERTAS_STREAM_LATIDO))
+            yield _formatear(renderer, eventos) if eventos else renderer.comentario('latido')
+    finally:
+        difusor.cancelar(suscripcion)
+
+
+async def _flujo_async(suscripcion, cabecera, iniciales, renderer):
+    fin = time.monotonic() + settings.ALERTAS_STREAM_DURACION
+    try:
+        yield cabecera + _formatear(renderer, suscripcion.nuevos(iniciales))
+        while time.monotonic() < fin and not suscripcion.desbordada:
+            eventos = suscripcion.nuevos(await suscripcion.esperar_async(settings.ALERTAS_STREAM_LATIDO))
+            yield _formatear(renderer, eventos) if eventos else renderer.comentario('latido')
+    finally:
+        difusor.cancelar(suscripcion)
+
+
+def respuesta_flujo(request, filtros=None, ultimo=None):
+    """
+    Abre el flujo SSE de alertas.
+
+    Args:
+        request: HttpRequest de Django (ASGI o WSGI)
+        filtros: {campo: valores aceptados}, ej. {'nivel_gravedad': {'alta'}}
+        ultimo: Secuencia del último evento recibido (Last-Event-ID); None para empezar desde ahora.
+            Si hay más de ``REPETICION_MAXIMA`` eventos posteriores se envía ``reinicio``
+    """
+    from sync.cambios import estado_contador
+
+    renderer = EventStreamRenderer()
+    cabecera = f'retry: {REINTENTO_MS}\n\n'.encode()
+    suscripcion = difusor.suscribir(filtros)
+    iniciales = []
+    if ultimo is not None:
+        iniciales = leer_eventos_alertas(ultimo, REPETICION_MAXIMA + 1)
+    if len(iniciales) > REPETICION_MAXIMA:
+        # Demasiado atrás para repetir: el cliente recarga el listado y sigue desde ahora
+        iniciales = []
+        suscripcion.ultima = estado_contador()[0]
+        cabecera += renderer.evento('reinicio', {'secuencia': suscripcion.ultima}, suscripcion.ultima)
+    elif ultimo is None:
+        suscripcion.ultima = estado_contador()[0]
+    else:
+        suscripcion.ultima = ultimo
+
+    if isinstance(request, ASGIRequest):
+        contenido = _flujo_async(suscripcion, cabecera, iniciales, renderer)
+    else:
+        contenido = _flujo(suscripcion, cabecera, iniciales, renderer)
+    response = StreamingHttpResponse(contenido, content_type=renderer.media_type)
+    response['Cache-Control'] = 'no-cache'
+    # nginx no debe retener los eventos en su buffer
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:29
+
+import core.indices
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertasistema',
+            name='fecha_reconocimiento',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='alertasistema',
+            name='fecha_resolucion',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='alertasistema',
+            name='fk_usuario_reconoce',
+            field=models.ForeignKey(blank=True, db_column='fk_usuario_reconoce', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='alertas_reconocidas', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='alertasistema',
+            name='reconocido',
+            field=models.BooleanField(default=False, help_text='Alerta vista por un usuario, aún sin resolver'),
+        ),
+        migrations.AddIndex(
+            model_name='alertasistema',
+            index=core.indices.IndiceParcial(condicion=models.Q(('resuelto', False)), fields=['-fecha_hora'], name='alerta_abiertas_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from core.indices import IndiceParcial
 from core.models import Usuario
 
 
@@ -11,12 +12,21 @@ class AlertaSistema(models.Model):
     entidad_origen = models.CharField(max_length=50)
     resuelto = models.BooleanField(default=False)
     fk_usuario_resuelve = models.ForeignKey(Usuario, on_delete=models.SET_NULL, null=True, blank=True, related_name='alertas_resueltas', db_column='fk_usuario_resuelve')
+    fecha_resolucion = models.DateTimeField(null=True, blank=True)
+    reconocido = models.BooleanField(default=False, help_text="Alerta vista por un usuario, aún sin resolver")
+    fk_usuario_reconoce = models.ForeignKey(Usuario, on_delete=models.SET_NULL, null=True, blank=True, related_name='alertas_reconocidas', db_column='fk_usuario_reconoce')
+    fecha_reconocimiento = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         db_table = 'alerta_sistema'
         verbose_name = 'Alerta del Sistema'
         verbose_name_plural = 'Alertas del Sistema'
         ordering = ['-fecha_hora']
+        indexes = [
+            # Alertas abiertas (la gran mayoría de las consultas y de las
+            # resoluciones masivas filtran resuelto=False)
+            IndiceParcial(fields=['-fecha_hora'], condicion=models.Q(resuelto=False), name='alerta_abiertas_idx'),
+        ]
     
     def __str__(self):
         return f"Alerta {self.id_alerta} - {self.tipo_alerta} ({self.nivel_gravedad})"
\ No newline at end of file
@@ -9,4 +9,55 @@ class AlertaSistemaSerializer(serializers.ModelSerializer):
     class Meta:
         model = AlertaSistema
         fields = '__all__'
-        read_only_fields = ['fecha_hora']
\ No newline at end of file
+        read_only_fields = ['fecha_hora', 'fecha_resolucion', 'fecha_reconocimiento']
+
+
+class FiltroAlertasSerializer(serializers.Serializer):
+    """Criterio de selección de alertas para las acciones masivas."""
+    tipo_alerta = serializers.CharField(max_length=50, required=False)
+    entidad_origen = serializers.CharField(max_length=50, required=False)
+    nivel_gravedad = serializers.CharField(max_length=10, required=False)
+    desde = serializers.DateTimeField(required=False, help_text='fecha_hora >= desde')
+    hasta = serializers.DateTimeField(required=False, help_text='fecha_hora < hasta')
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError('Indique al menos un criterio de filtro')
+        if 'desde' in data and 'hasta' in data and data['desde'] >= data['hasta']:
+            raise serializers.ValidationError({'hasta': 'Debe ser posterior a desde'})
+        return data
+
+
+class AccionMasivaAlertasSerializer(serializers.Serializer):
+    """
+    Selección de alertas para resolver/reconocer en bloque: una lista de ids o
+    un filtro (no ambos).
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False, max_length=10000,
+    )
+    filtros = FiltroAlertasSerializer(required=False)
+
+    def validate(self, data):
+        if ('ids' in data) == ('filtros' in data):
+            raise serializers.ValidationError('Indique "ids" o "filtros" (uno de los dos)')
+        return data
+
+    def criterio(self):
+        """Argumentos de ``filter()`` equivalentes a la selección validada."""
+        datos = self.validated_data
+        if 'ids' in datos:
+            return {'id_alerta__in': sorted(set(datos['ids']))}
+        filtros = dict(datos['filtros'])
+        criterio = {campo: filtros.pop(campo) for campo in ('tipo_alerta', 'entidad_origen', 'nivel_gravedad') if campo in filtros}
+        if 'desde' in filtros:
+            criterio['fecha_hora__gte'] = filtros['desde']
+        if 'hasta' in filtros:
+            criterio['fecha_hora__lt'] = filtros['hasta']
+        return criterio
+
+
+class ResultadoAccionMasivaSerializer(serializers.Serializer):
+    accion = serializers.CharField()
+    solicitadas = serializers.IntegerField(allow_null=True, help_text='Cantidad de ids recibidos (null si se usó filtro)')
+    actualizadas = serializers.IntegerField(help_text='Alertas modificadas por esta operación')
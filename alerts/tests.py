@@ -1,3 +1,224 @@
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from compliance.models import TrazaMovimiento
+from core.models import Usuario, Rol, Permiso, RolPermiso
+from .models import AlertaSistema
+
+
+class AccionesMasivasAlertasTestCase(APITestCase):
+    """Tests de resolución y reconocimiento masivo de alertas"""
+
+    def setUp(self):
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+        rol = Rol.objects.create(nombre_rol='supervisor_jefe')
+        for codigo in ('alert:read', 'alert:resolve'):
+            permiso = Permiso.objects.create(codigo_permiso=codigo, categoria='alerts')
+            RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        self.supervisor = Usuario.objects.create_user(
+            run='15000000-9', email='supervisor@hospital.com', password='x',
+            nombre_completo='Supervisora', fk_rol=rol,
+        )
+        self.lector = Usuario.objects.create_user(
+            run='16000000-7', email='lector@hospital.com', password='x', nombre_completo='Lector',
+            fk_rol=Rol.objects.create(nombre_rol='lector'),
+        )
+        RolPermiso.objects.create(fk_rol=self.lector.fk_rol, fk_permiso=Permiso.objects.get(codigo_permiso='alert:read'))
+
+        self.alertas = []
+        for i in range(6):
+            self.alertas.append(AlertaSistema.objects.create(
+                fk_usuario_genera=self.supervisor, tipo_alerta='DATO_INCOMPLETO' if i < 4 else 'CRITICA',
+                nivel_gravedad='MEDIA', entidad_origen='parto' if i % 2 == 0 else 'recien_nacido',
+            ))
+        # La última ya estaba resuelta
+        AlertaSistema.objects.filter(pk=self.alertas[-1].pk).update(resuelto=True)
+        self.client.force_authenticate(self.supervisor)
+
+    def test_resolver_por_ids(self):
+        """Resuelve solo las abiertas de la lista, con un UPDATE y una traza"""
+        ids = [a.pk for a in self.alertas[:3]] + [self.alertas[-1].pk, 99999]
+        trazas_antes = TrazaMovimiento.objects.filter(tabla_afectada='alerta_sistema').count()
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post('/api/alerts/alertas/resolver/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data, {'accion': 'resolver', 'solicitadas': 5, 'actualizadas': 3})
+        self.assertEqual(sum(q['sql'].startswith('UPDATE "alerta_sistema"') for q in consultas), 1)
+
+        resueltas = AlertaSistema.objects.filter(pk__in=ids[:3])
+        self.assertTrue(all(a.resuelto and a.fk_usuario_resuelve_id == self.supervisor.pk and a.fecha_resolucion
+                            for a in resueltas))
+        trazas = TrazaMovimiento.objects.filter(tabla_afectada='alerta_sistema')
+        self.assertEqual(trazas.count(), trazas_antes + 1)
+        self.assertEqual(trazas.order_by('-id_traza').first().cambios_nuevos['actualizadas'], 3)
+
+    def test_resolver_por_filtros(self):
+        """Los filtros combinan tipo, entidad y rango de fechas"""
+        AlertaSistema.objects.filter(pk=self.alertas[0].pk).update(fecha_hora=timezone.now() - timedelta(days=10))
+        desde = (timezone.now() - timedelta(days=1)).isoformat()
+        response = self.client.post('/api/alerts/alertas/resolver/', {
+            'filtros': {'tipo_alerta': 'DATO_INCOMPLETO', 'entidad_origen': 'parto', 'desde': desde},
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        # DATO_INCOMPLETO + parto = alertas 0 y 2; la 0 queda fuera del rango
+        self.assertEqual(response.data['actualizadas'], 1)
+        self.assertEqual(response.data['solicitadas'], None)
+        self.assertTrue(AlertaSistema.objects.get(pk=self.alertas[2].pk).resuelto)
+        self.assertFalse(AlertaSistema.objects.get(pk=self.alertas[0].pk).resuelto)
+
+    def test_reconocer(self):
+        """Reconocer no resuelve y no vuelve a marcar las ya reconocidas"""
+        ids = [a.pk for a in self.alertas[:2]]
+        response = self.client.post('/api/alerts/alertas/reconocer/', {'ids': ids}, format='json')
+        self.assertEqual(response.data['actualizadas'], 2)
+        alerta = AlertaSistema.objects.get(pk=ids[0])
+        self.assertTrue(alerta.reconocido)
+        self.assertFalse(alerta.resuelto)
+        self.assertEqual(alerta.fk_usuario_reconoce, self.supervisor)
+        response = self.client.post('/api/alerts/alertas/reconocer/', {'ids': ids}, format='json')
+        self.assertEqual(response.data['actualizadas'], 0)
+
+    def test_validacion_y_permisos(self):
+        """Se exige ids o filtros (no ambos, no vacío) y el permiso alert:resolve"""
+        for cuerpo in ({}, {'ids': []}, {'filtros': {}}, {'ids': [1], 'filtros': {'tipo_alerta': 'X'}}):
+            with self.subTest(cuerpo=cuerpo):
+                response = self.client.post('/api/alerts/alertas/resolver/', cuerpo, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(AlertaSistema.objects.filter(resuelto=True).exclude(pk=self.alertas[-1].pk).exists())
+
+        self.client.force_authenticate(self.lector)
+        response = self.client.post('/api/alerts/alertas/resolver/', {'ids': [self.alertas[0].pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_listado_invalida_cache(self):
+        """El listado cacheado refleja la resolución masiva"""
+        self.assertEqual(self.client.get('/api/alerts/alertas/abiertas/').data['count'], 5)
+        self.client.get('/api/alerts/alertas/')
+        self.client.post('/api/alerts/alertas/resolver/', {'ids': [self.alertas[0].pk]}, format='json')
+        response = self.client.get('/api/alerts/alertas/')
+        self.assertTrue(next(a for a in response.data['results'] if a['id_alerta'] == self.alertas[0].pk)['resuelto'])
+        self.assertEqual(self.client.get('/api/alerts/alertas/abiertas/').data['count'], 4)
+
+
+class IndiceAlertasAbiertasTestCase(TestCase):
+    """Tests del índice parcial de alertas abiertas"""
+
+    def test_consulta_usa_indice(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('El plan de consulta se verifica en SQLite')
+        plan = AlertaSistema.objects.filter(resuelto=False).order_by('-fecha_hora').explain()
+        self.assertIn('alerta_abiertas_idx', plan)
+
+    def test_sin_indices_parciales_usa_compuesto(self):
+        """En motores sin índices parciales (MySQL) se crea (resuelto, fecha_hora)"""
+        from unittest import mock
+        indice = next(i for i in AlertaSistema._meta.indexes if i.name == 'alerta_abiertas_idx')
+        sin_parciales = mock.Mock(features=mock.Mock(supports_partial_indexes=False))
+        self.assertEqual(indice.indice_para(sin_parciales).fields, ['resuelto', '-fecha_hora'])
+        self.assertIsNone(indice.indice_para(sin_parciales).condition)
+        if connection.features.supports_partial_indexes:
+            self.assertIsNotNone(indice.indice_para(connection).condition)
+
+
+class AlertasEnVivoTestCase(APITestCase):
+    """Tests del flujo Server-Sent Events de alertas"""
+
+    url = '/api/alerts/alertas/stream/'
+
+    def setUp(self):
+        from unittest import mock
+        from core.cache import obtener_cache
+        from . import difusion
+        obtener_cache().clear()
+        rol = Rol.objects.create(nombre_rol='matrona_clinica')
+        RolPermiso.objects.create(fk_rol=rol, fk_permiso=Permiso.objects.create(codigo_permiso='alert:read', categoria='alerts'))
+        self.matrona = Usuario.objects.create_user(
+            run='15000000-9', email='matrona@hospital.com', password='x', nombre_completo='Matrona', fk_rol=rol,
+        )
+        self.sin_permiso = Usuario.objects.create_user(
+            run='16000000-7', email='otro@hospital.com', password='x', nombre_completo='Sin permiso',
+            fk_rol=Rol.objects.create(nombre_rol='otro'),
+        )
+        # Difusor propio y sin hilo: los sondeos se hacen a mano en el hilo del test
+        self.difusor = difusion.Difusor()
+        for parche in (mock.patch.object(difusion, 'difusor', self.difusor),
+                       mock.patch.object(difusion.Difusor, '_asegurar_hilo')):
+            parche.start()
+            self.addCleanup(parche.stop)
+        self.client.force_authenticate(self.matrona)
+
+    def crear_alerta(self, nivel='ALTA'):
+        return AlertaSistema.objects.create(
+            fk_usuario_genera=self.matrona, tipo_alerta='APGAR_BAJO', nivel_gravedad=nivel, entidad_origen='recien_nacido',
+        )
+
+    def test_recuperacion_y_eventos_en_vivo(self):
+        """Last-Event-ID entrega lo perdido; luego llegan los cambios que lee el difusor"""
+        alerta = self.crear_alerta()
+        response = self.client.get(self.url, HTTP_LAST_EVENT_ID='0', HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertNotIn('Content-Encoding', response)
+        flujo = iter(response.streaming_content)
+        primero = next(flujo).decode()
+        self.assertIn('event: nueva\n', primero)
+        self.assertIn(f'"id_alerta":{alerta.pk}', primero)
+
+        alerta.resuelto = True
+        alerta.save()
+        self.crear_alerta()
+        self.assertEqual(self.difusor.sondear(), 2)
+        # La primera alerta ya se envió en la recuperación: no se repite
+        siguiente = next(flujo).decode()
+        self.assertEqual(siguiente.count('event: '), 2)
+        self.assertIn('event: resuelta\n', siguiente)
+        self.assertIn('event: nueva\n', siguiente)
+
+        response.close()
+        self.assertEqual(len(self.difusor._suscripciones), 0)
+
+    def test_reinicio_si_se_perdio_demasiado(self):
+        """Más de REPETICION_MAXIMA eventos perdidos no se repiten: llega reinicio y sigue desde ahora"""
+        from unittest import mock
+        from sync.cambios import estado_contador
+        from . import difusion
+        for _ in range(3):
+            self.crear_alerta()
+        with mock.patch.object(difusion, 'REPETICION_MAXIMA', 2):
+            response = self.client.get(self.url, {'desde': '0'}, HTTP_ACCEPT='text/event-stream')
+        flujo = iter(response.streaming_content)
+        primero = next(flujo).decode()
+        self.assertIn(f'id: {estado_contador()[0]}\nevent: reinicio\n', primero)
+        self.assertNotIn('event: nueva', primero)
+
+        alerta = self.crear_alerta()
+        self.difusor.sondear()
+        siguiente = next(flujo).decode()
+        self.assertEqual(siguiente.count('event: nueva'), 1)
+        self.assertIn(f'"id_alerta":{alerta.pk}', siguiente)
+        response.close()
+
+    def test_filtros_y_permisos(self):
+        response = self.client.get(self.url, {'nivel_gravedad': 'ALTA'}, HTTP_ACCEPT='text/event-stream')
+        flujo = iter(response.streaming_content)
+        self.assertEqual(next(flujo), b'retry: 3000\n\n')
+        self.crear_alerta('BAJA')
+        alta = self.crear_alerta('ALTA')
+        self.difusor.sondear()
+        siguiente = next(flujo).decode()
+        self.assertEqual(siguiente.count('event: nueva'), 1)
+        self.assertIn(f'"id_alerta":{alta.pk}', siguiente)
+        response.close()
 
-# Create your tests here.
+        self.assertEqual(self.client.get(self.url, {'desde': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(self.sin_permiso)
+        response = self.client.get(self.url, HTTP_ACCEPT='text/event-stream')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(response.content.startswith(b'event: error\n'))
@@ -0,0 +1,369 @@
+"""
+Dataset hospitalario sintético para benchmarks (``manage.py generar_dataset``).
+
+Genera partos repartidos uniformemente en ``anios`` años hasta ``hasta``, en
+orden cronológico, y por cada parto los registros que lo acompañan:
+
+- ``MadrePaciente`` con RUN válido (algunas vuelven a parir en el período,
+  al menos 15 meses después) y su ``Embarazo``
+- ``Parto`` con tipo, presentación, inicio y cesáreas previas en
+  proporciones cercanas a las de una maternidad chilena, complicaciones
+  (~12 %) y anestesia
+- ``RecienNacido`` (dos en partos múltiples) con atención inmediata,
+  tamizajes metabólico, auditivo y de cardiopatía, y egreso
+- ``AlertaSistema`` (~5 % de los partos) y ``TrazaMovimiento`` de creación
+  del parto y de cada recién nacido, encadenadas
+
+Todo se inserta con ``bulk_create`` por lotes de partos, cada lote en su
+transacción. Los ids se asignan de forma explícita a continuación del máximo
+existente, lo que permite enlazar hijos sin releer la base de datos en
+cualquier motor. La misma semilla, los mismos parámetros y la misma base
+inicial producen exactamente los mismos datos.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from alerts.models import AlertaSistema
+from catalogs.models import CatComplicacionParto, CatNacionalidad, CatPuebloOriginario, CatTipoParto
+from compliance.models import TrazaMovimiento
+from core.models import Rol, Usuario
+from core.utils import calcular_dv
+from maternity.models import Embarazo, MadrePaciente, Parto, PartoAnestesia, PartoComplicacion
+from neonatology.models import (
+    RecienNacido, RNAtencionInmediata, RNTamizajeMetabolico, RNTamizajeAuditivo, RNTamizajeCardiopatia, RNEgreso,
+)
+
+PRESETS = {
+    # Partos por año y profesionales
+    'sala': {'partos_por_anio': 600, 'profesionales': 8},
+    'regional': {'partos_por_anio': 5000, 'profesionales': 60},
+    'nacional': {'partos_por_anio': 180000, 'profesionales': 1500},
+}
+
+TAMANO_LOTE = 5000
+
+# Los RUN sintéticos empiezan sobre los asignados a la fecha
+BASE_RUN = 30000000
+
+NACIONALIDADES = [('Chilena', 84), ('Venezolana', 6), ('Peruana', 3), ('Haitiana', 3), ('Colombiana', 2), ('Boliviana', 2)]
+PUEBLOS_ORIGINARIOS = [('Mapuche', 80), ('Aymara', 8), ('Diaguita', 5), ('Quechua', 3), ('Rapa Nui', 2), ('Atacameño', 2)]
+TIPOS_PARTO = [('Vaginal', 52), ('Cesárea', 42), ('Instrumental', 6)]
+COMPLICACIONES = [
+    'Hemorragia postparto', 'Preeclampsia', 'Desgarro perineal grado III-IV', 'Retención placentaria',
+    'Distocia de hombros', 'Infección puerperal',
+]
+NOMBRES = [
+    'Sofía', 'Isidora', 'Florencia', 'Josefa', 'Valentina', 'Catalina', 'Fernanda', 'Camila', 'Francisca',
+    'Antonia', 'Javiera', 'Constanza', 'Daniela', 'María', 'Paula', 'Carolina', 'Yesenia', 'Rosa',
+]
+APELLIDOS = [
+    'González', 'Muñoz', 'Rojas', 'Díaz', 'Pérez', 'Soto', 'Contreras', 'Silva', 'Martínez', 'Sepúlveda',
+    'Morales', 'Rodríguez', 'López', 'Fuentes', 'Hernández', 'Torres', 'Araya', 'Flores', 'Espinoza', 'Valenzuela',
+]
+ACOMPANANTES = ['Pareja', 'Madre', 'Hermana', 'Amiga', 'Doula']
+
+# Probabilidad de que el parto sea de una madre que ya parió en el período
+PROB_MADRE_RECURRENTE = 0.15
+INTERVALO_MINIMO_PARTOS = timedelta(days=450)
+
+
+def _elegir(rng, opciones):
+    """Elige de una lista de (valor, peso)."""
+    return rng.choices([o[0] for o in opciones], weights=[o[1] for o in opciones])[0]
+
+
+def _catalogo(modelo, nombres):
+    """{nombre: id} de ``nombres`` en el catálogo, creando los que falten."""
+    ids = dict(modelo.objects.filter(nombre__in=nombres).values_list('nombre', modelo._meta.pk.attname))
+    for nombre in nombres:
+        if nombre not in ids:
+            ids[nombre] = modelo.objects.create(nombre=nombre).pk
+    return ids
+
+
+class Contador:
+    """Próximos ids explícitos de cada modelo (a continuación del máximo existente)."""
+
+    def __init__(self, modelos):
+        self.siguiente = {
+            modelo: (modelo.objects.aggregate(m=Max(modelo._meta.pk.attname))['m'] or 0) + 1 for modelo in modelos
+        }
+
+    def __call__(self, modelo):
+        valor = self.siguiente[modelo]
+        self.siguiente[modelo] += 1
+        return valor
+
+
+class GeneradorDataset:
+    """Genera ``partos`` partos (con todo lo asociado) entre ``hasta - anios`` y ``hasta``."""
+
+    MODELOS = (
+        MadrePaciente, Embarazo, Parto, PartoComplicacion, PartoAnestesia, RecienNacido,
+        RNTamizajeMetabolico, RNTamizajeAuditivo, RNTamizajeCardiopatia, AlertaSistema,
+    )
+
+    def __init__(self, partos, anios, profesionales, hasta=None, semilla=1, tamano_lote=TAMANO_LOTE):
+        self.total_partos = partos
+        self.profesionales = profesionales
+        self.hasta = hasta or timezone.localdate()
+        self.desde = date(self.hasta.year - anios, self.hasta.month, min(self.hasta.day, 28))
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+        self.tamano_lote = tamano_lote
+        self.conteo = {}
+
+    def generar(self, progreso=None):
+        """
+        Inserta el dataset lote a lote; ``progreso(partos_generados)`` se llama
+        tras cada lote.
+
+        Returns:
+            dict con las filas insertadas por tabla
+        """
+        self._preparar_catalogos()
+        self.ids = Contador(self.MODELOS)
+        self.primer_parto = self.ids.siguiente[Parto]
+        self.recurrentes = []
+
+        inicio = timezone.make_aware(datetime.combine(self.desde, time.min))
+        paso = (timezone.make_aware(datetime.combine(self.hasta, time.min)) - inicio) / max(1, self.total_partos)
+        generados = 0
+        while generados < self.total_partos:
+            n = min(self.tamano_lote, self.total_partos - generados)
+            fechas = [inicio + paso * (generados + i + self.rng.random()) for i in range(n)]
+            with transaction.atomic():
+                self._insertar(self._lote(fechas))
+            generados += n
+            if progreso:
+                progreso(generados)
+
+        self._reiniciar_secuencias()
+        return self.conteo
+
+    # ------------------------------------------------------------------ catálogos
+
+    def _preparar_catalogos(self):
+        self.nacionalidades = _catalogo(CatNacionalidad, [n for n, _ in NACIONALIDADES])
+        self.pueblos = _catalogo(CatPuebloOriginario, [n for n, _ in PUEBLOS_ORIGINARIOS])
+        self.tipos_parto = _catalogo(CatTipoParto, [n for n, _ in TIPOS_PARTO])
+        self.complicaciones = list(_catalogo(CatComplicacionParto, COMPLICACIONES).values())
+
+        roles = dict(Rol.objects.filter(nombre_rol__in=['matrona_clinica', 'medico']).values_list('nombre_rol', 'id_rol'))
+        existentes = dict(
+            Usuario.objects.filter(email__endswith='@sintetico.local').order_by('run').values_list('run', 'id_usuario')
+        )
+        self.ids_profesionales = []
+        for i in range(self.profesionales):
+            cuerpo = BASE_RUN - 1 - i
+            run = f'{cuerpo}-{calcular_dv(cuerpo)}'
+            if run not in existentes:
+                rol = 'matrona_clinica' if i % 10 < 7 else 'medico'
+                existentes[run] = Usuario.objects.create_user(
+                    run=run, email=f'{run}@sintetico.local', password=None,
+                    nombre_completo=f'{NOMBRES[i % len(NOMBRES)]} {APELLIDOS[i * 7 % len(APELLIDOS)]}',
+                    fk_rol_id=roles.get(rol),
+                ).pk
+            self.ids_profesionales.append(existentes[run])
+
+    # ---------------------------------------------------------------- generación
+
+    def _lote(self, fechas):
+        """Instancias (sin guardar) de todos los modelos para los partos de ``fechas``."""
+        filas = {modelo: [] for modelo in (
+            MadrePaciente, Embarazo, Parto, PartoComplicacion, PartoAnestesia, RecienNacido, RNAtencionInmediata,
+            RNTamizajeMetabolico, RNTamizajeAuditivo, RNTamizajeCardiopatia, RNEgreso, AlertaSistema, TrazaMovimiento,
+        )}
+        for fecha_parto in fechas:
+            self._parto(fecha_parto, filas)
+        return filas
+
+    def _madre(self, fecha_parto, filas):
+        """(id_madre, paridad) de la madre del parto: recurrente o nueva."""
+        rng = self.rng
+        if self.recurrentes and rng.random() < PROB_MADRE_RECURRENTE:
+            posicion = rng.randrange(len(self.recurrentes))
+            id_madre, ultimo_parto, paridad = self.recurrentes[posicion]
+            if fecha_parto - ultimo_parto >= INTERVALO_MINIMO_PARTOS:
+                self.recurrentes[posicion] = (id_madre, fecha_parto, paridad + 1)
+                return id_madre, paridad + 1
+
+        id_madre = self.ids(MadrePaciente)
+        cuerpo = BASE_RUN + id_madre
+        edad = min(46, max(15, round(rng.gauss(29, 6))))
+        pueblo = _elegir(rng, PUEBLOS_ORIGINARIOS) if rng.random() < 0.1 else None
+        filas[MadrePaciente].append(MadrePaciente(
+            id_madre=id_madre, run=f'{cuerpo}-{calcular_dv(cuerpo)}',
+            nombre=rng.choice(NOMBRES), apellido_paterno=rng.choice(APELLIDOS), apellido_materno=rng.choice(APELLIDOS),
+            fecha_nacimiento=fecha_parto.date() - timedelta(days=edad * 365 + rng.randrange(365)),
+            fk_nacionalidad_id=self.nacionalidades[_elegir(rng, NACIONALIDADES)],
+            fk_pueblo_originario_id=self.pueblos[pueblo] if pueblo else None,
+            discapacidad_senadis=rng.random() < 0.02,
+            privada_de_libertad=rng.random() < 0.002,
+            trans_masculino_no_binarie=rng.random() < 0.002,
+        ))
+        paridad = 0 if rng.random() < 0.42 else min(6, 1 + int(rng.expovariate(1.2)))
+        self.recurrentes.append((id_madre, fecha_parto, paridad))
+        if len(self.recurrentes) > 50000:
+            self.recurrentes = self.recurrentes[-25000:]
+        return id_madre, paridad
+
+    def _parto(self, fecha_parto, filas):
+        rng = self.rng
+        id_madre, paridad = self._madre(fecha_parto, filas)
+        profesional = rng.choice(self.ids_profesionales)
+
+        prematuro = rng.random() < 0.08
+        semanas = min(36, max(24, round(rng.gauss(33, 3)))) if prematuro else min(42, max(37, round(rng.gauss(39, 1))))
+        filas[Embarazo].append(Embarazo(
+            id_embarazo=self.ids(Embarazo), fk_madre_id=id_madre, paridad=paridad,
+            control_prenatal=rng.random() < 0.95,
+            fecha_ultima_menstruacion=fecha_parto.date() - timedelta(weeks=semanas, days=rng.randrange(7)),
+            semana_obstetrica=semanas,
+            riesgo_obstetrico='alto' if prematuro or rng.random() < 0.15 else 'bajo',
+        ))
+
+        multiple = rng.random() < 0.015
+        cesareas_previas = 0 if paridad == 0 or rng.random() < 0.7 else (1 if rng.random() < 0.8 else 2)
+        presentacion = _elegir(rng, [('cefalica', 95), ('podalica', 4), ('transversa', 1)])
+        # Cicatriz uterina, presentación no cefálica y embarazo múltiple son casi siempre cesárea
+        forzada = 0.9 if presentacion != 'cefalica' else 0.8 if cesareas_previas else 0.6 if multiple else 0
+        tipo = 'Cesárea' if rng.random() < forzada else _elegir(rng, TIPOS_PARTO)
+        if tipo == 'Cesárea':
+            inicio = _elegir(rng, [('cesarea_electiva', 50), ('espontaneo', 30), ('inducido', 20)])
+        else:
+            inicio = _elegir(rng, [('espontaneo', 75), ('inducido', 25)])
+        id_parto = self.ids(Parto)
+        filas[Parto].append(Parto(
+            id_parto=id_parto, fk_madre_id=id_madre, fk_tipo_parto_id=self.tipos_parto[tipo], fecha_parto=fecha_parto,
+            es_parto_multiple=multiple, presentacion=presentacion, inicio_trabajo_parto=inicio,
+            cesareas_previas=cesareas_previas, fk_profesional_responsable_id=profesional,
+            plan_de_parto=rng.random() < 0.3, libertad_movimiento=rng.random() < 0.6,
+            horas_trabajo_parto=0 if inicio == 'cesarea_electiva' else round(rng.gammavariate(2, 4), 1),
+            fk_acompanante=rng.choice(ACOMPANANTES) if rng.random() < 0.85 else None,
+            fk_sala_duelo_perinatal=False,
+        ))
+
+        if rng.random() < 0.12:
+            for id_complicacion in rng.sample(self.complicaciones, 1 if rng.random() < 0.85 else 2):
+                filas[PartoComplicacion].append(PartoComplicacion(
+                    id_complicacion=self.ids(PartoComplicacion), fk_parto_id=id_parto, fk_complicacion_id=id_complicacion,
+                    histerectomia_obstetrica=rng.random() < 0.01, transfusion_sanguinea=rng.random() < 0.08,
+                ))
+        if tipo == 'Cesárea':
+            anestesia = _elegir(rng, [('raquídea', 85), ('epidural', 10), ('general', 5)])
+        else:
+            anestesia = _elegir(rng, [('epidural', 55), ('ninguna', 30), ('local', 15)])
+        filas[PartoAnestesia].append(PartoAnestesia(
+            id_anestesia=self.ids(PartoAnestesia), fk_parto_id=id_parto, tipo_anestesia=anestesia,
+            solicitada_por_paciente=anestesia == 'epidural' and rng.random() < 0.8,
+        ))
+
+        filas[TrazaMovimiento].append(TrazaMovimiento(
+            fk_usuario_id=profesional, tipo_accion='CREATE', tabla_afectada='parto', id_registro=id_parto,
+            cambios_nuevos={'fk_madre': id_madre, 'fk_tipo_parto': self.tipos_parto[tipo]},
+            resultado='SUCCESS', descripcion='Registro de parto (dataset sintético)', fecha_hora=fecha_parto,
+        ))
+        for orden in range(1, 3 if multiple else 2):
+            self._recien_nacido(id_parto, fecha_parto, semanas, multiple, profesional, filas, orden)
+
+        if rng.random() < 0.05:
+            resuelto = rng.random() < 0.9
+            filas[AlertaSistema].append(AlertaSistema(
+                id_alerta=self.ids(AlertaSistema), fk_usuario_genera_id=profesional,
+                tipo_alerta=rng.choice(['tamizaje_vencido', 'complicacion_parto', 'apgar_bajo', 'peso_extremo']),
+                nivel_gravedad=_elegir(rng, [('baja', 50), ('media', 35), ('alta', 15)]),
+                entidad_origen=rng.choice(['parto', 'recien_nacido']),
+                resuelto=resuelto, fk_usuario_resuelve_id=profesional if resuelto else None,
+                fecha_resolucion=fecha_parto + timedelta(hours=rng.randint(1, 72)) if resuelto else None,
+            ))
+
+    def _recien_nacido(self, id_parto, fecha_parto, semanas, multiple, profesional, filas, orden):
+        rng = self.rng
+        id_rn = self.ids(RecienNacido)
+        media = 3350 if semanas >= 37 else 3350 - (37 - semanas) * 250
+        peso = max(500, round(rng.gauss(media - (500 if multiple else 0), 420)))
+        muerte = rng.random() < 0.004
+        filas[RecienNacido].append(RecienNacido(
+            id_rn=id_rn, fk_parto_id=id_parto, sexo=rng.choice(['M', 'F']), peso_gramos=peso,
+            talla_cm=Decimal(f'{min(56.0, max(28.0, rng.gauss(49.5 - max(0, 37 - semanas), 2))):.2f}'),
+            anomalia_congenita=rng.random() < 0.02, tipo_muerte=rng.choice(['fetal', 'neonatal']) if muerte else None,
+        ))
+        apgar_1 = min(10, max(0, round(rng.gauss(8, 1.2))))
+        filas[RNAtencionInmediata].append(RNAtencionInmediata(
+            fk_rn_id=id_rn, fk_profesional_registra_id=profesional, apgar_1_minuto=apgar_1,
+            apgar_5_minutos=min(10, apgar_1 + rng.randint(0, 2)), ligadura_tardia_cordon=rng.random() < 0.7,
+            contacto_piel_piel=_elegir(rng, [('inmediato', 70), ('diferido', 20), ('no', 10)]),
+            profilaxis_hepatitis_b=rng.random() < 0.97, profilaxis_ocular=rng.random() < 0.97,
+            reanimacion_basica=apgar_1 < 7, reanimacion_avanzada=apgar_1 < 4,
+        ))
+        filas[TrazaMovimiento].append(TrazaMovimiento(
+            fk_usuario_id=profesional, tipo_accion='CREATE', tabla_afectada='recien_nacido', id_registro=id_rn,
+            cambios_nuevos={'fk_parto': id_parto, 'peso_gramos': peso}, resultado='SUCCESS',
+            descripcion='Registro de recién nacido (dataset sintético)',
+            # Microsegundos después del parto: las trazas quedan en orden cronológico de secuencia
+            fecha_hora=fecha_parto + timedelta(microseconds=orden),
+        ))
+        if muerte:
+            return
+
+        if rng.random() < 0.97:
+            filas[RNTamizajeMetabolico].append(RNTamizajeMetabolico(
+                id_tamizaje_metabolico=self.ids(RNTamizajeMetabolico), fk_rn_id=id_rn,
+                fecha_muestra=fecha_parto.date() + timedelta(days=2), resultado_alterado=rng.random() < 0.003,
+            ))
+            if peso < 2000:
+                filas[RNTamizajeMetabolico].append(RNTamizajeMetabolico(
+                    id_tamizaje_metabolico=self.ids(RNTamizajeMetabolico), fk_rn_id=id_rn,
+                    fecha_muestra=fecha_parto.date() + timedelta(days=10), es_segunda_muestra=True,
+                ))
+        if rng.random() < 0.95:
+            refiere = rng.random() < 0.04
+            filas[RNTamizajeAuditivo].append(RNTamizajeAuditivo(
+                id_tamizaje_auditivo=self.ids(RNTamizajeAuditivo), fk_rn_id=id_rn,
+                oido_derecho_resultado='refiere' if refiere else 'pasa', oido_izquierdo_resultado='pasa',
+            ))
+            if refiere and rng.random() < 0.8:
+                filas[RNTamizajeAuditivo].append(RNTamizajeAuditivo(
+                    id_tamizaje_auditivo=self.ids(RNTamizajeAuditivo), fk_rn_id=id_rn,
+                    oido_derecho_resultado='pasa', oido_izquierdo_resultado='pasa',
+                    es_retamizaje=True, es_ambulatorio=True,
+                ))
+        if rng.random() < 0.9:
+            saturacion = rng.randint(95, 100)
+            filas[RNTamizajeCardiopatia].append(RNTamizajeCardiopatia(
+                id_tamizaje_cardiopatia=self.ids(RNTamizajeCardiopatia), fk_rn_id=id_rn,
+                fecha_hora_tamizaje=fecha_parto + timedelta(hours=rng.randint(24, 40)),
+                saturacion_mano_derecha=saturacion, saturacion_pie=saturacion - rng.randint(0, 2),
+                referido_cardiologia=rng.random() < 0.002,
+            ))
+        if rng.random() < 0.98:
+            alimentacion = _elegir(rng, [('LME', 75), ('mixta', 20), ('formula', 5)])
+            filas[RNEgreso].append(RNEgreso(
+                fk_rn_id=id_rn, tipo_alimentacion_alta=alimentacion,
+                motivo_no_lme=None if alimentacion == 'LME' else rng.choice(['hipogalactia', 'decision_materna', 'medica']),
+            ))
+
+    # ------------------------------------------------------------------ escritura
+
+    def _insertar(self, filas):
+        for modelo, objetos in filas.items():
+            if objetos:
+                # TrazaMovimiento.objects encadena los hashes del lote
+                modelo.objects.bulk_create(objetos, batch_size=1000)
+                etiqueta = modelo._meta.db_table
+                self.conteo[etiqueta] = self.conteo.get(etiqueta, 0) + len(objetos)
+
+    def _reiniciar_secuencias(self):
+        """Tras insertar ids explícitos, las secuencias (PostgreSQL) siguen desde el máximo."""
+        sentencias = connection.ops.sequence_reset_sql(no_style(), list(self.MODELOS))
+        if sentencias:
+            with connection.cursor() as cursor:
+                for sentencia in sentencias:
+                    cursor.execute(sentencia)
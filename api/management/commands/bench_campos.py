@@ -0,0 +1,130 @@
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from catalogs.models import CatNacionalidad, CatTipoParto, CatComplicacionParto
+from core.models import Usuario
+from maternity.models import MadrePaciente, Parto, PartoComplicacion, PartoAnestesia
+from neonatology.models import RecienNacido
+
+# (nombre, URL completa, URL reducida). {parto} se reemplaza por un id real.
+CASOS = [
+    ('partos', '/api/maternity/partos/', '/api/maternity/partos/?fields=id_parto,fecha_parto,madre_run'),
+    ('parto detalle', '/api/maternity/partos/{parto}/',
+     '/api/maternity/partos/{parto}/?omit=complicaciones,anestesias'),
+    ('madres', '/api/maternity/madres/', '/api/maternity/madres/?fields=id_madre,run,nombre_completo'),
+    ('recién nacidos', '/api/neonatology/recien-nacidos/',
+     '/api/neonatology/recien-nacidos/?fields=id_rn,sexo,peso_gramos'),
+]
+
+
+def crear_datos_bench(n):
+    """
+    Crea n madres con un parto (con complicación y anestesia) y un recién
+    nacido cada una. Debe llamarse dentro de una transacción que se revierte.
+
+    Returns:
+        tuple: (superusuario para las requests, primer parto creado)
+    """
+    nacionalidad = CatNacionalidad.objects.create(nombre='Bench')
+    tipo_parto = CatTipoParto.objects.create(nombre='Bench')
+    complicacion = CatComplicacionParto.objects.create(nombre='Bench')
+    usuario = Usuario.objects.filter(is_superuser=True, is_active=True).first() or \
+        Usuario.objects.create_superuser(run='10000000-8', email='bench@hospital.local', password=None)
+    MadrePaciente.objects.bulk_create([
+        MadrePaciente(
+            run=f'{80000000 + i}-B', nombre=f'Madre{i}', apellido_paterno='Bench',
+            apellido_materno='Prueba', fecha_nacimiento=date(1980 + i % 25, 1 + i % 12, 1 + i % 28),
+            fk_nacionalidad=nacionalidad,
+        )
+        for i in range(n)
+    ], batch_size=1000)
+    madres = list(MadrePaciente.objects.filter(fk_nacionalidad=nacionalidad).only('id_madre'))
+    ahora = timezone.now()
+    Parto.objects.bulk_create([
+        Parto(
+            fk_madre=madre, fk_tipo_parto=tipo_parto, fk_profesional_responsable=usuario,
+            fecha_parto=ahora - timedelta(hours=i), horas_trabajo_parto=i % 24,
+        )
+        for i, madre in enumerate(madres)
+    ], batch_size=1000)
+    partos = list(Parto.objects.filter(fk_tipo_parto=tipo_parto).only('id_parto'))
+    PartoComplicacion.objects.bulk_create(
+        [PartoComplicacion(fk_parto=p, fk_complicacion=complicacion) for p in partos], batch_size=1000
+    )
+    PartoAnestesia.objects.bulk_create(
+        [PartoAnestesia(fk_parto=p, tipo_anestesia='epidural') for p in partos], batch_size=1000
+    )
+    RecienNacido.objects.bulk_create([
+        RecienNacido(fk_parto=p, sexo='F' if i % 2 else 'M', peso_gramos=2500 + i % 1500,
+                     talla_cm=Decimal('49.50'))
+        for i, p in enumerate(partos)
+    ], batch_size=1000)
+    return usuario, partos[0]
+
+
+def ejecutar_vista(usuario, url, renderizar=True):
+    """
+    Ejecuta la vista de ``url`` directamente (sin middleware) como ``usuario``.
+
+    Returns:
+        tuple: (response, consultas, segundos)
+    """
+    ruta, _, _ = url.partition('?')
+    coincidencia = resolve(ruta)
+    host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if h != '*'), 'localhost')
+    request = APIRequestFactory().get(url, HTTP_HOST=host)
+    force_authenticate(request, user=usuario)
+    with CaptureQueriesContext(connection) as consultas:
+        inicio = time.perf_counter()
+        response = coincidencia.func(request, *coincidencia.args, **coincidencia.kwargs)
+        if renderizar:
+            response.render()
+        duracion = time.perf_counter() - inicio
+    return response, len(consultas), duracion
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara tamaño de respuesta, consultas y latencia de endpoints completos contra los mismos '
+        'endpoints con ?fields=/?omit=. Los datos de prueba se crean en una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=500, help='Partos (con madre y recién nacido) a crear')
+        parser.add_argument('--repeticiones', type=int, default=5, help='Se informa la mediana de N')
+
+    def handle(self, *args, **options):
+        # Sin caché de respuestas: se mide la serialización, no el acierto de caché
+        with override_settings(API_CACHE_HABILITADA=False), transaction.atomic():
+            usuario, parto = crear_datos_bench(max(1, options['filas']))
+            self._medir(usuario, parto, max(1, options['repeticiones']))
+            # Los datos de prueba no se guardan
+            transaction.set_rollback(True)
+
+    def _medir(self, usuario, parto, repeticiones):
+        self.stdout.write(
+            f"{'Endpoint':<16} {'Bytes':>9} {'Reducido':>9} {'Ahorro':>7} "
+            f"{'Consultas':>10} {'ms':>8} {'ms red.':>8}"
+        )
+        for nombre, completa, reducida in CASOS:
+            resultados = []
+            for url in (completa, reducida):
+                url = url.format(parto=parto.pk)
+                medidas = [ejecutar_vista(usuario, url) for _ in range(repeticiones)]
+                response, consultas, _ = medidas[-1]
+                resultados.append((len(response.content), consultas, statistics.median(m[2] for m in medidas) * 1000))
+            (b_completo, q_completo, ms_completo), (b_reducido, q_reducido, ms_reducido) = resultados
+            self.stdout.write(
+                f'{nombre:<16} {b_completo:>9,} {b_reducido:>9,} {1 - b_reducido / b_completo:>6.0%} '
+                f'{f"{q_completo}→{q_reducido}":>10} {ms_completo:>8.1f} {ms_reducido:>8.1f}'
+            )
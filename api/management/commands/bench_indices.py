@@ -0,0 +1,153 @@
+import json
+import statistics
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from catalogs.models import CatNacionalidad, CatTipoParto
+from core.models import Usuario
+from maternity.models import MadrePaciente, Embarazo, Parto
+from reports.models import ReporteREM
+
+from .bench_campos import ejecutar_vista
+
+# (nombre, URL, modelo, índice). {tipo} se reemplaza por un id real.
+CASOS = [
+    ('partos por tipo', '/api/maternity/partos/?fk_tipo_parto={tipo}', Parto, 'parto_tipo_fecha_idx'),
+    ('embarazos', '/api/maternity/embarazos/', Embarazo, 'embarazo_registro_idx'),
+    ('madres', '/api/maternity/madres/', MadrePaciente, 'madre_registro_idx'),
+    ('reportes REM', '/api/reports/reportes-rem/', ReporteREM, 'reporte_rem_generacion_idx'),
+]
+
+LOTE = 10000
+
+
+def _por_lotes(modelo, filas):
+    """``bulk_create`` de un generador, sin tener todas las instancias en memoria."""
+    lote = []
+    for fila in filas:
+        lote.append(fila)
+        if len(lote) == LOTE:
+            modelo.objects.bulk_create(lote)
+            lote = []
+    if lote:
+        modelo.objects.bulk_create(lote)
+
+
+def crear_datos(n):
+    """
+    Crea n partos repartidos en n/2 madres (cada una con dos embarazos), tres
+    tipos de parto y n/10 reportes REM.
+
+    Returns:
+        tuple: (superusuario para las requests, ids para las URLs de CASOS)
+    """
+    nacionalidad = CatNacionalidad.objects.create(nombre='Bench')
+    tipos = [CatTipoParto.objects.create(nombre=nombre).pk for nombre in ('Vaginal', 'Cesárea', 'Instrumental')]
+    usuario = Usuario.objects.create_superuser(run='10000000-8', email='bench@hospital.local', password=None)
+    madres = max(1, n // 2)
+    _por_lotes(MadrePaciente, (
+        MadrePaciente(
+            run=f'{80000000 + i}-B', nombre=f'Madre{i}', apellido_paterno='Bench', apellido_materno='Prueba',
+            fecha_nacimiento=date(1980 + i % 25, 1 + i % 12, 1 + i % 28), fk_nacionalidad=nacionalidad,
+        )
+        for i in range(madres)
+    ))
+    ids_madres = list(MadrePaciente.objects.order_by('id_madre').values_list('id_madre', flat=True))
+    hoy = date.today()
+    _por_lotes(Embarazo, (
+        Embarazo(
+            fk_madre_id=madre, paridad=k, semana_obstetrica=(i + k) % 43,
+            fecha_ultima_menstruacion=hoy - timedelta(days=i % 3000 + 400 * k),
+        )
+        for i, madre in enumerate(ids_madres) for k in range(2)
+    ))
+    ahora = timezone.now()
+    _por_lotes(Parto, (
+        Parto(
+            fk_madre_id=ids_madres[i % madres], fk_tipo_parto_id=tipos[i % 3], fk_profesional_responsable=usuario,
+            fecha_parto=ahora - timedelta(minutes=37 * i), horas_trabajo_parto=i % 24,
+        )
+        for i in range(n)
+    ))
+    _por_lotes(ReporteREM, (
+        ReporteREM(
+            fk_usuario_genera=usuario, tipo_reporte='BS22', estado='generado',
+            rango_fecha_inicio=hoy - timedelta(days=30 + i), rango_fecha_fin=hoy - timedelta(days=i),
+        )
+        for i in range(max(1, n // 10))
+    ))
+    return usuario, {'tipo': tipos[0]}
+
+
+def analizar(modelos):
+    """Actualiza las estadísticas del planificador tras la carga masiva."""
+    sentencia = 'ANALYZE TABLE {}' if connection.vendor == 'mysql' else 'ANALYZE {}'
+    with connection.cursor() as cursor:
+        for modelo in modelos:
+            cursor.execute(sentencia.format(connection.ops.quote_name(modelo._meta.db_table)))
+
+
+def medir(usuario, url, repeticiones):
+    """Mediana en ms de ``repeticiones`` ejecuciones de la vista (tras una de calentamiento)."""
+    ejecutar_vista(usuario, url)
+    return statistics.median(ejecutar_vista(usuario, url)[2] for _ in range(repeticiones)) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide cada endpoint afectado por los índices compuestos de listados con y sin su índice. '
+        'Trabaja sobre una base de datos temporal (la de los tests), que se carga con --filas partos '
+        'y se elimina al terminar: la base configurada no se modifica.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=200000,
+                            help='Partos a crear (n/2 madres, n embarazos, n/10 reportes REM)')
+        parser.add_argument('--repeticiones', type=int, default=5, help='Se informa la mediana de N')
+        parser.add_argument('--guardar', default=None, help='Guarda el resultado en un archivo JSON')
+
+    def handle(self, *args, **options):
+        verbosidad = max(0, options['verbosity'] - 1)
+        nombre_original = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=verbosidad, autoclobber=True, serialize=False)
+        try:
+            # Sin caché de respuestas: se mide la consulta, no el acierto de caché
+            with override_settings(API_CACHE_HABILITADA=False):
+                resultado = self._medir(max(1, options['filas']), max(1, options['repeticiones']))
+        finally:
+            connection.creation.destroy_test_db(nombre_original, verbosity=verbosidad)
+
+        if options['guardar']:
+            with open(options['guardar'], 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"✓ Resultado guardado en {options['guardar']}"))
+
+    def _medir(self, filas, repeticiones):
+        self.stdout.write(f'Creando {filas:,} partos...')
+        usuario, ids = crear_datos(filas)
+        analizar({modelo for _, _, modelo, _ in CASOS})
+
+        self.stdout.write(f"{'Endpoint':<20} {'Índice':<28} {'Sin índice ms':>14} {'Con índice ms':>14} {'Mejora':>8}")
+        casos = []
+        for nombre, url, modelo, nombre_indice in CASOS:
+            url = url.format(**ids)
+            indice = next(i for i in modelo._meta.indexes if i.name == nombre_indice)
+            with connection.schema_editor() as editor:
+                editor.remove_index(modelo, indice)
+            sin_indice = medir(usuario, url, repeticiones)
+            with connection.schema_editor() as editor:
+                editor.add_index(modelo, indice)
+            con_indice = medir(usuario, url, repeticiones)
+            self.stdout.write(
+                f'{nombre:<20} {nombre_indice:<28} {sin_indice:>14.1f} {con_indice:>14.1f} '
+                f'{sin_indice / con_indice:>7.1f}x'
+            )
+            casos.append({
+                'endpoint': nombre, 'url': url, 'indice': nombre_indice,
+                'sin_indice_ms': round(sin_indice, 2), 'con_indice_ms': round(con_indice, 2),
+            })
+        return {'motor': connection.vendor, 'filas': filas, 'repeticiones': repeticiones, 'casos': casos}
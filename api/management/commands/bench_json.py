@@ -0,0 +1,84 @@
+import gzip
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from core.middleware import brotli
+from core.renderers import JSONRapidoRenderer, MessagePackRenderer, msgpack, orjson
+from maternity.fast_serializers import PartoValores
+from maternity.models import Parto
+from .bench_campos import crear_datos_bench, ejecutar_vista
+
+# (nombre, URL). {parto} y {madre} se reemplazan por ids reales.
+CASOS = [
+    ('partos (página)', '/api/maternity/partos/'),
+    ('parto detalle', '/api/maternity/partos/{parto}/'),
+    ('recién nacidos', '/api/neonatology/recien-nacidos/'),
+    ('timeline madre', '/api/maternity/madres/{madre}/timeline/'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el tiempo de codificación y los bytes del JSONRenderer de DRF contra JSONRapidoRenderer '
+        '(orjson) y MessagePack, y el tamaño y costo de gzip/brotli, sobre endpoints representativos. Los '
+        'datos de prueba se crean en una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=500,
+                            help='Partos a crear; también es el tamaño del caso "partos (todas)"')
+        parser.add_argument('--repeticiones', type=int, default=20, help='Se informa la mediana de N')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING('orjson no está instalado: JSONRapidoRenderer usa la implementación de DRF'))
+        with override_settings(API_CACHE_HABILITADA=False), transaction.atomic():
+            usuario, parto = crear_datos_bench(max(1, options['filas']))
+            datos = []
+            for nombre, url in CASOS:
+                url = url.format(parto=parto.pk, madre=parto.fk_madre_id)
+                response, _, _ = ejecutar_vista(usuario, url, renderizar=False)
+                datos.append((nombre, response.data))
+            datos.append(('partos (todas)', PartoValores().serializar(PartoValores().preparar(Parto.objects.all()))))
+            self._medir(datos, max(1, options['repeticiones']))
+            # Los datos de prueba no se guardan
+            transaction.set_rollback(True)
+
+    def _mediana_ms(self, funcion, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            resultado = funcion()
+            tiempos.append(time.perf_counter() - inicio)
+        return resultado, statistics.median(tiempos) * 1000
+
+    def _medir(self, datos, repeticiones):
+        drf, rapido = JSONRenderer(), JSONRapidoRenderer()
+        self.stdout.write(
+            f"{'Caso':<18} {'Bytes':>9} {'DRF ms':>8} {'orjson ms':>10} {'Mejora':>7} "
+            f"{'gzip':>9} {'gzip ms':>8} {'br':>9} {'br ms':>7} {'msgpack':>9} {'mp ms':>7}"
+        )
+        for nombre, data in datos:
+            contenido_drf, ms_drf = self._mediana_ms(lambda: drf.render(data), repeticiones)
+            contenido, ms_rapido = self._mediana_ms(lambda: rapido.render(data), repeticiones)
+            if contenido != contenido_drf:
+                self.stdout.write(self.style.ERROR(f'{nombre}: la salida difiere del JSONRenderer de DRF'))
+            comprimido, ms_gzip = self._mediana_ms(lambda: gzip.compress(contenido, compresslevel=6, mtime=0),
+                                                   repeticiones)
+            br, ms_br = '-', '-'
+            if brotli is not None:
+                comprimido_br, ms = self._mediana_ms(lambda: brotli.compress(contenido, quality=4), repeticiones)
+                br, ms_br = f'{len(comprimido_br):,}', f'{ms:.2f}'
+            mp, ms_mp = '-', '-'
+            if msgpack is not None:
+                binario, ms = self._mediana_ms(lambda: MessagePackRenderer().render(data), repeticiones)
+                mp, ms_mp = f'{len(binario):,}', f'{ms:.2f}'
+            self.stdout.write(
+                f'{nombre:<18} {len(contenido):>9,} {ms_drf:>8.2f} {ms_rapido:>10.2f} {ms_drf / ms_rapido:>6.1f}x '
+                f'{len(comprimido):>9,} {ms_gzip:>8.2f} {br:>9} {ms_br:>7} {mp:>9} {ms_mp:>7}'
+            )
@@ -0,0 +1,58 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.dataset import PRESETS, TAMANO_LOTE, GeneradorDataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera un dataset hospitalario sintético (madres, embarazos, partos con complicaciones y anestesia, '
+        'recién nacidos con atención inmediata, tamizajes y egreso, alertas y trazas) para benchmarks. '
+        'Es determinista: la misma --semilla y los mismos parámetros producen los mismos datos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--preset', choices=list(PRESETS), default='sala',
+                            help='Escala: ' + ', '.join(f'{n} ({p["partos_por_anio"]:,} partos/año)' for n, p in PRESETS.items()))
+        parser.add_argument('--anios', type=int, default=3, help='Años de historia')
+        parser.add_argument('--partos', type=int, default=None, help='Total de partos (reemplaza el del preset)')
+        parser.add_argument('--hasta', default=None, help='Fecha final YYYY-MM-DD (por defecto: hoy)')
+        parser.add_argument('--semilla', type=int, default=1)
+        parser.add_argument('--tamano-lote', type=int, default=TAMANO_LOTE, help='Partos por transacción')
+        parser.add_argument('--robson', action='store_true', help='Calcula el grupo de Robson al terminar')
+
+    def handle(self, *args, **options):
+        preset = PRESETS[options['preset']]
+        anios = max(1, options['anios'])
+        partos = options['partos'] if options['partos'] is not None else preset['partos_por_anio'] * anios
+        try:
+            hasta = date.fromisoformat(options['hasta']) if options['hasta'] else None
+        except ValueError:
+            raise CommandError('--hasta debe tener formato YYYY-MM-DD')
+
+        generador = GeneradorDataset(
+            partos=max(1, partos), anios=anios, profesionales=preset['profesionales'], hasta=hasta,
+            semilla=options['semilla'], tamano_lote=max(1, options['tamano_lote']),
+        )
+        self.stdout.write(f'Generando {partos:,} partos en {anios} años (preset {options["preset"]})...')
+        inicio = time.perf_counter()
+        conteo = generador.generar(
+            progreso=lambda n: self.stdout.write(f'  {n:,} partos ({time.perf_counter() - inicio:.0f} s)')
+        )
+        segundos = time.perf_counter() - inicio
+
+        total = sum(conteo.values())
+        for tabla, filas in sorted(conteo.items(), key=lambda t: -t[1]):
+            self.stdout.write(f'  {tabla:<28} {filas:>12,}')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ {total:,} filas en {segundos:.1f} s ({total / max(segundos, 1e-9):,.0f} filas/s)'
+        ))
+
+        if options['robson']:
+            from maternity.models import Parto
+            from maternity.robson import recalcular_robson
+
+            resumen = recalcular_robson(Parto.objects.filter(id_parto__gte=generador.primer_parto))
+            self.stdout.write(f'Robson: {resumen["clasificados"]:,} de {resumen["procesados"]:,} partos clasificados')
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from drf_spectacular.drainage import GENERATOR_STATS
+
+from api.schema import generar_schema, ruta_schema
+
+
+class Command(BaseCommand):
+    help = (
+        'Genera y valida el schema OpenAPI y lo guarda como artefacto estático (schema.yml). '
+        'Con --check falla si el archivo versionado no coincide con el código.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--archivo', default=None, help='Ruta de salida (por defecto settings.API_SCHEMA_ARCHIVO)')
+        parser.add_argument('--check', action='store_true', help='No escribe; falla si el archivo difiere del schema generado')
+        parser.add_argument('--fallar-con-advertencias', action='store_true', help='Falla si drf-spectacular emite advertencias')
+
+    def handle(self, *args, **options):
+        ruta = ruta_schema() if options['archivo'] is None else options['archivo']
+        GENERATOR_STATS.reset()
+
+        try:
+            if options['verbosity'] > 1:
+                contenido = generar_schema(validar=True)
+            else:
+                with GENERATOR_STATS.silence():
+                    contenido = generar_schema(validar=True)
+        except Exception as e:
+            raise CommandError(f'El schema generado no es válido: {e}')
+
+        if options['verbosity'] > 0:
+            GENERATOR_STATS.emit_summary()
+        if options['fallar_con_advertencias'] and GENERATOR_STATS:
+            raise CommandError('Fallando por advertencias en la generación del schema')
+
+        if options['check']:
+            try:
+                with open(ruta, 'rb') as f:
+                    actual = f.read()
+            except FileNotFoundError:
+                raise CommandError(f'No existe {ruta}. Ejecute: python manage.py generar_schema')
+            if actual != contenido:
+                raise CommandError(
+                    f'{ruta} no coincide con el código. Ejecute: python manage.py generar_schema'
+                )
+            self.stdout.write(self.style.SUCCESS(f'✓ {ruta} está actualizado'))
+            return
+
+        with open(ruta, 'wb') as f:
+            f.write(contenido)
+        self.stdout.write(self.style.SUCCESS(f'✓ Schema generado en {ruta} ({len(contenido)} bytes)'))
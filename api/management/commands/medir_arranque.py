@@ -0,0 +1,139 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Script que se ejecuta en un intérprete nuevo (arranque en frío) y reporta
+# los tiempos por stdout. Las líneas de -X importtime van a stderr.
+SCRIPT_ARRANQUE = r'''
+import json, os, sys, time
+t0 = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+if {objetivo!r} == 'wsgi':
+    from config.wsgi import application
+else:
+    import django
+    django.setup()
+t1 = time.perf_counter()
+if {url!r}:
+    from django.urls import resolve
+    resolve({url!r})
+t2 = time.perf_counter()
+print(json.dumps({{
+    'arranque_ms': (t1 - t0) * 1000,
+    'primera_url_ms': (t2 - t1) * 1000,
+    'modulos': len(sys.modules),
+}}))
+'''
+
+
+def parsear_importtime(salida):
+    """
+    Parsea la salida de ``python -X importtime``.
+
+    Returns:
+        list[tuple[str, int, int]]: (módulo, self_us, acumulado_us) por import
+    """
+    imports = []
+    for linea in salida.splitlines():
+        if not linea.startswith('import time:') or 'imported package' in linea:
+            continue
+        try:
+            propio, acumulado, modulo = linea[len('import time:'):].split('|')
+            imports.append((modulo.strip(), int(propio), int(acumulado)))
+        except ValueError:
+            continue
+    return imports
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el arranque en frío de la aplicación (import de config.wsgi o django.setup() y '
+        'primera resolución de URL) en intérpretes nuevos, y lista los imports más costosos.'
+    )
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--objetivo', choices=['wsgi', 'setup'], default='wsgi',
+                            help='wsgi: import de config.wsgi (worker gunicorn); setup: solo django.setup() (comandos)')
+        parser.add_argument('--url', default='/api/maternity/partos/',
+                            help='URL a resolver después del arranque ("" para omitir)')
+        parser.add_argument('--repeticiones', type=int, default=5, help='Número de arranques a medir')
+        parser.add_argument('--top', type=int, default=20, help='Imports más costosos a mostrar')
+        parser.add_argument('--guardar', default=None, help='Guarda el resultado en un archivo JSON')
+        parser.add_argument('--presupuesto-ms', type=float, default=None,
+                            help='Falla si la mediana de arranque + primera URL supera este valor')
+
+    def _ejecutar(self, objetivo, url, importtime):
+        comando = [sys.executable]
+        if importtime:
+            comando += ['-X', 'importtime']
+        comando += ['-c', SCRIPT_ARRANQUE.format(objetivo=objetivo, url=url)]
+        resultado = subprocess.run(
+            comando, cwd=settings.BASE_DIR, env=os.environ.copy(),
+            capture_output=True, text=True,
+        )
+        if resultado.returncode != 0:
+            raise CommandError(f'El arranque falló:\n{resultado.stderr[-2000:]}')
+        return json.loads(resultado.stdout.strip().splitlines()[-1]), resultado.stderr
+
+    def handle(self, *args, **options):
+        objetivo, url = options['objetivo'], options['url']
+        repeticiones = max(1, options['repeticiones'])
+
+        # Las mediciones de tiempo se hacen sin -X importtime (que agrega overhead)
+        mediciones = [self._ejecutar(objetivo, url, importtime=False)[0] for _ in range(repeticiones)]
+        _, stderr = self._ejecutar(objetivo, url, importtime=True)
+        imports = parsear_importtime(stderr)
+
+        por_paquete = defaultdict(int)
+        for modulo, propio, _ in imports:
+            por_paquete[modulo.split('.')[0]] += propio
+
+        arranque = statistics.median(m['arranque_ms'] for m in mediciones)
+        primera_url = statistics.median(m['primera_url_ms'] for m in mediciones)
+        resultado = {
+            'objetivo': objetivo,
+            'url': url,
+            'repeticiones': repeticiones,
+            'arranque_ms': round(arranque, 1),
+            'primera_url_ms': round(primera_url, 1),
+            'total_ms': round(arranque + primera_url, 1),
+            'modulos': mediciones[-1]['modulos'],
+            'imports_mas_costosos': [
+                {'modulo': m, 'acumulado_ms': round(a / 1000, 1)}
+                for m, _, a in sorted(imports, key=lambda i: i[2], reverse=True)[:options['top']]
+            ],
+            'por_paquete_ms': {
+                p: round(us / 1000, 1)
+                for p, us in sorted(por_paquete.items(), key=lambda i: i[1], reverse=True)[:options['top']]
+            },
+        }
+
+        self.stdout.write(f"Objetivo: {objetivo}  URL: {url or '-'}  Repeticiones: {repeticiones}")
+        self.stdout.write(f"Arranque (mediana):     {resultado['arranque_ms']:>8.1f} ms")
+        self.stdout.write(f"Primera URL (mediana):  {resultado['primera_url_ms']:>8.1f} ms")
+        self.stdout.write(f"Módulos cargados:       {resultado['modulos']:>8}")
+        self.stdout.write('')
+        self.stdout.write(f"{'Import (acumulado)':<60} {'ms':>8}")
+        for item in resultado['imports_mas_costosos']:
+            self.stdout.write(f"{item['modulo']:<60} {item['acumulado_ms']:>8.1f}")
+        self.stdout.write('')
+        self.stdout.write(f"{'Paquete (tiempo propio)':<60} {'ms':>8}")
+        for paquete, ms in resultado['por_paquete_ms'].items():
+            self.stdout.write(f"{paquete:<60} {ms:>8.1f}")
+
+        if options['guardar']:
+            with open(options['guardar'], 'w', encoding='utf-8') as f:
+                json.dump(resultado, f, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"✓ Resultado guardado en {options['guardar']}"))
+
+        if options['presupuesto_ms'] is not None and resultado['total_ms'] > options['presupuesto_ms']:
+            raise CommandError(
+                f"El arranque ({resultado['total_ms']} ms) supera el presupuesto de {options['presupuesto_ms']} ms"
+            )
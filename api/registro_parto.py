@@ -0,0 +1,244 @@
+"""
+Registro de un parto completo en una sola petición
+(POST /api/maternity/partos/registrar/).
+
+Reemplaza la secuencia de POST a partos, partos-complicaciones,
+partos-anestesias, recien-nacidos y atenciones-inmediatas por un único
+documento:
+
+    {
+        "fk_madre": 1, "fk_tipo_parto": 2, "fk_profesional_responsable": 5,
+        "fecha_parto": "...",
+        "complicaciones": [{"fk_complicacion": 3}],
+        "anestesias": [{"tipo_anestesia": "epidural"}],
+        "recien_nacidos": [
+            {"sexo": "F", "peso_gramos": 3200, "talla_cm": "49.5",
+             "atencion_inmediata": {"apgar_1_minuto": 8, "apgar_5_minutos": 9}}
+        ]
+    }
+
+- Se valida todo antes de escribir: los catálogos contra los ids cacheados
+  (``core.cache.ids_catalogo``) y los profesionales con una sola consulta.
+- Se escribe en una transacción: el parto con ``save()`` (calcula Robson)
+  y el resto con un ``bulk_create`` por tabla. Un error en cualquier fila
+  revierte el episodio completo.
+- ``bulk_create`` no emite señales: el registro de cambios de la
+  sincronización, la outbox y la caché de respuestas se actualizan a mano.
+- Cada sección exige el mismo permiso que su endpoint individual, y queda
+  una sola traza de auditoría para el episodio.
+"""
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from catalogs.models import CatComplicacionParto, CatRobson, CatTipoParto
+from core.cache import ids_catalogo, invalidar_modelo
+from core.models import Usuario
+from maternity.models import Parto, PartoComplicacion, PartoAnestesia
+from maternity.serializers import PartoDetailSerializer
+from neonatology.models import RecienNacido, RNAtencionInmediata
+from neonatology.serializers import RecienNacidoSerializer, RNAtencionInmediataSerializer
+
+# Permiso de escritura de cada sección (los mismos que exigen sus endpoints)
+PERMISO_PARTO = 'maternity:delivery:create'
+PERMISOS_SECCION = {
+    'complicaciones': 'maternity:complication:manage',
+    'anestesias': 'maternity:delivery:update_all',
+    'recien_nacidos': 'neonatal:rn:create',
+    'atencion_inmediata': 'neonatal:rn:update_immediate',
+}
+
+
+def permisos_requeridos(datos):
+    """
+    Permisos que exige el documento según las secciones que trae. Se
+    calcula sobre los datos crudos, antes de validarlos.
+    """
+    permisos = [PERMISO_PARTO]
+    if not isinstance(datos, dict):
+        return permisos
+    for seccion in ('complicaciones', 'anestesias', 'recien_nacidos'):
+        if datos.get(seccion):
+            permisos.append(PERMISOS_SECCION[seccion])
+    recien_nacidos = datos.get('recien_nacidos')
+    if isinstance(recien_nacidos, list) and any(
+        isinstance(rn, dict) and rn.get('atencion_inmediata') for rn in recien_nacidos
+    ):
+        permisos.append(PERMISOS_SECCION['atencion_inmediata'])
+    return permisos
+
+
+class IdCatalogoField(serializers.IntegerField):
+    """Id de un catálogo validado contra el conjunto cacheado, sin consultar la base de datos."""
+    default_error_messages = {
+        'does_not_exist': serializers.PrimaryKeyRelatedField.default_error_messages['does_not_exist'],
+    }
+
+    def __init__(self, modelo, **kwargs):
+        self.modelo = modelo
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        valor = super().to_internal_value(data)
+        if valor not in ids_catalogo(self.modelo):
+            self.fail('does_not_exist', pk_value=valor)
+        return valor
+
+
+class ComplicacionRegistroSerializer(serializers.ModelSerializer):
+    fk_complicacion = IdCatalogoField(CatComplicacionParto)
+
+    class Meta:
+        model = PartoComplicacion
+        fields = ['fk_complicacion', 'histerectomia_obstetrica', 'transfusion_sanguinea']
+
+
+class AnestesiaRegistroSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PartoAnestesia
+        fields = ['tipo_anestesia', 'solicitada_por_paciente']
+
+
+class AtencionInmediataRegistroSerializer(serializers.ModelSerializer):
+    # Se valida junto con el resto de los profesionales del documento
+    fk_profesional_registra = serializers.IntegerField(
+        required=False, help_text='Por defecto, el profesional responsable del parto',
+    )
+
+    class Meta:
+        model = RNAtencionInmediata
+        exclude = ['fk_rn']
+
+
+class RecienNacidoRegistroSerializer(serializers.ModelSerializer):
+    atencion_inmediata = AtencionInmediataRegistroSerializer(required=False, allow_null=True)
+
+    class Meta:
+        model = RecienNacido
+        exclude = ['id_rn', 'fk_parto']
+
+
+class RegistroPartoSerializer(serializers.ModelSerializer):
+    """Episodio de parto completo: parto, complicaciones, anestesias y recién nacidos."""
+    fk_tipo_parto = IdCatalogoField(CatTipoParto)
+    fk_clasificacion_robson = IdCatalogoField(CatRobson, required=False, allow_null=True)
+    fk_profesional_responsable = serializers.IntegerField()
+    complicaciones = ComplicacionRegistroSerializer(many=True, required=False)
+    anestesias = AnestesiaRegistroSerializer(many=True, required=False)
+    recien_nacidos = RecienNacidoRegistroSerializer(many=True, required=False)
+
+    class Meta:
+        model = Parto
+        fields = [
+            'fk_madre', 'fk_tipo_parto', 'fk_profesional_responsable', 'fecha_parto',
+            'es_parto_multiple', 'presentacion', 'inicio_trabajo_parto', 'cesareas_previas',
+            'fk_clasificacion_robson', 'plan_de_parto', 'libertad_movimiento', 'horas_trabajo_parto',
+            'fk_acompanante', 'fk_sala_duelo_perinatal',
+            'complicaciones', 'anestesias', 'recien_nacidos',
+        ]
+
+    def validate(self, attrs):
+        errores = {}
+        complicaciones = [c['fk_complicacion'] for c in attrs.get('complicaciones', [])]
+        if len(set(complicaciones)) != len(complicaciones):
+            errores['complicaciones'] = 'Una complicación no puede registrarse dos veces en el mismo parto'
+        if len(attrs.get('recien_nacidos', [])) > 1 and not attrs.get('es_parto_multiple'):
+            errores['es_parto_multiple'] = 'Debe ser verdadero si se registra más de un recién nacido'
+
+        atenciones = [rn['atencion_inmediata'] for rn in attrs.get('recien_nacidos', []) if rn.get('atencion_inmediata')]
+        for atencion in atenciones:
+            atencion.setdefault('fk_profesional_registra', attrs['fk_profesional_responsable'])
+        profesionales = {attrs['fk_profesional_responsable']} | {a['fk_profesional_registra'] for a in atenciones}
+        faltantes = profesionales - set(Usuario.objects.filter(pk__in=profesionales).values_list('pk', flat=True))
+        if faltantes:
+            errores['profesionales'] = f'Usuarios inexistentes: {sorted(faltantes)}'
+
+        if errores:
+            raise serializers.ValidationError(errores)
+        return attrs
+
+
+def _insertar(modelo, instancias, parto):
+    """
+    ``bulk_create`` de las filas de un parto recién creado, con sus claves
+    primarias asignadas.
+    """
+    if not instancias:
+        return []
+    creadas = modelo.objects.bulk_create(instancias)
+    if not connection.features.can_return_rows_from_bulk_insert:
+        # MySQL no retorna las claves de un INSERT múltiple. El parto es nuevo, así
+        # que sus filas son exactamente éstas y las claves siguen el orden de inserción.
+        creadas = list(modelo.objects.filter(fk_parto=parto).order_by('pk'))
+    return creadas
+
+
+def _publicar(modelo, instancias):
+    """Lo que harían las señales ``post_save`` de cada fila creada con ``bulk_create``."""
+    from sync.cambios import registrar_cambios
+    from sync.outbox import CREAR, registrar_eventos
+
+    if instancias:
+        registrar_cambios(modelo, [instancia.pk for instancia in instancias])
+        registrar_eventos(modelo, instancias, CREAR)
+        invalidar_modelo(modelo)
+        transaction.on_commit(lambda: invalidar_modelo(modelo))
+
+
+def registrar_parto(datos):
+    """
+    Escribe el episodio validado por ``RegistroPartoSerializer``.
+
+    Returns:
+        tuple: (parto, complicaciones, anestesias, recien_nacidos, atenciones)
+    """
+    datos = dict(datos)
+    complicaciones = datos.pop('complicaciones', [])
+    anestesias = datos.pop('anestesias', [])
+    recien_nacidos = datos.pop('recien_nacidos', [])
+    for campo in ('fk_tipo_parto', 'fk_clasificacion_robson', 'fk_profesional_responsable'):
+        if campo in datos:
+            datos[f'{campo}_id'] = datos.pop(campo)
+
+    with transaction.atomic():
+        parto = Parto(**datos)
+        parto.save()
+        filas_complicaciones = _insertar(PartoComplicacion, [
+            PartoComplicacion(fk_parto=parto, fk_complicacion_id=c.pop('fk_complicacion'), **c)
+            for c in complicaciones
+        ], parto)
+        filas_anestesias = _insertar(PartoAnestesia, [PartoAnestesia(fk_parto=parto, **a) for a in anestesias], parto)
+        atenciones = [rn.pop('atencion_inmediata', None) for rn in recien_nacidos]
+        filas_rn = _insertar(RecienNacido, [RecienNacido(fk_parto=parto, **rn) for rn in recien_nacidos], parto)
+        filas_atencion = RNAtencionInmediata.objects.bulk_create([
+            RNAtencionInmediata(
+                fk_rn=rn, fk_profesional_registra_id=atencion.pop('fk_profesional_registra'), **atencion,
+            )
+            for rn, atencion in zip(filas_rn, atenciones) if atencion
+        ])
+        for modelo, filas in (
+            (PartoComplicacion, filas_complicaciones),
+            (PartoAnestesia, filas_anestesias),
+            (RecienNacido, filas_rn),
+            (RNAtencionInmediata, filas_atencion),
+        ):
+            _publicar(modelo, filas)
+    return parto, filas_complicaciones, filas_anestesias, filas_rn, filas_atencion
+
+
+def serializar_registro(parto, recien_nacidos, atenciones):
+    """Respuesta del registro: el parto con su detalle y los recién nacidos con su atención inmediata."""
+    parto = Parto.objects.con_detalle().get(pk=parto.pk)
+    profesionales = Usuario.objects.in_bulk({atencion.fk_profesional_registra_id for atencion in atenciones})
+    por_rn = {}
+    for atencion in atenciones:
+        atencion.fk_profesional_registra = profesionales[atencion.fk_profesional_registra_id]
+        por_rn[atencion.fk_rn_id] = atencion
+    datos = PartoDetailSerializer(parto).data
+    datos['recien_nacidos'] = []
+    for rn in recien_nacidos:
+        rn.fk_parto = parto
+        fila = RecienNacidoSerializer(rn).data
+        atencion = por_rn.get(rn.pk)
+        fila['atencion_inmediata'] = RNAtencionInmediataSerializer(atencion).data if atencion else None
+        datos['recien_nacidos'].append(fila)
+    return datos
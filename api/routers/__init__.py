@@ -0,0 +1,72 @@
+"""
+Rutas de la API, con un router por aplicación.
+
+Cada aplicación se monta bajo su prefijo (``maternity/``, ``neonatology/``...)
+con un URLconf que Django importa recién cuando una request coincide con ese
+prefijo. Así un worker recién iniciado (o un comando de gestión) no importa
+todos los viewsets y serializers del sistema: una request a
+``/api/maternity/partos/`` solo carga ``api.routers.maternity`` y sus
+dependencias.
+
+Los nombres de ruta (``parto-list``, ``token_obtain_pair``...) y las URLs son
+los mismos que con el router único anterior.
+"""
+from importlib import import_module
+
+from django.urls import path, re_path
+from rest_framework.routers import APIRootView, DefaultRouter
+
+# (prefijo URL, módulo con urlpatterns). 'core' va al final porque se monta
+# en la raíz (usuarios/, roles/...) y no debe atrapar las demás rutas.
+ROUTERS_POR_APP = (
+    ('catalogs/', 'api.routers.catalogs'),
+    ('maternity/', 'api.routers.maternity'),
+    ('neonatology/', 'api.routers.neonatology'),
+    ('compliance/', 'api.routers.compliance'),
+    ('alerts/', 'api.routers.alerts'),
+    ('reports/', 'api.routers.reports'),
+    ('sync/', 'api.routers.sync'),
+    ('', 'api.routers.core'),
+)
+
+
+class RouterApp(DefaultRouter):
+    """Router de una aplicación: sin vista raíz propia (la raíz es RaizAPIView)."""
+    include_root_view = False
+
+
+class RaizAPIView(APIRootView):
+    """
+    Raíz navegable de la API (GET /api/).
+
+    Construye el listado de endpoints al primer uso, importando los routers de
+    todas las aplicaciones solo en ese momento.
+    """
+    _api_root_dict = None
+
+    @classmethod
+    def obtener_api_root_dict(cls):
+        if cls._api_root_dict is None:
+            api_root_dict = {}
+            for prefijo, modulo in ROUTERS_POR_APP:
+                router = import_module(modulo).router
+                for prefix, viewset, basename in router.registry:
+                    api_root_dict[prefijo + prefix] = router.routes[0].name.format(basename=basename)
+            cls._api_root_dict = api_root_dict
+        return cls._api_root_dict
+
+    def get(self, request, *args, **kwargs):
+        self.api_root_dict = self.obtener_api_root_dict()
+        return super().get(request, *args, **kwargs)
+
+
+urlpatterns = [
+    re_path(r'^$', RaizAPIView.as_view(), name='api-root'),
+    re_path(r'^\.(?P<format>[a-z0-9]+)/?$', RaizAPIView.as_view(), name='api-root'),
+    # Una tupla (módulo, app_name, namespace) crea un URLResolver que importa
+    # el módulo de forma diferida, a diferencia de include().
+    path('auth/', ('api.routers.auth', None, None)),
+] + [
+    path(prefijo, (modulo, None, None))
+    for prefijo, modulo in ROUTERS_POR_APP
+]
@@ -0,0 +1,10 @@
+from api.routers import RouterApp
+
+from api.viewsets.alerts import AlertaSistemaViewSet
+
+router = RouterApp()
+
+# ============ ALERTS ============
+router.register(r'alertas', AlertaSistemaViewSet, basename='alerta-sistema')
+
+urlpatterns = router.urls
@@ -0,0 +1,17 @@
+from api.routers import RouterApp
+
+from api.viewsets.catalogs import (
+    CatNacionalidadViewSet, CatPuebloOriginarioViewSet, CatComplicacionPartoViewSet,
+    CatRobsonViewSet, CatTipoPartoViewSet,
+)
+
+router = RouterApp()
+
+# ============ CATALOGS ============
+router.register(r'nacionalidades', CatNacionalidadViewSet, basename='cat-nacionalidad')
+router.register(r'pueblos-originarios', CatPuebloOriginarioViewSet, basename='cat-pueblo-originario')
+router.register(r'complicaciones-parto', CatComplicacionPartoViewSet, basename='cat-complicacion-parto')
+router.register(r'robson', CatRobsonViewSet, basename='cat-robson')
+router.register(r'tipos-parto', CatTipoPartoViewSet, basename='cat-tipo-parto')
+
+urlpatterns = router.urls
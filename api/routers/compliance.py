@@ -0,0 +1,10 @@
+from api.routers import RouterApp
+
+from api.viewsets.compliance import TrazaMovimientoViewSet
+
+router = RouterApp()
+
+# ============ COMPLIANCE ============
+router.register(r'trazas', TrazaMovimientoViewSet, basename='traza-movimiento')
+
+urlpatterns = router.urls
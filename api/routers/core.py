@@ -0,0 +1,13 @@
+from api.routers import RouterApp
+
+from api.viewsets.core import UsuarioViewSet, RolViewSet, PermisoViewSet, RolPermisoViewSet
+
+router = RouterApp()
+
+# ============ CORE ============
+router.register(r'usuarios', UsuarioViewSet, basename='usuario')
+router.register(r'roles', RolViewSet, basename='rol')
+router.register(r'permisos', PermisoViewSet, basename='permiso')
+router.register(r'roles-permisos', RolPermisoViewSet, basename='rol-permiso')
+
+urlpatterns = router.urls
@@ -0,0 +1,20 @@
+from api.routers import RouterApp
+
+from api.viewsets.maternity import (
+    MadrePacienteViewSet, EmbarazoViewSet, PartoViewSet, PartoComplicacionViewSet,
+    PartoAnestesiaViewSet, IVEAtencionViewSet, IVEAcompanamientoViewSet, AltaAnticonceptivoViewSet,
+)
+
+router = RouterApp()
+
+# ============ MATERNITY ============
+router.register(r'madres', MadrePacienteViewSet, basename='madre-paciente')
+router.register(r'embarazos', EmbarazoViewSet, basename='embarazo')
+router.register(r'partos', PartoViewSet, basename='parto')
+router.register(r'partos-complicaciones', PartoComplicacionViewSet, basename='parto-complicacion')
+router.register(r'partos-anestesias', PartoAnestesiaViewSet, basename='parto-anestesia')
+router.register(r'ive-atenciones', IVEAtencionViewSet, basename='ive-atencion')
+router.register(r'ive-acompanamientos', IVEAcompanamientoViewSet, basename='ive-acompanamiento')
+router.register(r'altas-anticonceptivos', AltaAnticonceptivoViewSet, basename='alta-anticonceptivo')
+
+urlpatterns = router.urls
@@ -0,0 +1,20 @@
+from api.routers import RouterApp
+
+from api.viewsets.neonatology import (
+    RecienNacidoViewSet, RNAtencionInmediataViewSet, RNTamizajeMetabolicoViewSet,
+    RNTamizajeAuditivoViewSet, RNTamizajeCardiopatiaViewSet, RNEgresoViewSet,
+    TamizajePendienteViewSet,
+)
+
+router = RouterApp()
+
+# ============ NEONATOLOGY ============
+router.register(r'recien-nacidos', RecienNacidoViewSet, basename='recien-nacido')
+router.register(r'atenciones-inmediatas', RNAtencionInmediataViewSet, basename='rn-atencion-inmediata')
+router.register(r'tamizajes-metabolicos', RNTamizajeMetabolicoViewSet, basename='rn-tamizaje-metabolico')
+router.register(r'tamizajes-auditivos', RNTamizajeAuditivoViewSet, basename='rn-tamizaje-auditivo')
+router.register(r'tamizajes-cardiopatias', RNTamizajeCardiopatiaViewSet, basename='rn-tamizaje-cardiopatia')
+router.register(r'tamizajes-pendientes', TamizajePendienteViewSet, basename='rn-tamizaje-pendiente')
+router.register(r'egresos', RNEgresoViewSet, basename='rn-egreso')
+
+urlpatterns = router.urls
@@ -0,0 +1,12 @@
+from api.routers import RouterApp
+
+from api.viewsets.reports import ReporteREMViewSet, ReporteREMDetalleViewSet, IndicadorPartoViewSet
+
+router = RouterApp()
+
+# ============ REPORTS ============
+router.register(r'reportes-rem', ReporteREMViewSet, basename='reporte-rem')
+router.register(r'reportes-rem-detalles', ReporteREMDetalleViewSet, basename='reporte-rem-detalle')
+router.register(r'indicadores-partos', IndicadorPartoViewSet, basename='indicador-parto')
+
+urlpatterns = router.urls
@@ -0,0 +1,11 @@
+from api.routers import RouterApp
+
+from api.viewsets.sync import FeedEventosViewSet, SincronizacionViewSet
+
+router = RouterApp()
+
+# ============ SYNC ============
+router.register(r'cambios', SincronizacionViewSet, basename='sync-cambio')
+router.register(r'eventos', FeedEventosViewSet, basename='sync-evento')
+
+urlpatterns = router.urls
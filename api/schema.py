@@ -0,0 +1,80 @@
+"""
+Generación y carga del schema OpenAPI pre-generado.
+
+El schema se genera una vez en build (``python manage.py generar_schema``) y
+se guarda en ``schema.yml``. En tiempo de ejecución se lee una sola vez por
+proceso y se mantiene en memoria ya serializado (YAML y JSON), comprimido con
+gzip y con su ETag, de modo que servir Swagger/ReDoc no introspecciona los
+viewsets ni los serializers.
+"""
+import gzip
+import hashlib
+import json
+import logging
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+ArtefactoSchema = namedtuple('ArtefactoSchema', ['contenido', 'comprimido', 'etag'])
+
+
+def ruta_schema():
+    return Path(getattr(settings, 'API_SCHEMA_ARCHIVO', settings.BASE_DIR / 'schema.yml'))
+
+
+def generar_schema(validar=True):
+    """
+    Genera el schema OpenAPI a partir de los viewsets registrados.
+
+    Args:
+        validar: Si True, valida el schema contra la especificación OpenAPI 3
+
+    Returns:
+        bytes: Schema serializado en YAML
+    """
+    from drf_spectacular.renderers import OpenApiYamlRenderer
+    from drf_spectacular.settings import spectacular_settings
+    from drf_spectacular.validation import validate_schema
+
+    generador = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generador.get_schema(request=None, public=True)
+    if validar:
+        validate_schema(schema)
+    return OpenApiYamlRenderer().render(schema, renderer_context={})
+
+
+def _construir_artefacto(contenido):
+    return ArtefactoSchema(
+        contenido=contenido,
+        # mtime=0 para que los bytes comprimidos (y por lo tanto el ETag de
+        # la variante gzip) sean iguales en todos los workers.
+        comprimido=gzip.compress(contenido, compresslevel=9, mtime=0),
+        etag='"{}"'.format(hashlib.sha256(contenido).hexdigest()[:32]),
+    )
+
+
+@lru_cache(maxsize=None)
+def cargar_schema(formato='yaml'):
+    """
+    Retorna el artefacto del schema en el formato pedido ('yaml' o 'json').
+
+    Se calcula una sola vez por proceso. Si el archivo no existe se genera en
+    memoria como último recurso.
+    """
+    if formato == 'json':
+        datos = yaml.safe_load(cargar_schema('yaml').contenido)
+        contenido = json.dumps(datos, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return _construir_artefacto(contenido)
+
+    ruta = ruta_schema()
+    try:
+        contenido = ruta.read_bytes()
+    except FileNotFoundError:
+        logger.warning(f"No existe {ruta}; generando schema en memoria. Ejecute 'manage.py generar_schema'.")
+        contenido = generar_schema(validar=False)
+    return _construir_artefacto(contenido)
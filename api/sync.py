@@ -0,0 +1,212 @@
+"""
+Sincronización incremental para tablets sin conexión (/api/sync/cambios/).
+
+Lectura: ``GET ?token=N`` entrega los registros de maternidad y neonatología
+modificados después de la secuencia N (ver ``sync.cambios``), en orden de
+secuencia y por páginas, incluidas las lápidas de los borrados. El token de
+la respuesta se envía en la siguiente llamada; ``token=0`` es la carga
+inicial (sin lápidas). Cada registro se serializa como en el listado de su
+recurso y solo se incluyen los recursos que el rol puede leer.
+
+Escritura: ``POST`` con un lote de cambios hechos sin conexión. Cada cambio
+pasa por el ViewSet de su recurso (mismos permisos, validaciones y
+restricción de turno que la API REST) en su propia transacción. Una
+actualización o eliminación trae la secuencia del registro que vio el
+cliente (``base``): si el servidor tiene una posterior, el cambio no se
+aplica y se responde ``conflicto`` con la versión del servidor.
+"""
+from django.apps import apps
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from rest_framework.exceptions import NotAuthenticated, PermissionDenied, ValidationError
+
+from core.rbac_utils import obtener_ip_cliente, obtener_permisos_usuario, registrar_auditoria
+from core.sparse_fields import podar_queryset
+from sync.cambios import MODELOS_SINCRONIZADOS, bloquear_contador, estado_contador, secuencias_de
+from sync.models import CambioRegistro
+
+# ViewSet de cada recurso sincronizado
+VIEWSET_POR_RECURSO = {
+    'madres': 'MadrePacienteViewSet',
+    'embarazos': 'EmbarazoViewSet',
+    'partos': 'PartoViewSet',
+    'partos-complicaciones': 'PartoComplicacionViewSet',
+    'partos-anestesias': 'PartoAnestesiaViewSet',
+    'ive-atenciones': 'IVEAtencionViewSet',
+    'ive-acompanamientos': 'IVEAcompanamientoViewSet',
+    'altas-anticonceptivos': 'AltaAnticonceptivoViewSet',
+    'recien-nacidos': 'RecienNacidoViewSet',
+    'atenciones-inmediatas': 'RNAtencionInmediataViewSet',
+    'tamizajes-metabolicos': 'RNTamizajeMetabolicoViewSet',
+    'tamizajes-auditivos': 'RNTamizajeAuditivoViewSet',
+    'tamizajes-cardiopatias': 'RNTamizajeCardiopatiaViewSet',
+    'egresos': 'RNEgresoViewSet',
+}
+
+ACCION_POR_OPERACION = {'crear': 'create', 'actualizar': 'partial_update', 'eliminar': 'destroy'}
+
+TIPO_AUDITORIA = {'crear': 'CREATE', 'actualizar': 'UPDATE', 'eliminar': 'DELETE'}
+
+LIMITE_POR_DEFECTO = 500
+LIMITE_MAXIMO = 5000
+
+
+class TokenPurgado(Exception):
+    """El token es anterior a lápidas ya purgadas: el cliente debe resincronizar desde 0."""
+
+
+class Conflicto(Exception):
+    def __init__(self, secuencia, datos):
+        self.secuencia = secuencia
+        self.datos = datos
+
+
+def vista_de(recurso, request, accion, **kwargs):
+    """Instancia del ViewSet del recurso, lista para ``accion`` sobre ``request``."""
+    import api.viewsets
+
+    clase = getattr(api.viewsets, VIEWSET_POR_RECURSO[recurso])
+    return clase(request=request, format_kwarg=None, action=accion, args=(), kwargs=kwargs)
+
+
+def recursos_legibles(request):
+    """Recursos cuyo permiso de lectura (el del listado) tiene el usuario."""
+    permisos = None if request.user.is_superuser else obtener_permisos_usuario(request.user)
+    return [
+        recurso for recurso in MODELOS_SINCRONIZADOS
+        if permisos is None or vista_de(recurso, request, 'list').get_required_permission() in permisos
+    ]
+
+
+def serializar(recurso, request, ids):
+    """{id: datos} de los registros ``ids`` del recurso, como en su listado."""
+    vista = vista_de(recurso, request, 'list')
+    serializer = vista.get_serializer_class()(many=True, context=vista.get_serializer_context())
+    serializer.instance = objetos = list(podar_queryset(vista.get_queryset().filter(pk__in=ids), serializer))
+    return {objeto.pk: fila for objeto, fila in zip(objetos, serializer.data)}
+
+
+def leer_cambios(request, token, limite):
+    """
+    Página de cambios posteriores a ``token``.
+
+    Returns:
+        dict: token (para la siguiente llamada), hay_mas y cambios
+    """
+    # El contador se lee antes que los cambios: toda secuencia <= ultima ya está confirmada
+    ultima, purgada = estado_contador()
+    if 0 < token < purgada:
+        raise TokenPurgado()
+
+    etiquetas = {apps.get_model(MODELOS_SINCRONIZADOS[r])._meta.label_lower: r for r in recursos_legibles(request)}
+    queryset = CambioRegistro.objects.filter(secuencia__gt=token, modelo__in=list(etiquetas)).order_by('secuencia')
+    if token == 0:
+        queryset = queryset.filter(eliminado=False)
+    filas = list(queryset.values_list('secuencia', 'modelo', 'id_registro', 'eliminado')[:limite + 1])
+    hay_mas = len(filas) > limite
+    filas = filas[:limite]
+
+    por_recurso = {}
+    for _, modelo, id_registro, eliminado in filas:
+        if not eliminado:
+            por_recurso.setdefault(etiquetas[modelo], []).append(id_registro)
+    datos = {recurso: serializar(recurso, request, ids) for recurso, ids in por_recurso.items()}
+
+    cambios = []
+    for secuencia, modelo, id_registro, eliminado in filas:
+        recurso = etiquetas[modelo]
+        actual = None if eliminado else datos[recurso].get(id_registro)
+        # Borrado entre las dos lecturas: su lápida llega en la próxima página
+        cambios.append({
+            'secuencia': secuencia, 'recurso': recurso, 'id': id_registro,
+            'eliminado': actual is None, 'datos': actual,
+        })
+    siguiente = filas[-1][0] if filas else token
+    return {'token': siguiente if hay_mas else max(siguiente, ultima), 'hay_mas': hay_mas, 'cambios': cambios}
+
+
+def _resolver_ids_cliente(datos, ids_cliente):
+    """Reemplaza los valores "$id_cliente" por el id real de un registro creado antes en el lote."""
+    return {
+        campo: ids_cliente.get(valor[1:], valor) if isinstance(valor, str) and valor.startswith('$') else valor
+        for campo, valor in datos.items()
+    }
+
+
+def _aplicar(request, cambio, ids_cliente):
+    recurso, operacion = cambio['recurso'], cambio['operacion']
+    vista = vista_de(recurso, request, ACCION_POR_OPERACION[operacion], pk=cambio.get('id'))
+    vista.check_permissions(request)
+    modelo = vista.get_queryset().model
+    datos = _resolver_ids_cliente(cambio['datos'], ids_cliente)
+
+    bloquear_contador()
+    if operacion == 'crear':
+        serializer = vista.get_serializer(data=datos)
+        serializer.is_valid(raise_exception=True)
+        vista.perform_create(serializer)
+        instancia = serializer.instance
+    else:
+        actual = secuencias_de(modelo, [cambio['id']]).get(cambio['id'])
+        if actual and actual[0] > cambio['base']:
+            secuencia, eliminado = actual
+            raise Conflicto(secuencia, None if eliminado else serializar(recurso, request, [cambio['id']]).get(cambio['id']))
+        instancia = vista.get_object()
+        if operacion == 'actualizar':
+            serializer = vista.get_serializer(instancia, data=datos, partial=True)
+            serializer.is_valid(raise_exception=True)
+            vista.perform_update(serializer)
+        else:
+            vista.perform_destroy(instancia)
+
+    id_registro = instancia.pk if operacion != 'eliminar' else cambio['id']
+    registrar_auditoria(
+        usuario=request.user,
+        tipo_accion=TIPO_AUDITORIA[operacion],
+        tabla_afectada=modelo._meta.db_table,
+        id_registro=id_registro,
+        cambios_nuevos=cambio['datos'] or None,
+        ip_address=obtener_ip_cliente(request),
+        user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
+        descripcion=f'Sincronización: {operacion} {recurso}',
+    )
+    return {
+        'id': id_registro,
+        'secuencia': secuencias_de(modelo, [id_registro])[id_registro][0],
+        'datos': None if operacion == 'eliminar' else serializar(recurso, request, [id_registro]).get(id_registro),
+    }
+
+
+def aplicar_cambios(request, cambios):
+    """
+    Aplica en orden los cambios validados por ``LoteCambiosSerializer``,
+    cada uno en su propia transacción: un cambio rechazado no deshace los
+    anteriores ni impide los siguientes (salvo los que referencian su id_cliente).
+
+    Returns:
+        dict: aplicados y un resultado por cambio, en el mismo orden
+    """
+    ids_cliente = {}
+    resultados = []
+    for cambio in cambios:
+        resultado = {'recurso': cambio['recurso'], 'id': cambio.get('id')}
+        if 'id_cliente' in cambio:
+            resultado['id_cliente'] = cambio['id_cliente']
+        try:
+            with transaction.atomic():
+                resultado.update(_aplicar(request, cambio, ids_cliente), estado='aplicado')
+        except Conflicto as conflicto:
+            resultado.update(estado='conflicto', secuencia=conflicto.secuencia, datos=conflicto.datos)
+        except ValidationError as error:
+            resultado.update(estado='invalido', errores=error.detail)
+        except IntegrityError as error:
+            resultado.update(estado='invalido', errores={'detail': str(error)})
+        except (PermissionDenied, NotAuthenticated) as error:
+            resultado.update(estado='denegado', errores={'detail': str(error.detail)})
+        except Http404:
+            resultado.update(estado='no_encontrado')
+        else:
+            if cambio['operacion'] == 'crear' and 'id_cliente' in cambio:
+                ids_cliente[cambio['id_cliente']] = resultado['id']
+        resultados.append(resultado)
+    return {'aplicados': sum(r['estado'] == 'aplicado' for r in resultados), 'resultados': resultados}
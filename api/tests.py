@@ -1,3 +1,855 @@
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management import call_command
+from django.conf import settings
 from django.test import TestCase
+from django.urls import reverse
+
+from .schema import cargar_schema, ruta_schema
+from .views import SchemaEstaticoView
+
+
+class SchemaEstaticoTest(TestCase):
+    """Pruebas para el schema OpenAPI pre-generado."""
+
+    def setUp(self):
+        cargar_schema.cache_clear()
+        self.url = reverse('schema')
+
+    def _get(self, **extra):
+        # Se llama a la vista directamente para no depender de API_SCHEMA_ESTATICO
+        from django.test import RequestFactory
+        request = RequestFactory().get(self.url, **extra)
+        return SchemaEstaticoView.as_view()(request)
+
+    def test_schema_versionado_actualizado(self):
+        """schema.yml coincide con el schema generado desde el código."""
+        call_command('generar_schema', '--check', verbosity=0)
+
+    def test_sirve_bytes_del_archivo(self):
+        """La vista entrega el contenido de schema.yml con ETag."""
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, ruta_schema().read_bytes())
+        self.assertIn('ETag', response)
+        self.assertTrue(response['Content-Type'].startswith('application/vnd.oai.openapi'))
+
+    def test_if_none_match_retorna_304(self):
+        """Un ETag vigente produce 304 sin cuerpo."""
+        etag = self._get()['ETag']
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_gzip_precomprimido(self):
+        """Con Accept-Encoding gzip se entregan los bytes comprimidos."""
+        response = self._get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), ruta_schema().read_bytes())
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_formato_json(self):
+        """?format=json entrega el mismo schema en JSON."""
+        import json
+        response = self._get(data={'format': 'json'})
+        datos = json.loads(response.content)
+        self.assertEqual(datos['info']['title'], 'Hospital Maternity System API')
+
+
+class CargaDiferidaRoutersTest(TestCase):
+    """Pruebas de la carga diferida de routers y viewsets por aplicación."""
+
+    def _modulos_cargados(self, url):
+        # Intérprete nuevo: en el proceso de tests todos los módulos ya están importados
+        script = (
+            "import json, os, sys\n"
+            "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')\n"
+            "from config.wsgi import application\n"
+            "from django.urls import resolve\n"
+            f"resolve({url!r})\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith('api.'))))\n"
+        )
+        resultado = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR,
+            env=os.environ.copy(), capture_output=True, text=True, check=True,
+        )
+        return json.loads(resultado.stdout)
+
+    def test_resolver_url_carga_solo_su_aplicacion(self):
+        """Resolver /api/maternity/partos/ no importa los viewsets de otras apps."""
+        modulos = self._modulos_cargados('/api/maternity/partos/')
+        self.assertIn('api.viewsets.maternity', modulos)
+        for app in ('core', 'catalogs', 'neonatology', 'compliance', 'alerts', 'reports'):
+            self.assertNotIn(f'api.viewsets.{app}', modulos)
+            self.assertNotIn(f'api.routers.{app}', modulos)
+
+    def test_nombres_de_ruta_se_mantienen(self):
+        """Las URLs conservan los nombres y rutas del router único anterior."""
+        self.assertEqual(reverse('parto-list'), '/api/maternity/partos/')
+        self.assertEqual(reverse('usuario-me'), '/api/usuarios/me/')
+        self.assertEqual(reverse('cat-robson-detail', args=[1]), '/api/catalogs/robson/1/')
+        self.assertEqual(reverse('token_obtain_pair'), '/api/auth/token/')
+        self.assertEqual(reverse('api-root'), '/api/')
+
+    def test_raiz_lista_todos_los_endpoints(self):
+        """La raíz de la API lista los endpoints de todas las aplicaciones."""
+        from rest_framework.test import APIClient
+        from core.models import Usuario
+        usuario = Usuario.objects.create_superuser(run='11111111-1', email='admin@test.cl', password='x')
+        client = APIClient()
+        client.force_authenticate(usuario)
+        response = client.get('/api/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        datos = response.json()
+        self.assertTrue(datos['maternity/partos'].endswith('/api/maternity/partos/'))
+        self.assertTrue(datos['usuarios'].endswith('/api/usuarios/'))
+        self.assertEqual(len(datos), 31)
+
+
+class TimelineMadreTest(TestCase):
+    """Pruebas de GET /api/maternity/madres/{id}/timeline/."""
+
+    def setUp(self):
+        from datetime import date
+        from django.utils import timezone
+        from rest_framework.test import APIClient
+        from catalogs.models import CatNacionalidad, CatTipoParto, CatComplicacionParto
+        from core.cache import obtener_cache
+        from core.models import Rol, Permiso, RolPermiso, Usuario
+        from maternity.models import MadrePaciente
+        obtener_cache().clear()
+
+        self.client = APIClient()
+        self.timezone = timezone
+        self.tipo_parto = CatTipoParto.objects.create(nombre='Vaginal')
+        self.complicacion = CatComplicacionParto.objects.create(nombre='HPP')
+        self.madre = MadrePaciente.objects.create(
+            run='11111111-1', nombre='Ana', apellido_paterno='Pérez', apellido_materno='Silva',
+            fecha_nacimiento=date(1990, 1, 1),
+            fk_nacionalidad=CatNacionalidad.objects.create(nombre='Chilena'),
+        )
+
+        def crear_rol(nombre, codigos):
+            rol = Rol.objects.create(nombre_rol=nombre)
+            for codigo in codigos:
+                permiso, _ = Permiso.objects.get_or_create(codigo_permiso=codigo, defaults={'categoria': 'test'})
+                RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+            return rol
+
+        lectura = ['maternity:mother:read', 'maternity:delivery:read', 'neonatal:rn:read']
+        self.medico = Usuario.objects.create_user(
+            run='15000000-9', email='medico@hospital.com', password='x', nombre_completo='Médico',
+            fk_rol=crear_rol('medico', lectura + ['maternity:ive:manage']),
+        )
+        self.matrona = Usuario.objects.create_user(
+            run='16000000-7', email='matrona@hospital.com', password='x', nombre_completo='Matrona',
+            fk_rol=crear_rol('matrona', lectura),
+        )
+        self.administrativo = Usuario.objects.create_user(
+            run='17000000-5', email='adm@hospital.com', password='x', nombre_completo='Administrativo',
+            fk_rol=crear_rol('administrativo', ['maternity:mother:read']),
+        )
+        self.url = f'/api/maternity/madres/{self.madre.pk}/timeline/'
+
+    def _crear_episodio(self, semanas=38):
+        from datetime import date, timedelta
+        from decimal import Decimal
+        from maternity.models import Embarazo, Parto, PartoComplicacion, PartoAnestesia, IVEAtencion, IVEAcompanamiento, AltaAnticonceptivo
+        from neonatology.models import (
+            RecienNacido, RNAtencionInmediata, RNTamizajeMetabolico, RNTamizajeAuditivo,
+            RNTamizajeCardiopatia, RNEgreso,
+        )
+        ahora = self.timezone.now()
+        Embarazo.objects.create(
+            fk_madre=self.madre, paridad=0, semana_obstetrica=semanas,
+            fecha_ultima_menstruacion=date.today() - timedelta(weeks=semanas, days=Embarazo.objects.count()),
+        )
+        parto = Parto.objects.create(
+            fk_madre=self.madre, fk_tipo_parto=self.tipo_parto,
+            fk_profesional_responsable=self.medico, fecha_parto=ahora,
+        )
+        PartoComplicacion.objects.create(fk_parto=parto, fk_complicacion=self.complicacion)
+        PartoAnestesia.objects.create(fk_parto=parto, tipo_anestesia='epidural')
+        AltaAnticonceptivo.objects.create(fk_evento=parto.pk, tipo_alta='parto', fk_metodo_anticonceptivo='1')
+        for _ in range(2):
+            rn = RecienNacido.objects.create(fk_parto=parto, sexo='F', peso_gramos=3200, talla_cm=Decimal('49.50'))
+            RNAtencionInmediata.objects.create(
+                fk_rn=rn, fk_profesional_registra=self.medico, apgar_1_minuto=8, apgar_5_minutos=9,
+            )
+            RNTamizajeMetabolico.objects.create(fk_rn=rn, fecha_muestra=date.today())
+            RNTamizajeAuditivo.objects.create(fk_rn=rn, oido_derecho_resultado='pasa', oido_izquierdo_resultado='pasa')
+            RNTamizajeCardiopatia.objects.create(
+                fk_rn=rn, fecha_hora_tamizaje=ahora, saturacion_mano_derecha=98, saturacion_pie=97,
+            )
+            RNEgreso.objects.create(fk_rn=rn, tipo_alimentacion_alta='LME')
+        ive = IVEAtencion.objects.create(fk_madre=self.madre, fk_causal='3', edad_gestacional_semanas=14)
+        IVEAcompanamiento.objects.create(fk_ive_atencion=ive, tipo_profesional='psicologo')
+        AltaAnticonceptivo.objects.create(fk_evento=ive.pk, tipo_alta='ive', fk_metodo_anticonceptivo='2')
+
+    def test_arbol_completo(self):
+        """Con todos los permisos se entrega el árbol completo."""
+        self._crear_episodio()
+        self.client.force_authenticate(self.medico)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        datos = response.data
+        self.assertEqual(datos['madre']['id_madre'], self.madre.pk)
+        self.assertEqual(len(datos['embarazos']), 1)
+        parto = datos['partos'][0]
+        self.assertTrue(parto['tuvo_complicaciones'])
+        self.assertEqual(parto['complicaciones'][0]['complicacion_nombre'], 'HPP')
+        self.assertEqual(parto['altas_anticonceptivas'][0]['tipo_alta'], 'parto')
+        rn = parto['recien_nacidos'][0]
+        self.assertEqual(rn['atencion_inmediata']['apgar_5_minutos'], 9)
+        self.assertEqual(len(rn['tamizajes_metabolicos']), 1)
+        self.assertEqual(rn['egreso']['tipo_alimentacion_alta'], 'LME')
+        self.assertEqual(datos['ive_atenciones'][0]['altas_anticonceptivas'][0]['tipo_alta'], 'ive')
+        self.assertEqual(datos['secciones_omitidas'], [])
+
+    def test_consultas_constantes(self):
+        """El número de consultas no depende de la cantidad de episodios."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.client.force_authenticate(self.medico)
+        self._crear_episodio()
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as uno:
+            self.client.get(self.url)
+        for semanas in (30, 39, 40):
+            self._crear_episodio(semanas)
+        with CaptureQueriesContext(connection) as cuatro:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['partos']), 4)
+        self.assertEqual(len(cuatro), len(uno))
+        self.assertLessEqual(len(cuatro), 16)
+
+    def test_ramas_filtradas_por_permiso(self):
+        """Sin maternity:ive:manage no se ven IVE ni sus altas anticonceptivas."""
+        self._crear_episodio()
+        self.client.force_authenticate(self.matrona)
+        datos = self.client.get(self.url).data
+        self.assertNotIn('ive_atenciones', datos)
+        self.assertEqual(datos['secciones_omitidas'], ['ive_atenciones'])
+        self.assertEqual(len(datos['partos'][0]['recien_nacidos']), 2)
+
+        self.client.force_authenticate(self.administrativo)
+        datos = self.client.get(self.url).data
+        self.assertNotIn('partos', datos)
+        self.assertIn('embarazos', datos)
+        self.assertEqual(
+            datos['secciones_omitidas'],
+            ['partos', 'ive_atenciones', 'altas_anticonceptivas'],
+        )
+
+    def test_requiere_lectura_de_madre(self):
+        from core.models import Rol, Usuario
+        sin_permisos = Usuario.objects.create_user(
+            run='18000000-3', email='sin@hospital.com', password='x', nombre_completo='Sin permisos',
+            fk_rol=Rol.objects.create(nombre_rol='invitado'),
+        )
+        self.client.force_authenticate(sin_permisos)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class ExportacionStreamingTest(TestCase):
+    """Pruebas de GET .../exportar/ (NDJSON y MessagePack)."""
+
+    def setUp(self):
+        from datetime import date
+        from decimal import Decimal
+        from django.utils import timezone
+        from rest_framework.test import APIClient
+        from catalogs.models import CatNacionalidad, CatTipoParto
+        from core.cache import obtener_cache
+        from core.models import Rol, Permiso, RolPermiso, Usuario
+        from maternity.models import MadrePaciente, Parto
+        from neonatology.models import RecienNacido
+        obtener_cache().clear()
+
+        def crear_rol(nombre, codigos):
+            rol = Rol.objects.create(nombre_rol=nombre)
+            for codigo in codigos:
+                permiso = Permiso.objects.create(codigo_permiso=codigo, categoria='test')
+                RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+            return rol
+
+        self.exportador = Usuario.objects.create_user(
+            run='15000000-9', email='rem@hospital.com', password='x', nombre_completo='Exportador REM',
+            fk_rol=crear_rol('exportador', ['report:export_data']),
+        )
+        self.lector = Usuario.objects.create_user(
+            run='16000000-7', email='lector@hospital.com', password='x', nombre_completo='Lector',
+            fk_rol=crear_rol('lector', ['neonatal:rn:read']),
+        )
+        madre = MadrePaciente.objects.create(
+            run='11111111-1', nombre='Ana', apellido_paterno='Pérez', apellido_materno='Silva',
+            fecha_nacimiento=date(1990, 1, 1),
+            fk_nacionalidad=CatNacionalidad.objects.create(nombre='Chilena'),
+        )
+        tipo = CatTipoParto.objects.create(nombre='Vaginal')
+        for i in range(7):
+            parto = Parto.objects.create(
+                fk_madre=madre, fk_tipo_parto=tipo, fk_profesional_responsable=self.exportador,
+                fecha_parto=timezone.now(),
+            )
+            RecienNacido.objects.create(fk_parto=parto, sexo='F', peso_gramos=3000 + i, talla_cm=Decimal('49.50'))
+        self.client = APIClient()
+        self.client.force_authenticate(self.exportador)
+
+    def _ndjson(self, response):
+        return [json.loads(linea) for linea in b''.join(response.streaming_content).splitlines()]
+
+    def test_ndjson_por_lotes(self):
+        """El export entrega un objeto por línea, igual que el listado, en varios lotes."""
+        from unittest import mock
+        from api.viewsets.neonatology import RecienNacidoViewSet
+        from neonatology.models import RecienNacido
+        from neonatology.serializers import RecienNacidoSerializer
+        with mock.patch.object(RecienNacidoViewSet, 'tamano_lote_exportacion', 3):
+            response = self.client.get('/api/neonatology/recien-nacidos/exportar/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+            self.assertTrue(response.streaming)
+            filas = self._ndjson(response)
+        esperado = json.loads(json.dumps(
+            RecienNacidoSerializer(RecienNacido.objects.order_by('id_rn'), many=True).data
+        ))
+        self.assertEqual(filas, esperado)
+        self.assertEqual(filas[0]['talla_cm'], '49.50')
+
+    def test_listado_rapido_y_fields(self):
+        """Partos usan el serializador rápido y respetan ?fields=."""
+        response = self.client.get('/api/maternity/partos/exportar/?fields=id_parto,madre_run')
+        filas = self._ndjson(response)
+        self.assertEqual(len(filas), 7)
+        self.assertEqual(filas[0], {'id_parto': filas[0]['id_parto'], 'madre_run': '11111111-1'})
+
+        response = self.client.get('/api/maternity/partos/exportar/?fields=no_existe')
+        self.assertEqual(response.status_code, 400)
+
+    def test_requiere_permiso_exportacion(self):
+        """El export exige report:export_data aunque se pueda leer el listado."""
+        self.client.force_authenticate(self.lector)
+        self.assertEqual(self.client.get('/api/neonatology/recien-nacidos/').status_code, 200)
+        self.assertEqual(self.client.get('/api/neonatology/recien-nacidos/exportar/').status_code, 403)
+
+    def test_msgpack_no_instalado(self):
+        """Sin el paquete msgpack la API responde 406/415 en lugar de fallar."""
+        from unittest import mock
+        from core import renderers
+        from core.models import Usuario
+        self.client.force_authenticate(Usuario.objects.create_superuser(
+            run='17000000-5', email='admin@hospital.com', password='x'
+        ))
+        # Simula la instalación sin la dependencia opcional
+        with mock.patch.object(renderers.MessagePackRenderer, 'disponible', False), \
+                mock.patch.object(renderers.MessagePackParser, 'disponible', False):
+            response = self.client.get('/api/neonatology/recien-nacidos/', HTTP_ACCEPT='application/msgpack')
+            self.assertEqual(response.status_code, 406)
+            response = self.client.post(
+                '/api/neonatology/recien-nacidos/', b'\x80', content_type='application/msgpack'
+            )
+            self.assertEqual(response.status_code, 415)
+
+    def test_msgpack(self):
+        """Con msgpack: respuestas, requests y export en el mismo mapeo de tipos que JSON."""
+        from core import renderers
+        if renderers.msgpack is None:
+            self.skipTest('msgpack no está instalado')
+        msgpack = renderers.msgpack
+        from core.models import Usuario
+        self.client.force_authenticate(Usuario.objects.create_superuser(
+            run='17000000-5', email='admin@hospital.com', password='x'
+        ))
+        json_datos = self.client.get('/api/neonatology/recien-nacidos/').json()
+        response = self.client.get('/api/neonatology/recien-nacidos/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content, raw=False), json_datos)
+
+        response = self.client.get('/api/neonatology/recien-nacidos/exportar/?format=msgpack')
+        filas = list(msgpack.Unpacker(io.BytesIO(b''.join(response.streaming_content)), raw=False))
+        self.assertEqual(filas, json_datos['results'])
+
+        parto_id = json_datos['results'][0]['fk_parto']
+        response = self.client.post(
+            '/api/neonatology/recien-nacidos/',
+            msgpack.packb({'fk_parto': parto_id, 'sexo': 'M', 'peso_gramos': 3100, 'talla_cm': '50.00'}),
+            content_type='application/msgpack', HTTP_ACCEPT='application/msgpack',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(msgpack.unpackb(response.content, raw=False)['talla_cm'], '50.00')
+
+
+class FiltroCamposExactosTest(TestCase):
+    """Pruebas de los filtros ?campo= declarados en filterset_fields."""
+
+    def setUp(self):
+        from datetime import date, timedelta
+        from django.utils import timezone
+        from rest_framework.test import APIClient
+        from catalogs.models import CatNacionalidad, CatTipoParto
+        from core.cache import obtener_cache
+        from core.models import Rol, Permiso, RolPermiso, Usuario
+        from maternity.models import MadrePaciente, Parto
+        obtener_cache().clear()
+
+        rol = Rol.objects.create(nombre_rol='lector')
+        permiso = Permiso.objects.create(codigo_permiso='maternity:delivery:read', categoria='maternity')
+        RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        usuario = Usuario.objects.create_user(run='15000000-9', password='x', nombre_completo='Lector', fk_rol=rol)
+        nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        self.madres = [
+            MadrePaciente.objects.create(
+                run=run, nombre='Ana', apellido_paterno='Pérez', apellido_materno='Silva',
+                fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=nacionalidad,
+            )
+            for run in ('11111111-1', '12345678-5')
+        ]
+        self.tipos = [CatTipoParto.objects.create(nombre=nombre) for nombre in ('Vaginal', 'Cesárea')]
+        ahora = timezone.now()
+        self.partos = [
+            Parto.objects.create(
+                fk_madre=self.madres[i % 2], fk_tipo_parto=self.tipos[i // 2], fk_profesional_responsable=usuario,
+                fecha_parto=ahora - timedelta(days=i),
+            )
+            for i in range(4)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(usuario)
+
+    def ids(self, **params):
+        response = self.client.get('/api/maternity/partos/', params)
+        self.assertEqual(response.status_code, 200)
+        return [fila['id_parto'] for fila in response.data['results']]
+
+    def test_filtra_y_respeta_orden(self):
+        """?fk_madre= y ?fk_tipo_parto= filtran y se combinan, con el orden por -fecha_parto."""
+        p = [parto.pk for parto in self.partos]
+        self.assertEqual(self.ids(), p)
+        self.assertEqual(self.ids(fk_madre=self.madres[0].pk), [p[0], p[2]])
+        self.assertEqual(self.ids(fk_tipo_parto=self.tipos[1].pk), [p[2], p[3]])
+        self.assertEqual(self.ids(fk_madre=self.madres[1].pk, fk_tipo_parto=self.tipos[0].pk), [p[1]])
+        self.assertEqual(self.ids(fk_madre=''), p)
+
+    def test_valor_invalido(self):
+        """Un valor que no corresponde al tipo del campo responde 400."""
+        response = self.client.get('/api/maternity/partos/', {'fk_madre': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fk_madre', response.data)
+
+
+class GeneradorDatasetTest(TestCase):
+    """Pruebas del dataset sintético (generar_dataset)."""
+
+    def generar(self, **opciones):
+        from datetime import date
+        from api.dataset import GeneradorDataset
+        opciones = {'partos': 60, 'anios': 2, 'profesionales': 3, 'hasta': date(2025, 7, 1), 'tamano_lote': 25, **opciones}
+        return GeneradorDataset(**opciones).generar()
+
+    def firma(self):
+        from maternity.models import Parto
+        from neonatology.models import RecienNacido
+        return (
+            list(Parto.objects.order_by('id_parto').values_list('fk_madre__run', 'fecha_parto', 'fk_tipo_parto__nombre')),
+            list(RecienNacido.objects.order_by('id_rn').values_list('fk_parto', 'peso_gramos', 'talla_cm')),
+        )
+
+    def test_dataset_coherente(self):
+        """Cada parto trae embarazo y anestesia; RUN válidos, fechas en rango y trazas encadenadas."""
+        from datetime import date
+        from compliance.cadena import verificar_cadena
+        from core.utils import validar_run
+        from maternity.models import MadrePaciente, Embarazo, Parto, PartoAnestesia
+        from neonatology.models import RecienNacido, RNAtencionInmediata
+
+        conteo = self.generar()
+        self.assertEqual(Parto.objects.count(), 60)
+        self.assertEqual(conteo['parto'], 60)
+        self.assertEqual(Embarazo.objects.count(), 60)
+        self.assertEqual(PartoAnestesia.objects.count(), 60)
+        self.assertGreaterEqual(RecienNacido.objects.count(), 60)
+        self.assertEqual(RNAtencionInmediata.objects.count(), RecienNacido.objects.count())
+        self.assertTrue(all(validar_run(run) for run in MadrePaciente.objects.values_list('run', flat=True)))
+        fechas = sorted(Parto.objects.values_list('fecha_parto', flat=True))
+        self.assertGreaterEqual(fechas[0].date(), date(2023, 6, 30))
+        self.assertLess(fechas[-1].date(), date(2025, 7, 1))
+
+        resultado = verificar_cadena()
+        self.assertIsNone(resultado.error)
+        self.assertEqual(resultado.verificadas, conteo['traza_movimiento'])
+
+        # Una segunda corrida agrega datos a continuación de los existentes
+        self.generar(partos=10)
+        self.assertEqual(Parto.objects.count(), 70)
+
+    def test_determinista(self):
+        """La misma semilla sobre la misma base produce los mismos datos; otra semilla, otros."""
+        from django.db import transaction
+
+        firmas = []
+        for semilla in (7, 7, 8):
+            with transaction.atomic():
+                self.generar(semilla=semilla)
+                firmas.append(self.firma())
+                transaction.set_rollback(True)
+        self.assertEqual(firmas[0], firmas[1])
+        self.assertNotEqual(firmas[0], firmas[2])
+
+    def test_comando(self):
+        """El comando aplica el preset, los años y --robson."""
+        from maternity.models import Parto
+        salida = io.StringIO()
+        call_command('generar_dataset', partos=20, anios=1, hasta='2025-01-01', robson=True, stdout=salida)
+        self.assertEqual(Parto.objects.count(), 20)
+        self.assertFalse(Parto.objects.filter(fk_robson_calculado__isnull=True).exists())
+        self.assertIn('Robson: 20 de 20', salida.getvalue())
+
+
+class SincronizacionTest(TestCase):
+    """Pruebas de /api/sync/cambios/ (lectura por token y escritura por lotes)."""
+
+    url = '/api/sync/cambios/'
+
+    def setUp(self):
+        from rest_framework.test import APIClient
+        from catalogs.models import CatNacionalidad
+        from core.cache import obtener_cache
+        from core.models import Rol, Permiso, RolPermiso, Usuario
+        obtener_cache().clear()
+
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        rol = Rol.objects.create(nombre_rol='medico')
+        for codigo in ('maternity:mother:read', 'maternity:mother:update'):
+            RolPermiso.objects.create(fk_rol=rol, fk_permiso=Permiso.objects.create(codigo_permiso=codigo, categoria='maternity'))
+        self.medico = Usuario.objects.create_user(run='15000000-9', password='x', nombre_completo='Médico', fk_rol=rol)
+        self.admin = Usuario.objects.create_superuser(run='11111111-1', email='admin@test.cl', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def crear_madre(self, run):
+        from datetime import date
+        from maternity.models import MadrePaciente
+        return MadrePaciente.objects.create(
+            run=run, nombre='Ana', apellido_paterno='Rojas', apellido_materno='Soto',
+            fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=self.nacionalidad,
+        )
+
+    def leer(self, token, **params):
+        response = self.client.get(self.url, {'token': token, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_deltas_desde_token(self):
+        """Cada lectura trae solo lo cambiado desde el token, con lápidas y paginado por secuencia"""
+        from datetime import date
+        from maternity.models import Embarazo
+        madre = self.crear_madre('16000000-7')
+        otra = self.crear_madre('17000000-5')
+        embarazo = Embarazo.objects.create(
+            fk_madre=madre, paridad=0, fecha_ultima_menstruacion=date(2024, 1, 1), semana_obstetrica=30,
+        )
+
+        pagina = self.leer(0, limite=2)
+        self.assertTrue(pagina['hay_mas'])
+        self.assertEqual([(c['recurso'], c['id']) for c in pagina['cambios']],
+                         [('madres', madre.pk), ('madres', otra.pk)])
+        self.assertEqual(pagina['cambios'][0]['datos']['run'], '16000000-7')
+        pagina = self.leer(pagina['token'], limite=2)
+        self.assertFalse(pagina['hay_mas'])
+        self.assertEqual([c['recurso'] for c in pagina['cambios']], ['embarazos'])
+        token = pagina['token']
+        self.assertEqual(self.leer(token)['cambios'], [])
+
+        otra.nombre = 'Beatriz'
+        otra.save()
+        embarazo.delete()
+        cambios = self.leer(token)['cambios']
+        self.assertEqual([(c['recurso'], c['eliminado']) for c in cambios], [('madres', False), ('embarazos', True)])
+        self.assertEqual(cambios[0]['datos']['nombre'], 'Beatriz')
+        self.assertIsNone(cambios[1]['datos'])
+        # La carga inicial no incluye lápidas
+        self.assertEqual(len(self.leer(0)['cambios']), 2)
+
+    def test_solo_recursos_legibles(self):
+        """Un rol sin permiso de lectura de partos no recibe sus cambios"""
+        from datetime import datetime
+        from django.utils import timezone
+        from catalogs.models import CatTipoParto
+        from maternity.models import Parto
+        madre = self.crear_madre('16000000-7')
+        Parto.objects.create(
+            fk_madre=madre, fk_tipo_parto=CatTipoParto.objects.create(nombre='Vaginal'),
+            fk_profesional_responsable=self.admin, fecha_parto=timezone.make_aware(datetime(2024, 10, 1, 10)),
+        )
+        self.assertEqual({c['recurso'] for c in self.leer(0)['cambios']}, {'madres', 'partos'})
+        self.client.force_authenticate(self.medico)
+        self.assertEqual({c['recurso'] for c in self.leer(0)['cambios']}, {'madres'})
+
+    def test_lote_con_conflictos(self):
+        """El lote se aplica en orden: ids de cliente, conflictos, permisos y validación por cambio"""
+        madre = self.crear_madre('16000000-7')
+        base = self.leer(0)['cambios'][0]['secuencia']
+        madre.nombre = 'Editada en el servidor'
+        madre.save()
+
+        response = self.client.post(self.url, {'cambios': [
+            {'recurso': 'madres', 'operacion': 'crear', 'id_cliente': 'm1', 'datos': {
+                'run': '17000000-5', 'nombre': 'Carla', 'apellido_paterno': 'Díaz', 'apellido_materno': 'Mora',
+                'fecha_nacimiento': '1995-05-05', 'fk_nacionalidad': self.nacionalidad.pk,
+            }},
+            {'recurso': 'ive-atenciones', 'operacion': 'crear', 'datos': {
+                'fk_madre': '$m1', 'fk_causal': '3', 'edad_gestacional_semanas': 20,
+            }},
+            {'recurso': 'madres', 'operacion': 'actualizar', 'id': madre.pk, 'base': base, 'datos': {'nombre': 'Tablet'}},
+            {'recurso': 'embarazos', 'operacion': 'crear', 'datos': {'fk_madre': madre.pk}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        datos = response.json()
+        self.assertEqual(datos['aplicados'], 2)
+        self.assertEqual([r['estado'] for r in datos['resultados']], ['aplicado', 'aplicado', 'conflicto', 'invalido'])
+        creada, ive, conflicto, _ = datos['resultados']
+        self.assertEqual(ive['datos']['fk_madre'], creada['id'])
+        self.assertEqual(conflicto['datos']['nombre'], 'Editada en el servidor')
+
+        # Con la secuencia del servidor como base, el cambio se aplica
+        response = self.client.post(self.url, {'cambios': [
+            {'recurso': 'madres', 'operacion': 'actualizar', 'id': madre.pk, 'base': conflicto['secuencia'],
+             'datos': {'nombre': 'Tablet'}},
+        ]}, format='json')
+        resultado = response.json()['resultados'][0]
+        self.assertEqual((resultado['estado'], resultado['datos']['nombre']), ('aplicado', 'Tablet'))
+        self.assertGreater(resultado['secuencia'], conflicto['secuencia'])
+
+        # Sin permiso de creación: denegado, sin abortar el resto del lote
+        self.client.force_authenticate(self.medico)
+        response = self.client.post(self.url, {'cambios': [
+            {'recurso': 'madres', 'operacion': 'crear', 'datos': {}},
+            {'recurso': 'madres', 'operacion': 'eliminar', 'id': madre.pk, 'base': resultado['secuencia']},
+        ]}, format='json')
+        self.assertEqual([r['estado'] for r in response.json()['resultados']], ['denegado', 'aplicado'])
+
+        response = self.client.post(self.url, {'cambios': [{'recurso': 'madres', 'operacion': 'actualizar'}]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_token_purgado(self):
+        """Un token anterior a lápidas purgadas responde 410"""
+        from sync.cambios import purgar_lapidas
+        madre = self.crear_madre('16000000-7')
+        token = self.leer(0)['token']
+        self.crear_madre('17000000-5')
+        madre.delete()
+        self.assertEqual(purgar_lapidas(dias=0), 1)
+        self.assertEqual(self.client.get(self.url, {'token': token}).status_code, 410)
+        self.assertEqual(len(self.leer(0)['cambios']), 1)
+
+
+class FeedEventosTest(TestCase):
+    """Pruebas de /api/sync/eventos/ (outbox con offsets por consumidor)."""
+
+    url = '/api/sync/eventos/'
+
+    def setUp(self):
+        from rest_framework.test import APIClient
+        from catalogs.models import CatNacionalidad
+        from core.cache import obtener_cache
+        from core.models import Rol, Usuario
+        obtener_cache().clear()
+
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        self.matrona = Usuario.objects.create_user(
+            run='15000000-9', password='x', nombre_completo='Matrona', fk_rol=Rol.objects.create(nombre_rol='matrona_clinica'),
+        )
+        self.admin = Usuario.objects.create_superuser(run='11111111-1', email='admin@test.cl', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_lectura_por_offset_y_confirmacion(self):
+        """El consumidor continúa desde su offset confirmado; las acciones masivas también publican eventos"""
+        from datetime import date
+        from alerts.models import AlertaSistema
+        from maternity.models import MadrePaciente
+        madre = MadrePaciente.objects.create(
+            run='16000000-7', nombre='Ana', apellido_paterno='Rojas', apellido_materno='Soto',
+            fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=self.nacionalidad,
+        )
+        alerta = AlertaSistema.objects.create(
+            tipo_alerta='apgar_bajo', nivel_gravedad='alta', entidad_origen='recien_nacido', fk_usuario_genera=self.admin,
+        )
+
+        pagina = self.client.get(self.url, {'consumidor': 'dwh', 'limite': 1}).json()
+        self.assertTrue(pagina['hay_mas'])
+        self.assertEqual(
+            [(e['modelo'], e['id_registro'], e['operacion']) for e in pagina['eventos']],
+            [('maternity.madrepaciente', madre.pk, 'crear')],
+        )
+        response = self.client.post(f'{self.url}confirmar/', {'consumidor': 'dwh', 'secuencia': pagina['siguiente']}, format='json')
+        self.assertEqual(response.json()['pendientes'], 1)
+
+        self.client.post('/api/alerts/alertas/resolver/', {'ids': [alerta.pk]}, format='json')
+        pagina = self.client.get(self.url, {'consumidor': 'dwh'}).json()
+        self.assertFalse(pagina['hay_mas'])
+        self.assertEqual([e['operacion'] for e in pagina['eventos']], ['crear', 'actualizar'])
+        self.assertTrue(pagina['eventos'][-1]['datos']['resuelto'])
+
+        filtrada = self.client.get(self.url, {'desde': 0, 'modelos': 'alerts.alertasistema'}).json()
+        self.assertEqual({e['modelo'] for e in filtrada['eventos']}, {'alerts.alertasistema'})
+        self.assertEqual(self.client.get(self.url, {'modelos': 'core.usuario'}).status_code, 400)
+        response = self.client.post(f'{self.url}confirmar/', {'consumidor': 'dwh', 'secuencia': 10 ** 9}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([c['consumidor'] for c in self.client.get(f'{self.url}consumidores/').json()], ['dwh'])
+
+    def test_requiere_permiso_de_exportacion(self):
+        self.client.force_authenticate(self.matrona)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_escritura_revertida_no_deja_cambio(self):
+        """Sin ATOMIC_REQUESTS el alta y sus señales siguen en una transacción: si el evento falla, no queda la fila"""
+        from unittest import mock
+        from maternity.models import MadrePaciente
+        from sync.models import CambioRegistro
+        datos = {
+            'run': '16000000-7', 'nombre': 'Ana', 'apellido_paterno': 'Rojas', 'apellido_materno': 'Soto',
+            'fecha_nacimiento': '1990-01-01', 'fk_nacionalidad': self.nacionalidad.pk,
+        }
+        with mock.patch('sync.outbox.registrar_eventos', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            self.client.post('/api/maternity/madres/', datos, format='json')
+        self.assertFalse(MadrePaciente.objects.filter(run='16000000-7').exists())
+        self.assertFalse(CambioRegistro.objects.filter(modelo='maternity.madrepaciente').exists())
+
+        self.assertEqual(self.client.post('/api/maternity/madres/', datos, format='json').status_code, 201)
+
+
+class RegistroPartoCompletoTest(TestCase):
+    """Pruebas de POST /api/maternity/partos/registrar/ (episodio de parto en una transacción)."""
+
+    url = '/api/maternity/partos/registrar/'
+
+    def setUp(self):
+        from datetime import date
+        from rest_framework.test import APIClient
+        from catalogs.models import CatNacionalidad, CatTipoParto, CatComplicacionParto
+        from core.cache import obtener_cache
+        from core.models import Rol, Permiso, RolPermiso, Usuario
+        from maternity.models import MadrePaciente
+        obtener_cache().clear()
+
+        self.tipo_parto = CatTipoParto.objects.create(nombre='Vaginal')
+        self.hpp = CatComplicacionParto.objects.create(nombre='HPP')
+        self.desgarro = CatComplicacionParto.objects.create(nombre='Desgarro')
+        self.madre = MadrePaciente.objects.create(
+            run='11111111-1', nombre='Ana', apellido_paterno='Pérez', apellido_materno='Silva',
+            fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=CatNacionalidad.objects.create(nombre='Chilena'),
+        )
+
+        def crear_usuario(run, email, codigos):
+            rol = Rol.objects.create(nombre_rol=email.split('@')[0])
+            for codigo in codigos:
+                permiso, _ = Permiso.objects.get_or_create(codigo_permiso=codigo, defaults={'categoria': 'test'})
+                RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+            return Usuario.objects.create_user(run=run, email=email, password='x', nombre_completo=email, fk_rol=rol)
+
+        parto = ['maternity:delivery:create', 'maternity:complication:manage', 'maternity:delivery:update_all']
+        self.medico = crear_usuario('15000000-9', 'medico@hospital.com', parto + ['neonatal:rn:create', 'neonatal:rn:update_immediate'])
+        self.obstetra = crear_usuario('16000000-7', 'obstetra@hospital.com', parto)
+        self.client = APIClient()
+        self.client.force_authenticate(self.medico)
+
+    def _episodio(self, **cambios):
+        from django.utils import timezone
+        datos = {
+            'fk_madre': self.madre.pk, 'fk_tipo_parto': self.tipo_parto.pk,
+            'fk_profesional_responsable': self.medico.pk, 'fecha_parto': timezone.now().isoformat(),
+            'es_parto_multiple': True,
+            'complicaciones': [{'fk_complicacion': self.hpp.pk, 'transfusion_sanguinea': True}, {'fk_complicacion': self.desgarro.pk}],
+            'anestesias': [{'tipo_anestesia': 'epidural', 'solicitada_por_paciente': True}],
+            'recien_nacidos': [
+                {'sexo': 'F', 'peso_gramos': 2600, 'talla_cm': '47.50',
+                 'atencion_inmediata': {'apgar_1_minuto': 7, 'apgar_5_minutos': 9}},
+                {'sexo': 'M', 'peso_gramos': 2450, 'talla_cm': '46.00'},
+            ],
+        }
+        datos.update(cambios)
+        return datos
+
+    def test_registra_episodio_completo(self):
+        """Todas las filas quedan escritas, con eventos en la outbox y una sola traza de auditoría."""
+        from compliance.models import TrazaMovimiento
+        from maternity.models import Parto
+        from neonatology.models import RNAtencionInmediata
+        from sync.models import EventoCambio
+
+        response = self.client.post(self.url, self._episodio(), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        datos = response.json()
+        parto = Parto.objects.get(pk=datos['id_parto'])
+        self.assertEqual(
+            sorted(parto.complicaciones.values_list('fk_complicacion__nombre', 'transfusion_sanguinea')),
+            [('Desgarro', False), ('HPP', True)],
+        )
+        self.assertEqual(parto.anestesias.get().tipo_anestesia, 'epidural')
+        self.assertEqual([rn['peso_gramos'] for rn in datos['recien_nacidos']], [2600, 2450])
+        atencion = RNAtencionInmediata.objects.get()
+        self.assertEqual(atencion.fk_rn_id, datos['recien_nacidos'][0]['id_rn'])
+        self.assertEqual(atencion.fk_profesional_registra, self.medico)
+        self.assertEqual(datos['recien_nacidos'][0]['atencion_inmediata']['apgar_5_minutos'], 9)
+        self.assertIsNone(datos['recien_nacidos'][1]['atencion_inmediata'])
+        self.assertEqual(len(datos['complicaciones']), 2)
+
+        creados = EventoCambio.objects.exclude(modelo='maternity.madrepaciente').values_list('modelo', flat=True)
+        self.assertEqual(sorted(set(creados)), [
+            'maternity.parto', 'maternity.partoanestesia', 'maternity.partocomplicacion',
+            'neonatology.reciennacido', 'neonatology.rnatencioninmediata',
+        ])
+        self.assertEqual(len(creados), 7)
+        trazas = TrazaMovimiento.objects.filter(tabla_afectada='parto', id_registro=parto.pk)
+        self.assertEqual(trazas.count(), 1)
+        self.assertEqual(len(trazas.get().cambios_nuevos['recien_nacidos']), 2)
+
+    def test_error_en_una_fila_no_guarda_nada(self):
+        from maternity.models import Parto
+        datos = self._episodio()
+        datos['recien_nacidos'][1]['peso_gramos'] = 'mucho'
+        datos['complicaciones'].append({'fk_complicacion': 999})
+        response = self.client.post(self.url, datos, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('peso_gramos', response.json()['recien_nacidos'][1])
+        self.assertIn('fk_complicacion', response.json()['complicaciones'][2])
+        self.assertFalse(Parto.objects.exists())
+
+        response = self.client.post(self.url, self._episodio(es_parto_multiple=False), format='json')
+        self.assertIn('es_parto_multiple', response.json())
+        self.assertFalse(Parto.objects.exists())
+
+    def test_permisos_por_seccion(self):
+        """Sin neonatal:rn:create no se registran recién nacidos; sin ellos, el parto sí."""
+        from maternity.models import Parto
+        self.client.force_authenticate(self.obstetra)
+        response = self.client.post(self.url, self._episodio(), format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('neonatal:rn:create', response.json()['detail'])
+        self.assertFalse(Parto.objects.exists())
+
+        response = self.client.post(self.url, self._episodio(recien_nacidos=[]), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['recien_nacidos'], [])
+
+    def test_catalogos_cacheados(self):
+        """Un segundo registro no vuelve a consultar los catálogos; un alta en el catálogo se ve de inmediato."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from catalogs.models import CatComplicacionParto
+        self.client.post(self.url, self._episodio(), format='json')
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.post(self.url, self._episodio(), format='json')
+        catalogos = ('FROM "cat_complicacion_parto"', 'FROM "cat_tipo_parto"')
+        self.assertFalse([q['sql'] for q in consultas if any(tabla in q['sql'] for tabla in catalogos)])
 
-# Create your tests here.
+        nueva = CatComplicacionParto.objects.create(nombre='Retención placentaria')
+        response = self.client.post(self.url, self._episodio(complicaciones=[{'fk_complicacion': nueva.pk}]), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
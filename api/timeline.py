@@ -0,0 +1,154 @@
+"""
+Línea de tiempo clínica de una madre (GET /api/maternity/madres/{id}/timeline/).
+
+Arma en una sola respuesta el árbol completo de episodios de la paciente:
+
+    madre
+    ├── embarazos
+    ├── partos → complicaciones, anestesias, altas anticonceptivas
+    │   └── recien_nacidos → atención inmediata, tamizajes, egreso
+    └── ive_atenciones → acompañamientos, altas anticonceptivas
+
+Cada nivel se carga con un prefetch, de modo que el número de consultas es
+fijo sin importar cuántos partos o recién nacidos tenga la madre. Cada rama se
+incluye solo si el rol del usuario tiene el permiso de lectura correspondiente
+(las ramas omitidas se informan en ``secciones_omitidas``).
+"""
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Prefetch, Q
+
+from maternity.models import AltaAnticonceptivo, IVEAtencion
+from maternity.serializers import (
+    MadrePacienteSerializer, EmbarazoSerializer, PartoDetailSerializer,
+    IVEAtencionDetailSerializer, AltaAnticonceptivoSerializer,
+)
+from neonatology.models import RecienNacido, RNTamizajeMetabolico, RNTamizajeAuditivo, RNTamizajeCardiopatia
+from neonatology.serializers import (
+    RecienNacidoSerializer, RNAtencionInmediataSerializer, RNTamizajeMetabolicoSerializer,
+    RNTamizajeAuditivoSerializer, RNTamizajeCardiopatiaSerializer, RNEgresoSerializer,
+)
+
+# Permiso de lectura requerido por cada rama (los mismos que exigen sus endpoints)
+PERMISOS_RAMA = {
+    'embarazos': 'maternity:mother:read',
+    'partos': 'maternity:delivery:read',
+    'recien_nacidos': 'neonatal:rn:read',
+    'ive_atenciones': 'maternity:ive:manage',
+    'altas_anticonceptivas': 'maternity:delivery:read',
+}
+
+
+def _relacion_opcional(instancia, nombre):
+    """Retorna una relación uno a uno inversa o None si no existe (sin consultar si ya está cargada)."""
+    try:
+        return getattr(instancia, nombre)
+    except ObjectDoesNotExist:
+        return None
+
+
+def _serializar_recien_nacido(rn):
+    datos = RecienNacidoSerializer(rn).data
+    atencion = _relacion_opcional(rn, 'rnatencioninmediata')
+    egreso = _relacion_opcional(rn, 'rnegreso')
+    datos['atencion_inmediata'] = RNAtencionInmediataSerializer(atencion).data if atencion else None
+    datos['tamizajes_metabolicos'] = RNTamizajeMetabolicoSerializer(rn.rntamizajemetabolico_set.all(), many=True).data
+    datos['tamizajes_auditivos'] = RNTamizajeAuditivoSerializer(rn.rntamizajeauditivo_set.all(), many=True).data
+    datos['tamizajes_cardiopatia'] = RNTamizajeCardiopatiaSerializer(rn.rntamizajecardiopatia_set.all(), many=True).data
+    datos['egreso'] = RNEgresoSerializer(egreso).data if egreso else None
+    return datos
+
+
+def _prefetch_recien_nacidos():
+    return Prefetch(
+        'reciennacido_set',
+        queryset=RecienNacido.objects.select_related(
+            'rnatencioninmediata__fk_profesional_registra', 'rnegreso',
+        ).prefetch_related(
+            Prefetch('rntamizajemetabolico_set', queryset=RNTamizajeMetabolico.objects.order_by('fecha_muestra')),
+            Prefetch('rntamizajeauditivo_set', queryset=RNTamizajeAuditivo.objects.order_by('id_tamizaje_auditivo')),
+            Prefetch('rntamizajecardiopatia_set', queryset=RNTamizajeCardiopatia.objects.order_by('fecha_hora_tamizaje')),
+        ).order_by('id_rn'),
+    )
+
+
+def construir_timeline(madre, permisos=None):
+    """
+    Construye la línea de tiempo de una madre.
+
+    Args:
+        madre: Instancia de MadrePaciente (idealmente con select_related de
+            nacionalidad y pueblo originario)
+        permisos: Códigos de permiso del usuario, o None para incluir todo
+            (superusuario)
+
+    Returns:
+        dict: Datos listos para Response
+    """
+    def permitido(rama):
+        return permisos is None or PERMISOS_RAMA[rama] in permisos
+
+    timeline = {'madre': MadrePacienteSerializer(madre).data}
+    omitidas = []
+
+    if permitido('embarazos'):
+        timeline['embarazos'] = EmbarazoSerializer(
+            madre.embarazos.select_related('fk_madre').con_edad_gestacional()
+            .order_by('fecha_ultima_menstruacion'), many=True
+        ).data
+    else:
+        omitidas.append('embarazos')
+
+    partos = []
+    if permitido('partos'):
+        partos = madre.partos.con_detalle().order_by('fecha_parto')
+        if permitido('recien_nacidos'):
+            partos = partos.prefetch_related(_prefetch_recien_nacidos())
+        else:
+            omitidas.append('recien_nacidos')
+        partos = list(partos)
+    else:
+        omitidas.append('partos')
+
+    ives = []
+    if permitido('ive_atenciones'):
+        ives = list(
+            IVEAtencion.objects.filter(fk_madre=madre).select_related('fk_madre')
+            .prefetch_related('acompañamientos').order_by('fecha_atencion')
+        )
+    else:
+        omitidas.append('ive_atenciones')
+
+    # Las altas anticonceptivas referencian el evento (parto o IVE) por id y
+    # tipo; solo se muestran las de eventos visibles para el usuario.
+    altas_por_evento = {}
+    if permitido('altas_anticonceptivas') and (partos or ives):
+        filtro = Q(tipo_alta='parto', fk_evento__in=[p.id_parto for p in partos])
+        filtro |= Q(tipo_alta='ive', fk_evento__in=[i.id_ive_atencion for i in ives])
+        for alta in AltaAnticonceptivo.objects.filter(filtro).order_by('fecha_registro'):
+            altas_por_evento.setdefault((alta.tipo_alta, alta.fk_evento), []).append(alta)
+    elif not permitido('altas_anticonceptivas'):
+        omitidas.append('altas_anticonceptivas')
+
+    def altas(tipo, evento_id):
+        return AltaAnticonceptivoSerializer(altas_por_evento.get((tipo, evento_id), []), many=True).data
+
+    if permitido('partos'):
+        timeline['partos'] = []
+        for parto in partos:
+            datos = PartoDetailSerializer(parto).data
+            if permitido('recien_nacidos'):
+                datos['recien_nacidos'] = [_serializar_recien_nacido(rn) for rn in parto.reciennacido_set.all()]
+            if permitido('altas_anticonceptivas'):
+                datos['altas_anticonceptivas'] = altas('parto', parto.id_parto)
+            timeline['partos'].append(datos)
+
+    if permitido('ive_atenciones'):
+        timeline['ive_atenciones'] = []
+        for ive in ives:
+            datos = IVEAtencionDetailSerializer(ive).data
+            if permitido('altas_anticonceptivas'):
+                datos['altas_anticonceptivas'] = altas('ive', ive.id_ive_atencion)
+            timeline['ive_atenciones'].append(datos)
+
+    timeline['secciones_omitidas'] = omitidas
+    return timeline
@@ -1,3 +1,43 @@
-from django.shortcuts import render
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.views import View
 
-# Create your views here.
+from .schema import cargar_schema
+
+
+class SchemaEstaticoView(View):
+    """
+    Sirve el schema OpenAPI pre-generado (schema.yml) sin introspección.
+
+    GET /api/schema/            -> YAML (application/vnd.oai.openapi)
+    GET /api/schema/?format=json -> JSON (application/vnd.oai.openapi+json)
+
+    Responde 304 si el cliente envía un If-None-Match vigente y entrega los
+    bytes ya comprimidos con gzip cuando el cliente lo acepta.
+    """
+    http_method_names = ['get', 'head']
+
+    TIPOS_CONTENIDO = {
+        'yaml': 'application/vnd.oai.openapi; charset=utf-8',
+        'json': 'application/vnd.oai.openapi+json; charset=utf-8',
+    }
+
+    def get(self, request, *args, **kwargs):
+        formato = 'json' if request.GET.get('format') in ('json', 'openapi-json') else 'yaml'
+        artefacto = cargar_schema(formato)
+        usar_gzip = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        etag = artefacto.etag[:-1] + '-gzip"' if usar_gzip else artefacto.etag
+
+        etags_cliente = [e.strip() for e in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]
+        if etag in etags_cliente or artefacto.etag in etags_cliente:
+            response = HttpResponseNotModified()
+        elif usar_gzip:
+            response = HttpResponse(artefacto.comprimido, content_type=self.TIPOS_CONTENIDO[formato])
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(artefacto.contenido, content_type=self.TIPOS_CONTENIDO[formato])
+
+        response['ETag'] = etag
+        response['Cache-Control'] = 'public, no-cache'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
@@ -0,0 +1,66 @@
+"""
+ViewSets de la API, separados por aplicación.
+
+Cada submódulo importa solo los modelos y serializers de su aplicación. Los
+nombres se siguen exportando desde ``api.viewsets`` pero se cargan de forma
+diferida (PEP 562): ``from api.viewsets import PartoViewSet`` importa solo
+``api.viewsets.maternity``.
+"""
+from importlib import import_module
+
+_MODULO_POR_VIEWSET = {
+    # Core
+    'UsuarioViewSet': 'core',
+    'RolViewSet': 'core',
+    'PermisoViewSet': 'core',
+    'RolPermisoViewSet': 'core',
+    # Catalogs
+    'CatNacionalidadViewSet': 'catalogs',
+    'CatPuebloOriginarioViewSet': 'catalogs',
+    'CatComplicacionPartoViewSet': 'catalogs',
+    'CatRobsonViewSet': 'catalogs',
+    'CatTipoPartoViewSet': 'catalogs',
+    # Maternity
+    'MadrePacienteViewSet': 'maternity',
+    'EmbarazoViewSet': 'maternity',
+    'PartoViewSet': 'maternity',
+    'PartoComplicacionViewSet': 'maternity',
+    'PartoAnestesiaViewSet': 'maternity',
+    'IVEAtencionViewSet': 'maternity',
+    'IVEAcompanamientoViewSet': 'maternity',
+    'AltaAnticonceptivoViewSet': 'maternity',
+    # Neonatology
+    'RecienNacidoViewSet': 'neonatology',
+    'RNAtencionInmediataViewSet': 'neonatology',
+    'RNTamizajeMetabolicoViewSet': 'neonatology',
+    'RNTamizajeAuditivoViewSet': 'neonatology',
+    'RNTamizajeCardiopatiaViewSet': 'neonatology',
+    'RNEgresoViewSet': 'neonatology',
+    'TamizajePendienteViewSet': 'neonatology',
+    # Compliance
+    'TrazaMovimientoViewSet': 'compliance',
+    # Alerts
+    'AlertaSistemaViewSet': 'alerts',
+    # Reports
+    'ReporteREMViewSet': 'reports',
+    'ReporteREMDetalleViewSet': 'reports',
+    'IndicadorPartoViewSet': 'reports',
+    # Sync
+    'SincronizacionViewSet': 'sync',
+    'FeedEventosViewSet': 'sync',
+}
+
+__all__ = list(_MODULO_POR_VIEWSET)
+
+
+def __getattr__(nombre):
+    modulo = _MODULO_POR_VIEWSET.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(import_module(f'.{modulo}', __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
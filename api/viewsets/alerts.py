@@ -0,0 +1,184 @@
+"""
+ViewSets de Alertas.
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+
+from core.rbac_utils import RBACPermission, registrar_auditoria, obtener_ip_cliente
+from core.transacciones import EscrituraAtomicaMixin
+from core.cache import RespuestaCacheadaMixin, invalidar_modelo
+from core.models import Usuario
+from core.renderers import EventStreamRenderer, JSONRapidoRenderer
+
+from alerts.difusion import respuesta_flujo
+from alerts.models import AlertaSistema
+from sync.outbox import ACTUALIZAR, registrar_eventos
+from alerts.serializers import AlertaSistemaSerializer, AccionMasivaAlertasSerializer, ResultadoAccionMasivaSerializer
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Alertas'], summary='Listar alertas del sistema', description='Requiere: alert:read'),
+    create=extend_schema(tags=['Alertas'], summary='Crear alerta', description='Requiere: alert:resolve'),
+    retrieve=extend_schema(tags=['Alertas'], summary='Obtener alerta'),
+    update=extend_schema(tags=['Alertas'], summary='Actualizar alerta (resolver)', description='Requiere: alert:resolve'),
+    partial_update=extend_schema(tags=['Alertas'], summary='Actualizar alerta parcialmente'),
+    destroy=extend_schema(tags=['Alertas'], summary='Eliminar alerta', description='Requiere: alert:resolve'),
+)
+class AlertaSistemaViewSet(RespuestaCacheadaMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para alertas del sistema con permisos RBAC."""
+    queryset = AlertaSistema.objects.all()
+    serializer_class = AlertaSistemaSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    cache_dependencias = (AlertaSistema, Usuario)
+
+    def get_required_permission(self):
+        if self.action in ['update', 'partial_update', 'resolver', 'reconocer']:
+            return 'alert:resolve'
+        elif self.action in ['create', 'destroy']:
+            return 'alert:resolve'
+        return 'alert:read'
+
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+    def get_serializer_class(self):
+        if self.action in ['resolver', 'reconocer']:
+            return AccionMasivaAlertasSerializer
+        return AlertaSistemaSerializer
+
+    def perform_update(self, serializer):
+        # Resolver por PATCH individual deja la misma huella que la resolución masiva
+        extra = {}
+        if serializer.validated_data.get('resuelto') and not serializer.instance.resuelto:
+            extra['fecha_resolucion'] = timezone.now()
+            if not serializer.validated_data.get('fk_usuario_resuelve'):
+                extra['fk_usuario_resuelve'] = self.request.user
+        with transaction.atomic():
+            serializer.save(**extra)
+
+    @extend_schema(
+        tags=['Alertas'],
+        summary='Alertas abiertas',
+        description='Requiere: alert:read. Alertas sin resolver, de la más reciente a la más antigua.',
+    )
+    @action(detail=False, methods=['get'])
+    def abiertas(self, request):
+        queryset = self.get_queryset().filter(resuelto=False).select_related('fk_usuario_genera', 'fk_usuario_resuelve')
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(AlertaSistemaSerializer(page, many=True).data)
+        return Response(AlertaSistemaSerializer(queryset, many=True).data)
+
+    @extend_schema(
+        tags=['Alertas'],
+        summary='Alertas en vivo (Server-Sent Events)',
+        description=(
+            'Requiere: alert:read. Flujo text/event-stream que reemplaza el sondeo del listado: envía un evento '
+            'por cada alerta nueva, resuelta, reconocida, actualizada o eliminada (event: nueva, resuelta, ...), '
+            'con la secuencia como id. Al reconectarse, enviar Last-Event-ID (o ?desde=) para recibir lo perdido; '
+            'si se perdieron demasiados eventos llega event: reinicio y el cliente debe recargar el listado. '
+            'El servidor cierra el flujo periódicamente; el cliente debe reconectarse.'
+        ),
+        parameters=[
+            OpenApiParameter('nivel_gravedad', str, description='Niveles a recibir, separados por coma'),
+            OpenApiParameter('tipo_alerta', str, description='Tipos a recibir, separados por coma'),
+            OpenApiParameter('desde', int, description='Secuencia del último evento recibido (alternativa a Last-Event-ID)'),
+        ],
+        responses={(200, 'text/event-stream'): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=['get'], renderer_classes=[EventStreamRenderer, JSONRapidoRenderer])
+    def stream(self, request):
+        filtros = {
+            campo: set(request.query_params[campo].split(','))
+            for campo in ('nivel_gravedad', 'tipo_alerta') if request.query_params.get(campo)
+        }
+        ultimo = request.headers.get('Last-Event-ID') or request.query_params.get('desde')
+        if ultimo is not None and not ultimo.isdigit():
+            raise ValidationError({'desde': 'Debe ser un entero no negativo'})
+        return respuesta_flujo(request._request, filtros, int(ultimo) if ultimo is not None else None)
+
+    def _accion_masiva(self, request, accion, cambios, pendientes):
+        """
+        Aplica ``cambios`` con un único UPDATE a las alertas seleccionadas que
+        cumplen ``pendientes``, y registra una sola traza de auditoría.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        criterio = serializer.criterio()
+
+        with transaction.atomic():
+            ids = list(AlertaSistema.objects.select_for_update().filter(**criterio, **pendientes)
+                       .values_list('id_alerta', flat=True))
+            actualizadas = AlertaSistema.objects.filter(id_alerta__in=ids).update(**cambios)
+            # update() no emite señales: los eventos de la outbox se registran a mano
+            registrar_eventos(AlertaSistema, AlertaSistema.objects.filter(id_alerta__in=ids), ACTUALIZAR)
+            registrar_auditoria(
+                usuario=request.user,
+                tipo_accion='UPDATE',
+                tabla_afectada='alerta_sistema',
+                id_registro=0,
+                cambios_nuevos={
+                    'accion': accion,
+                    'criterio': request.data.get('filtros') or {'ids': criterio['id_alerta__in']},
+                    'actualizadas': actualizadas,
+                },
+                ip_address=obtener_ip_cliente(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
+                descripcion=f'{accion.capitalize()} masivo: {actualizadas} alertas',
+            )
+        # update() no emite señales: se invalida la caché de respuestas a mano, también
+        # al confirmar la transacción externa (otra petición pudo cachear la versión anterior)
+        invalidar_modelo(AlertaSistema)
+        transaction.on_commit(lambda: invalidar_modelo(AlertaSistema))
+
+        solicitadas = serializer.validated_data.get('ids')
+        return Response(ResultadoAccionMasivaSerializer({
+            'accion': accion,
+            'solicitadas': len(set(solicitadas)) if solicitadas is not None else None,
+            'actualizadas': actualizadas,
+        }).data)
+
+    @extend_schema(
+        tags=['Alertas'],
+        summary='Resolver alertas en bloque',
+        description=(
+            'Requiere: alert:resolve. Resuelve las alertas abiertas indicadas por "ids" o por "filtros" '
+            '(tipo_alerta, entidad_origen, nivel_gravedad, desde, hasta) en una sola operación.'
+        ),
+        request=AccionMasivaAlertasSerializer,
+        responses=ResultadoAccionMasivaSerializer,
+    )
+    @action(detail=False, methods=['post'])
+    def resolver(self, request):
+        return self._accion_masiva(
+            request, 'resolver',
+            cambios={'resuelto': True, 'fk_usuario_resuelve': request.user, 'fecha_resolucion': timezone.now()},
+            pendientes={'resuelto': False},
+        )
+
+    @extend_schema(
+        tags=['Alertas'],
+        summary='Reconocer alertas en bloque',
+        description=(
+            'Requiere: alert:resolve. Marca como vistas (sin resolver) las alertas abiertas indicadas por '
+            '"ids" o por "filtros" en una sola operación.'
+        ),
+        request=AccionMasivaAlertasSerializer,
+        responses=ResultadoAccionMasivaSerializer,
+    )
+    @action(detail=False, methods=['post'])
+    def reconocer(self, request):
+        return self._accion_masiva(
+            request, 'reconocer',
+            cambios={'reconocido': True, 'fk_usuario_reconoce': request.user, 'fecha_reconocimiento': timezone.now()},
+            pendientes={'resuelto': False, 'reconocido': False},
+        )
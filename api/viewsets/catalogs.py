@@ -0,0 +1,123 @@
+"""
+ViewSets de Catálogos.
+"""
+from rest_framework import viewsets
+from rest_framework.permissions import IsAuthenticated
+
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from core.rbac_utils import RBACPermission
+from core.transacciones import EscrituraAtomicaMixin
+
+from catalogs.models import CatNacionalidad, CatPuebloOriginario, CatComplicacionParto, CatRobson, CatTipoParto
+from catalogs.serializers import CatNacionalidadSerializer, CatPuebloOriginarioSerializer, CatComplicacionPartoSerializer, CatRobsonSerializer, CatTipoPartoSerializer
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Catálogos'], summary='Listar nacionalidades'),
+    create=extend_schema(tags=['Catálogos'], summary='Crear nacionalidad'),
+    retrieve=extend_schema(tags=['Catálogos'], summary='Obtener nacionalidad'),
+    update=extend_schema(tags=['Catálogos'], summary='Actualizar nacionalidad'),
+    destroy=extend_schema(tags=['Catálogos'], summary='Eliminar nacionalidad'),
+)
+class CatNacionalidadViewSet(EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    queryset = CatNacionalidad.objects.all()
+    serializer_class = CatNacionalidadSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'catalog:manage'
+        return 'catalog:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Catálogos'], summary='Listar pueblos originarios'),
+    create=extend_schema(tags=['Catálogos'], summary='Crear pueblo originario'),
+    retrieve=extend_schema(tags=['Catálogos'], summary='Obtener pueblo originario'),
+    update=extend_schema(tags=['Catálogos'], summary='Actualizar pueblo originario'),
+    destroy=extend_schema(tags=['Catálogos'], summary='Eliminar pueblo originario'),
+)
+class CatPuebloOriginarioViewSet(EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    queryset = CatPuebloOriginario.objects.all()
+    serializer_class = CatPuebloOriginarioSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'catalog:manage'
+        return 'catalog:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Catálogos'], summary='Listar complicaciones de parto'),
+    create=extend_schema(tags=['Catálogos'], summary='Crear complicación'),
+    retrieve=extend_schema(tags=['Catálogos'], summary='Obtener complicación'),
+    update=extend_schema(tags=['Catálogos'], summary='Actualizar complicación'),
+    destroy=extend_schema(tags=['Catálogos'], summary='Eliminar complicación'),
+)
+class CatComplicacionPartoViewSet(EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    queryset = CatComplicacionParto.objects.all()
+    serializer_class = CatComplicacionPartoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'catalog:manage'
+        return 'catalog:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Catálogos'], summary='Listar clasificaciones Robson'),
+    create=extend_schema(tags=['Catálogos'], summary='Crear clasificación Robson'),
+    retrieve=extend_schema(tags=['Catálogos'], summary='Obtener clasificación Robson'),
+    update=extend_schema(tags=['Catálogos'], summary='Actualizar clasificación Robson'),
+    destroy=extend_schema(tags=['Catálogos'], summary='Eliminar clasificación Robson'),
+)
+class CatRobsonViewSet(EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    queryset = CatRobson.objects.all()
+    serializer_class = CatRobsonSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'catalog:manage'
+        return 'catalog:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Catálogos'], summary='Listar tipos de parto'),
+    create=extend_schema(tags=['Catálogos'], summary='Crear tipo de parto'),
+    retrieve=extend_schema(tags=['Catálogos'], summary='Obtener tipo de parto'),
+    update=extend_schema(tags=['Catálogos'], summary='Actualizar tipo de parto'),
+    destroy=extend_schema(tags=['Catálogos'], summary='Eliminar tipo de parto'),
+)
+class CatTipoPartoViewSet(EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    queryset = CatTipoParto.objects.all()
+    serializer_class = CatTipoPartoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'catalog:manage'
+        return 'catalog:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
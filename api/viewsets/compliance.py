@@ -0,0 +1,209 @@
+"""
+ViewSets de Cumplimiento: auditoría.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import Trunc
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+
+from core.rbac_utils import RBACPermission
+
+from compliance.archivo import ArchivoTrazas, ConsultaArchivo, ResultadoConArchivo
+from compliance.models import TrazaMovimiento
+from compliance.serializers import TrazaMovimientoSerializer, AgregadosTrazasSerializer
+
+# Dimensiones por las que se puede agrupar en /trazas/agregados/
+DIMENSIONES_AGREGADOS = ('tipo_accion', 'tabla_afectada', 'resultado', 'fk_usuario')
+INTERVALOS_AGREGADOS = ('hour', 'day', 'month')
+
+
+def parsear_fecha_hora(nombre, valor):
+    """``YYYY-MM-DD`` (inicio del día) o ISO-8601; las fechas sin zona usan la zona local."""
+    fecha_hora = parse_datetime(valor)
+    if fecha_hora is None:
+        fecha = parse_date(valor)
+        if fecha is None:
+            raise ValidationError({nombre: 'Formato inválido (YYYY-MM-DD o ISO-8601)'})
+        fecha_hora = datetime.combine(fecha, time.min)
+    if timezone.is_naive(fecha_hora):
+        fecha_hora = timezone.make_aware(fecha_hora)
+    return fecha_hora
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Auditoría'], 
+        summary='Listar trazas de auditoría', 
+        description=(
+            'Solo lectura. Requiere: compliance:audit:read (solo supervisores). Si "desde" es anterior a la '
+            'traza más antigua de la tabla, el resultado incluye las trazas archivadas (archivar_trazas) del '
+            'rango; la respuesta lleva el header X-Auditoria-Archivo: 1.'
+        ),
+        parameters=[
+            OpenApiParameter('tipo_accion', str, description='Filtrar por tipo de acción'),
+            OpenApiParameter('tabla_afectada', str, description='Filtrar por tabla afectada'),
+            OpenApiParameter('resultado', str, enum=['SUCCESS', 'FAILED'], description='Filtrar por resultado'),
+            OpenApiParameter('fk_usuario', int, description='Filtrar por usuario'),
+            OpenApiParameter('desde', str, description='Fecha/hora inicial, inclusiva (YYYY-MM-DD o ISO-8601)'),
+            OpenApiParameter('hasta', str, description='Fecha/hora final, exclusiva (YYYY-MM-DD o ISO-8601)'),
+        ]
+    ),
+    retrieve=extend_schema(tags=['Auditoría'], summary='Obtener traza de auditoría', description='Busca también en el archivo.'),
+)
+class TrazaMovimientoViewSet(viewsets.ReadOnlyModelViewSet):
+    """ViewSet de solo lectura para auditoría con permisos RBAC."""
+    queryset = TrazaMovimiento.objects.select_related('fk_usuario')
+    serializer_class = TrazaMovimientoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        return 'compliance:audit:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+    def filtros(self):
+        """Filtros de la query string, validados."""
+        params = self.request.query_params
+        filtros = {
+            campo: params[campo] for campo in ('tipo_accion', 'tabla_afectada', 'resultado') if params.get(campo)
+        }
+        if params.get('fk_usuario'):
+            try:
+                filtros['fk_usuario'] = int(params['fk_usuario'])
+            except ValueError:
+                raise ValidationError({'fk_usuario': 'Debe ser un número entero'})
+        for campo in ('desde', 'hasta'):
+            if params.get(campo):
+                filtros[campo] = parsear_fecha_hora(campo, params[campo])
+        return filtros
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in ('list', 'agregados'):
+            return queryset
+        filtros = self.filtros()
+        desde, hasta = filtros.pop('desde', None), filtros.pop('hasta', None)
+        if desde is not None:
+            queryset = queryset.filter(fecha_hora__gte=desde)
+        if hasta is not None:
+            queryset = queryset.filter(fecha_hora__lt=hasta)
+        if 'fk_usuario' in filtros:
+            filtros['fk_usuario_id'] = filtros.pop('fk_usuario')
+        return queryset.filter(**filtros)
+
+    @extend_schema(
+        tags=['Auditoría'],
+        summary='Conteos agregados de trazas',
+        description=(
+            'Requiere: compliance:audit:read. Cantidad de trazas por período ("intervalo": hour, day o month) '
+            'y por las dimensiones de "agrupar" (tipo_accion, tabla_afectada, resultado, fk_usuario, separadas '
+            'por coma), calculada con GROUP BY en la base de datos. "desde" y "hasta" son obligatorios y el rango '
+            'no puede superar AUDITORIA_AGREGADOS_MAX_DIAS. Acepta los mismos filtros que el listado. Solo '
+            'considera la tabla, no el archivo.'
+        ),
+        parameters=[
+            OpenApiParameter('desde', str, required=True, description='Fecha/hora inicial, inclusiva'),
+            OpenApiParameter('hasta', str, required=True, description='Fecha/hora final, exclusiva'),
+            OpenApiParameter('intervalo', str, enum=list(INTERVALOS_AGREGADOS), description='Por defecto: day'),
+            OpenApiParameter('agrupar', str, description='Dimensiones separadas por coma (ej: fk_usuario,tipo_accion)'),
+            OpenApiParameter('tipo_accion', str, description='Filtrar por tipo de acción'),
+            OpenApiParameter('tabla_afectada', str, description='Filtrar por tabla afectada'),
+            OpenApiParameter('resultado', str, enum=['SUCCESS', 'FAILED'], description='Filtrar por resultado'),
+            OpenApiParameter('fk_usuario', int, description='Filtrar por usuario'),
+        ],
+        responses=AgregadosTrazasSerializer,
+    )
+    @action(detail=False, methods=['get'])
+    def agregados(self, request):
+        params = request.query_params
+        filtros = self.filtros()
+        desde, hasta = filtros.get('desde'), filtros.get('hasta')
+        errores = {campo: 'Este parámetro es requerido' for campo in ('desde', 'hasta') if filtros.get(campo) is None}
+        if errores:
+            raise ValidationError(errores)
+        if hasta <= desde:
+            raise ValidationError({'hasta': 'Debe ser posterior a "desde"'})
+        maximo = timedelta(days=settings.AUDITORIA_AGREGADOS_MAX_DIAS)
+        if hasta - desde > maximo:
+            raise ValidationError({'hasta': f'El rango no puede superar {maximo.days} días'})
+
+        intervalo = params.get('intervalo') or 'day'
+        if intervalo not in INTERVALOS_AGREGADOS:
+            raise ValidationError({'intervalo': f'Debe ser uno de: {", ".join(INTERVALOS_AGREGADOS)}'})
+        agrupar = [d.strip() for d in params.get('agrupar', '').split(',') if d.strip()]
+        invalidas = sorted(set(agrupar) - set(DIMENSIONES_AGREGADOS))
+        if invalidas:
+            raise ValidationError({'agrupar': f'Dimensiones no válidas: {", ".join(invalidas)}'})
+        agrupar = list(dict.fromkeys(agrupar))
+
+        filas = (
+            self.filter_queryset(TrazaMovimiento.objects.all())
+            .order_by()
+            .annotate(periodo=Trunc('fecha_hora', intervalo, tzinfo=timezone.get_current_timezone()))
+            .values('periodo', *agrupar)
+            .annotate(total=Count('id_traza'))
+            .order_by('periodo', *agrupar)
+        )
+        return Response(AgregadosTrazasSerializer({
+            'desde': desde,
+            'hasta': hasta,
+            'intervalo': intervalo,
+            'agrupar': agrupar,
+            'total': sum(fila['total'] for fila in filas),
+            'resultados': filas,
+        }).data)
+
+    def trazas_archivadas(self):
+        """
+        Trazas del archivo para la parte del rango pedido que ya no está en la
+        tabla (anterior a su traza más antigua), o ``None`` si no aplica.
+        """
+        filtros = self.filtros()
+        desde = filtros.get('desde')
+        if desde is None:
+            return None
+        mas_antigua = TrazaMovimiento.objects.order_by('fecha_hora').values_list('fecha_hora', flat=True).first()
+        if mas_antigua is not None and mas_antigua <= desde:
+            return None
+        hasta = filtros.get('hasta')
+        if mas_antigua is not None:
+            hasta = min(hasta, mas_antigua) if hasta is not None else mas_antigua
+        filtros.update(hasta=hasta)
+        return ConsultaArchivo(filtros)
+
+    def list(self, request, *args, **kwargs):
+        archivadas = self.trazas_archivadas()
+        if not archivadas:
+            return super().list(request, *args, **kwargs)
+
+        resultado = ResultadoConArchivo(self.filter_queryset(self.get_queryset()), archivadas)
+        page = self.paginate_queryset(resultado)
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        else:
+            response = Response(self.get_serializer(list(resultado), many=True).data)
+        response['X-Auditoria-Archivo'] = '1'
+        return response
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            valor = str(self.kwargs[self.lookup_field])
+            archivadas = ArchivoTrazas().buscar(id_traza=int(valor)) if valor.isdigit() else []
+            if not archivadas:
+                raise
+            return archivadas[0]
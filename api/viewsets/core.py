@@ -0,0 +1,127 @@
+"""
+ViewSets de Core: usuarios, roles y permisos.
+"""
+from rest_framework import viewsets, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, extend_schema_view
+
+from core.sparse_fields import CamposDinamicosViewMixin
+from core.rbac_utils import RBACPermission
+from core.transacciones import EscrituraAtomicaMixin
+
+from core.models import Usuario, Rol, Permiso, RolPermiso
+from core.serializers import (
+    UsuarioSerializer, RolSerializer, PermisoSerializer, RolPermisoSerializer,
+    ChangePasswordSerializer, UsuarioProfileSerializer
+)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Usuarios'], summary='Listar usuarios', description='Requiere: core:user:manage'),
+    create=extend_schema(tags=['Usuarios'], summary='Crear usuario', description='Requiere: core:user:manage'),
+    retrieve=extend_schema(tags=['Usuarios'], summary='Obtener usuario'),
+    update=extend_schema(tags=['Usuarios'], summary='Actualizar usuario'),
+    partial_update=extend_schema(tags=['Usuarios'], summary='Actualizar usuario (parcial)'),
+    destroy=extend_schema(tags=['Usuarios'], summary='Eliminar usuario'),
+)
+class UsuarioViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de usuarios con permisos RBAC."""
+    queryset = Usuario.objects.all()
+    serializer_class = UsuarioSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'core:user:manage'
+        return 'core:user:manage'
+    
+    def check_permissions(self, request):
+        if self.action in ['me', 'change_password', 'logout']:
+            return
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+    @extend_schema(tags=['Usuarios'], summary='Mi perfil', description='Obtiene perfil del usuario autenticado')
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def me(self, request):
+        serializer = UsuarioProfileSerializer(request.user)
+        return Response(serializer.data)
+
+    @extend_schema(tags=['Usuarios'], summary='Cambiar contraseña')
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def change_password(self, request):
+        serializer = ChangePasswordSerializer(data=request.data)
+        if serializer.is_valid():
+            user = request.user
+            if not user.check_password(serializer.validated_data['old_password']):
+                return Response({'old_password': 'Contraseña incorrecta'}, status=status.HTTP_400_BAD_REQUEST)
+            user.set_password(serializer.validated_data['new_password'])
+            user.save()
+            return Response({'detail': 'Contraseña actualizada exitosamente'}, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @extend_schema(tags=['Usuarios'], summary='Logout')
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def logout(self, request):
+        return Response({'detail': 'Logout exitoso'}, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Roles & Permisos'], summary='Listar roles'),
+    create=extend_schema(tags=['Roles & Permisos'], summary='Crear rol'),
+    retrieve=extend_schema(tags=['Roles & Permisos'], summary='Obtener rol'),
+    update=extend_schema(tags=['Roles & Permisos'], summary='Actualizar rol'),
+    destroy=extend_schema(tags=['Roles & Permisos'], summary='Eliminar rol'),
+)
+class RolViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    queryset = Rol.objects.all()
+    serializer_class = RolSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        return 'core:role:manage'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Roles & Permisos'], summary='Listar permisos'),
+    create=extend_schema(tags=['Roles & Permisos'], summary='Crear permiso'),
+    retrieve=extend_schema(tags=['Roles & Permisos'], summary='Obtener permiso'),
+    update=extend_schema(tags=['Roles & Permisos'], summary='Actualizar permiso'),
+    destroy=extend_schema(tags=['Roles & Permisos'], summary='Eliminar permiso'),
+)
+class PermisoViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    queryset = Permiso.objects.all()
+    serializer_class = PermisoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        return 'core:role:manage'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Roles & Permisos'], summary='Listar asignaciones rol-permiso'),
+    create=extend_schema(tags=['Roles & Permisos'], summary='Asignar permiso a rol'),
+    retrieve=extend_schema(tags=['Roles & Permisos'], summary='Obtener asignación'),
+    destroy=extend_schema(tags=['Roles & Permisos'], summary='Eliminar asignación'),
+)
+class RolPermisoViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    queryset = RolPermiso.objects.all()
+    serializer_class = RolPermisoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        return 'core:role:manage'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
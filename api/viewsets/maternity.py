@@ -0,0 +1,506 @@
+"""
+ViewSets de Maternidad: madres, embarazos, partos, IVE y altas anticonceptivas.
+"""
+from django.db import transaction
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+
+from core.exportacion import ExportacionMixin, RESPUESTA_EXPORTACION
+from core.sparse_fields import CamposDinamicosViewMixin
+from core.rbac_utils import (
+    RBACPermission, RBACObjectPermission, puede_modificar_registro_turno, obtener_permisos_usuario,
+    registrar_auditoria, obtener_ip_cliente,
+)
+from core.cache import RespuestaCacheadaMixin
+from core.transacciones import EscrituraAtomicaMixin
+from core.fast_serializers import ListaRapidaMixin
+from core.models import Usuario
+
+from catalogs.models import CatComplicacionParto, CatRobson, CatTipoParto
+from maternity.models import MadrePaciente, Embarazo, Parto, PartoComplicacion, PartoAnestesia, IVEAtencion, IVEAcompanamiento, AltaAnticonceptivo
+from maternity.serializers import (
+    MadrePacienteSerializer, EmbarazoSerializer, PartoSerializer, PartoDetailSerializer,
+    PartoComplicacionSerializer, PartoAnestesiaSerializer, 
+    IVEAtencionSerializer, IVEAtencionDetailSerializer, IVEAcompanamientoSerializer, 
+    AltaAnticonceptivoSerializer
+)
+from maternity.fast_serializers import MadrePacienteValores, EmbarazoValores, PartoValores
+from api.registro_parto import RegistroPartoSerializer, permisos_requeridos, registrar_parto, serializar_registro
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Maternidad'], 
+        summary='Listar madres pacientes',
+        description='Retorna lista paginada de madres. Requiere: maternity:mother:read',
+        parameters=[
+            OpenApiParameter('run', str, description='Filtrar por RUN'),
+            OpenApiParameter('fk_nacionalidad', int, description='Filtrar por nacionalidad'),
+        ]
+    ),
+    create=extend_schema(tags=['Maternidad'], summary='Crear madre paciente', description='Requiere: maternity:mother:create'),
+    retrieve=extend_schema(tags=['Maternidad'], summary='Obtener madre paciente'),
+    update=extend_schema(tags=['Maternidad'], summary='Actualizar madre paciente'),
+    partial_update=extend_schema(tags=['Maternidad'], summary='Actualizar madre (parcial)'),
+    destroy=extend_schema(tags=['Maternidad'], summary='Eliminar madre paciente'),
+)
+class MadrePacienteViewSet(ListaRapidaMixin, CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de madres pacientes con permisos RBAC."""
+    queryset = MadrePaciente.objects.all()
+    serializer_class = MadrePacienteSerializer
+    serializador_lista = MadrePacienteValores
+    permission_classes = [IsAuthenticated, RBACPermission]
+    search_fields = ['run', 'nombre', 'apellido_paterno', 'apellido_materno']
+    filterset_fields = ['fk_nacionalidad', 'fk_pueblo_originario']
+    
+    def get_required_permission(self):
+        if self.action == 'create':
+            return 'maternity:mother:create'
+        elif self.action in ['update', 'partial_update']:
+            return 'maternity:mother:update'
+        elif self.action == 'destroy':
+            return 'maternity:mother:update'
+        return 'maternity:mother:read'
+    
+    def check_permissions(self, request):
+        if self.action in ['embarazos', 'partos', 'ive_atenciones', 'timeline']:
+            self.required_permission = 'maternity:mother:read'
+        else:
+            self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'timeline':
+            return queryset.select_related('fk_nacionalidad', 'fk_pueblo_originario')
+        return queryset
+    
+    @extend_schema(tags=['Maternidad'], summary='Obtener embarazos de una madre')
+    @action(detail=True, methods=['get'])
+    def embarazos(self, request, pk=None):
+        madre = self.get_object()
+        embarazos = madre.embarazos.con_edad_gestacional()
+        serializer = EmbarazoSerializer(embarazos, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(tags=['Maternidad'], summary='Obtener partos de una madre')
+    @action(detail=True, methods=['get'])
+    def partos(self, request, pk=None):
+        madre = self.get_object()
+        partos = madre.partos.con_detalle()
+        serializer = PartoDetailSerializer(partos, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(tags=['Maternidad'], summary='Obtener atenciones IVE de una madre')
+    @action(detail=True, methods=['get'])
+    def ive_atenciones(self, request, pk=None):
+        madre = self.get_object()
+        ives = madre.ive_atenciones.all()
+        serializer = IVEAtencionDetailSerializer(ives, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(
+        tags=['Maternidad'],
+        summary='Línea de tiempo clínica de una madre',
+        description=(
+            'Árbol completo de episodios en una sola llamada: embarazos, partos (complicaciones, '
+            'anestesias, recién nacidos con atención inmediata, tamizajes y egreso), atenciones IVE '
+            'y altas anticonceptivas. Requiere: maternity:mother:read. Cada rama se incluye solo con '
+            'su permiso de lectura (partos: maternity:delivery:read, recién nacidos: neonatal:rn:read, '
+            'IVE: maternity:ive:manage); las omitidas se listan en secciones_omitidas.'
+        ),
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        from api.timeline import construir_timeline
+        madre = self.get_object()
+        permisos = None if request.user.is_superuser else obtener_permisos_usuario(request.user)
+        return Response(construir_timeline(madre, permisos))
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Maternidad'],
+        summary='Listar embarazos',
+        description=(
+            'Requiere: maternity:mother:read. semanas_gestacion, trimestre y viable se calculan a la fecha de hoy '
+            'desde fecha_ultima_menstruacion (semana_obstetrica es la semana informada al registrar). Son null si '
+            'el embarazo no está en curso: FUM futura o de hace más de 45 semanas, o un parto de la madre desde la '
+            'FUM. semanas_desde/semanas_hasta solo devuelven embarazos en curso.'
+        ),
+        parameters=[
+            OpenApiParameter('semanas_desde', int, description='Edad gestacional mínima hoy, en semanas (inclusive)'),
+            OpenApiParameter('semanas_hasta', int, description='Edad gestacional máxima hoy, en semanas (inclusive)'),
+        ]
+    ),
+    create=extend_schema(tags=['Maternidad'], summary='Crear embarazo'),
+    retrieve=extend_schema(tags=['Maternidad'], summary='Obtener embarazo'),
+    update=extend_schema(tags=['Maternidad'], summary='Actualizar embarazo'),
+    destroy=extend_schema(tags=['Maternidad'], summary='Eliminar embarazo'),
+)
+class EmbarazoViewSet(ListaRapidaMixin, CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de embarazos con permisos RBAC."""
+    queryset = Embarazo.objects.all()
+    serializer_class = EmbarazoSerializer
+    serializador_lista = EmbarazoValores
+    permission_classes = [IsAuthenticated, RBACPermission]
+    filterset_fields = ['fk_madre']
+    ordering_fields = ['semana_obstetrica', 'fecha_ultima_menstruacion', 'fecha_registro']
+    
+    def get_required_permission(self):
+        if self.action == 'create':
+            return 'maternity:mother:create'
+        elif self.action in ['update', 'partial_update', 'destroy']:
+            return 'maternity:mother:update'
+        return 'maternity:mother:read'
+    
+    def check_permissions(self, request):
+        if self.action == 'detalle':
+            self.required_permission = 'maternity:mother:read'
+        else:
+            self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve', 'detalle'):
+            # Edad gestacional en SQL: evita buscar los partos de la madre embarazo por embarazo
+            queryset = queryset.con_edad_gestacional()
+        return queryset
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+        params = self.request.query_params
+        semanas = {}
+        for campo in ('semanas_desde', 'semanas_hasta'):
+            if params.get(campo):
+                if not params[campo].isdigit():
+                    raise ValidationError({campo: 'Debe ser un entero no negativo'})
+                semanas[campo] = int(params[campo])
+        if semanas:
+            # Rango de FUM: usa el índice en lugar de calcular la edad gestacional por fila
+            queryset = queryset.por_semanas(semanas.get('semanas_desde'), semanas.get('semanas_hasta'))
+        return queryset
+    
+    @extend_schema(tags=['Maternidad'], summary='Obtener detalle de embarazo con trimestre y viabilidad')
+    @action(detail=True, methods=['get'])
+    def detalle(self, request, pk=None):
+        embarazo = self.get_object()
+        return Response({
+            'id': embarazo.id_embarazo,
+            'madre': MadrePacienteSerializer(embarazo.fk_madre).data,
+            'semana_obstetrica': embarazo.semana_obstetrica,
+            'semanas_gestacion': embarazo.edad_gestacional(),
+            'trimestre': embarazo.obtener_trimestre(),
+            'viable': embarazo.es_embarazo_viables(),
+            'fecha_ultima_menstruacion': embarazo.fecha_ultima_menstruacion,
+        })
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Maternidad'], 
+        summary='Listar partos',
+        description='Requiere: maternity:delivery:read. Matronas con restricción de turno.',
+        parameters=[
+            OpenApiParameter('fk_madre', int, description='Filtrar por madre'),
+            OpenApiParameter('fk_tipo_parto', int, description='Filtrar por tipo de parto'),
+        ]
+    ),
+    create=extend_schema(tags=['Maternidad'], summary='Crear parto', description='Requiere: maternity:delivery:create'),
+    retrieve=extend_schema(tags=['Maternidad'], summary='Obtener parto (detalle completo)'),
+    update=extend_schema(tags=['Maternidad'], summary='Actualizar parto'),
+    destroy=extend_schema(tags=['Maternidad'], summary='Eliminar parto'),
+    exportar=extend_schema(tags=['Maternidad'], summary='Exportar partos', description='Requiere: report:export_data. Streaming NDJSON o MessagePack (Accept: application/msgpack).', responses=RESPUESTA_EXPORTACION),
+)
+class PartoViewSet(RespuestaCacheadaMixin, ListaRapidaMixin, ExportacionMixin, CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de partos con permisos RBAC y restricción de turno."""
+    queryset = Parto.objects.all()
+    serializer_class = PartoDetailSerializer
+    serializador_lista = PartoValores
+    permission_classes = [IsAuthenticated, RBACPermission, RBACObjectPermission]
+    cache_dependencias = (
+        Parto, MadrePaciente, CatTipoParto, CatRobson, Usuario,
+        PartoComplicacion, CatComplicacionParto, PartoAnestesia,
+    )
+    filterset_fields = ['fk_madre', 'fk_tipo_parto']
+    ordering_fields = ['fecha_parto', 'fecha_registro']
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'registrar']:
+            return 'maternity:delivery:create'
+        elif self.action in ['update', 'partial_update']:
+            from core.rbac_utils import usuario_es_matrona
+            if usuario_es_matrona(self.request.user):
+                return 'maternity:delivery:update_own'
+            return 'maternity:delivery:update_all'
+        elif self.action == 'destroy':
+            return 'maternity:delivery:update_all'
+        elif self.action == 'exportar':
+            return 'report:export_data'
+        return 'maternity:delivery:read'
+    
+    def check_permissions(self, request):
+        if self.action in ['complicaciones', 'anestesias']:
+            self.required_permission = 'maternity:delivery:read'
+        else:
+            self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+        if self.action == 'registrar' and not request.user.is_superuser:
+            permisos = obtener_permisos_usuario(request.user)
+            for codigo in permisos_requeridos(request.data):
+                if codigo not in permisos:
+                    self.permission_denied(request, message=f'No tiene permiso para: {codigo}')
+    
+    def validar_permiso_objeto(self, usuario, obj):
+        return puede_modificar_registro_turno(usuario, obj)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['retrieve', 'complicaciones']:
+            return queryset.con_detalle()
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return PartoDetailSerializer
+        return PartoSerializer
+    
+    @extend_schema(tags=['Maternidad'], summary='Obtener complicaciones de un parto')
+    @action(detail=True, methods=['get'])
+    def complicaciones(self, request, pk=None):
+        parto = self.get_object()
+        complicaciones = parto.complicaciones.all()
+        serializer = PartoComplicacionSerializer(complicaciones, many=True)
+        return Response({
+            'parto_id': parto.id_parto,
+            'tuvo_complicaciones': parto.tuvo_complicaciones(),
+            'complicaciones': serializer.data
+        })
+    
+    @extend_schema(tags=['Maternidad'], summary='Obtener anestesias de un parto')
+    @action(detail=True, methods=['get'])
+    def anestesias(self, request, pk=None):
+        parto = self.get_object()
+        anestesias = parto.anestesias.all()
+        serializer = PartoAnestesiaSerializer(anestesias, many=True)
+        return Response(serializer.data)
+    
+    @extend_schema(
+        tags=['Maternidad'],
+        summary='Registrar parto completo',
+        description=(
+            'Registra en una sola transacción el parto con sus complicaciones, anestesias y recién nacidos '
+            '(cada uno con su atención inmediata). Si una fila no es válida no se guarda nada. '
+            'Requiere: maternity:delivery:create, y según las secciones enviadas maternity:complication:manage '
+            '(complicaciones), maternity:delivery:update_all (anestesias), neonatal:rn:create (recien_nacidos) '
+            'y neonatal:rn:update_immediate (atencion_inmediata).'
+        ),
+        request=RegistroPartoSerializer,
+        responses={201: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=['post'])
+    def registrar(self, request):
+        serializer = RegistroPartoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            parto, complicaciones, anestesias, recien_nacidos, atenciones = registrar_parto(serializer.validated_data)
+            registrar_auditoria(
+                usuario=request.user,
+                tipo_accion='CREATE',
+                tabla_afectada='parto',
+                id_registro=parto.pk,
+                cambios_nuevos={
+                    'complicaciones': [c.pk for c in complicaciones],
+                    'anestesias': [a.pk for a in anestesias],
+                    'recien_nacidos': [rn.pk for rn in recien_nacidos],
+                    'atenciones_inmediatas': [a.pk for a in atenciones],
+                },
+                ip_address=obtener_ip_cliente(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', '')[:500],
+                descripcion=f'Registro de parto completo: {len(recien_nacidos)} recién nacidos',
+            )
+        return Response(serializar_registro(parto, recien_nacidos, atenciones), status=status.HTTP_201_CREATED)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Maternidad'], summary='Listar complicaciones de parto'),
+    create=extend_schema(tags=['Maternidad'], summary='Crear complicación de parto'),
+    retrieve=extend_schema(tags=['Maternidad'], summary='Obtener complicación'),
+    update=extend_schema(tags=['Maternidad'], summary='Actualizar complicación'),
+    destroy=extend_schema(tags=['Maternidad'], summary='Eliminar complicación'),
+)
+class PartoComplicacionViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de complicaciones de parto con permisos RBAC."""
+    queryset = PartoComplicacion.objects.all()
+    serializer_class = PartoComplicacionSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    filterset_fields = ['fk_parto', 'fk_complicacion']
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'maternity:complication:manage'
+        return 'maternity:delivery:read'
+    
+    def check_permissions(self, request):
+        if self.action == 'por_parto':
+            self.required_permission = 'maternity:delivery:read'
+        else:
+            self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+    
+    @extend_schema(
+        tags=['Maternidad'], 
+        summary='Obtener complicaciones por parto',
+        parameters=[OpenApiParameter('parto_id', int, required=True, description='ID del parto')]
+    )
+    @action(detail=False, methods=['get'])
+    def por_parto(self, request):
+        from rest_framework.exceptions import ValidationError
+        parto_id = request.query_params.get('parto_id')
+        if not parto_id:
+            raise ValidationError({'parto_id': 'Este parámetro es requerido'})
+        complicaciones = self.queryset.filter(fk_parto=parto_id)
+        serializer = self.get_serializer(complicaciones, many=True)
+        return Response(serializer.data)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Maternidad'], summary='Listar anestesias de parto'),
+    create=extend_schema(tags=['Maternidad'], summary='Crear anestesia'),
+    retrieve=extend_schema(tags=['Maternidad'], summary='Obtener anestesia'),
+    update=extend_schema(tags=['Maternidad'], summary='Actualizar anestesia'),
+    destroy=extend_schema(tags=['Maternidad'], summary='Eliminar anestesia'),
+)
+class PartoAnestesiaViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de anestesias de parto con permisos RBAC."""
+    queryset = PartoAnestesia.objects.all()
+    serializer_class = PartoAnestesiaSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    filterset_fields = ['fk_parto', 'tipo_anestesia']
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'maternity:delivery:update_all'
+        return 'maternity:delivery:read'
+    
+    def check_permissions(self, request):
+        if self.action == 'estadisticas':
+            self.required_permission = 'maternity:delivery:read'
+        else:
+            self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+    
+    @extend_schema(tags=['Maternidad'], summary='Estadísticas de tipos de anestesia')
+    @action(detail=False, methods=['get'])
+    def estadisticas(self, request):
+        from django.db.models import Count
+        stats = PartoAnestesia.objects.values('tipo_anestesia').annotate(cantidad=Count('id_anestesia'))
+        return Response(list(stats))
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Maternidad'], summary='Listar atenciones IVE'),
+    create=extend_schema(tags=['Maternidad'], summary='Crear atención IVE'),
+    retrieve=extend_schema(tags=['Maternidad'], summary='Obtener atención IVE (con acompañamientos)'),
+    update=extend_schema(tags=['Maternidad'], summary='Actualizar atención IVE'),
+    destroy=extend_schema(tags=['Maternidad'], summary='Eliminar atención IVE'),
+)
+class IVEAtencionViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de atenciones IVE con permisos RBAC."""
+    queryset = IVEAtencion.objects.all()
+    serializer_class = IVEAtencionDetailSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    filterset_fields = ['fk_madre', 'fk_causal']
+    ordering_fields = ['fecha_atencion']
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'maternity:ive:manage'
+        return 'maternity:mother:read'
+    
+    def check_permissions(self, request):
+        if self.action == 'acompaniamientos':
+            self.required_permission = 'maternity:mother:read'
+        else:
+            self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+    
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return IVEAtencionDetailSerializer
+        return IVEAtencionSerializer
+    
+    @extend_schema(tags=['Maternidad'], summary='Obtener acompañamientos de una atención IVE')
+    @action(detail=True, methods=['get'])
+    def acompaniamientos(self, request, pk=None):
+        ive = self.get_object()
+        acomps = ive.acompañamientos.all()
+        serializer = IVEAcompanamientoSerializer(acomps, many=True)
+        return Response(serializer.data)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Maternidad'], summary='Listar acompañamientos IVE'),
+    create=extend_schema(tags=['Maternidad'], summary='Crear acompañamiento IVE'),
+    retrieve=extend_schema(tags=['Maternidad'], summary='Obtener acompañamiento IVE'),
+    update=extend_schema(tags=['Maternidad'], summary='Actualizar acompañamiento IVE'),
+    destroy=extend_schema(tags=['Maternidad'], summary='Eliminar acompañamiento IVE'),
+)
+class IVEAcompanamientoViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de acompañamientos IVE con permisos RBAC."""
+    queryset = IVEAcompanamiento.objects.all()
+    serializer_class = IVEAcompanamientoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    filterset_fields = ['fk_ive_atencion', 'tipo_profesional']
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'maternity:ive:manage'
+        return 'maternity:mother:read'
+    
+    def check_permissions(self, request):
+        if self.action == 'tipos_disponibles':
+            self.required_permission = 'maternity:mother:read'
+        else:
+            self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+    
+    @extend_schema(tags=['Maternidad'], summary='Obtener tipos de profesionales disponibles')
+    @action(detail=False, methods=['get'])
+    def tipos_disponibles(self, request):
+        tipos = IVEAcompanamiento.TIPO_PROFESIONAL_CHOICES
+        return Response([{'value': t[0], 'label': t[1]} for t in tipos])
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Maternidad'], summary='Listar altas anticonceptivas'),
+    create=extend_schema(tags=['Maternidad'], summary='Crear alta anticonceptiva'),
+    retrieve=extend_schema(tags=['Maternidad'], summary='Obtener alta anticonceptiva'),
+    update=extend_schema(tags=['Maternidad'], summary='Actualizar alta anticonceptiva'),
+    destroy=extend_schema(tags=['Maternidad'], summary='Eliminar alta anticonceptiva'),
+)
+class AltaAnticonceptivoViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de altas anticonceptivas con permisos RBAC."""
+    queryset = AltaAnticonceptivo.objects.all()
+    serializer_class = AltaAnticonceptivoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    filterset_fields = ['tipo_alta', 'esterilizacion_quirurgica']
+    ordering_fields = ['fecha_registro']
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'maternity:contraceptive:manage'
+        return 'maternity:delivery:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
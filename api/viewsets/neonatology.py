@@ -0,0 +1,234 @@
+"""
+ViewSets de Neonatología: recién nacidos, tamizajes y egresos.
+"""
+from django.utils import timezone
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from drf_spectacular.utils import extend_schema, extend_schema_view, inline_serializer, OpenApiParameter
+
+from core.exportacion import ExportacionMixin, RESPUESTA_EXPORTACION
+from core.sparse_fields import CamposDinamicosViewMixin
+from core.rbac_utils import RBACPermission
+from core.transacciones import EscrituraAtomicaMixin
+from core.cache import RespuestaCacheadaMixin
+
+from maternity.models import MadrePaciente, Parto
+from neonatology.models import RecienNacido, RNAtencionInmediata, RNTamizajeMetabolico, RNTamizajeAuditivo, RNTamizajeCardiopatia, RNEgreso
+from neonatology.serializers import RecienNacidoSerializer, RNAtencionInmediataSerializer, RNTamizajeMetabolicoSerializer, RNTamizajeAuditivoSerializer, RNTamizajeCardiopatiaSerializer, RNEgresoSerializer
+from neonatology.serializers import TamizajePendienteSerializer, ResumenTamizajePendienteSerializer
+from neonatology.tamizajes import REGLAS_TAMIZAJE, ESTADOS, tamizajes_pendientes, completar_plazos, resumen_pendientes
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Neonatología'], summary='Listar recién nacidos'),
+    create=extend_schema(tags=['Neonatología'], summary='Crear recién nacido', description='Requiere: neonatal:rn:create'),
+    retrieve=extend_schema(tags=['Neonatología'], summary='Obtener recién nacido'),
+    update=extend_schema(tags=['Neonatología'], summary='Actualizar recién nacido'),
+    destroy=extend_schema(tags=['Neonatología'], summary='Eliminar recién nacido'),
+    exportar=extend_schema(tags=['Neonatología'], summary='Exportar recién nacidos', description='Requiere: report:export_data. Streaming NDJSON o MessagePack (Accept: application/msgpack).', responses=RESPUESTA_EXPORTACION),
+)
+class RecienNacidoViewSet(RespuestaCacheadaMixin, ExportacionMixin, CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para gestión de recién nacidos con permisos RBAC."""
+    queryset = RecienNacido.objects.select_related('fk_parto__fk_madre')
+    serializer_class = RecienNacidoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    cache_dependencias = (RecienNacido, Parto, MadrePaciente)
+    
+    def get_required_permission(self):
+        if self.action == 'create':
+            return 'neonatal:rn:create'
+        elif self.action in ['update', 'partial_update', 'destroy']:
+            return 'neonatal:rn:update_immediate'
+        elif self.action == 'exportar':
+            return 'report:export_data'
+        return 'neonatal:rn:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Neonatología'], summary='Listar atenciones inmediatas RN'),
+    create=extend_schema(tags=['Neonatología'], summary='Crear atención inmediata RN', description='Requiere: neonatal:rn:update_immediate'),
+    retrieve=extend_schema(tags=['Neonatología'], summary='Obtener atención inmediata RN'),
+    update=extend_schema(tags=['Neonatología'], summary='Actualizar atención inmediata RN'),
+    destroy=extend_schema(tags=['Neonatología'], summary='Eliminar atención inmediata RN'),
+)
+class RNAtencionInmediataViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para atención inmediata de RN con permisos RBAC."""
+    queryset = RNAtencionInmediata.objects.all()
+    serializer_class = RNAtencionInmediataSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'neonatal:rn:update_immediate'
+        return 'neonatal:rn:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Neonatología'], summary='Listar tamizajes metabólicos'),
+    create=extend_schema(tags=['Neonatología'], summary='Crear tamizaje metabólico', description='Requiere: neonatal:tamizaje:manage'),
+    retrieve=extend_schema(tags=['Neonatología'], summary='Obtener tamizaje metabólico'),
+    update=extend_schema(tags=['Neonatología'], summary='Actualizar tamizaje metabólico'),
+    destroy=extend_schema(tags=['Neonatología'], summary='Eliminar tamizaje metabólico'),
+    exportar=extend_schema(tags=['Neonatología'], summary='Exportar tamizajes metabólicos', description='Requiere: report:export_data. Streaming NDJSON o MessagePack (Accept: application/msgpack).', responses=RESPUESTA_EXPORTACION),
+)
+class RNTamizajeMetabolicoViewSet(ExportacionMixin, CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para tamizaje metabólico de RN con permisos RBAC."""
+    queryset = RNTamizajeMetabolico.objects.select_related('fk_rn')
+    serializer_class = RNTamizajeMetabolicoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'neonatal:tamizaje:manage'
+        elif self.action == 'exportar':
+            return 'report:export_data'
+        return 'neonatal:rn:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Neonatología'], summary='Listar tamizajes auditivos'),
+    create=extend_schema(tags=['Neonatología'], summary='Crear tamizaje auditivo', description='Requiere: neonatal:tamizaje:manage'),
+    retrieve=extend_schema(tags=['Neonatología'], summary='Obtener tamizaje auditivo'),
+    update=extend_schema(tags=['Neonatología'], summary='Actualizar tamizaje auditivo'),
+    destroy=extend_schema(tags=['Neonatología'], summary='Eliminar tamizaje auditivo'),
+    exportar=extend_schema(tags=['Neonatología'], summary='Exportar tamizajes auditivos', description='Requiere: report:export_data. Streaming NDJSON o MessagePack (Accept: application/msgpack).', responses=RESPUESTA_EXPORTACION),
+)
+class RNTamizajeAuditivoViewSet(ExportacionMixin, CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para tamizaje auditivo de RN con permisos RBAC."""
+    queryset = RNTamizajeAuditivo.objects.select_related('fk_rn')
+    serializer_class = RNTamizajeAuditivoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'neonatal:tamizaje:manage'
+        elif self.action == 'exportar':
+            return 'report:export_data'
+        return 'neonatal:rn:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Neonatología'], summary='Listar tamizajes de cardiopatías'),
+    create=extend_schema(tags=['Neonatología'], summary='Crear tamizaje de cardiopatía', description='Requiere: neonatal:tamizaje:manage'),
+    retrieve=extend_schema(tags=['Neonatología'], summary='Obtener tamizaje de cardiopatía'),
+    update=extend_schema(tags=['Neonatología'], summary='Actualizar tamizaje de cardiopatía'),
+    destroy=extend_schema(tags=['Neonatología'], summary='Eliminar tamizaje de cardiopatía'),
+    exportar=extend_schema(tags=['Neonatología'], summary='Exportar tamizajes de cardiopatía', description='Requiere: report:export_data. Streaming NDJSON o MessagePack (Accept: application/msgpack).', responses=RESPUESTA_EXPORTACION),
+)
+class RNTamizajeCardiopatiaViewSet(ExportacionMixin, CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para tamizaje de cardiopatías de RN con permisos RBAC."""
+    queryset = RNTamizajeCardiopatia.objects.select_related('fk_rn')
+    serializer_class = RNTamizajeCardiopatiaSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'neonatal:tamizaje:manage'
+        elif self.action == 'exportar':
+            return 'report:export_data'
+        return 'neonatal:rn:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Neonatología'], summary='Listar egresos de RN'),
+    create=extend_schema(tags=['Neonatología'], summary='Crear egreso de RN', description='Requiere: neonatal:discharge:manage'),
+    retrieve=extend_schema(tags=['Neonatología'], summary='Obtener egreso de RN'),
+    update=extend_schema(tags=['Neonatología'], summary='Actualizar egreso de RN'),
+    destroy=extend_schema(tags=['Neonatología'], summary='Eliminar egreso de RN'),
+)
+class RNEgresoViewSet(CamposDinamicosViewMixin, EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para egreso de RN con permisos RBAC."""
+    queryset = RNEgreso.objects.all()
+    serializer_class = RNEgresoSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+            return 'neonatal:discharge:manage'
+        return 'neonatal:rn:read'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Neonatología'],
+        summary='Tamizajes pendientes',
+        description=(
+            'Requiere: neonatal:rn:read. Recién nacidos vivos a los que les falta el tamizaje indicado y ya '
+            'corresponde tomarlo, del parto más antiguo al más reciente. "vencido" indica que se superó el plazo. '
+            'Solo incluye partos de los últimos TAMIZAJES_VENTANA_DIAS días (90 por defecto).'
+        ),
+        parameters=[
+            OpenApiParameter('tipo', str, required=True, enum=list(REGLAS_TAMIZAJE), description='Tipo de tamizaje'),
+            OpenApiParameter('estado', str, enum=list(ESTADOS), description='Filtrar por estado'),
+        ],
+    ),
+)
+class TamizajePendienteViewSet(viewsets.GenericViewSet):
+    """Lista de trabajo de tamizajes neonatales pendientes y vencidos."""
+    serializer_class = TamizajePendienteSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+
+    def get_required_permission(self):
+        return 'neonatal:rn:read'
+
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+    def list(self, request):
+        tipo = request.query_params.get('tipo')
+        if tipo not in REGLAS_TAMIZAJE:
+            raise ValidationError({'tipo': f'Debe ser uno de: {", ".join(REGLAS_TAMIZAJE)}'})
+        estado = request.query_params.get('estado')
+        if estado and estado not in ESTADOS:
+            raise ValidationError({'estado': f'Debe ser uno de: {", ".join(ESTADOS)}'})
+
+        ahora = timezone.now()
+        queryset = tamizajes_pendientes(tipo, ahora=ahora, estado=estado)
+        page = self.paginate_queryset(queryset)
+        filas = completar_plazos(list(page if page is not None else queryset), tipo, ahora=ahora)
+        data = self.get_serializer(filas, many=True).data
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    @extend_schema(
+        tags=['Neonatología'],
+        summary='Resumen de tamizajes pendientes',
+        description='Requiere: neonatal:rn:read. Cantidad de pendientes y vencidos por tipo de tamizaje.',
+        responses=inline_serializer(
+            'ResumenTamizajesPendientes',
+            {tipo: ResumenTamizajePendienteSerializer() for tipo in REGLAS_TAMIZAJE},
+        ),
+    )
+    @action(detail=False, methods=['get'])
+    def resumen(self, request):
+        return Response(resumen_pendientes())
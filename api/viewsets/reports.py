@@ -0,0 +1,145 @@
+"""
+ViewSets de Reportes REM.
+"""
+from datetime import date
+
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+
+from core.rbac_utils import RBACPermission
+from core.transacciones import EscrituraAtomicaMixin
+
+from reports.cubo import DIMENSIONES, GRANOS, consultar_cubo
+from reports.models import ReporteREM, ReporteREMDetalle, EstadoCuboPartos
+from reports.serializers import ReporteREMSerializer, ReporteREMDetalleSerializer, IndicadoresPartosSerializer
+
+
+def parsear_mes(nombre, valor):
+    """``YYYY-MM`` o ``YYYY-MM-DD`` como el primer día del mes."""
+    try:
+        anio, mes = (int(parte) for parte in valor.split('-')[:2])
+        return date(anio, mes, 1)
+    except ValueError:
+        raise ValidationError({nombre: 'Formato inválido (YYYY-MM)'})
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Reportes'], 
+        summary='Listar reportes REM', 
+        description='Requiere: report:generate_rem (solo supervisores)'
+    ),
+    create=extend_schema(tags=['Reportes'], summary='Generar reporte REM', description='Requiere: report:generate_rem'),
+    retrieve=extend_schema(tags=['Reportes'], summary='Obtener reporte REM'),
+    update=extend_schema(tags=['Reportes'], summary='Actualizar reporte REM'),
+    destroy=extend_schema(tags=['Reportes'], summary='Eliminar reporte REM'),
+)
+class ReporteREMViewSet(EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para reportes REM con permisos RBAC."""
+    queryset = ReporteREM.objects.all()
+    serializer_class = ReporteREMSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        if self.action == 'create':
+            return 'report:generate_rem'
+        elif self.action in ['update', 'partial_update', 'destroy']:
+            return 'report:generate_rem'
+        return 'report:generate_rem'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(tags=['Reportes'], summary='Listar detalles de reportes REM'),
+    create=extend_schema(tags=['Reportes'], summary='Crear detalle de reporte REM'),
+    retrieve=extend_schema(tags=['Reportes'], summary='Obtener detalle de reporte REM'),
+    update=extend_schema(tags=['Reportes'], summary='Actualizar detalle de reporte REM'),
+    destroy=extend_schema(tags=['Reportes'], summary='Eliminar detalle de reporte REM'),
+)
+class ReporteREMDetalleViewSet(EscrituraAtomicaMixin, viewsets.ModelViewSet):
+    """ViewSet para detalles de reportes REM con permisos RBAC."""
+    queryset = ReporteREMDetalle.objects.all()
+    serializer_class = ReporteREMDetalleSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    
+    def get_required_permission(self):
+        return 'report:generate_rem'
+    
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Reportes'],
+        summary='Indicadores de parto (cubo)',
+        description=(
+            'Requiere: report:generate_rem. Partos, cesáreas, tasa de cesáreas, tamaño relativo y contribución '
+            'por período ("grano": mes, trimestre, anio o total) y por las dimensiones de "agrupar" (robson, '
+            'tipo_parto, profesional, separadas por coma). Se calcula sobre el cubo materializado, que se '
+            'refresca con manage.py refrescar_cubo_partos; "actualizado" indica el último refresco.'
+        ),
+        parameters=[
+            OpenApiParameter('grano', str, enum=list(GRANOS), description='Por defecto: mes'),
+            OpenApiParameter('agrupar', str, description='Dimensiones separadas por coma (ej: robson,profesional)'),
+            OpenApiParameter('desde', str, description='Mes inicial YYYY-MM, inclusivo'),
+            OpenApiParameter('hasta', str, description='Mes final YYYY-MM, inclusivo'),
+            OpenApiParameter('robson', str, description='Filtrar por grupo de Robson (1 a 10)'),
+            OpenApiParameter('tipo_parto', int, description='Filtrar por tipo de parto'),
+            OpenApiParameter('profesional', int, description='Filtrar por profesional responsable'),
+        ],
+        responses=IndicadoresPartosSerializer,
+    ),
+)
+class IndicadorPartoViewSet(viewsets.GenericViewSet):
+    """Consultas de corte y agregación sobre el cubo de indicadores de parto."""
+    serializer_class = IndicadoresPartosSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    pagination_class = None
+
+    def get_required_permission(self):
+        return 'report:generate_rem'
+
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+    def list(self, request):
+        params = request.query_params
+        grano = params.get('grano') or 'mes'
+        if grano not in GRANOS:
+            raise ValidationError({'grano': f'Debe ser uno de: {", ".join(GRANOS)}'})
+        agrupar = [d.strip() for d in params.get('agrupar', '').split(',') if d.strip()]
+        invalidas = sorted(set(agrupar) - set(DIMENSIONES))
+        if invalidas:
+            raise ValidationError({'agrupar': f'Dimensiones no válidas: {", ".join(invalidas)}'})
+        agrupar = list(dict.fromkeys(agrupar))
+
+        filtros = {}
+        for nombre in ('desde', 'hasta'):
+            if params.get(nombre):
+                filtros[nombre] = parsear_mes(nombre, params[nombre])
+        if params.get('robson'):
+            filtros['robson'] = params['robson'].strip()
+        for nombre in ('tipo_parto', 'profesional'):
+            valor = params.get(nombre)
+            if valor:
+                if not valor.isdigit():
+                    raise ValidationError({nombre: 'Debe ser un id numérico'})
+                filtros[nombre] = int(valor)
+
+        estado = EstadoCuboPartos.objects.filter(pk=1).values_list('ultima_actualizacion', flat=True).first()
+        return Response(IndicadoresPartosSerializer({
+            'grano': grano,
+            'agrupar': agrupar,
+            'actualizado': estado,
+            'resultados': consultar_cubo(grano, agrupar, **filtros),
+        }).data)
@@ -0,0 +1,171 @@
+"""
+ViewSets de sincronización incremental para tablets sin conexión y del
+feed de eventos (outbox) para integraciones.
+"""
+from django.apps import apps
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+
+from core.rbac_utils import RBACPermission
+from api.sync import LIMITE_MAXIMO, LIMITE_POR_DEFECTO, TokenPurgado, aplicar_cambios, leer_cambios
+from sync.cambios import estado_contador
+from sync.models import EventoCambio, OffsetConsumidor
+from sync.outbox import MODELOS_CON_EVENTOS, confirmar_offset, leer_eventos, offset_de
+from sync.serializers import (
+    ConfirmacionOffsetSerializer, LoteCambiosSerializer, OffsetConsumidorSerializer, PaginaCambiosSerializer,
+    PaginaEventosSerializer, ResultadoLoteSerializer,
+)
+
+
+def parsear_entero(nombre, valor, defecto, maximo=None):
+    if valor in (None, ''):
+        return defecto
+    if not valor.isdigit():
+        raise ValidationError({nombre: 'Debe ser un entero no negativo'})
+    return min(int(valor), maximo) if maximo else int(valor)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Sincronización'],
+        summary='Cambios desde un token',
+        description=(
+            'Registros de maternidad y neonatología creados, modificados o eliminados (lápidas) después de '
+            '"token", en orden de secuencia. Enviar el token de la respuesta en la siguiente llamada mientras '
+            'hay_mas sea true. token=0 es la carga inicial. Solo incluye los recursos que el rol puede leer. '
+            'Responde 410 si el token es anterior a lápidas ya purgadas: el cliente debe volver a token=0.'
+        ),
+        parameters=[
+            OpenApiParameter('token', int, description='Última secuencia recibida (0: carga inicial)'),
+            OpenApiParameter('limite', int, description=f'Cambios por página (máx. {LIMITE_MAXIMO})'),
+        ],
+        responses=PaginaCambiosSerializer,
+    ),
+    create=extend_schema(
+        tags=['Sincronización'],
+        summary='Aplicar cambios hechos sin conexión',
+        description=(
+            'Aplica en orden un lote de creaciones, actualizaciones y eliminaciones. Cada cambio exige el mismo '
+            'permiso que su endpoint REST y se aplica en su propia transacción. Actualizar o eliminar requiere '
+            '"base", la secuencia del registro que vio el cliente: si el servidor tiene una posterior, responde '
+            '"conflicto" con la versión del servidor y no aplica el cambio.'
+        ),
+        request=LoteCambiosSerializer,
+        responses=ResultadoLoteSerializer,
+    ),
+)
+class SincronizacionViewSet(viewsets.GenericViewSet):
+    """Sincronización por deltas: lectura por token de cambios y escritura por lotes."""
+    serializer_class = LoteCambiosSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def list(self, request):
+        token = parsear_entero('token', request.query_params.get('token'), 0)
+        limite = parsear_entero('limite', request.query_params.get('limite'), LIMITE_POR_DEFECTO, LIMITE_MAXIMO)
+        try:
+            pagina = leer_cambios(request, token, max(1, limite))
+        except TokenPurgado:
+            return Response(
+                {'detail': 'El token es anterior a registros eliminados ya purgados. Sincronice desde token=0.'},
+                status=status.HTTP_410_GONE,
+            )
+        return Response(PaginaCambiosSerializer(pagina).data)
+
+    def create(self, request):
+        serializer = LoteCambiosSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(ResultadoLoteSerializer(aplicar_cambios(request, serializer.validated_data['cambios'])).data)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=['Sincronización'],
+        summary='Feed de eventos de cambio',
+        description=(
+            'Requiere: report:export_data. Eventos de alta, modificación y borrado de maternidad, neonatología '
+            'y alertas posteriores a "desde", en orden de secuencia. Con "consumidor" y sin "desde" continúa '
+            'desde su último offset confirmado. Tras procesar la página, confirmar "siguiente" en '
+            '/confirmar/ y volver a llamar mientras hay_mas sea true.'
+        ),
+        parameters=[
+            OpenApiParameter('consumidor', str, description='Nombre del consumidor (usa su offset)'),
+            OpenApiParameter('desde', int, description='Última secuencia procesada (tiene prioridad sobre el offset)'),
+            OpenApiParameter('limite', int, description=f'Eventos por página (máx. {LIMITE_MAXIMO})'),
+            OpenApiParameter('modelos', str, description='Etiquetas de modelo separadas por coma, ej. maternity.parto'),
+        ],
+        responses=PaginaEventosSerializer,
+    ),
+    confirmar=extend_schema(
+        tags=['Sincronización'],
+        summary='Confirmar offset de un consumidor',
+        description='Requiere: report:export_data. El offset nunca retrocede.',
+        request=ConfirmacionOffsetSerializer,
+        responses=OffsetConsumidorSerializer,
+    ),
+    consumidores=extend_schema(
+        tags=['Sincronización'],
+        summary='Offsets de los consumidores',
+        description='Requiere: report:export_data. Offset y eventos pendientes de cada consumidor registrado.',
+        responses=OffsetConsumidorSerializer(many=True),
+    ),
+)
+class FeedEventosViewSet(viewsets.GenericViewSet):
+    """Feed de eventos de la outbox con offsets por consumidor."""
+    serializer_class = PaginaEventosSerializer
+    permission_classes = [IsAuthenticated, RBACPermission]
+    pagination_class = None
+
+    def get_required_permission(self):
+        return 'report:export_data'
+
+    def check_permissions(self, request):
+        self.required_permission = self.get_required_permission()
+        super().check_permissions(request)
+
+    def list(self, request):
+        params = request.query_params
+        consumidor = params.get('consumidor')
+        desde = parsear_entero('desde', params.get('desde'), None)
+        if desde is None:
+            desde = offset_de(consumidor) if consumidor else 0
+        limite = parsear_entero('limite', params.get('limite'), LIMITE_POR_DEFECTO, LIMITE_MAXIMO)
+
+        modelos = None
+        if params.get('modelos'):
+            disponibles = {apps.get_model(etiqueta)._meta.label_lower for etiqueta in MODELOS_CON_EVENTOS}
+            modelos = [m.strip().lower() for m in params['modelos'].split(',') if m.strip()]
+            desconocidos = set(modelos) - disponibles
+            if desconocidos:
+                raise ValidationError({'modelos': f'Desconocidos: {", ".join(sorted(desconocidos))}'})
+        return Response(PaginaEventosSerializer(leer_eventos(desde, max(1, limite), modelos)).data)
+
+    @action(detail=False, methods=['post'])
+    def confirmar(self, request):
+        serializer = ConfirmacionOffsetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        consumidor, secuencia = serializer.validated_data['consumidor'], serializer.validated_data['secuencia']
+        ultima, _ = estado_contador()
+        if secuencia > ultima:
+            raise ValidationError({'secuencia': f'Posterior a la última secuencia asignada ({ultima})'})
+        return Response(OffsetConsumidorSerializer(self._estado(confirmar_offset(consumidor, secuencia))).data)
+
+    @action(detail=False, methods=['get'])
+    def consumidores(self, request):
+        return Response(OffsetConsumidorSerializer(
+            [self._estado(offset) for offset in OffsetConsumidor.objects.order_by('consumidor')], many=True,
+        ).data)
+
+    @staticmethod
+    def _estado(offset):
+        return {
+            'consumidor': offset.consumidor,
+            'ultima_secuencia': offset.ultima_secuencia,
+            'pendientes': EventoCambio.objects.filter(secuencia__gt=offset.ultima_secuencia).count(),
+            'fecha_actualizacion': offset.fecha_actualizacion,
+        }
@@ -0,0 +1,61 @@
+import csv
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from catalogs.semillas import filas_catalogos
+from core.seeding import Semilla, resumen, sembrar
+
+
+def leer_csv(ruta):
+    """Filas de un CSV con encabezado (las columnas son los campos del catálogo)."""
+    try:
+        with open(ruta, newline='', encoding='utf-8-sig') as f:
+            return [{c.strip(): v.strip() for c, v in fila.items() if c} for fila in csv.DictReader(f)]
+    except OSError as e:
+        raise CommandError(f'No se pudo leer {ruta}: {e}')
+
+
+class Command(BaseCommand):
+    help = (
+        'Carga los catálogos base (nacionalidades, pueblos originarios, tipos de parto, complicaciones y '
+        'grupos de Robson). Es idempotente y solo escribe las diferencias: puede ejecutarse en cada despliegue. '
+        'Las filas que ya no están en la definición se conservan, porque los registros clínicos las referencian.'
+    )
+    # Solo escribe datos: no necesita los system checks (ver load_rbac_system)
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('catalogos', nargs='*', help='Catálogos a cargar (por defecto todos)')
+        parser.add_argument('--csv', action='append', default=[], metavar='CATALOGO=ARCHIVO',
+                            help='Reemplaza el contenido de un catálogo por las filas de un CSV con encabezado')
+        parser.add_argument('--simular', action='store_true', help='Muestra las diferencias sin escribir')
+
+    def handle(self, *args, **options):
+        catalogos = filas_catalogos()
+        desconocidos = set(options['catalogos']) - set(catalogos)
+        if desconocidos:
+            raise CommandError(f"Catálogo desconocido: {', '.join(sorted(desconocidos))}. "
+                               f"Disponibles: {', '.join(catalogos)}")
+
+        for opcion in options['csv']:
+            nombre, separador, ruta = opcion.partition('=')
+            if not separador or nombre not in catalogos:
+                raise CommandError(f'--csv espera CATALOGO=ARCHIVO con un catálogo de: {", ".join(catalogos)}')
+            modelo, clave, _ = catalogos[nombre]
+            catalogos[nombre] = (modelo, clave, leer_csv(ruta))
+
+        seleccion = options['catalogos'] or list(catalogos)
+        try:
+            semillas = [Semilla(*catalogos[nombre]) for nombre in seleccion]
+        except FieldDoesNotExist as e:
+            raise CommandError(f'Columna desconocida: {e}')
+        except (ValidationError, KeyError) as e:
+            raise CommandError(f'Fila inválida: {e}')
+
+        for resultado in sembrar(*semillas, aplicar=not options['simular']):
+            self.stdout.write(resumen(resultado))
+        if options['simular']:
+            self.stdout.write('Simulación: no se escribió nada')
+        else:
+            self.stdout.write(self.style.SUCCESS('✓ Catálogos cargados'))
@@ -0,0 +1,50 @@
+"""
+Contenido base de los catálogos, cargado por ``cargar_catalogos``.
+
+Cada catálogo se identifica por su clave natural (``nombre``, o ``grupo`` en
+Robson). Las listas oficiales completas (ej. todas las nacionalidades) se
+cargan desde un CSV con ``cargar_catalogos --csv nacionalidades=archivo.csv``,
+que reemplaza la lista de este módulo para ese catálogo.
+"""
+from .models import CatComplicacionParto, CatNacionalidad, CatPuebloOriginario, CatRobson, CatTipoParto
+
+NACIONALIDADES = [
+    'Chilena', 'Argentina', 'Boliviana', 'Brasileña', 'Colombiana', 'Cubana', 'Dominicana', 'Ecuatoriana',
+    'Haitiana', 'Mexicana', 'Paraguaya', 'Peruana', 'Uruguaya', 'Venezolana', 'Costarricense', 'Guatemalteca',
+    'Hondureña', 'Nicaragüense', 'Panameña', 'Salvadoreña', 'Puertorriqueña', 'Estadounidense', 'Canadiense',
+    'Española', 'Italiana', 'Francesa', 'Alemana', 'Portuguesa', 'Británica', 'Rusa', 'Ucraniana', 'China',
+    'Japonesa', 'Coreana', 'India', 'Filipina', 'Pakistaní', 'Siria', 'Palestina', 'Libanesa', 'Senegalesa',
+    'Nigeriana', 'Otra', 'Sin información',
+]
+
+# Pueblos reconocidos por la Ley Indígena 19.253 y sus modificaciones
+PUEBLOS_ORIGINARIOS = [
+    'Mapuche', 'Aymara', 'Rapa Nui', 'Atacameño', 'Quechua', 'Colla', 'Diaguita', 'Kawésqar', 'Yagán', 'Chango',
+]
+
+TIPOS_PARTO = ['Vaginal', 'Cesárea', 'Instrumental']
+
+COMPLICACIONES_PARTO = [
+    'Hemorragia postparto', 'Preeclampsia', 'Eclampsia', 'Síndrome HELLP', 'Desgarro perineal grado III-IV',
+    'Retención placentaria', 'Distocia de hombros', 'Infección puerperal', 'Rotura uterina', 'Inercia uterina',
+    'Desprendimiento prematuro de placenta', 'Prolapso de cordón',
+]
+
+
+def _nombres(nombres):
+    return ({'nombre': nombre} for nombre in nombres)
+
+
+def filas_catalogos():
+    """{nombre del catálogo: (modelo, clave, filas)} con el contenido de este módulo."""
+    from maternity.robson import GRUPOS_ROBSON
+
+    return {
+        'nacionalidades': (CatNacionalidad, ['nombre'], _nombres(NACIONALIDADES)),
+        'pueblos_originarios': (CatPuebloOriginario, ['nombre'], _nombres(PUEBLOS_ORIGINARIOS)),
+        'tipos_parto': (CatTipoParto, ['nombre'], _nombres(TIPOS_PARTO)),
+        'complicaciones_parto': (CatComplicacionParto, ['nombre'], _nombres(COMPLICACIONES_PARTO)),
+        'robson': (CatRobson, ['grupo'], (
+            {'grupo': str(grupo), 'descripcion': descripcion} for grupo, descripcion in GRUPOS_ROBSON.items()
+        )),
+    }
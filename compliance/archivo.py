@@ -0,0 +1,415 @@
+"""
+Archivo frío de trazas de auditoría.
+
+Las trazas antiguas se exportan (``manage.py archivar_trazas``) a segmentos
+en ``settings.AUDITORIA_ARCHIVO_DIR``. Cada segmento son dos archivos:
+
+- ``trazas_<id_min>_<id_max>.bloques``: bloques comprimidos con zlib, uno
+  tras otro. Cada bloque guarda hasta ``TAMANO_BLOQUE`` trazas en formato
+  columnar (un arreglo JSON por columna), ordenadas por ``fecha_hora``; las
+  columnas repetitivas (tabla, acción, user agent) comprimen mucho mejor así.
+- ``trazas_<id_min>_<id_max>.indice.json``: índice lateral con, por bloque,
+  su posición y largo en el archivo, su CRC32, los rangos de ``fecha_hora``,
+  ``id_traza`` y ``secuencia`` (cadena de hashes), y los ``fk_usuario`` y
+  ``tabla_afectada`` que contiene.
+
+La lectura (``ArchivoTrazas.filas``) consulta primero los índices y solo
+descomprime los bloques cuyo rango de fechas se cruza con el pedido y que
+contienen al usuario/tabla buscados; el archivo de bloques se lee con
+``mmap``, de modo que solo se traen a memoria las páginas de esos bloques.
+"Todas las acciones del usuario X en marzo de 2024" lee los pocos bloques de
+marzo donde aparece X, no el archivo completo. Las filas se entregan de la
+más reciente a la más antigua a medida que se descomprimen los bloques, así
+que una página del listado (``ConsultaArchivo``) solo lee los bloques que
+llegan hasta su última fila.
+
+Las fechas se guardan como microsegundos desde epoch (UTC). El nombre del
+usuario se guarda junto a la traza: el archivo conserva quién hizo la acción
+aunque el usuario se elimine después (``fk_usuario`` es ``SET_NULL``).
+"""
+import heapq
+import itertools
+import json
+import mmap
+import os
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+
+from core.models import Usuario
+from .models import TrazaMovimiento
+
+VERSION_FORMATO = 1
+
+TAMANO_BLOQUE = 1000
+
+COLUMNAS = (
+    'id_traza', 'fk_usuario', 'usuario_nombre', 'tipo_accion', 'tabla_afectada', 'id_registro',
+    'cambios_anteriores', 'cambios_nuevos', 'ip_address', 'user_agent', 'resultado', 'descripcion',
+    'fecha_hora', 'secuencia', 'hash_anterior', 'hash',
+)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def a_microsegundos(fecha):
+    return (fecha - EPOCH) // timedelta(microseconds=1)
+
+
+def desde_microsegundos(valor):
+    return EPOCH + timedelta(microseconds=valor)
+
+
+def directorio_archivo():
+    return Path(settings.AUDITORIA_ARCHIVO_DIR)
+
+
+class ArchivoCorrupto(Exception):
+    """Un bloque no coincide con el CRC32 registrado en el índice."""
+
+
+class EscritorSegmento:
+    """
+    Escribe un segmento bloque a bloque (la memoria usada es un bloque).
+
+    Las filas deben llegar ordenadas por ``fecha_hora``. Los archivos se
+    escriben con sufijo ``.tmp`` y se publican en ``cerrar()``: un lector
+    nunca ve un segmento a medio escribir.
+    """
+
+    def __init__(self, directorio, tamano_bloque=TAMANO_BLOQUE):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.tamano_bloque = tamano_bloque
+        self.ruta_tmp = self.directorio / f'.segmento-{os.getpid()}.tmp'
+        self.archivo = open(self.ruta_tmp, 'wb')
+        self.bloques = []
+        self.pendientes = []
+
+    def agregar(self, fila):
+        self.pendientes.append(fila)
+        if len(self.pendientes) >= self.tamano_bloque:
+            self._escribir_bloque()
+
+    def _escribir_bloque(self):
+        filas, self.pendientes = self.pendientes, []
+        columnas = {columna: [fila[columna] for fila in filas] for columna in COLUMNAS}
+        comprimido = zlib.compress(json.dumps(columnas, separators=(',', ':')).encode('utf-8'), 6)
+        self.bloques.append({
+            'offset': self.archivo.tell(),
+            'largo': len(comprimido),
+            'crc32': zlib.crc32(comprimido),
+            'filas': len(filas),
+            'fecha_min': columnas['fecha_hora'][0],
+            'fecha_max': columnas['fecha_hora'][-1],
+            'id_min': min(columnas['id_traza']),
+            'id_max': max(columnas['id_traza']),
+            'secuencia_min': min((s for s in columnas['secuencia'] if s is not None), default=None),
+            'secuencia_max': max((s for s in columnas['secuencia'] if s is not None), default=None),
+            'usuarios': sorted({u for u in columnas['fk_usuario'] if u is not None}),
+            'tablas': sorted(set(columnas['tabla_afectada'])),
+        })
+        self.archivo.write(comprimido)
+
+    def cerrar(self):
+        """
+        Publica el segmento y retorna la ruta del índice, o ``None`` si no se
+        agregó ninguna fila.
+        """
+        if self.pendientes:
+            self._escribir_bloque()
+        self.archivo.flush()
+        os.fsync(self.archivo.fileno())
+        self.archivo.close()
+        if not self.bloques:
+            self.ruta_tmp.unlink()
+            return None
+
+        id_min = min(b['id_min'] for b in self.bloques)
+        id_max = max(b['id_max'] for b in self.bloques)
+        base = self.directorio / f'trazas_{id_min:012d}_{id_max:012d}'
+        ruta_bloques = base.with_suffix('.bloques')
+        os.replace(self.ruta_tmp, ruta_bloques)
+
+        indice = {
+            'version': VERSION_FORMATO,
+            'compresion': 'zlib',
+            'columnas': list(COLUMNAS),
+            'archivo': ruta_bloques.name,
+            'filas': sum(b['filas'] for b in self.bloques),
+            'fecha_min': min(b['fecha_min'] for b in self.bloques),
+            'fecha_max': max(b['fecha_max'] for b in self.bloques),
+            'id_min': id_min,
+            'id_max': id_max,
+            'bloques': self.bloques,
+        }
+        ruta_indice = base.with_suffix('.indice.json')
+        ruta_tmp = ruta_indice.with_suffix('.tmp')
+        with open(ruta_tmp, 'w', encoding='utf-8') as archivo:
+            json.dump(indice, archivo)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        # El índice se publica al final: sin índice el segmento no existe
+        os.replace(ruta_tmp, ruta_indice)
+        return ruta_indice
+
+
+def fila_de_traza(traza, usuario_nombre):
+    return {
+        'id_traza': traza.id_traza,
+        'fk_usuario': traza.fk_usuario_id,
+        'usuario_nombre': usuario_nombre,
+        'tipo_accion': traza.tipo_accion,
+        'tabla_afectada': traza.tabla_afectada,
+        'id_registro': traza.id_registro,
+        'cambios_anteriores': traza.cambios_anteriores,
+        'cambios_nuevos': traza.cambios_nuevos,
+        'ip_address': traza.ip_address,
+        'user_agent': traza.user_agent,
+        'resultado': traza.resultado,
+        'descripcion': traza.descripcion,
+        'fecha_hora': a_microsegundos(traza.fecha_hora),
+        'secuencia': traza.secuencia,
+        'hash_anterior': traza.hash_anterior,
+        'hash': traza.hash,
+    }
+
+
+def traza_de_fila(fila):
+    """
+    ``TrazaMovimiento`` sin guardar con los datos de una fila archivada. El
+    usuario se asigna como instancia parcial para que el serializer obtenga
+    ``usuario_nombre`` sin consultar la base de datos.
+    """
+    datos = {c: fila.get(c) for c in COLUMNAS if c not in ('fk_usuario', 'usuario_nombre', 'fecha_hora')}
+    traza = TrazaMovimiento(**datos, fecha_hora=desde_microsegundos(fila['fecha_hora']))
+    if fila['fk_usuario'] is not None:
+        traza.fk_usuario = Usuario(pk=fila['fk_usuario'], nombre_completo=fila['usuario_nombre'])
+    return traza
+
+
+class Segmento:
+    """Un segmento del archivo: su índice y el archivo de bloques (vía mmap)."""
+
+    def __init__(self, ruta_indice):
+        with open(ruta_indice, encoding='utf-8') as archivo:
+            self.indice = json.load(archivo)
+        if self.indice['version'] != VERSION_FORMATO:
+            raise ArchivoCorrupto(f'{ruta_indice}: versión de formato {self.indice["version"]} no soportada')
+        self.ruta_bloques = Path(ruta_indice).parent / self.indice['archivo']
+
+    def bloques_candidatos(self, desde=None, hasta=None, fk_usuario=None, tabla_afectada=None, id_traza=None,
+                           secuencia=None):
+        """Bloques que pueden contener filas del filtro, según el índice."""
+        for bloque in self.indice['bloques']:
+            if desde is not None and bloque['fecha_max'] < desde:
+                continue
+            if hasta is not None and bloque['fecha_min'] >= hasta:
+                continue
+            if fk_usuario is not None and fk_usuario not in bloque['usuarios']:
+                continue
+            if tabla_afectada is not None and tabla_afectada not in bloque['tablas']:
+                continue
+            if id_traza is not None and not bloque['id_min'] <= id_traza <= bloque['id_max']:
+                continue
+            if secuencia is not None and (bloque.get('secuencia_min') is None
+                                          or not bloque['secuencia_min'] <= secuencia <= bloque['secuencia_max']):
+                continue
+            yield bloque
+
+    def leer_bloques(self, bloques):
+        """Filas (diccionarios) de los ``bloques`` indicados."""
+        bloques = list(bloques)
+        if not bloques:
+            return
+        with open(self.ruta_bloques, 'rb') as archivo, \
+                mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            for bloque in bloques:
+                datos = mapa[bloque['offset']:bloque['offset'] + bloque['largo']]
+                if zlib.crc32(datos) != bloque['crc32']:
+                    raise ArchivoCorrupto(f'{self.ruta_bloques}: bloque en {bloque["offset"]} no coincide con su CRC32')
+                columnas = json.loads(zlib.decompress(datos))
+                nombres = list(columnas)
+                for valores in zip(*columnas.values()):
+                    yield dict(zip(nombres, valores))
+
+
+class ArchivoTrazas:
+    """Lector del archivo de trazas (todos los segmentos de un directorio)."""
+
+    def __init__(self, directorio=None):
+        self.directorio = Path(directorio) if directorio is not None else directorio_archivo()
+        self.bloques_leidos = 0
+
+    def segmentos(self):
+        if not self.directorio.is_dir():
+            return []
+        return [Segmento(ruta) for ruta in sorted(self.directorio.glob('trazas_*.indice.json'))]
+
+    def id_maximo(self):
+        """Mayor ``id_traza`` archivado (0 si el archivo está vacío)."""
+        return max((s.indice['id_max'] for s in self.segmentos()), default=0)
+
+    def _bloques(self, desde_us, hasta_us, fk_usuario, tabla_afectada, id_traza, secuencia):
+        """Pares (segmento, bloque) candidatos de todos los segmentos."""
+        for segmento in self.segmentos():
+            indice = segmento.indice
+            if (desde_us is not None and indice['fecha_max'] < desde_us) or \
+                    (hasta_us is not None and indice['fecha_min'] >= hasta_us):
+                continue
+            for bloque in segmento.bloques_candidatos(
+                desde_us, hasta_us, fk_usuario, tabla_afectada, id_traza, secuencia,
+            ):
+                yield segmento, bloque
+
+    def filas(self, desde=None, hasta=None, fk_usuario=None, tabla_afectada=None, tipo_accion=None,
+              resultado=None, id_traza=None, secuencia=None):
+        """
+        Filas archivadas que cumplen el filtro, de la más reciente a la más
+        antigua, sin leerlas todas: los bloques se descomprimen en orden
+        descendente de ``fecha_max`` y una fila se entrega cuando ningún bloque
+        pendiente puede tener una más reciente. Quien deja de iterar (una
+        página) no descomprime el resto del archivo.
+        """
+        desde_us = a_microsegundos(desde) if desde is not None else None
+        hasta_us = a_microsegundos(hasta) if hasta is not None else None
+
+        def coincide(fila):
+            return (
+                (desde_us is None or fila['fecha_hora'] >= desde_us)
+                and (hasta_us is None or fila['fecha_hora'] < hasta_us)
+                and (fk_usuario is None or fila['fk_usuario'] == fk_usuario)
+                and (tabla_afectada is None or fila['tabla_afectada'] == tabla_afectada)
+                and (tipo_accion is None or fila['tipo_accion'] == tipo_accion)
+                and (resultado is None or fila['resultado'] == resultado)
+                and (id_traza is None or fila['id_traza'] == id_traza)
+                and (secuencia is None or fila.get('secuencia') == secuencia)
+            )
+
+        bloques = sorted(
+            self._bloques(desde_us, hasta_us, fk_usuario, tabla_afectada, id_traza, secuencia),
+            key=lambda par: par[1]['fecha_max'], reverse=True,
+        )
+        pendientes = []
+        siguiente = 0
+        orden = itertools.count()
+        while True:
+            while siguiente < len(bloques) and (
+                not pendientes or -pendientes[0][0] <= bloques[siguiente][1]['fecha_max']
+            ):
+                segmento, bloque = bloques[siguiente]
+                siguiente += 1
+                self.bloques_leidos += 1
+                for fila in segmento.leer_bloques([bloque]):
+                    if coincide(fila):
+                        heapq.heappush(pendientes, (-fila['fecha_hora'], -fila['id_traza'], next(orden), fila))
+            if not pendientes:
+                return
+            yield heapq.heappop(pendientes)[-1]
+
+    def contar(self, desde=None, hasta=None, fk_usuario=None, tabla_afectada=None, tipo_accion=None,
+               resultado=None, id_traza=None, secuencia=None):
+        """
+        Cantidad de filas de ``filas()`` con los mismos argumentos. Si solo se
+        filtra por fecha, los bloques completamente dentro del rango se cuentan
+        con el índice, sin descomprimirlos.
+        """
+        filtros = dict(fk_usuario=fk_usuario, tabla_afectada=tabla_afectada, tipo_accion=tipo_accion,
+                       resultado=resultado, id_traza=id_traza, secuencia=secuencia)
+        if any(valor is not None for valor in filtros.values()):
+            return sum(1 for _ in self.filas(desde, hasta, **filtros))
+        desde_us = a_microsegundos(desde) if desde is not None else None
+        hasta_us = a_microsegundos(hasta) if hasta is not None else None
+        total = 0
+        for segmento, bloque in self._bloques(desde_us, hasta_us, None, None, None, None):
+            if (desde_us is None or bloque['fecha_min'] >= desde_us) and \
+                    (hasta_us is None or bloque['fecha_max'] < hasta_us):
+                total += bloque['filas']
+                continue
+            self.bloques_leidos += 1
+            total += sum(
+                1 for fila in segmento.leer_bloques([bloque])
+                if (desde_us is None or fila['fecha_hora'] >= desde_us)
+                and (hasta_us is None or fila['fecha_hora'] < hasta_us)
+            )
+        return total
+
+    def buscar(self, **filtros):
+        """
+        Trazas archivadas que cumplen el filtro, de la más reciente a la más
+        antigua. ``desde`` es inclusivo y ``hasta`` exclusivo (``datetime``).
+
+        Returns:
+            list de ``TrazaMovimiento`` sin guardar
+        """
+        return [traza_de_fila(fila) for fila in self.filas(**filtros)]
+
+
+class ConsultaArchivo:
+    """
+    Resultado perezoso de una búsqueda en el archivo, paginable: ``count()``
+    usa ``ArchivoTrazas.contar`` y un slice solo lee las filas hasta su fin.
+    """
+
+    def __init__(self, filtros, archivo=None):
+        self.filtros = filtros
+        self.archivo = archivo or ArchivoTrazas()
+        self._total = None
+
+    def count(self):
+        if self._total is None:
+            self._total = self.archivo.contar(**self.filtros)
+        return self._total
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return (traza_de_fila(fila) for fila in self.archivo.filas(**self.filtros))
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return list(self[item:item + 1])[0]
+        inicio, fin, _ = item.indices(self.count())
+        if fin <= inicio:
+            return []
+        return [traza_de_fila(fila) for fila in itertools.islice(self.archivo.filas(**self.filtros), inicio, fin)]
+
+
+class ResultadoConArchivo:
+    """
+    Secuencia paginable: primero el queryset vivo, luego las trazas
+    archivadas (más antiguas). ``Paginator`` usa ``count()`` y slices, de modo
+    que del queryset solo se lee la página pedida.
+    """
+
+    def __init__(self, queryset, archivadas):
+        self.queryset = queryset
+        self.archivadas = archivadas
+        self._total_vivo = None
+
+    @property
+    def total_vivo(self):
+        if self._total_vivo is None:
+            self._total_vivo = self.queryset.count()
+        return self._total_vivo
+
+    def count(self):
+        return self.total_vivo + len(self.archivadas)
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        yield from self.queryset
+        yield from self.archivadas
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return list(self[item:item + 1])[0]
+        inicio, fin, _ = item.indices(self.count())
+        vivo = list(self.queryset[inicio:fin]) if inicio < self.total_vivo else []
+        archivo = self.archivadas[max(inicio - self.total_vivo, 0):max(fin - self.total_vivo, 0)]
+        return vivo + archivo
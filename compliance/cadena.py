@@ -0,0 +1,140 @@
+"""
+Cadena de hashes de las trazas de auditoría.
+
+Cada ``TrazaMovimiento`` lleva un número de ``secuencia`` correlativo, el
+``hash_anterior`` de la traza previa y su propio ``hash``:
+
+    hash = SHA-256(JSON canónico de los campos de la traza + hash_anterior)
+
+Modificar o borrar una traza en la base de datos rompe la cadena desde ese
+punto, y ``manage.py verificar_trazas`` lo detecta.
+
+La cabeza de la cadena (última secuencia y último hash) vive en una fila de
+``CadenaTrazas`` que se bloquea (``SELECT ... FOR UPDATE``) mientras se
+insertan las trazas, de modo que escritores concurrentes no bifurcan la
+cadena. Un lote (``TrazaMovimiento.objects.bulk_create``) toma el bloqueo una
+sola vez para todas sus trazas.
+
+La verificación es incremental: ``PuntoVerificacionTrazas`` guarda la última
+secuencia verificada y su hash, y la siguiente corrida solo recorre las
+trazas posteriores, en lotes por rango de ``secuencia``. Las trazas más
+antiguas pueden haberse movido al archivo (``archivar_trazas --eliminar``):
+si la primera traza de la tabla no continúa al punto de verificación, se
+busca su antecesora en el archivo.
+"""
+import hashlib
+import json
+from collections import namedtuple
+from datetime import timezone as dt_timezone
+
+from django.db import transaction
+
+# hash_anterior de la primera traza de la cadena
+HASH_GENESIS = ''
+
+TAMANO_LOTE_VERIFICACION = 5000
+
+
+# Campos de la traza que entran al hash (además de fecha_hora y hash_anterior)
+CAMPOS_HASH = (
+    'secuencia', 'fk_usuario', 'tipo_accion', 'tabla_afectada', 'id_registro', 'cambios_anteriores',
+    'cambios_nuevos', 'ip_address', 'user_agent', 'resultado', 'descripcion',
+)
+
+
+def _valor_normalizado(traza, nombre):
+    """
+    Valor del campo como queda al guardarlo y volver a leerlo (``to_python``
+    del campo del modelo): ``id_registro='7'`` se guarda como 7, y el hash
+    calculado antes de insertar debe coincidir con el de la verificación.
+    """
+    campo = traza._meta.get_field(nombre)
+    return campo.to_python(getattr(traza, campo.attname))
+
+
+def calcular_hash(traza, hash_anterior):
+    """SHA-256 (hex) de la traza encadenada a ``hash_anterior``."""
+    contenido = {nombre: _valor_normalizado(traza, nombre) for nombre in CAMPOS_HASH}
+    # GenericIPAddressField guarda NULL en lugar de ''
+    contenido['ip_address'] = contenido['ip_address'] or None
+    contenido['fecha_hora'] = traza.fecha_hora.astimezone(dt_timezone.utc).isoformat(timespec='microseconds')
+    contenido['hash_anterior'] = hash_anterior
+    canonico = json.dumps(contenido, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+
+def encadenar(trazas, guardar):
+    """
+    Asigna ``secuencia``, ``hash_anterior`` y ``hash`` a ``trazas`` (sin
+    guardar, en orden) y llama a ``guardar(trazas)`` dentro de la misma
+    transacción que avanza la cabeza de la cadena.
+    """
+    from .models import CadenaTrazas
+
+    with transaction.atomic():
+        cabeza, _ = CadenaTrazas.objects.select_for_update().get_or_create(pk=1)
+        secuencia, hash_anterior = cabeza.ultima_secuencia, cabeza.ultimo_hash
+        for traza in trazas:
+            secuencia += 1
+            traza.secuencia = secuencia
+            traza.hash_anterior = hash_anterior
+            traza.hash = hash_anterior = calcular_hash(traza, hash_anterior)
+        resultado = guardar(trazas)
+        CadenaTrazas.objects.filter(pk=1).update(ultima_secuencia=secuencia, ultimo_hash=hash_anterior)
+    return resultado
+
+
+ErrorCadena = namedtuple('ErrorCadena', ['secuencia', 'id_traza', 'motivo'])
+
+ResultadoVerificacion = namedtuple('ResultadoVerificacion', ['verificadas', 'secuencia', 'hash', 'error'])
+
+
+def _antecesora_archivada(secuencia):
+    """Hash de la traza ``secuencia`` en el archivo, o ``None`` si no está."""
+    from .archivo import ArchivoTrazas
+
+    archivadas = ArchivoTrazas().buscar(secuencia=secuencia)
+    return archivadas[0].hash if archivadas else None
+
+
+def verificar_cadena(secuencia=0, hash_esperado=HASH_GENESIS, tamano_lote=TAMANO_LOTE_VERIFICACION):
+    """
+    Verifica las trazas con secuencia mayor a ``secuencia``, cuyo hash
+    verificado es ``hash_esperado``. Lee por lotes de ``tamano_lote`` con
+    rangos de ``secuencia`` (índice único), sin cargar la tabla en memoria.
+
+    Returns:
+        ResultadoVerificacion con la cantidad verificada, la última secuencia
+        y hash válidos, y el primer error encontrado (o ``None``)
+    """
+    from .models import TrazaMovimiento
+
+    verificadas = 0
+    primera = True
+    while True:
+        lote = list(
+            TrazaMovimiento.objects.filter(secuencia__gt=secuencia).order_by('secuencia')[:tamano_lote]
+        )
+        if not lote:
+            return ResultadoVerificacion(verificadas, secuencia, hash_esperado, None)
+        for traza in lote:
+            if traza.secuencia != secuencia + 1:
+                # Solo se aceptan huecos al inicio, si las trazas faltantes están archivadas
+                anterior = _antecesora_archivada(traza.secuencia - 1) if primera else None
+                if anterior is None:
+                    return ResultadoVerificacion(verificadas, secuencia, hash_esperado, ErrorCadena(
+                        traza.secuencia, traza.id_traza,
+                        f'faltan las trazas {secuencia + 1} a {traza.secuencia - 1}',
+                    ))
+                hash_esperado = anterior
+            primera = False
+            if traza.hash_anterior != hash_esperado:
+                return ResultadoVerificacion(verificadas, secuencia, hash_esperado, ErrorCadena(
+                    traza.secuencia, traza.id_traza, 'hash_anterior no coincide con la traza previa',
+                ))
+            if calcular_hash(traza, traza.hash_anterior) != traza.hash:
+                return ResultadoVerificacion(verificadas, secuencia, hash_esperado, ErrorCadena(
+                    traza.secuencia, traza.id_traza, 'el contenido no coincide con su hash (traza modificada)',
+                ))
+            secuencia, hash_esperado = traza.secuencia, traza.hash
+            verificadas += 1
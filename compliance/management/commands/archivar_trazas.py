@@ -0,0 +1,65 @@
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from compliance.archivo import ArchivoTrazas, EscritorSegmento, TAMANO_BLOQUE, directorio_archivo, fila_de_traza
+from compliance.models import TrazaMovimiento
+
+
+class Command(BaseCommand):
+    help = (
+        'Exporta las trazas de auditoría anteriores a una fecha al archivo frío comprimido '
+        '(settings.AUDITORIA_ARCHIVO_DIR) y, con --eliminar, las borra de la tabla. Las trazas ya '
+        'archivadas no se vuelven a exportar. La API de trazas las sigue mostrando desde el archivo.'
+    )
+
+    def add_arguments(self, parser):
+        corte = parser.add_mutually_exclusive_group(required=True)
+        corte.add_argument('--antes-de', help='Fecha de corte (YYYY-MM-DD, exclusiva)')
+        corte.add_argument('--dias', type=int, help='Archiva las trazas con más de N días')
+        parser.add_argument('--eliminar', action='store_true', help='Borra de la tabla las trazas archivadas')
+        parser.add_argument('--tamano-bloque', type=int, default=TAMANO_BLOQUE, help='Trazas por bloque comprimido')
+
+    def handle(self, *args, **options):
+        if options['antes_de']:
+            fecha = parse_date(options['antes_de'])
+            if fecha is None:
+                raise CommandError('--antes-de debe tener formato YYYY-MM-DD')
+            corte = timezone.make_aware(datetime.combine(fecha, time.min))
+        else:
+            corte = timezone.now() - timedelta(days=options['dias'])
+
+        directorio = directorio_archivo()
+        trazas = (
+            TrazaMovimiento.objects
+            .filter(fecha_hora__lt=corte, id_traza__gt=ArchivoTrazas(directorio).id_maximo())
+            .select_related('fk_usuario')
+            .order_by('fecha_hora', 'id_traza')
+        )
+        escritor = EscritorSegmento(directorio, tamano_bloque=max(1, options['tamano_bloque']))
+        for traza in trazas.iterator(chunk_size=2000):
+            nombre = traza.fk_usuario.nombre_completo if traza.fk_usuario_id else None
+            escritor.agregar(fila_de_traza(traza, nombre))
+        ruta_indice = escritor.cerrar()
+        if ruta_indice is None:
+            self.stdout.write('No hay trazas nuevas que archivar')
+            return
+
+        indice = escritor.bloques
+        filas = sum(b['filas'] for b in indice)
+        bytes_archivo = sum(b['largo'] for b in indice)
+        self.stdout.write(self.style.SUCCESS(
+            f'{filas} trazas archivadas en {len(indice)} bloques ({bytes_archivo:,} bytes): {ruta_indice.name}'
+        ))
+
+        if options['eliminar']:
+            with transaction.atomic():
+                eliminadas, _ = TrazaMovimiento.objects.filter(
+                    fecha_hora__lt=corte,
+                    id_traza__gte=min(b['id_min'] for b in indice),
+                    id_traza__lte=max(b['id_max'] for b in indice),
+                ).delete()
+            self.stdout.write(f'{eliminadas} trazas eliminadas de la tabla')
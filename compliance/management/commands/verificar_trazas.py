@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from compliance.cadena import HASH_GENESIS, TAMANO_LOTE_VERIFICACION, verificar_cadena
+from compliance.models import TrazaMovimiento, PuntoVerificacionTrazas
+
+
+class Command(BaseCommand):
+    help = (
+        'Verifica la cadena de hashes de las trazas de auditoría desde el último punto de verificación '
+        '(o desde el inicio con --completo) y registra un nuevo punto. Termina con error si encuentra '
+        'una traza modificada o faltante.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--completo', action='store_true', help='Verifica desde la primera traza')
+        parser.add_argument('--tamano-lote', type=int, default=TAMANO_LOTE_VERIFICACION,
+                            help='Trazas leídas por consulta')
+
+    def handle(self, *args, **options):
+        punto = None if options['completo'] else PuntoVerificacionTrazas.objects.first()
+        secuencia, hash_esperado = (punto.secuencia, punto.hash) if punto else (0, HASH_GENESIS)
+        if punto:
+            # La traza del punto de verificación tampoco puede haber cambiado (si sigue en la tabla)
+            hash_actual = TrazaMovimiento.objects.filter(secuencia=punto.secuencia).values_list('hash', flat=True).first()
+            if hash_actual is not None and hash_actual != punto.hash:
+                raise CommandError(f'La traza {punto.secuencia} cambió desde la última verificación')
+            self.stdout.write(f'Verificando desde la secuencia {punto.secuencia} ({punto.fecha_verificacion:%Y-%m-%d %H:%M})')
+
+        inicio = time.perf_counter()
+        resultado = verificar_cadena(secuencia, hash_esperado, tamano_lote=max(1, options['tamano_lote']))
+        segundos = time.perf_counter() - inicio
+
+        if resultado.verificadas:
+            PuntoVerificacionTrazas.objects.create(
+                secuencia=resultado.secuencia, hash=resultado.hash, trazas_verificadas=resultado.verificadas,
+            )
+        self.stdout.write(
+            f'{resultado.verificadas} trazas verificadas en {segundos:.1f} s (hasta la secuencia {resultado.secuencia})'
+        )
+        if resultado.error:
+            error = resultado.error
+            raise CommandError(f'Cadena rota en la secuencia {error.secuencia} (traza {error.id_traza}): {error.motivo}')
+        self.stdout.write(self.style.SUCCESS('Cadena de auditoría íntegra'))
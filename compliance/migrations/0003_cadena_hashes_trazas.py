@@ -0,0 +1,85 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def encadenar_existentes(apps, schema_editor):
+    """Encadena las trazas ya registradas, en orden de id, y deja la cabeza al final."""
+    from compliance.cadena import HASH_GENESIS, calcular_hash
+
+    TrazaMovimiento = apps.get_model('compliance', 'TrazaMovimiento')
+    CadenaTrazas = apps.get_model('compliance', 'CadenaTrazas')
+    secuencia, hash_anterior = 0, HASH_GENESIS
+    lote = []
+    for traza in TrazaMovimiento.objects.order_by('id_traza').iterator(chunk_size=2000):
+        secuencia += 1
+        traza.secuencia = secuencia
+        traza.hash_anterior = hash_anterior
+        traza.hash = hash_anterior = calcular_hash(traza, hash_anterior)
+        lote.append(traza)
+        if len(lote) >= 2000:
+            TrazaMovimiento.objects.bulk_update(lote, ['secuencia', 'hash_anterior', 'hash'])
+            lote = []
+    if lote:
+        TrazaMovimiento.objects.bulk_update(lote, ['secuencia', 'hash_anterior', 'hash'])
+    CadenaTrazas.objects.update_or_create(pk=1, defaults={'ultima_secuencia': secuencia, 'ultimo_hash': hash_anterior})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CadenaTrazas',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ultima_secuencia', models.BigIntegerField(default=0)),
+                ('ultimo_hash', models.CharField(blank=True, default='', max_length=64)),
+            ],
+            options={
+                'verbose_name': 'Cabeza de Cadena de Auditoría',
+                'db_table': 'traza_cadena',
+            },
+        ),
+        migrations.CreateModel(
+            name='PuntoVerificacionTrazas',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('secuencia', models.BigIntegerField()),
+                ('hash', models.CharField(blank=True, max_length=64)),
+                ('trazas_verificadas', models.BigIntegerField(default=0)),
+                ('fecha_verificacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Punto de Verificación de Auditoría',
+                'verbose_name_plural': 'Puntos de Verificación de Auditoría',
+                'db_table': 'traza_punto_verificacion',
+                'ordering': ['-secuencia'],
+            },
+        ),
+        migrations.AddField(
+            model_name='trazamovimiento',
+            name='hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='trazamovimiento',
+            name='hash_anterior',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='trazamovimiento',
+            name='secuencia',
+            field=models.BigIntegerField(editable=False, help_text='Posición en la cadena de auditoría', null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='trazamovimiento',
+            name='fecha_hora',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+        migrations.RunPython(encadenar_existentes, migrations.RunPython.noop),
+    ]
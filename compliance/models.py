@@ -1,5 +1,17 @@
 from django.db import models
+from django.utils import timezone
 from core.models import Usuario
+from .cadena import encadenar
+
+
+class TrazaMovimientoManager(models.Manager):
+    def bulk_create(self, objs, *args, **kwargs):
+        """Inserta un lote encadenado con un solo bloqueo de la cabeza de la cadena."""
+        objs = list(objs)
+        nuevas = [traza for traza in objs if traza.secuencia is None]
+        if not nuevas:
+            return super().bulk_create(objs, *args, **kwargs)
+        return encadenar(nuevas, lambda trazas: super(TrazaMovimientoManager, self).bulk_create(objs, *args, **kwargs))
 
 
 class TrazaMovimiento(models.Model):
@@ -29,7 +41,14 @@ class TrazaMovimiento(models.Model):
         default='SUCCESS'
     )
     descripcion = models.TextField(blank=True, help_text="Descripción adicional de la acción")
-    fecha_hora = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Se fija antes de insertar (no auto_now_add) porque forma parte del hash
+    fecha_hora = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
+    # Cadena de hashes (compliance/cadena.py)
+    secuencia = models.BigIntegerField(null=True, unique=True, editable=False, help_text="Posición en la cadena de auditoría")
+    hash_anterior = models.CharField(max_length=64, blank=True, default='', editable=False)
+    hash = models.CharField(max_length=64, blank=True, default='', editable=False)
+
+    objects = TrazaMovimientoManager()
     
     class Meta:
         db_table = 'traza_movimiento'
@@ -44,3 +63,40 @@ class TrazaMovimiento(models.Model):
 
     def __str__(self):
         return f"{self.get_tipo_accion_display()} - {self.tabla_afectada}({self.id_registro}) - {self.fk_usuario}"
+
+    def save(self, *args, **kwargs):
+        # Solo las trazas nuevas se encadenan: modificar una existente rompe su hash
+        if self._state.adding and self.secuencia is None:
+            encadenar([self], lambda trazas: super(TrazaMovimiento, self).save(*args, **kwargs))
+        else:
+            super().save(*args, **kwargs)
+
+
+class CadenaTrazas(models.Model):
+    """Cabeza de la cadena de hashes de auditoría (una sola fila, pk=1)."""
+    ultima_secuencia = models.BigIntegerField(default=0)
+    ultimo_hash = models.CharField(max_length=64, blank=True, default='')
+
+    class Meta:
+        db_table = 'traza_cadena'
+        verbose_name = 'Cabeza de Cadena de Auditoría'
+
+    def __str__(self):
+        return f"Cadena de auditoría en {self.ultima_secuencia}"
+
+
+class PuntoVerificacionTrazas(models.Model):
+    """Última traza verificada por ``verificar_trazas``; la siguiente corrida parte de aquí."""
+    secuencia = models.BigIntegerField()
+    hash = models.CharField(max_length=64, blank=True)
+    trazas_verificadas = models.BigIntegerField(default=0)
+    fecha_verificacion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'traza_punto_verificacion'
+        verbose_name = 'Punto de Verificación de Auditoría'
+        verbose_name_plural = 'Puntos de Verificación de Auditoría'
+        ordering = ['-secuencia']
+
+    def __str__(self):
+        return f"Verificado hasta {self.secuencia} ({self.fecha_verificacion:%Y-%m-%d %H:%M})"
@@ -8,4 +8,22 @@ class TrazaMovimientoSerializer(serializers.ModelSerializer):
     class Meta:
         model = TrazaMovimiento
         fields = '__all__'
-        read_only_fields = ['fecha_hora']
\ No newline at end of file
+        read_only_fields = ['fecha_hora']
+
+class AgregadoTrazaSerializer(serializers.Serializer):
+    """Un grupo de /trazas/agregados/. Solo se incluyen las dimensiones pedidas en "agrupar"."""
+    periodo = serializers.DateTimeField()
+    tipo_accion = serializers.CharField(required=False)
+    tabla_afectada = serializers.CharField(required=False)
+    resultado = serializers.CharField(required=False)
+    fk_usuario = serializers.IntegerField(required=False)
+    total = serializers.IntegerField()
+
+
+class AgregadosTrazasSerializer(serializers.Serializer):
+    desde = serializers.DateTimeField()
+    hasta = serializers.DateTimeField()
+    intervalo = serializers.CharField()
+    agrupar = serializers.ListField(child=serializers.CharField())
+    total = serializers.IntegerField()
+    resultados = AgregadoTrazaSerializer(many=True)
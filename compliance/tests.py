@@ -1,3 +1,313 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import date, datetime
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command, CommandError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Usuario, Rol, Permiso, RolPermiso
+from core.rbac_utils import registrar_auditoria
+from .archivo import ArchivoTrazas, ArchivoCorrupto, ConsultaArchivo
+from .cadena import calcular_hash
+from .models import TrazaMovimiento, PuntoVerificacionTrazas
+
+
+def crear_traza(usuario, fecha_hora, tabla='parto', tipo_accion='UPDATE'):
+    traza = TrazaMovimiento.objects.create(
+        fk_usuario=usuario, tipo_accion=tipo_accion, tabla_afectada=tabla, id_registro=1,
+        cambios_nuevos={'campo': 'valor'}, ip_address='10.0.0.1', user_agent='Mozilla/5.0',
+    )
+    # fecha_hora es auto_now_add: se retrocede con update()
+    TrazaMovimiento.objects.filter(pk=traza.pk).update(fecha_hora=fecha_hora)
+    return traza
+
+
+class ArchivoTrazasBase(TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio)
+        configuracion = override_settings(AUDITORIA_ARCHIVO_DIR=self.directorio)
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+
+        self.usuario_x = Usuario.objects.create_user(
+            run='15000000-9', email='x@hospital.com', password='x', nombre_completo='Usuaria X',
+        )
+        self.usuario_y = Usuario.objects.create_user(
+            run='16000000-7', email='y@hospital.com', password='x', nombre_completo='Usuario Y',
+        )
+        # Enero a junio de 2024: 10 trazas por mes, 2 de ellas de X en marzo
+        self.de_x_en_marzo = []
+        for mes in range(1, 7):
+            for i in range(10):
+                fecha = timezone.make_aware(datetime(2024, mes, 1 + i, 12))
+                usuario = self.usuario_x if mes == 3 and i < 2 else self.usuario_y
+                traza = crear_traza(usuario, fecha, tabla='parto' if i % 2 else 'recien_nacido')
+                if usuario == self.usuario_x:
+                    self.de_x_en_marzo.append(traza.pk)
+
+
+class ArchivoTrazasTestCase(ArchivoTrazasBase):
+    """Tests del formato de archivo y del comando archivar_trazas"""
+
+    def test_archivar_y_leer_solo_bloques_relevantes(self):
+        """La consulta por usuario y mes descomprime solo los bloques que pueden contenerlo"""
+        call_command('archivar_trazas', antes_de='2024-07-01', tamano_bloque=5, eliminar=True, stdout=StringIO())
+        self.assertEqual(TrazaMovimiento.objects.count(), 0)
+
+        archivo = ArchivoTrazas()
+        trazas = archivo.buscar(
+            desde=timezone.make_aware(datetime(2024, 3, 1)), hasta=timezone.make_aware(datetime(2024, 4, 1)),
+            fk_usuario=self.usuario_x.pk,
+        )
+        self.assertEqual(sorted(t.pk for t in trazas), sorted(self.de_x_en_marzo))
+        # 12 bloques de 5 trazas; X aparece en uno solo
+        self.assertEqual(archivo.bloques_leidos, 1)
+
+        traza = trazas[0]
+        self.assertEqual(traza.fk_usuario.nombre_completo, 'Usuaria X')
+        self.assertEqual(traza.cambios_nuevos, {'campo': 'valor'})
+        self.assertEqual(traza.fecha_hora, timezone.make_aware(datetime(2024, 3, 2, 12)))
+
+    def test_pagina_lee_solo_los_bloques_necesarios(self):
+        """Una página del archivo descomprime los bloques más recientes, no el archivo completo"""
+        call_command('archivar_trazas', antes_de='2024-07-01', tamano_bloque=5, eliminar=True, stdout=StringIO())
+        archivo = ArchivoTrazas()
+        consulta = ConsultaArchivo({'desde': timezone.make_aware(datetime(2024, 1, 1))}, archivo)
+
+        # Todos los bloques caen dentro del rango: el total sale del índice
+        self.assertEqual(consulta.count(), 60)
+        self.assertEqual(archivo.bloques_leidos, 0)
+
+        pagina = consulta[0:7]
+        self.assertEqual(archivo.bloques_leidos, 2)
+        self.assertEqual([t.fecha_hora.date() for t in pagina], [date(2024, 6, 10 - i) for i in range(7)])
+        self.assertEqual([t.pk for t in consulta[55:60]], [t.pk for t in archivo.buscar()][55:60])
+
+    def test_no_reexporta_lo_ya_archivado(self):
+        """Sin --eliminar, una segunda corrida no duplica trazas"""
+        call_command('archivar_trazas', antes_de='2024-04-01', stdout=StringIO())
+        call_command('archivar_trazas', antes_de='2024-07-01', stdout=StringIO())
+        archivo = ArchivoTrazas()
+        self.assertEqual(len(archivo.segmentos()), 2)
+        self.assertEqual(len(archivo.buscar()), 60)
+        self.assertEqual(TrazaMovimiento.objects.count(), 60)
+
+    def test_bloque_corrupto(self):
+        """Un bloque alterado se detecta por CRC32"""
+        call_command('archivar_trazas', antes_de='2024-07-01', stdout=StringIO())
+        segmento = ArchivoTrazas().segmentos()[0]
+        with open(segmento.ruta_bloques, 'r+b') as archivo:
+            archivo.seek(10)
+            archivo.write(b'\x00\x00\x00')
+        with self.assertRaises(ArchivoCorrupto):
+            ArchivoTrazas().buscar()
+
+
+class TrazasConArchivoApiTestCase(ArchivoTrazasBase, APITestCase):
+    """Tests de /api/compliance/trazas/ con el archivo como respaldo"""
+
+    def setUp(self):
+        super().setUp()
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+        rol = Rol.objects.create(nombre_rol='auditor')
+        permiso = Permiso.objects.create(codigo_permiso='compliance:audit:read', categoria='compliance')
+        RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        self.auditor = Usuario.objects.create_user(
+            run='17000000-5', email='auditor@hospital.com', password='x', nombre_completo='Auditora', fk_rol=rol,
+        )
+        # Enero a abril se archivan y se borran; mayo y junio quedan en la tabla
+        call_command('archivar_trazas', antes_de='2024-05-01', eliminar=True, stdout=StringIO())
+        self.client.force_authenticate(self.auditor)
+
+    def test_rango_archivado(self):
+        """Marzo de 2024 por usuario se responde desde el archivo"""
+        response = self.client.get('/api/compliance/trazas/', {
+            'desde': '2024-03-01', 'hasta': '2024-04-01', 'fk_usuario': self.usuario_x.pk,
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Auditoria-Archivo'], '1')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([t['id_traza'] for t in response.data['results']], sorted(self.de_x_en_marzo, reverse=True))
+        self.assertEqual(response.data['results'][0]['usuario_nombre'], 'Usuaria X')
+
+    def test_rango_archivado_por_resultado(self):
+        """?resultado= también filtra las trazas archivadas"""
+        response = self.client.get(
+            '/api/compliance/trazas/', {'desde': '2024-03-01', 'hasta': '2024-04-01', 'resultado': 'SUCCESS'},
+        )
+        self.assertEqual(response.data['count'], 10)
+        response = self.client.get(
+            '/api/compliance/trazas/', {'desde': '2024-03-01', 'hasta': '2024-04-01', 'resultado': 'FAILED'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 0)
+
+    def test_rango_mixto_pagina_tabla_y_archivo(self):
+        """Un rango que cruza el corte trae primero la tabla y luego el archivo"""
+        response = self.client.get('/api/compliance/trazas/', {'desde': '2024-04-01', 'page': 1})
+        self.assertEqual(response.data['count'], 30)
+        self.assertEqual(len(response.data['results']), 30)
+        fechas = [t['fecha_hora'] for t in response.data['results']]
+        self.assertEqual(fechas, sorted(fechas, reverse=True))
+
+    def test_rango_en_tabla_no_usa_archivo(self):
+        response = self.client.get('/api/compliance/trazas/', {'desde': '2024-05-01', 'tabla_afectada': 'parto'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Auditoria-Archivo', response)
+        self.assertEqual(response.data['count'], 10)
+
+    def test_detalle_archivado(self):
+        response = self.client.get(f'/api/compliance/trazas/{self.de_x_en_marzo[0]}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['usuario_nombre'], 'Usuaria X')
+        self.assertEqual(self.client.get('/api/compliance/trazas/999999/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_fecha_invalida(self):
+        response = self.client.get('/api/compliance/trazas/', {'desde': 'marzo'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class AgregadosTrazasApiTestCase(APITestCase):
+    """Tests de /api/compliance/trazas/agregados/"""
+
+    def setUp(self):
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+        rol = Rol.objects.create(nombre_rol='auditor')
+        permiso = Permiso.objects.create(codigo_permiso='compliance:audit:read', categoria='compliance')
+        RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        self.auditor = Usuario.objects.create_user(
+            run='17000000-5', email='auditor@hospital.com', password='x', nombre_completo='Auditora', fk_rol=rol,
+        )
+        self.usuario = Usuario.objects.create_user(
+            run='15000000-9', email='x@hospital.com', password='x', nombre_completo='Usuaria X',
+        )
+        # 3 denegaciones de la usuaria el 3 de marzo, 1 el 4, y un UPDATE del auditor
+        for dia, hora in ((3, 9), (3, 10), (3, 18), (4, 9)):
+            crear_traza(self.usuario, timezone.make_aware(datetime(2024, 3, dia, hora)), tipo_accion='PERMISSION_DENIED')
+        crear_traza(self.auditor, timezone.make_aware(datetime(2024, 3, 3, 12)))
+        crear_traza(self.usuario, timezone.make_aware(datetime(2024, 5, 1, 12)), tipo_accion='PERMISSION_DENIED')
+        self.client.force_authenticate(self.auditor)
+        self.url = '/api/compliance/trazas/agregados/'
+
+    def test_denegaciones_por_usuario_y_dia(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(self.url, {
+                'desde': '2024-03-01', 'hasta': '2024-04-01', 'tipo_accion': 'PERMISSION_DENIED',
+                'agrupar': 'fk_usuario', 'intervalo': 'day',
+            })
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['total'], 4)
+        self.assertEqual(
+            [(r['periodo'][:10], r['fk_usuario'], r['total']) for r in response.data['resultados']],
+            [('2024-03-03', self.usuario.pk, 3), ('2024-03-04', self.usuario.pk, 1)],
+        )
+        self.assertEqual(sum('GROUP BY' in q['sql'] for q in consultas), 1)
+
+    def test_por_mes_y_tipo(self):
+        response = self.client.get(self.url, {
+            'desde': '2024-01-01', 'hasta': '2024-12-31', 'intervalo': 'month', 'agrupar': 'tipo_accion',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        resultados = [(r['periodo'][:7], r['tipo_accion'], r['total']) for r in response.data['resultados']]
+        self.assertEqual(resultados, [
+            ('2024-03', 'PERMISSION_DENIED', 4), ('2024-03', 'UPDATE', 1), ('2024-05', 'PERMISSION_DENIED', 1),
+        ])
+        self.assertNotIn('fk_usuario', response.data['resultados'][0])
+
+    def test_rango_obligatorio_y_acotado(self):
+        response = self.client.get(self.url, {'desde': '2024-03-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('hasta', response.data)
+        response = self.client.get(self.url, {'desde': '2020-01-01', 'hasta': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'desde': '2024-03-01', 'hasta': '2024-04-01', 'agrupar': 'ip_address'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'desde': '2024-03-01', 'hasta': '2024-04-01', 'intervalo': 'year'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CadenaTrazasTestCase(TestCase):
+    """Tests de la cadena de hashes y del comando verificar_trazas"""
+
+    def setUp(self):
+        self.usuario = Usuario.objects.create_user(
+            run='15000000-9', email='x@hospital.com', password='x', nombre_completo='Usuaria X',
+        )
+
+    def registrar(self, cantidad):
+        for i in range(cantidad):
+            registrar_auditoria(self.usuario, 'UPDATE', 'parto', i, cambios_nuevos={'campo': i},
+                                ip_address='::ffff:10.0.0.1', user_agent='Mozilla/5.0')
+
+    def verificar(self, **opciones):
+        salida = StringIO()
+        call_command('verificar_trazas', stdout=salida, **opciones)
+        return salida.getvalue()
+
+    def test_trazas_encadenadas(self):
+        """Cada traza apunta al hash de la anterior, también en bulk_create"""
+        self.registrar(3)
+        TrazaMovimiento.objects.bulk_create([
+            TrazaMovimiento(fk_usuario=self.usuario, tipo_accion='READ', tabla_afectada='parto', id_registro=i)
+            for i in range(3)
+        ])
+        trazas = list(TrazaMovimiento.objects.order_by('secuencia'))
+        self.assertEqual([t.secuencia for t in trazas], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(trazas[0].hash_anterior, '')
+        for anterior, traza in zip(trazas, trazas[1:]):
+            self.assertEqual(traza.hash_anterior, anterior.hash)
+        self.assertIn('Cadena de auditoría íntegra', self.verificar())
+
+    def test_valores_coercionados_al_guardar(self):
+        """El hash usa el valor guardado: id_registro='7' se almacena como 7 y no es una alteración"""
+        registrar_auditoria(None, 'UPDATE', 'x', '7', user_agent='')
+        registrar_auditoria(self.usuario, 'UPDATE', 'x', 8, ip_address='', user_agent='')
+        self.assertEqual(TrazaMovimiento.objects.get(secuencia=1).id_registro, 7)
+        self.assertIn('Cadena de auditoría íntegra', self.verificar())
+
+    def test_verificacion_incremental(self):
+        """La segunda corrida solo recorre las trazas nuevas"""
+        self.registrar(5)
+        self.assertIn('5 trazas verificadas', self.verificar(tamano_lote=2))
+        self.registrar(2)
+        self.assertIn('2 trazas verificadas', self.verificar())
+        self.assertEqual(PuntoVerificacionTrazas.objects.first().secuencia, 7)
+        self.assertIn('7 trazas verificadas', self.verificar(completo=True))
+
+    def test_detecta_modificacion_y_borrado(self):
+        self.registrar(4)
+        TrazaMovimiento.objects.filter(secuencia=3).update(descripcion='alterada')
+        with self.assertRaisesMessage(CommandError, 'secuencia 3'):
+            self.verificar()
+        # Avanzó hasta la última traza válida
+        self.assertEqual(PuntoVerificacionTrazas.objects.first().secuencia, 2)
+
+        TrazaMovimiento.objects.filter(secuencia=3).delete()
+        with self.assertRaisesMessage(CommandError, 'faltan las trazas 3 a 3'):
+            self.verificar()
+
+    def test_trazas_archivadas_no_rompen_la_cadena(self):
+        """Las trazas movidas al archivo se reemplazan por su copia archivada"""
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio)
+        self.registrar(3)
+        TrazaMovimiento.objects.filter(secuencia__lte=2).update(fecha_hora=timezone.make_aware(datetime(2020, 1, 1)))
+        # Se cambió la fecha de las dos primeras para archivarlas: se vuelve a encadenar
+        anterior = ''
+        for traza in TrazaMovimiento.objects.order_by('secuencia'):
+            traza.hash = calcular_hash(traza, anterior)
+            TrazaMovimiento.objects.filter(pk=traza.pk).update(hash_anterior=anterior, hash=traza.hash)
+            anterior = traza.hash
+        with override_settings(AUDITORIA_ARCHIVO_DIR=directorio):
+            call_command('archivar_trazas', antes_de='2021-01-01', eliminar=True, stdout=StringIO())
+            self.assertEqual(TrazaMovimiento.objects.count(), 1)
+            self.assertIn('1 trazas verificadas', self.verificar(completo=True))
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 from decouple import config, Csv
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -52,6 +53,7 @@ INSTALLED_APPS = [
     'compliance',
     'alerts',
     'reports',
+    'sync',
     'api',
     'core',
 ]
@@ -59,12 +61,14 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompresionMiddleware',  # gzip/brotli (antes de auditoría, que lee el cuerpo)
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.IdempotenciaMiddleware',  # Idempotency-Key (antes de auditoría: los reintentos no se auditan)
     'core.middleware.AuditoriaMiddleware',  # Middleware de auditoría
 ]
 
@@ -99,6 +103,7 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='3306'),
+        # Sin ATOMIC_REQUESTS: solo las escrituras abren transacción (core/transacciones.py)
     }
 }
 
@@ -145,6 +150,59 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# El alias 'api' guarda las respuestas cacheadas de los endpoints de lectura
+# (ver core/cache.py). LocMemCache sirve para un único proceso; con varios
+# workers usar un backend compartido (FileBasedCache, Redis o Memcached) para
+# que las invalidaciones lleguen a todos.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'api': {
+        'BACKEND': config('API_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('API_CACHE_LOCATION', default='api-respuestas'),
+        'TIMEOUT': config('API_CACHE_TIMEOUT', default=300, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': config('API_CACHE_MAX_ENTRIES', default=5000, cast=int),
+        },
+    },
+}
+
+API_CACHE_HABILITADA = config('API_CACHE_HABILITADA', default=True, cast=bool)
+
+# Compresión de respuestas (core.middleware.CompresionMiddleware). brotli se
+# usa solo si el paquete está instalado.
+API_COMPRESION_MINIMO = config('API_COMPRESION_MINIMO', default=1024, cast=int)
+API_COMPRESION_NIVEL_GZIP = config('API_COMPRESION_NIVEL_GZIP', default=6, cast=int)
+API_COMPRESION_CALIDAD_BROTLI = config('API_COMPRESION_CALIDAD_BROTLI', default=4, cast=int)
+
+# Idempotency-Key en escrituras (core/idempotencia.py): vigencia de las
+# respuestas guardadas, espera máxima de un duplicado concurrente (segundos)
+# y tamaño máximo de la respuesta que se guarda
+IDEMPOTENCIA_TTL_HORAS = config('IDEMPOTENCIA_TTL_HORAS', default=24, cast=int)
+IDEMPOTENCIA_ESPERA = config('IDEMPOTENCIA_ESPERA', default=10, cast=float)
+IDEMPOTENCIA_MAXIMO_BYTES = config('IDEMPOTENCIA_MAXIMO_BYTES', default=1024 * 1024, cast=int)
+
+# Alertas en vivo por Server-Sent Events (alerts/difusion.py): segundos entre
+# lecturas de la outbox por proceso, entre latidos y antes de cerrar el flujo
+# (el cliente se reconecta con Last-Event-ID)
+ALERTAS_STREAM_INTERVALO = config('ALERTAS_STREAM_INTERVALO', default=2, cast=float)
+ALERTAS_STREAM_LATIDO = config('ALERTAS_STREAM_LATIDO', default=15, cast=float)
+ALERTAS_STREAM_DURACION = config('ALERTAS_STREAM_DURACION', default=1800, cast=int)
+
+# Archivo frío de trazas de auditoría (compliance/archivo.py, manage.py archivar_trazas)
+AUDITORIA_ARCHIVO_DIR = config('AUDITORIA_ARCHIVO_DIR', default=str(BASE_DIR / 'archivo_auditoria'))
+# Rango máximo de /api/compliance/trazas/agregados/
+AUDITORIA_AGREGADOS_MAX_DIAS = config('AUDITORIA_AGREGADOS_MAX_DIAS', default=366, cast=int)
+
+# Lista de tamizajes pendientes (neonatology/tamizajes.py): solo partos de los
+# últimos N días; un tamizaje que falta desde antes deja de aparecer como vencido
+TAMIZAJES_VENTANA_DIAS = config('TAMIZAJES_VENTANA_DIAS', default=90, cast=int)
+
+
 # Custom user model
 AUTH_USER_MODEL = 'core.Usuario'
 
@@ -157,9 +215,26 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Filtros por igualdad de filterset_fields (core/filtros.py)
+    'DEFAULT_FILTER_BACKENDS': ['core.filtros.FiltroCamposExactos'],
     'PAGE_SIZE': 50,
+    # JSON con orjson (misma salida que el JSONRenderer de DRF, ver core/renderers.py)
+    # MessagePack (application/msgpack) para clientes máquina; se descarta en
+    # la negociación si el paquete msgpack no está instalado.
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.JSONRapidoRenderer',
+        'core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.JSONRapidoParser',
+        'core.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_CONTENT_NEGOTIATION_CLASS': 'core.renderers.NegociacionContenido',
     # ← AGREGAR ESTA LÍNEA
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_SCHEMA_CLASS': 'core.schema.AutoSchemaAPI',
 }
 
 # JWT Configuration
@@ -183,6 +258,8 @@ SIMPLE_JWT = {
 
 # CORS
 CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL_ORIGINS', default=False, cast=bool)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
 
 TEST_RUNNER = 'django.test.runner.DiscoverRunner'
 
@@ -190,6 +267,7 @@ TEST_RUNNER = 'django.test.runner.DiscoverRunner'
 # SPECTACULAR SETTINGS - Nueva sección
 # ============================================
 SPECTACULAR_SETTINGS = {
+    'GET_LIB_DOC_EXCLUDES': 'core.schema.excluir_docs_mixins',
     'TITLE': 'Hospital Maternity System API',
     'DESCRIPTION': """
     Sistema de gestión hospitalaria para el registro y seguimiento de partos, 
@@ -248,11 +326,17 @@ SPECTACULAR_SETTINGS = {
         {'name': 'Auditoría', 'description': 'Trazabilidad de acciones del sistema'},
         {'name': 'Alertas', 'description': 'Sistema de alertas y notificaciones'},
         {'name': 'Reportes', 'description': 'Generación de reportes REM'},
+        {'name': 'Sincronización', 'description': 'Sincronización por deltas para tablets sin conexión'},
     ],
     
     # Configuración de componentes
     'COMPONENT_SPLIT_REQUEST': True,
     'COMPONENT_NO_READ_ONLY_REQUIRED': True,
+    # Dos campos "estado" con opciones distintas: nombres fijos para que el contrato no cambie
+    'ENUM_NAME_OVERRIDES': {
+        'EstadoEnum': 'neonatology.tamizajes.ESTADOS',
+        'EstadoCambioSyncEnum': 'sync.serializers.ESTADOS',
+    },
     
     # Configuración de Swagger UI
     'SWAGGER_UI_SETTINGS': {
@@ -274,4 +358,10 @@ SPECTACULAR_SETTINGS = {
     # Ordenamiento de endpoints
     'SORT_OPERATIONS': True,
     'SORT_OPERATION_PARAMETERS': True,
-}
\ No newline at end of file
+}
+
+# Schema OpenAPI pre-generado: /api/schema/ sirve este archivo (generado con
+# `python manage.py generar_schema`) en lugar de introspeccionar los viewsets
+# en cada request. En desarrollo (DEBUG) se genera dinámicamente por defecto.
+API_SCHEMA_ARCHIVO = BASE_DIR / 'schema.yml'
+API_SCHEMA_ESTATICO = config('API_SCHEMA_ESTATICO', default=not DEBUG, cast=bool)
\ No newline at end of file
@@ -14,6 +14,7 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import (
@@ -21,6 +22,10 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
     SpectacularRedocView
 )
+from api.views import SchemaEstaticoView
+
+# Schema pre-generado (manage.py generar_schema) o introspección en cada request
+schema_view = SchemaEstaticoView.as_view() if settings.API_SCHEMA_ESTATICO else SpectacularAPIView.as_view()
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -31,7 +36,7 @@ urlpatterns = [
     # ============================================
     
     # Schema OpenAPI (JSON/YAML) - usado por Swagger y ReDoc
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/', schema_view, name='schema'),
     
     # Swagger UI - Interfaz interactiva
     path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
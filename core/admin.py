@@ -98,7 +98,7 @@ class TrazaMovimientoAdmin(admin.ModelAdmin):
 	list_display = ('id_traza', 'tipo_accion_badge', 'tabla_afectada', 'fk_usuario', 'resultado_badge', 'fecha_hora')
 	list_filter = ('tipo_accion', 'resultado', 'tabla_afectada', 'fecha_hora')
 	search_fields = ('fk_usuario__nombre_completo', 'tabla_afectada', 'descripcion')
-	readonly_fields = ('id_traza', 'fecha_hora', 'cambios_anteriores', 'cambios_nuevos')
+	readonly_fields = ('id_traza', 'fecha_hora', 'cambios_anteriores', 'cambios_nuevos', 'secuencia', 'hash_anterior', 'hash')
 	date_hierarchy = 'fecha_hora'
 	
 	fieldsets = (
@@ -117,7 +117,7 @@ class TrazaMovimientoAdmin(admin.ModelAdmin):
 			'classes': ('collapse',)
 		}),
 		('Auditoría', {
-			'fields': ('fecha_hora',),
+			'fields': ('fecha_hora', 'secuencia', 'hash_anterior', 'hash'),
 			'classes': ('collapse',)
 		}),
 	)
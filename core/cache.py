@@ -0,0 +1,298 @@
+"""
+Caché de respuestas de la API con invalidación por señales de modelo.
+
+Las respuestas de ``list`` y ``retrieve`` se guardan en el alias de caché
+``api`` usando una clave compuesta por:
+
+- URL absoluta del endpoint (esquema, host y ruta)
+- Parámetros de consulta normalizados (ordenados)
+- Huella del conjunto de permisos del rol del usuario
+- Generación actual de cada modelo del que depende la respuesta
+
+Cada modelo tiene un contador de "generación" en la misma caché. Las señales
+``post_save``/``post_delete`` incrementan la generación del modelo afectado,
+con lo que todas las claves que dependían de él dejan de coincidir sin
+necesidad de recorrer ni borrar entradas. Las operaciones masivas que no
+emiten señales (``update()``, ``bulk_create()``) deben llamar a
+``invalidar_modelo`` explícitamente.
+"""
+import hashlib
+import logging
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+logger = logging.getLogger(__name__)
+
+ALIAS_CACHE = 'api'
+
+# Apps cuyos modelos alimentan respuestas cacheadas. Las escrituras en otras
+# apps (p. ej. auditoría) no invalidan nada y se ignoran sin costo.
+APPS_INVALIDACION = ('catalogs', 'core', 'maternity', 'neonatology', 'alerts')
+
+# Modelos de los que depende la huella de permisos de un rol
+MODELOS_PERMISOS = ('core.rolpermiso', 'core.permiso')
+
+
+def obtener_cache():
+    """Retorna el backend de caché configurado para respuestas de la API."""
+    return caches[ALIAS_CACHE]
+
+
+def cache_habilitada():
+    return getattr(settings, 'API_CACHE_HABILITADA', True)
+
+
+def _clave_generacion(etiqueta):
+    return f'gen:{etiqueta}'
+
+
+def _etiqueta(modelo):
+    if isinstance(modelo, str):
+        return modelo.lower()
+    return modelo._meta.label_lower
+
+
+def invalidar_modelo(modelo):
+    """
+    Incrementa la generación de un modelo.
+
+    Toda respuesta cacheada que dependa del modelo queda obsoleta.
+
+    Args:
+        modelo: Clase de modelo o etiqueta 'app.modelo'
+    """
+    cache = obtener_cache()
+    clave = _clave_generacion(_etiqueta(modelo))
+    try:
+        cache.incr(clave)
+    except ValueError:
+        # Clave inexistente o expulsada: se reinicia con un valor que no
+        # puede coincidir con una generación anterior.
+        cache.set(clave, time.time_ns(), timeout=None)
+
+
+def obtener_generaciones(etiquetas):
+    """
+    Retorna la generación actual de cada etiqueta de modelo, en el mismo orden.
+
+    Las generaciones inexistentes se inicializan con la marca de tiempo actual.
+    """
+    cache = obtener_cache()
+    claves = [_clave_generacion(e) for e in etiquetas]
+    actuales = cache.get_many(claves)
+    for clave in claves:
+        if clave not in actuales:
+            cache.add(clave, time.time_ns(), timeout=None)
+            actuales[clave] = cache.get(clave)
+    return [actuales[clave] for clave in claves]
+
+
+def ids_catalogo(modelo):
+    """
+    Retorna el conjunto de claves primarias de un catálogo.
+
+    Se cachea por generación del modelo, así que un alta o baja en el
+    catálogo se ve en la siguiente validación sin esperar a que venza.
+
+    Args:
+        modelo: Clase del modelo de catálogo
+    """
+    if not cache_habilitada():
+        return frozenset(modelo.objects.values_list('pk', flat=True))
+    cache = obtener_cache()
+    etiqueta = _etiqueta(modelo)
+    clave = 'catalogo:{}:{}'.format(etiqueta, obtener_generaciones([etiqueta])[0])
+    ids = cache.get(clave)
+    if ids is None:
+        ids = frozenset(modelo.objects.values_list('pk', flat=True))
+        cache.set(clave, ids)
+    return ids
+
+
+def huella_permisos(usuario):
+    """
+    Retorna una huella estable del conjunto de permisos del usuario.
+
+    Dos usuarios con el mismo conjunto de permisos comparten huella (y por lo
+    tanto entradas de caché); usuarios con conjuntos distintos nunca.
+    """
+    if usuario.is_superuser:
+        return 'superusuario'
+    if not usuario.fk_rol_id:
+        return 'sin-rol'
+
+    cache = obtener_cache()
+    generaciones = obtener_generaciones(MODELOS_PERMISOS)
+    clave = 'permisos:{}:{}'.format(usuario.fk_rol_id, ':'.join(str(g) for g in generaciones))
+    huella = cache.get(clave)
+    if huella is None:
+        from core.rbac_utils import obtener_permisos_usuario
+        codigos = sorted(obtener_permisos_usuario(usuario))
+        huella = hashlib.sha256('|'.join(codigos).encode()).hexdigest()[:32]
+        cache.set(clave, huella)
+    return huella
+
+
+def construir_clave(request, basename, accion, dependencias, por_usuario=False):
+    """
+    Construye la clave de caché de una respuesta.
+
+    Args:
+        request: Request de DRF ya autenticada
+        basename: Basename del viewset en el router
+        accion: Acción del viewset ('list', 'retrieve')
+        dependencias: Etiquetas de modelos de los que depende la respuesta
+        por_usuario: Si True, la clave incluye el ID del usuario
+    """
+    consulta = urlencode(sorted(
+        (clave, valor)
+        for clave, valores in request.query_params.lists()
+        for valor in valores
+    ))
+    partes = [
+        request.build_absolute_uri(request.path),
+        consulta,
+        huella_permisos(request.user),
+        str(request.user.pk) if por_usuario else '',
+    ]
+    partes.extend(str(g) for g in obtener_generaciones(dependencias))
+    resumen = hashlib.sha256('\x1f'.join(partes).encode()).hexdigest()
+    return f'resp:{basename}:{accion}:{resumen}'
+
+
+def registrar_acceso(basename, acierto):
+    """Incrementa el contador de aciertos o fallos de un endpoint."""
+    cache = obtener_cache()
+    clave = f"stats:{basename}:{'hit' if acierto else 'miss'}"
+    if not cache.add(clave, 1, timeout=None):
+        try:
+            cache.incr(clave)
+        except ValueError:
+            cache.set(clave, 1, timeout=None)
+
+
+def obtener_estadisticas(basenames):
+    """
+    Retorna aciertos, fallos y tasa de acierto por endpoint.
+
+    Returns:
+        dict: {basename: {'hits': int, 'misses': int, 'hit_ratio': float}}
+    """
+    cache = obtener_cache()
+    claves = [f'stats:{b}:{t}' for b in basenames for t in ('hit', 'miss')]
+    valores = cache.get_many(claves)
+    estadisticas = {}
+    for basename in basenames:
+        hits = valores.get(f'stats:{basename}:hit', 0)
+        misses = valores.get(f'stats:{basename}:miss', 0)
+        total = hits + misses
+        estadisticas[basename] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else 0.0,
+        }
+    return estadisticas
+
+
+def reiniciar_estadisticas(basenames):
+    obtener_cache().delete_many([f'stats:{b}:{t}' for b in basenames for t in ('hit', 'miss')])
+
+
+class RespuestaCacheadaMixin:
+    """
+    Mixin para ViewSets que cachea las respuestas de list y retrieve.
+
+    Uso en ViewSet:
+        class PartoViewSet(RespuestaCacheadaMixin, viewsets.ModelViewSet):
+            cache_dependencias = (Parto, MadrePaciente, CatTipoParto)
+
+    Los permisos RBAC se validan antes de consultar la caché (en
+    ``initial()``), y la clave incluye la huella de permisos del rol, por lo
+    que una respuesta nunca se entrega a un usuario con permisos distintos.
+    En ``retrieve`` de ViewSets con validación a nivel de objeto
+    (``validar_permiso_objeto``) la clave incluye además el usuario. Con
+    ``?expand=`` se suman los modelos que leen los serializers expandidos.
+    """
+    cache_dependencias = ()
+    cache_acciones = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self._responder_cacheado(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._responder_cacheado(super().retrieve, request, *args, **kwargs)
+
+    def get_cache_dependencias(self):
+        from .sparse_fields import modelos_expandidos, seleccion_desde_request
+
+        etiquetas = [_etiqueta(m) for m in self.cache_dependencias]
+        # ?expand= embebe serializers que leen otros modelos (catálogos, usuarios)
+        expandidos = modelos_expandidos(self.get_serializer_class(), seleccion_desde_request(self.request))
+        etiquetas.extend(sorted({_etiqueta(m) for m in expandidos} - set(etiquetas)))
+        if self._cache_por_usuario():
+            etiquetas.append('core.restriccionturno')
+        return etiquetas
+
+    def _cache_por_usuario(self):
+        return self.action == 'retrieve' and hasattr(self, 'validar_permiso_objeto')
+
+    def _responder_cacheado(self, vista, request, *args, **kwargs):
+        if not cache_habilitada() or self.action not in self.cache_acciones:
+            return vista(request, *args, **kwargs)
+
+        basename = getattr(self, 'basename', None) or self.__class__.__name__
+        cache = obtener_cache()
+        try:
+            clave = construir_clave(
+                request, basename, self.action,
+                self.get_cache_dependencias(),
+                por_usuario=self._cache_por_usuario(),
+            )
+            datos = cache.get(clave)
+        except Exception as e:
+            logger.error(f"Error consultando caché de respuestas: {e}")
+            return vista(request, *args, **kwargs)
+
+        if datos is not None:
+            # Import local: este módulo se carga en CoreConfig.ready() y no debe
+            # arrastrar DRF al arranque de cada proceso.
+            from rest_framework.response import Response
+
+            registrar_acceso(basename, acierto=True)
+            response = Response(datos)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = vista(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(clave, response.data)
+        registrar_acceso(basename, acierto=False)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+def _invalidar_seguro(sender):
+    try:
+        invalidar_modelo(sender)
+    except Exception as e:
+        logger.error(f"Error invalidando caché de {sender._meta.label}: {e}")
+
+
+def _invalidar_por_senal(sender, **kwargs):
+    if sender._meta.app_label in APPS_INVALIDACION:
+        _invalidar_seguro(sender)
+        # Segunda invalidación al confirmar la transacción: una lectura
+        # concurrente pudo cachear datos previos al COMMIT con la generación
+        # nueva. En modo autocommit se ejecuta de inmediato.
+        transaction.on_commit(lambda: _invalidar_seguro(sender))
+
+
+def conectar_senales():
+    """Conecta las señales de invalidación (se llama desde CoreConfig.ready)."""
+    post_save.connect(_invalidar_por_senal, dispatch_uid='core.cache.post_save')
+    post_delete.connect(_invalidar_por_senal, dispatch_uid='core.cache.post_delete')
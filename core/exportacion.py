@@ -0,0 +1,81 @@
+"""
+Exportación en streaming para clientes máquina (``GET .../exportar/``).
+
+    GET /api/neonatology/recien-nacidos/exportar/          (NDJSON)
+    GET /api/neonatology/recien-nacidos/exportar/?format=msgpack
+    Accept: application/msgpack
+
+La respuesta es un flujo con un objeto por registro: líneas JSON
+(``application/x-ndjson``) o una secuencia de objetos MessagePack
+(``application/msgpack``). El queryset se recorre con ``iterator()`` en lotes
+y cada lote se serializa y se envía antes de leer el siguiente, de modo que la
+memoria usada no depende del total de registros y el cliente empieza a
+recibir datos de inmediato. Aplica ``filter_queryset`` y ``?fields=``/``?omit=``
+igual que el listado; no hay paginación.
+
+Si ocurre un error a mitad del flujo la respuesta queda truncada (el status
+200 ya se envió); el cliente debe tratar un flujo incompleto como fallido.
+"""
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiResponse
+from rest_framework.decorators import action
+
+from .renderers import NDJSONRenderer, MessagePackRenderer
+
+
+def iterar_lotes(iterable, tamano):
+    lote = []
+    for item in iterable:
+        lote.append(item)
+        if len(lote) >= tamano:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+RESPUESTA_EXPORTACION = OpenApiResponse(
+    response=OpenApiTypes.BINARY,
+    description='Un objeto por registro: líneas JSON (NDJSON) o secuencia de objetos MessagePack.',
+)
+
+
+class ExportacionMixin:
+    """
+    Mixin para ViewSets: agrega la acción ``exportar`` (GET, sin paginación).
+
+    El ViewSet debe asignar un permiso a la acción ``exportar`` en su
+    ``get_required_permission`` (normalmente ``report:export_data``). Si el
+    ViewSet usa ``ListaRapidaMixin`` se reutiliza su ``SerializadorValores``.
+    """
+    tamano_lote_exportacion = 500
+
+    def serializar_lotes(self, queryset):
+        """
+        Retorna un generador de listas de objetos serializados, un lote a la
+        vez. La selección de campos se valida antes de empezar el flujo.
+        """
+        if not queryset.ordered:
+            queryset = queryset.order_by(queryset.model._meta.pk.name)
+        tamano = self.tamano_lote_exportacion
+
+        obtener_rapido = getattr(self, 'obtener_serializador_rapido', None)
+        rapido = obtener_rapido() if obtener_rapido is not None else None
+        if rapido is not None:
+            filas = rapido.preparar(queryset).iterator(chunk_size=tamano)
+            return (rapido.serializar(lote) for lote in iterar_lotes(filas, tamano))
+
+        self.get_serializer().fields  # ?fields= inválido: 400 antes del flujo
+        return (
+            self.get_serializer(lote, many=True).data
+            for lote in iterar_lotes(queryset.iterator(chunk_size=tamano), tamano)
+        )
+
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, MessagePackRenderer])
+    def exportar(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        lotes = self.serializar_lotes(self.filter_queryset(self.get_queryset()))
+        response = StreamingHttpResponse(renderer.render_flujo(lotes), content_type=renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}.{renderer.format}"'
+        return response
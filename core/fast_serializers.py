@@ -0,0 +1,178 @@
+"""
+Serialización rápida de listados a partir de ``.values()``.
+
+Un ``ModelSerializer`` instancia un modelo por fila y recorre sus campos DRF
+uno por uno (incluyendo ``SerializerMethodField``). Para listados grandes de
+solo lectura, ``SerializadorValores`` produce exactamente la misma salida a
+partir de un queryset ``.values()``:
+
+- Las columnas simples y las relaciones (``fk_madre.nombre``) se piden a la
+  base de datos como lookups (``fk_madre__nombre``), sin instanciar modelos.
+- Los campos calculados se resuelven como anotaciones SQL (``anotaciones``)
+  o en una pasada por columna sobre todas las filas (métodos ``columna_<campo>``).
+- Cada valor se convierte con el mismo campo DRF del serializer de referencia,
+  de modo que fechas, zonas horarias y decimales quedan idénticos.
+
+El serializer de referencia (``serializer_class``) sigue siendo la definición
+del contrato: el orden y el nombre de las claves salen de sus ``fields``.
+"""
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .sparse_fields import nombres_seleccionados, seleccion_desde_request
+
+# Campos cuya representación es el valor tal como viene de la base de datos
+CAMPOS_SIN_CONVERSION = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.SerializerMethodField,
+)
+
+
+class SerializadorValores:
+    """
+    Serializador de solo lectura basado en ``.values()``.
+
+    Atributos de la subclase:
+        serializer_class: Serializer DRF cuya salida se reproduce
+        anotaciones: {campo: expresión} calculados en SQL
+        columnas_requeridas: {campo: [lookups]} que necesita un ``columna_<campo>``
+
+    Los ``SerializerMethodField`` deben cubrirse con una anotación o con un
+    método ``columna_<campo>(self, filas)`` que retorne la lista de valores.
+    """
+    serializer_class = None
+    anotaciones = {}
+    columnas_requeridas = {}
+
+    def __init__(self, campos=None):
+        """
+        Args:
+            campos: Nombres de campos a incluir (``?fields=``/``?omit=``), o
+                None para todos
+        """
+        # El plan (campos DRF ya construidos) se arma una vez por clase
+        cls = type(self)
+        if '_plan_completo' not in cls.__dict__:
+            cls._plan_completo = self._construir_plan(self.serializer_class())
+        self._plan = self._plan_completo
+        if campos is not None:
+            campos = set(campos)
+            self._plan = [paso for paso in self._plan if paso[0] in campos]
+
+    def nombres_campos(self):
+        return [paso[0] for paso in self._plan_completo]
+
+    def _construir_plan(self, serializer):
+        plan = []
+        for nombre, campo in serializer.fields.items():
+            if campo.write_only:
+                continue
+            calcular = f'columna_{nombre}' if hasattr(self, f'columna_{nombre}') else None
+            if nombre in self.anotaciones:
+                lookup = nombre
+                calcular = None
+            elif calcular is not None:
+                lookup = None
+            elif isinstance(campo, serializers.SerializerMethodField):
+                raise TypeError(
+                    f'{type(self).__name__}: el campo calculado {nombre!r} necesita una '
+                    f'anotación o un método columna_{nombre}()'
+                )
+            else:
+                lookup = campo.source.replace('.', '__')
+            convertir = None if isinstance(campo, CAMPOS_SIN_CONVERSION) else campo.to_representation
+            # DRF omite la clave (SkipField) cuando una relación anidada opcional es nula
+            omitir_nulo = '.' in campo.source and not campo.required and not campo.allow_null
+            plan.append((nombre, lookup, calcular, convertir, omitir_nulo))
+        return plan
+
+    def lookups(self):
+        """Lookups que se piden a ``.values()``, sin duplicados y en orden."""
+        vistos = []
+        for nombre, lookup, calcular, _, _ in self._plan:
+            for item in ([lookup] if lookup else self.columnas_requeridas.get(nombre, [])):
+                if item not in vistos:
+                    vistos.append(item)
+        return vistos
+
+    def preparar(self, queryset):
+        """Retorna el queryset de diccionarios listo para paginar."""
+        lookups = self.lookups()
+        anotaciones = {k: v for k, v in self.anotaciones.items() if k in lookups}
+        if anotaciones:
+            queryset = queryset.annotate(**anotaciones)
+        return queryset.values(*lookups)
+
+    def serializar(self, filas):
+        """
+        Convierte filas de ``.values()`` en la misma lista que
+        ``serializer_class(instancias, many=True).data``.
+        """
+        filas = list(filas)
+        columnas = []
+        for nombre, lookup, calcular, convertir, omitir_nulo in self._plan:
+            if calcular:
+                valores = getattr(self, calcular)(filas)
+            else:
+                valores = [fila[lookup] for fila in filas]
+            if convertir is not None:
+                valores = [None if v is None else convertir(v) for v in valores]
+            columnas.append((nombre, valores, omitir_nulo))
+
+        resultado = []
+        for i in range(len(filas)):
+            item = {}
+            for nombre, valores, omitir_nulo in columnas:
+                valor = valores[i]
+                if valor is None and omitir_nulo:
+                    continue
+                item[nombre] = valor
+            resultado.append(item)
+        return resultado
+
+
+class ListaRapidaMixin:
+    """
+    Mixin para ViewSets: ``list`` usa un ``SerializadorValores`` cuando el
+    serializer de la acción es el que éste reproduce.
+
+    Se declara ``serializador_lista = MiSerializadorValores`` en el ViewSet.
+    La paginación y ``filter_queryset`` se aplican igual que en ``list``, y
+    ``?fields=``/``?omit=`` reducen las columnas pedidas a ``.values()``
+    (``?expand=`` y la selección anidada usan el serializer normal).
+    """
+    serializador_lista = None
+
+    def usar_lista_rapida(self):
+        return (
+            self.serializador_lista is not None
+            and self.get_serializer_class() is self.serializador_lista.serializer_class
+        )
+
+    def obtener_serializador_rapido(self):
+        """
+        Retorna el ``SerializadorValores`` para la request actual, o None si
+        corresponde usar el serializer normal.
+        """
+        if not self.usar_lista_rapida():
+            return None
+        seleccion = seleccion_desde_request(self.request)
+        if seleccion is not None and (seleccion.expandir or seleccion.hijos):
+            return None
+        campos = None
+        if seleccion is not None:
+            campos = nombres_seleccionados(self.serializador_lista().nombres_campos(), seleccion)
+        return self.serializador_lista(campos)
+
+    def list(self, request, *args, **kwargs):
+        serializador = self.obtener_serializador_rapido()
+        if serializador is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = serializador.preparar(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializador.serializar(page))
+        return Response(serializador.serializar(queryset))
@@ -0,0 +1,39 @@
+"""
+Filtro por igualdad sobre los ``filterset_fields`` de cada ViewSet.
+
+    class PartoViewSet(viewsets.ModelViewSet):
+        filterset_fields = ['fk_madre', 'fk_tipo_parto']
+
+    GET /api/maternity/partos/?fk_madre=12
+
+Cada valor se convierte con el campo del modelo (``to_python``); un valor
+inválido responde 400 en vez de llegar a la base de datos. Los índices
+compuestos de los modelos siguen estos filtros más el ``ordering`` por
+defecto (ej. ``parto_tipo_fecha_idx`` de ``Parto``: ``(fk_tipo_parto, -fecha_parto)``).
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class FiltroCamposExactos(BaseFilterBackend):
+    """Filtra el queryset por los parámetros que coinciden con ``filterset_fields``."""
+
+    def filter_queryset(self, request, queryset, view):
+        filtros = {}
+        for campo in getattr(view, 'filterset_fields', ()):
+            valor = request.query_params.get(campo)
+            if valor in (None, ''):
+                continue
+            try:
+                filtros[campo] = queryset.model._meta.get_field(campo).to_python(valor)
+            except DjangoValidationError:
+                raise ValidationError({campo: f'Valor inválido: {valor}'})
+        return queryset.filter(**filtros) if filtros else queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': campo, 'required': False, 'in': 'query', 'description': f'Filtrar por {campo}',
+             'schema': {'type': 'string'}}
+            for campo in getattr(view, 'filterset_fields', ())
+        ]
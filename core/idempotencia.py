@@ -0,0 +1,182 @@
+"""
+Claves de idempotencia para las escrituras de la API (``Idempotency-Key``).
+
+Una tablet que reintenta un POST tras un corte de Wi-Fi envía la misma
+cabecera ``Idempotency-Key``; el servidor guarda la primera respuesta
+(status, cuerpo y ``Content-Type``/``Location``) en ``ClaveIdempotencia`` y
+responde a los reintentos con ella, sin volver a ejecutar la vista: no se
+duplica el parto ni su traza de auditoría.
+
+    POST /api/maternity/partos/
+    Idempotency-Key: 3f1c2a9e-...
+
+- Aplica a POST, PUT y PATCH bajo ``/api/`` de usuarios autenticados. La
+  clave es por usuario (dos usuarios pueden usar la misma).
+- El reintento cuesta una lectura por el índice único (usuario, clave).
+- Reusar la clave con otra petición (método, ruta o cuerpo distintos)
+  responde 422.
+- Un duplicado que llega mientras el original se procesa espera hasta
+  ``IDEMPOTENCIA_ESPERA`` segundos a que termine y recibe su respuesta; si
+  no termina, 409 con ``Retry-After``.
+- No se guardan los errores 5xx, 401, 403 ni 429 (el reintento vuelve a
+  ejecutar la vista), ni las respuestas en streaming o de más de
+  ``IDEMPOTENCIA_MAXIMO_BYTES``.
+- Las claves vencen a las ``IDEMPOTENCIA_TTL_HORAS``; ``manage.py
+  purgar_claves_idempotencia`` borra las vencidas.
+"""
+import hashlib
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+CABECERA = 'HTTP_IDEMPOTENCY_KEY'
+METODOS = ('POST', 'PUT', 'PATCH')
+LARGO_MAXIMO_CLAVE = 255
+CABECERAS_GUARDADAS = ('Content-Type', 'Location')
+CODIGOS_NO_GUARDADOS = {401, 403, 429}
+
+# Segundos entre lecturas mientras se espera a la petición original
+PAUSA_ESPERA = 0.1
+
+
+def usuario_de(request):
+    """
+    Id del usuario de la petición, sin consultar la base de datos: el de la
+    sesión o el del access token JWT. None si no hay credenciales válidas
+    (la vista responderá 401).
+    """
+    if getattr(request, 'user', None) is not None and request.user.is_authenticated:
+        return request.user.pk
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+    from rest_framework_simplejwt.settings import api_settings
+
+    autenticacion = JWTAuthentication()
+    cabecera = autenticacion.get_header(request)
+    crudo = autenticacion.get_raw_token(cabecera) if cabecera else None
+    if crudo is None:
+        return None
+    try:
+        return autenticacion.get_validated_token(crudo).get(api_settings.USER_ID_CLAIM)
+    except (InvalidToken, TokenError):
+        return None
+
+
+def huella(request):
+    contenido = hashlib.sha256(f'{request.method} {request.get_full_path()}\n'.encode())
+    contenido.update(request.body)
+    return contenido.hexdigest()
+
+
+def respuesta_guardada(registro):
+    response = HttpResponse(bytes(registro.cuerpo or b''), status=registro.codigo_estado)
+    for nombre, valor in registro.cabeceras.items():
+        response[nombre] = valor
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def error(status, detalle, **cabeceras):
+    response = JsonResponse({'detail': detalle}, status=status)
+    for nombre, valor in cabeceras.items():
+        response[nombre] = valor
+    return response
+
+
+def guardable(response):
+    return (
+        not response.streaming
+        and response.status_code < 500
+        and response.status_code not in CODIGOS_NO_GUARDADOS
+        and len(response.content) <= settings.IDEMPOTENCIA_MAXIMO_BYTES
+    )
+
+
+def procesar(request, get_response):
+    """Ejecuta la petición una sola vez por clave, o repite la respuesta guardada."""
+    from core.models import ClaveIdempotencia
+
+    clave = request.META[CABECERA].strip()
+    if not clave or len(clave) > LARGO_MAXIMO_CLAVE:
+        return error(400, f'Idempotency-Key debe tener entre 1 y {LARGO_MAXIMO_CLAVE} caracteres')
+    id_usuario = usuario_de(request)
+    if id_usuario is None:
+        return get_response(request)
+    firma = huella(request)
+
+    registro = _reservar(ClaveIdempotencia, id_usuario, clave, firma)
+    if registro is not None:
+        if registro.huella != firma:
+            return error(422, 'Idempotency-Key ya se usó con otra petición')
+        registro = _esperar(ClaveIdempotencia, registro)
+        if registro.estado == ClaveIdempotencia.COMPLETADA:
+            return respuesta_guardada(registro)
+        return error(409, 'Una petición con esta Idempotency-Key aún está en proceso', **{
+            'Retry-After': str(max(1, round(settings.IDEMPOTENCIA_ESPERA))),
+        })
+
+    pendiente = ClaveIdempotencia.objects.filter(fk_usuario_id=id_usuario, clave=clave)
+    try:
+        response = get_response(request)
+    except Exception:
+        pendiente.delete()
+        raise
+    if guardable(response):
+        pendiente.update(
+            estado=ClaveIdempotencia.COMPLETADA,
+            codigo_estado=response.status_code,
+            cabeceras={nombre: response[nombre] for nombre in CABECERAS_GUARDADAS if response.has_header(nombre)},
+            cuerpo=response.content,
+        )
+    else:
+        pendiente.delete()
+    return response
+
+
+def _reservar(modelo, id_usuario, clave, firma):
+    """
+    Crea el registro "en proceso" de la clave. Si ya existe (reintento o
+    duplicado concurrente) y no venció, lo retorna; si se creó, None.
+    """
+    filtro = {'fk_usuario_id': id_usuario, 'clave': clave}
+    existente = modelo.objects.filter(**filtro).first()
+    if existente is not None and existente.fecha_expiracion > timezone.now():
+        return existente
+    try:
+        with transaction.atomic():
+            if existente is not None:
+                modelo.objects.filter(pk=existente.pk).delete()
+            modelo.objects.create(
+                **filtro, huella=firma,
+                fecha_expiracion=timezone.now() + timedelta(hours=settings.IDEMPOTENCIA_TTL_HORAS),
+            )
+    except IntegrityError:
+        # Otra petición con la misma clave la reservó entre la lectura y la inserción
+        return modelo.objects.get(**filtro)
+    return None
+
+
+def _esperar(modelo, registro):
+    limite = time.monotonic() + settings.IDEMPOTENCIA_ESPERA
+    while registro.estado == modelo.EN_PROCESO and time.monotonic() < limite:
+        time.sleep(PAUSA_ESPERA)
+        registro = modelo.objects.filter(pk=registro.pk).first()
+        if registro is None:
+            # La original falló sin respuesta guardable: este reintento se informa como en proceso
+            return modelo(estado=modelo.EN_PROCESO)
+    return registro
+
+
+def purgar_vencidas():
+    """
+    Returns:
+        int: Claves vencidas borradas
+    """
+    from core.models import ClaveIdempotencia
+
+    borradas, _ = ClaveIdempotencia.objects.filter(fecha_expiracion__lt=timezone.now()).delete()
+    return borradas
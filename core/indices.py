@@ -0,0 +1,50 @@
+"""
+Índices parciales portables entre motores.
+
+Django descarta la condición de un ``Index(condition=...)`` en MySQL (no
+soporta índices parciales) y crea un índice normal sobre ``fields``, que no
+sirve para la consulta que motivó el índice. ``IndiceParcial`` crea:
+
+- en PostgreSQL/SQLite: ``CREATE INDEX ... (fields) WHERE condición``
+- en MySQL: un índice compuesto con las columnas de la condición primero,
+  ``(columnas_condición, fields)``, que resuelve la misma consulta con un
+  rango sobre el prefijo.
+
+    IndiceParcial(fields=['-fecha_hora'], condicion=Q(resuelto=False), name='alerta_abiertas_idx')
+"""
+from django.db import models
+
+
+def campos_condicion(condicion):
+    """Columnas usadas en una condición ``Q`` simple, en orden de aparición."""
+    campos = []
+    for hijo in condicion.children:
+        if isinstance(hijo, models.Q):
+            nuevos = campos_condicion(hijo)
+        else:
+            nuevos = [hijo[0].split('__')[0]]
+        campos.extend(c for c in nuevos if c not in campos)
+    return campos
+
+
+class IndiceParcial(models.Index):
+    """``Index`` con ``condicion`` que degrada a índice compuesto sin soporte parcial."""
+
+    def __init__(self, *, condicion, **kwargs):
+        super().__init__(**kwargs)
+        self.condicion = condicion
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs['condicion'] = self.condicion
+        return path, args, kwargs
+
+    def indice_para(self, connection):
+        """El ``Index`` concreto que se crea en ``connection``."""
+        if connection.features.supports_partial_indexes:
+            return models.Index(fields=self.fields, name=self.name, condition=self.condicion)
+        prefijo = [c for c in campos_condicion(self.condicion) if c not in self.fields]
+        return models.Index(fields=[*prefijo, *self.fields], name=self.name)
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        return self.indice_para(schema_editor.connection).create_sql(model, schema_editor, using=using, **kwargs)
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver, URLResolver
+
+from core.cache import RespuestaCacheadaMixin, obtener_estadisticas, reiniciar_estadisticas
+
+
+def _endpoints_cacheados(patrones):
+    """Recorre el URLconf y retorna los basenames de ViewSets con caché."""
+    basenames = set()
+    for patron in patrones:
+        if isinstance(patron, URLResolver):
+            basenames |= _endpoints_cacheados(patron.url_patterns)
+            continue
+        cls = getattr(patron.callback, 'cls', None)
+        if cls and issubclass(cls, RespuestaCacheadaMixin):
+            basenames.add(patron.callback.initkwargs.get('basename') or cls.__name__)
+    return basenames
+
+
+class Command(BaseCommand):
+    help = 'Muestra aciertos, fallos y tasa de acierto de la caché de respuestas de la API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reiniciar', action='store_true', help='Reinicia los contadores después de mostrarlos')
+
+    def handle(self, *args, **options):
+        basenames = sorted(_endpoints_cacheados(get_resolver().url_patterns))
+        estadisticas = obtener_estadisticas(basenames)
+
+        self.stdout.write(f"{'Endpoint':<30} {'Hits':>10} {'Misses':>10} {'Hit ratio':>10}")
+        total_hits = total_misses = 0
+        for basename, datos in estadisticas.items():
+            total_hits += datos['hits']
+            total_misses += datos['misses']
+            self.stdout.write(
+                f"{basename:<30} {datos['hits']:>10} {datos['misses']:>10} {datos['hit_ratio']:>10.2%}"
+            )
+        total = total_hits + total_misses
+        ratio = total_hits / total if total else 0.0
+        self.stdout.write(self.style.SUCCESS(f"{'TOTAL':<30} {total_hits:>10} {total_misses:>10} {ratio:>10.2%}"))
+
+        if options['reiniciar']:
+            reiniciar_estadisticas(basenames)
+            self.stdout.write(self.style.SUCCESS('✓ Contadores reiniciados'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.idempotencia import purgar_vencidas
+
+
+class Command(BaseCommand):
+    help = 'Borra las claves de idempotencia vencidas (IDEMPOTENCIA_TTL_HORAS) con sus respuestas guardadas.'
+
+    def handle(self, *args, **options):
+        borradas = purgar_vencidas()
+        self.stdout.write(self.style.SUCCESS(f'✓ {borradas} claves de idempotencia borradas'))
@@ -1,11 +1,22 @@
 """
-Middleware para registrar auditoría automáticamente en cada request.
+Middleware para registrar auditoría automáticamente en cada request, para
+comprimir las respuestas de la API y para las claves de idempotencia.
 """
+import gzip
 import json
 import logging
+import re
+import zlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
 from django.utils.deprecation import MiddlewareMixin
 from core.rbac_utils import registrar_auditoria, obtener_ip_cliente
 
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -175,3 +186,152 @@ class AuditoriaMiddleware(MiddlewareMixin):
         except (json.JSONDecodeError, ValueError, AttributeError):
             pass
         return {}
+
+
+def codificaciones_aceptadas(accept_encoding):
+    """
+    Parsea un header Accept-Encoding.
+
+    Returns:
+        dict: {codificación: q}
+    """
+    aceptadas = {}
+    for parte in accept_encoding.split(','):
+        nombre, _, parametros = parte.strip().partition(';')
+        nombre = nombre.strip().lower()
+        if not nombre:
+            continue
+        q = 1.0
+        for parametro in parametros.split(';'):
+            clave, _, valor = parametro.strip().partition('=')
+            if clave.strip() == 'q':
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        aceptadas[nombre] = q
+    return aceptadas
+
+
+def _flujo_gzip(contenido, nivel):
+    compresor = zlib.compressobj(nivel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for parte in contenido:
+        datos = compresor.compress(parte)
+        if datos:
+            yield datos
+    yield compresor.flush()
+
+
+def _flujo_brotli(contenido, calidad):
+    compresor = brotli.Compressor(quality=calidad)
+    for parte in contenido:
+        datos = compresor.process(parte)
+        if datos:
+            yield datos
+    yield compresor.finish()
+
+
+class CompresionMiddleware:
+    """
+    Comprime las respuestas con brotli (si está instalado y el cliente lo
+    acepta) o gzip, según ``Accept-Encoding``.
+
+    - Solo respuestas de más de ``API_COMPRESION_MINIMO`` bytes: para cuerpos
+      pequeños el costo de CPU no compensa.
+    - Respeta respuestas que ya traen ``Content-Encoding`` (p. ej. el schema
+      pre-comprimido).
+    - Las respuestas en streaming se comprimen por partes, sin cargarlas en
+      memoria.
+    - Los flujos Server-Sent Events no se comprimen: el compresor retendría
+      cada evento hasta llenar un bloque.
+    - Solo bajo ``/api/`` y nunca HTML: las páginas del admin llevan el token
+      CSRF junto a texto que controla el usuario, y comprimirlas las expondría
+      a BREACH.
+
+    Debe ir antes de ``AuditoriaMiddleware``, que lee el cuerpo JSON de la
+    respuesta.
+    """
+    PREFIJO = '/api/'
+    TIPOS_COMPRIMIBLES = re.compile(
+        r'^(text/(plain|csv|css|javascript)|application/(json|x-ndjson|msgpack|xml|javascript|vnd\.oai\.openapi)|image/svg)'
+    )
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.minimo = getattr(settings, 'API_COMPRESION_MINIMO', 1024)
+        self.nivel_gzip = getattr(settings, 'API_COMPRESION_NIVEL_GZIP', 6)
+        self.calidad_brotli = getattr(settings, 'API_COMPRESION_CALIDAD_BROTLI', 4)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not request.path.startswith(self.PREFIJO) or not self._comprimible(response):
+            return response
+
+        # La respuesta depende de Accept-Encoding aunque esta vez no se comprima
+        patch_vary_headers(response, ('Accept-Encoding',))
+        codificacion = self.elegir_codificacion(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if codificacion is None:
+            return response
+
+        if response.streaming:
+            flujo = _flujo_brotli if codificacion == 'br' else _flujo_gzip
+            nivel = self.calidad_brotli if codificacion == 'br' else self.nivel_gzip
+            response.streaming_content = flujo(response.streaming_content, nivel)
+            del response['Content-Length']
+        else:
+            if len(response.content) < self.minimo:
+                return response
+            if codificacion == 'br':
+                comprimido = brotli.compress(response.content, quality=self.calidad_brotli)
+            else:
+                comprimido = gzip.compress(response.content, compresslevel=self.nivel_gzip, mtime=0)
+            if len(comprimido) >= len(response.content):
+                return response
+            response.content = comprimido
+            response['Content-Length'] = str(len(comprimido))
+
+        # El ETag identifica los bytes sin comprimir: pasa a ser débil
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = codificacion
+        return response
+
+    def _comprimible(self, response):
+        return (
+            response.status_code != 206
+            and not response.has_header('Content-Encoding')
+            and bool(self.TIPOS_COMPRIMIBLES.match(response.get('Content-Type', '')))
+            and not response.get('Content-Type', '').startswith('text/event-stream')
+        )
+
+    def elegir_codificacion(self, accept_encoding):
+        """Elige 'br' o 'gzip' (en ese orden de preferencia del servidor) o None."""
+        aceptadas = codificaciones_aceptadas(accept_encoding)
+        comodin = aceptadas.get('*', 0)
+        if brotli is not None and aceptadas.get('br', comodin) > 0:
+            return 'br'
+        if aceptadas.get('gzip', comodin) > 0:
+            return 'gzip'
+        return None
+
+
+class IdempotenciaMiddleware:
+    """
+    Repite la respuesta guardada a los reintentos de escrituras con cabecera
+    ``Idempotency-Key`` (ver ``core/idempotencia.py``).
+
+    Debe ir después de ``AuthenticationMiddleware`` y antes de
+    ``AuditoriaMiddleware``: un reintento respondido desde lo guardado no
+    genera una segunda traza.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from core.idempotencia import CABECERA, METODOS, procesar
+
+        if request.method not in METODOS or CABECERA not in request.META or not request.path.startswith('/api/'):
+            return self.get_response(request)
+        return procesar(request, self.get_response)
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_permiso_fecha_actualizacion_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaveIdempotencia',
+            fields=[
+                ('id_clave', models.BigAutoField(primary_key=True, serialize=False)),
+                ('clave', models.CharField(max_length=255)),
+                ('huella', models.CharField(help_text='SHA-256 de método, ruta y cuerpo de la petición', max_length=64)),
+                ('estado', models.CharField(choices=[('en_proceso', 'En proceso'), ('completada', 'Completada')], default='en_proceso', max_length=10)),
+                ('codigo_estado', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('cabeceras', models.JSONField(blank=True, default=dict)),
+                ('cuerpo', models.BinaryField(blank=True, null=True)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_expiracion', models.DateTimeField(db_index=True)),
+                ('fk_usuario', models.ForeignKey(db_column='fk_usuario', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Clave de Idempotencia',
+                'verbose_name_plural': 'Claves de Idempotencia',
+                'db_table': 'clave_idempotencia',
+                'constraints': [models.UniqueConstraint(fields=('fk_usuario', 'clave'), name='clave_idempotencia_usuario_uniq')],
+            },
+        ),
+    ]
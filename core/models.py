@@ -213,4 +213,38 @@ class RestriccionTurno(models.Model):
         """Verifica si la restricción de turno está vigente."""
         from django.utils import timezone
         today = timezone.now().date()
-        return self.activo and self.fecha_inicio <= today and (self.fecha_fin is None or today <= self.fecha_fin)
\ No newline at end of file
+        return self.activo and self.fecha_inicio <= today and (self.fecha_fin is None or today <= self.fecha_fin)
+
+class ClaveIdempotencia(models.Model):
+    """
+    Respuesta guardada de una escritura con cabecera ``Idempotency-Key``
+    (ver ``core/idempotencia.py``). Un reintento con la misma clave recibe
+    esta respuesta sin volver a ejecutar la vista.
+    """
+    EN_PROCESO = 'en_proceso'
+    COMPLETADA = 'completada'
+
+    id_clave = models.BigAutoField(primary_key=True)
+    fk_usuario = models.ForeignKey(Usuario, on_delete=models.CASCADE, db_column='fk_usuario', related_name='+')
+    clave = models.CharField(max_length=255)
+    huella = models.CharField(max_length=64, help_text="SHA-256 de método, ruta y cuerpo de la petición")
+    estado = models.CharField(
+        max_length=10, default=EN_PROCESO,
+        choices=[(EN_PROCESO, 'En proceso'), (COMPLETADA, 'Completada')],
+    )
+    codigo_estado = models.PositiveSmallIntegerField(null=True, blank=True)
+    cabeceras = models.JSONField(default=dict, blank=True)
+    cuerpo = models.BinaryField(null=True, blank=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_expiracion = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'clave_idempotencia'
+        verbose_name = 'Clave de Idempotencia'
+        verbose_name_plural = 'Claves de Idempotencia'
+        constraints = [
+            models.UniqueConstraint(fields=['fk_usuario', 'clave'], name='clave_idempotencia_usuario_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.clave} ({self.estado})"
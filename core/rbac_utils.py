@@ -117,6 +117,27 @@ def tiene_permiso(usuario, codigo_permiso):
     ).exists()
 
 
+def obtener_permisos_usuario(usuario):
+    """
+    Obtiene los códigos de permisos activos del rol de un usuario.
+
+    Args:
+        usuario: Instancia de Usuario
+
+    Returns:
+        frozenset: Códigos de permiso (vacío si no tiene rol)
+    """
+    if not usuario.fk_rol_id:
+        return frozenset()
+
+    from core.models import RolPermiso
+
+    return frozenset(RolPermiso.objects.filter(
+        fk_rol_id=usuario.fk_rol_id,
+        fk_permiso__activo=True
+    ).values_list('fk_permiso__codigo_permiso', flat=True))
+
+
 def requiere_permiso(codigo_permiso):
     """
     Decorador para funciones que requieren un permiso específico.
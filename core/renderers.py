@@ -0,0 +1,193 @@
+"""
+Renderers y parsers de la API: JSON con ``orjson``, MessagePack y NDJSON.
+
+``JSONRapidoRenderer`` produce los mismos bytes que el ``JSONRenderer`` de
+DRF (JSON compacto en UTF-8, ``\\u2028``/``\\u2029`` escapados), pero
+codifica varias veces más rápido. Los tipos que orjson no representa igual
+que DRF (``Decimal``, fechas y horas, cadenas lazy, querysets) se delegan al
+``JSONEncoder`` de DRF, de modo que ``talla_cm`` o un ``datetime`` devuelto
+directamente en un ``Response`` se ven igual con ambos renderers. Los
+``float`` en notación exponencial (orjson escribe ``1e16``, DRF ``1e+16``)
+hacen que la respuesta se codifique con DRF.
+
+Única diferencia: ``NaN`` e ``Infinity`` se escriben como ``null``, mientras
+que el encoder estricto de DRF lanza ``ValueError``.
+
+Si orjson no está instalado, o la respuesta pide indentación (API
+navegable, ``?indent=``), se usa la implementación de DRF.
+
+``application/msgpack`` es un formato alternativo para clientes máquina
+(cargador de laboratorio, exportador REM, tablets), tanto en requests como en
+respuestas. Los tipos se mapean igual que en JSON (fechas ISO-8601, decimales
+como string), de modo que un cliente ve los mismos valores en ambos formatos.
+Requiere el paquete ``msgpack``; si no está instalado, ``NegociacionContenido``
+lo descarta y la API responde 406/415 a quien lo pida.
+
+``NDJSONRenderer`` y ``MessagePackRenderer`` implementan además
+``render_flujo`` para las exportaciones en streaming (``core/exportacion.py``).
+``EventStreamRenderer`` da formato a los flujos Server-Sent Events
+(``text/event-stream``) de las alertas en vivo.
+"""
+import re
+
+from rest_framework.exceptions import ParseError
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+# Dígito, "e" y dígito o signo: posible float exponencial (o una cadena que lo
+# parece, que solo cuesta codificar esa respuesta con DRF)
+EXPONENTE = re.compile(rb'\de[-+\d]')
+
+if orjson is not None:
+    OPCIONES_ORJSON = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class JSONRapidoRenderer(JSONRenderer):
+    """``JSONRenderer`` de DRF acelerado con orjson (misma salida, salvo NaN/Infinity)."""
+
+    def _usar_orjson(self, accepted_media_type, renderer_context):
+        if orjson is None or not self.compact or self.ensure_ascii:
+            return False
+        return self.get_indent(accepted_media_type, renderer_context or {}) is None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self._usar_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        try:
+            contenido = orjson.dumps(data, default=encoder.default, option=OPCIONES_ORJSON)
+        except orjson.JSONEncodeError:
+            # Enteros de más de 64 bits u otros casos que orjson no acepta
+            return super().render(data, accepted_media_type, renderer_context)
+        if EXPONENTE.search(contenido):
+            # repr() de Python (DRF) y orjson escriben distinto los exponentes
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Igual que DRF: U+2028/U+2029 son JSON válido pero no JavaScript válido
+        if b'\xe2\x80\xa8' in contenido or b'\xe2\x80\xa9' in contenido:
+            contenido = contenido.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return contenido
+
+
+class JSONRapidoParser(JSONParser):
+    """``JSONParser`` de DRF acelerado con orjson."""
+    renderer_class = JSONRapidoRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # orjson rechaza NaN/Infinity igual que el modo estricto de DRF
+            return orjson.loads(stream.read() if stream is not None else b'')
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class NDJSONRenderer(JSONRapidoRenderer):
+    """JSON delimitado por líneas: un objeto por línea (exportaciones)."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (list, tuple)):
+            return b''.join(self.render_flujo([data]))
+        return super().render(data, accepted_media_type, renderer_context) + b'\n'
+
+    def render_flujo(self, lotes):
+        """Genera bytes por lote a partir de un iterable de listas de objetos."""
+        for lote in lotes:
+            yield b''.join(super(NDJSONRenderer, self).render(item) + b'\n' for item in lote)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Respuestas en MessagePack (mismo mapeo de tipos que el JSON de DRF)."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    disponible = msgpack is not None
+
+    def _packer(self):
+        return msgpack.Packer(default=JSONEncoder().default, use_bin_type=True)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self._packer().pack(data)
+
+    def render_flujo(self, lotes):
+        """
+        Genera una secuencia de objetos MessagePack, uno por registro, que el
+        cliente lee con ``msgpack.Unpacker``.
+        """
+        packer = self._packer()
+        for lote in lotes:
+            yield b''.join(packer.pack(item) for item in lote)
+
+
+class EventStreamRenderer(JSONRapidoRenderer):
+    """
+    Server-Sent Events: cada evento es un bloque ``id``/``event``/``data``
+    terminado en línea en blanco, con ``data`` en JSON compacto. Una
+    respuesta que no es un flujo (ej. un 403) se envía como un único evento
+    ``error``.
+    """
+    media_type = 'text/event-stream'
+    format = 'sse'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return self.evento('error', data)
+
+    def evento(self, tipo, datos, id_evento=None):
+        cabecera = f'id: {id_evento}\n' if id_evento is not None else ''
+        datos = super().render(datos)
+        return f'{cabecera}event: {tipo}\n'.encode() + b'data: ' + datos + b'\n\n'
+
+    @staticmethod
+    def comentario(texto):
+        """Línea que el cliente ignora (latido que mantiene viva la conexión)."""
+        return f': {texto}\n\n'.encode()
+
+
+class MessagePackParser(BaseParser):
+    """Requests en MessagePack."""
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+    disponible = msgpack is not None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read() if stream is not None else b'', raw=False)
+        except (ValueError, TypeError) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
+
+
+class NegociacionContenido(DefaultContentNegotiation):
+    """
+    Negociación de DRF que ignora los renderers y parsers cuya dependencia
+    opcional no está instalada (atributo ``disponible = False``).
+    """
+
+    def select_parser(self, request, parsers):
+        return super().select_parser(request, [p for p in parsers if getattr(p, 'disponible', True)])
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        renderers = [r for r in renderers if getattr(r, 'disponible', True)]
+        return super().select_renderer(request, renderers, format_suffix)
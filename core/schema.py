@@ -0,0 +1,53 @@
+"""
+Ajustes de drf-spectacular para los mixins de ViewSets del proyecto.
+"""
+from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.plumbing import get_lib_doc_excludes
+from drf_spectacular.utils import OpenApiParameter
+
+from core.idempotencia import METODOS as METODOS_IDEMPOTENTES
+
+
+def excluir_docs_mixins():
+    """
+    Clases cuyo docstring no debe usarse como descripción de un endpoint
+    (los mixins de infraestructura, igual que las clases de DRF).
+    """
+    from core.cache import RespuestaCacheadaMixin
+    from core.fast_serializers import ListaRapidaMixin
+    from core.sparse_fields import CamposDinamicosMixin, CamposDinamicosViewMixin
+    return get_lib_doc_excludes() + [
+        RespuestaCacheadaMixin, ListaRapidaMixin, CamposDinamicosMixin, CamposDinamicosViewMixin,
+    ]
+
+
+class AutoSchemaAPI(AutoSchema):
+    """
+    AutoSchema que documenta ?fields=, ?omit= y ?expand= donde aplican, y la
+    cabecera Idempotency-Key en las escrituras (core/idempotencia.py).
+    """
+
+    def get_override_parameters(self):
+        from core.sparse_fields import CamposDinamicosViewMixin
+
+        parametros = super().get_override_parameters()
+        accion = getattr(self.view, 'action', None)
+        if (
+            isinstance(self.view, CamposDinamicosViewMixin)
+            and self.method == 'GET'
+            and accion in self.view.acciones_campos_dinamicos
+        ):
+            parametros = list(parametros) + [
+                OpenApiParameter('fields', str, description='Campos a incluir, separados por coma (a.b para anidados)'),
+                OpenApiParameter('omit', str, description='Campos a excluir, separados por coma'),
+                OpenApiParameter('expand', str, description='Relaciones a expandir como objeto, separadas por coma'),
+            ]
+        if self.method in METODOS_IDEMPOTENTES:
+            parametros = list(parametros) + [
+                OpenApiParameter(
+                    'Idempotency-Key', str, location=OpenApiParameter.HEADER,
+                    description='Clave única por operación: un reintento con la misma clave recibe la respuesta '
+                                'original sin volver a ejecutarse (cabecera Idempotent-Replayed: true)',
+                ),
+            ]
+        return parametros
@@ -0,0 +1,177 @@
+"""
+Carga declarativa e idempotente de datos base (RBAC y catálogos).
+
+Cada ``Semilla`` describe el estado deseado de una tabla: las filas que deben
+existir, identificadas por una clave natural. ``sembrar`` lee la tabla una
+vez, compara y aplica solo las diferencias con operaciones masivas:
+
+    sembrar(Semilla(CatTipoParto, ['nombre'], [{'nombre': 'Vaginal'}, ...]))
+
+- Filas nuevas: ``bulk_create``.
+- Filas con algún campo distinto: ``bulk_update`` de esos campos.
+- Filas de la tabla que no están en la semilla (``sobrantes``): se conservan
+  por defecto, o se desactivan (``activo=False``) o eliminan según la semilla.
+
+Una segunda ejecución sin cambios es una consulta por tabla y ninguna
+escritura, por lo que los comandos que la usan pueden correr en cada
+despliegue. Como las operaciones masivas no emiten señales, la caché de
+respuestas se invalida explícitamente para cada modelo modificado.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import invalidar_modelo
+
+TAMANO_LOTE = 1000
+
+CONSERVAR = None
+DESACTIVAR = 'desactivar'
+ELIMINAR = 'eliminar'
+
+
+class Semilla:
+    """
+    Estado deseado de una tabla.
+
+    Args:
+        modelo: Clase del modelo
+        clave: Campos (``attname``) que identifican una fila, ej. ``['codigo_permiso']``
+            o ``['fk_rol_id', 'fk_permiso_id']``
+        filas: Iterable de diccionarios ``{campo: valor}`` con la clave y los
+            campos administrados; los demás campos de la tabla no se tocan.
+            Puede ser una función sin argumentos que los retorne: se evalúa al
+            sembrar esta tabla, después de las anteriores (para resolver ids)
+        sobrantes: ``CONSERVAR``, ``DESACTIVAR`` (requiere un campo ``activo``)
+            o ``ELIMINAR``
+    """
+
+    def __init__(self, modelo, clave, filas, sobrantes=CONSERVAR):
+        if sobrantes == DESACTIVAR and not any(f.name == 'activo' for f in modelo._meta.concrete_fields):
+            raise ValueError(f'{modelo.__name__} no tiene campo activo para desactivar sobrantes')
+        self.modelo = modelo
+        self.clave = tuple(clave)
+        self.sobrantes = sobrantes
+        self._origen = filas
+        self.filas = None
+        if not callable(filas):
+            self.preparar()
+
+    def preparar(self):
+        """Convierte y valida las filas; una clave repetida conserva la última."""
+        if self.filas is None:
+            origen = self._origen() if callable(self._origen) else self._origen
+            self.filas = {}
+            for fila in origen:
+                fila = {campo: self._valor(campo, valor) for campo, valor in fila.items()}
+                self.filas[tuple(fila[c] for c in self.clave)] = fila
+            self.campos = sorted({c for fila in self.filas.values() for c in fila} - set(self.clave))
+        return self.filas
+
+    def _valor(self, campo, valor):
+        """Convierte el valor con el campo del modelo y aplica sus validadores (ej. ``max_length``)."""
+        field = self.modelo._meta.get_field(campo)
+        valor = field.to_python(valor)
+        if valor is not None:
+            field.run_validators(valor)
+        return valor
+
+
+def _sembrar(semilla, aplicar):
+    semilla.preparar()
+    modelo = semilla.modelo
+    pk = modelo._meta.pk.attname
+    columnas = {pk, *semilla.clave, *semilla.campos}
+    if semilla.sobrantes == DESACTIVAR:
+        columnas.add('activo')
+    existentes = {}
+    for fila in modelo.objects.order_by(pk).values(*columnas).iterator():
+        # Los catálogos no tienen la clave natural como única: se usa la primera fila
+        existentes.setdefault(tuple(fila[c] for c in semilla.clave), fila)
+
+    nuevas, cambios = [], {}
+    for clave, deseada in semilla.filas.items():
+        actual = existentes.get(clave)
+        if actual is None:
+            nuevas.append(modelo(**deseada))
+            continue
+        distintos = [c for c, v in deseada.items() if actual[c] != v]
+        if distintos:
+            cambios[actual[pk]] = (deseada, distintos)
+    sobrantes = [
+        fila[pk] for clave, fila in existentes.items()
+        if clave not in semilla.filas and (semilla.sobrantes != DESACTIVAR or fila['activo'])
+    ]
+
+    resultado = {
+        'modelo': modelo._meta.label,
+        'creados': len(nuevas),
+        'actualizados': len(cambios),
+        'desactivados': len(sobrantes) if semilla.sobrantes == DESACTIVAR else 0,
+        'eliminados': len(sobrantes) if semilla.sobrantes == ELIMINAR else 0,
+        'sobrantes': len(sobrantes) if semilla.sobrantes == CONSERVAR else 0,
+        'sin_cambios': len(semilla.filas) - len(nuevas) - len(cambios),
+    }
+    escribe = nuevas or cambios or (sobrantes and semilla.sobrantes != CONSERVAR)
+    if not aplicar or not escribe:
+        return resultado
+
+    # bulk_update y update() no pasan por pre_save: auto_now se asigna a mano
+    auto_now = [f.attname for f in modelo._meta.concrete_fields if getattr(f, 'auto_now', False)]
+    ahora = timezone.now()
+    if nuevas:
+        modelo.objects.bulk_create(nuevas, batch_size=TAMANO_LOTE)
+    if cambios:
+        campos = sorted({c for _, distintos in cambios.values() for c in distintos} | set(auto_now))
+        objetos = []
+        for id_fila, (deseada, _) in cambios.items():
+            objeto = modelo(**deseada, **{pk: id_fila})
+            for campo in auto_now:
+                setattr(objeto, campo, ahora)
+            objetos.append(objeto)
+        modelo.objects.bulk_update(objetos, campos, batch_size=TAMANO_LOTE)
+    for inicio in range(0, len(sobrantes), TAMANO_LOTE):
+        lote = modelo.objects.filter(**{f'{pk}__in': sobrantes[inicio:inicio + TAMANO_LOTE]})
+        if semilla.sobrantes == DESACTIVAR:
+            lote.update(activo=False, **{campo: ahora for campo in auto_now})
+        elif semilla.sobrantes == ELIMINAR:
+            lote.delete()
+    resultado['modificado'] = True
+    return resultado
+
+
+def sembrar(*semillas, aplicar=True):
+    """
+    Lleva cada tabla al estado de su semilla, en orden y en una sola transacción.
+
+    Args:
+        *semillas: Instancias de ``Semilla``; las que dependen de otras
+            (ej. ``RolPermiso``) van después
+        aplicar: Si es False solo calcula las diferencias, sin escribir
+
+    Returns:
+        list: Por semilla, conteos de creados, actualizados, desactivados,
+        eliminados, sobrantes conservados y sin cambios
+    """
+    with transaction.atomic():
+        resultados = [_sembrar(semilla, aplicar) for semilla in semillas]
+    for semilla, resultado in zip(semillas, resultados):
+        if resultado.pop('modificado', False):
+            invalidar_modelo(semilla.modelo)
+    return resultados
+
+
+def ids_por_clave(modelo, campo, valores):
+    """{valor: pk} de las filas cuyo ``campo`` está en ``valores`` (la primera si hay repetidas)."""
+    pk = modelo._meta.pk.attname
+    ids = {}
+    for valor, id_fila in modelo.objects.filter(**{f'{campo}__in': list(valores)}).order_by(pk).values_list(campo, pk):
+        ids.setdefault(valor, id_fila)
+    return ids
+
+
+def resumen(resultado):
+    """Línea legible con los conteos de un resultado de ``sembrar``."""
+    partes = [f"{resultado[c]} {c.replace('_', ' ')}" for c in (
+        'creados', 'actualizados', 'desactivados', 'eliminados', 'sobrantes', 'sin_cambios'
+    ) if resultado[c]]
+    return f"{resultado['modelo']}: {', '.join(partes) or 'vacío'}"
@@ -1,17 +1,19 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from .sparse_fields import CamposDinamicosMixin
 from .models import Usuario, Rol, Permiso, RolPermiso
 from .utils import validar_run, normalizar_run
 
 
 
-class RolSerializer(serializers.ModelSerializer):
+class RolSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     class Meta:
         model = Rol
         fields = '__all__'
 
 
-class UsuarioSerializer(serializers.ModelSerializer):
+class UsuarioSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {'fk_rol': 'core.serializers.RolSerializer'}
     rol_nombre = serializers.CharField(source='fk_rol.nombre_rol', read_only=True)
     password = serializers.CharField(
         write_only=True,
@@ -75,13 +77,18 @@ class UsuarioSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class PermisoSerializer(serializers.ModelSerializer):
+class PermisoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     class Meta:
         model = Permiso
         fields = '__all__'
 
 
-class RolPermisoSerializer(serializers.ModelSerializer):
+class RolPermisoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {
+        'fk_rol': 'core.serializers.RolSerializer',
+        'fk_permiso': 'core.serializers.PermisoSerializer',
+    }
+
     rol_nombre = serializers.CharField(source='fk_rol.nombre_rol', read_only=True)
     permiso_codigo = serializers.CharField(source='fk_permiso.codigo_permiso', read_only=True)
 
@@ -122,7 +129,8 @@ class ChangePasswordSerializer(serializers.Serializer):
         return data
 
 
-class UsuarioProfileSerializer(serializers.ModelSerializer):
+class UsuarioProfileSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {'fk_rol': 'core.serializers.RolSerializer'}
     rol_nombre = serializers.CharField(source='fk_rol.nombre_rol', read_only=True)
     
     class Meta:
@@ -0,0 +1,326 @@
+"""
+Selección de campos en las respuestas: ``?fields=``, ``?omit=`` y ``?expand=``.
+
+    GET /api/maternity/partos/?fields=id_parto,fecha_parto,madre_run
+    GET /api/maternity/partos/1/?omit=complicaciones,anestesias
+    GET /api/maternity/partos/1/?fields=id_parto,complicaciones.complicacion_nombre
+    GET /api/maternity/partos/?expand=fk_madre&fields=id_parto,fk_madre.run
+
+- ``fields``: lista blanca; ``a.b`` selecciona el campo ``b`` del serializer
+  anidado ``a``.
+- ``omit``: lista negra (se aplica después de ``fields``).
+- ``expand``: reemplaza el id de una relación por el objeto serializado, para
+  las relaciones declaradas en ``campos_expandibles`` del serializer.
+
+La selección se aplica en dos lugares:
+
+1. ``CamposDinamicosMixin`` (serializers): quita los campos antes de
+   serializar cualquier fila.
+2. ``CamposDinamicosViewMixin`` (ViewSets): recorta el queryset según los
+   campos que quedaron: ``only()`` con las columnas necesarias,
+   ``select_related`` solo de las relaciones usadas y sin los prefetch de
+   relaciones omitidas.
+
+Solo aplica a lecturas (GET/HEAD); en escrituras el serializer es completo.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+PARAMETROS_SELECCION = ('fields', 'omit', 'expand')
+
+
+class SeleccionCampos:
+    """Árbol de selección parseado de los parámetros de la request."""
+
+    def __init__(self):
+        self.incluir = None     # None = todos
+        self.omitir = set()
+        self.expandir = set()
+        self.hijos = {}
+
+    def hijo(self, nombre):
+        if nombre not in self.hijos:
+            self.hijos[nombre] = SeleccionCampos()
+        return self.hijos[nombre]
+
+    def agregar(self, tipo, ruta):
+        nombre, _, resto = ruta.partition('.')
+        if not nombre:
+            return
+        if tipo == 'fields':
+            if self.incluir is None:
+                self.incluir = set()
+            self.incluir.add(nombre)
+        elif tipo == 'expand':
+            self.expandir.add(nombre)
+        elif not resto:
+            self.omitir.add(nombre)
+        if resto:
+            self.hijo(nombre).agregar(tipo, resto)
+
+
+def parsear_seleccion(query_params):
+    """
+    Construye la selección desde los query params.
+
+    Returns:
+        SeleccionCampos o None si la request no pide selección
+    """
+    if not any(query_params.get(p) for p in PARAMETROS_SELECCION):
+        return None
+    seleccion = SeleccionCampos()
+    for tipo in PARAMETROS_SELECCION:
+        for valor in query_params.getlist(tipo):
+            for ruta in valor.split(','):
+                seleccion.agregar(tipo, ruta.strip())
+    return seleccion
+
+
+def seleccion_desde_request(request):
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    return parsear_seleccion(request.query_params)
+
+
+def nombres_seleccionados(disponibles, seleccion):
+    """
+    Aplica fields/omit a una lista ordenada de nombres.
+
+    Raises:
+        ValidationError: si se pide un campo que no existe
+    """
+    pedidos = (seleccion.incluir or set()) | seleccion.omitir
+    desconocidos = pedidos - set(disponibles)
+    if desconocidos:
+        raise serializers.ValidationError({
+            'fields': f"Campos desconocidos: {', '.join(sorted(desconocidos))}"
+        })
+    return [
+        nombre for nombre in disponibles
+        if (seleccion.incluir is None or nombre in seleccion.incluir) and nombre not in seleccion.omitir
+    ]
+
+
+class CamposDinamicosMixin:
+    """
+    Mixin para ModelSerializer que aplica ``?fields=``/``?omit=``/``?expand=``.
+
+    Atributos opcionales:
+        campos_expandibles: {campo: 'ruta.al.Serializer'} relaciones que
+            ``?expand=`` reemplaza por el objeto completo
+        dependencias_calculados: {campo: [columnas]} columnas del modelo que
+            usa cada ``SerializerMethodField``; permite usar ``only()``
+            cuando el campo se pide
+    """
+    campos_expandibles = {}
+    dependencias_calculados = {}
+
+    def _obtener_seleccion(self):
+        if hasattr(self, '_seleccion'):
+            return self._seleccion
+        # Solo el serializer raíz (o el hijo de un ListSerializer raíz) lee la request
+        padre = self.parent
+        if padre is not None and not (isinstance(padre, serializers.ListSerializer) and padre.parent is None):
+            return None
+        return seleccion_desde_request(self.context.get('request'))
+
+    def get_fields(self):
+        campos = super().get_fields()
+        seleccion = self._obtener_seleccion()
+        if seleccion is None:
+            return campos
+
+        for nombre in seleccion.expandir:
+            if nombre not in self.campos_expandibles:
+                raise serializers.ValidationError({'expand': f'El campo {nombre!r} no se puede expandir'})
+            campos[nombre] = import_string(self.campos_expandibles[nombre])(read_only=True)
+
+        resultado = {nombre: campos[nombre] for nombre in nombres_seleccionados(list(campos), seleccion)}
+        for nombre, sub in seleccion.hijos.items():
+            anidado = resultado.get(nombre)
+            if isinstance(anidado, serializers.ListSerializer):
+                anidado = anidado.child
+            if isinstance(anidado, CamposDinamicosMixin):
+                anidado._seleccion = sub
+            elif anidado is not None and (sub.incluir or sub.omitir):
+                raise serializers.ValidationError({'fields': f'{nombre!r} no es un objeto anidado'})
+        return resultado
+
+
+def modelos_leidos(clase_serializer, vistos=None):
+    """
+    Modelos que lee un serializer completo: el de ``Meta.model``, los que
+    atraviesan los ``source`` con relaciones (``fk_madre.nombre``) y los de
+    sus serializers anidados. Los ``SerializerMethodField`` no se inspeccionan.
+    """
+    vistos = set() if vistos is None else vistos
+    modelo = getattr(getattr(clase_serializer, 'Meta', None), 'model', None)
+    if modelo is None or clase_serializer in vistos:
+        return set()
+    vistos.add(clase_serializer)
+    modelos = {modelo}
+    for campo in clase_serializer().fields.values():
+        if isinstance(campo, serializers.ListSerializer):
+            campo = campo.child
+        if isinstance(campo, serializers.BaseSerializer):
+            modelos |= modelos_leidos(type(campo), vistos)
+            continue
+        actual = modelo
+        for parte in campo.source.split('.')[:-1]:
+            try:
+                relacion = actual._meta.get_field(parte)
+            except FieldDoesNotExist:
+                break
+            if not relacion.is_relation:
+                break
+            actual = relacion.related_model
+            modelos.add(actual)
+    return modelos
+
+
+def modelos_expandidos(clase_serializer, seleccion):
+    """
+    Modelos que agregan a la respuesta las relaciones de ``?expand=`` (también
+    las anidadas, ``?expand=fk_parto.fk_madre``), para la caché de respuestas.
+    """
+    modelos = set()
+    if seleccion is None:
+        return modelos
+    expandibles = getattr(clase_serializer, 'campos_expandibles', {})
+    for nombre in seleccion.expandir:
+        if nombre in expandibles:
+            modelos |= modelos_leidos(import_string(expandibles[nombre]))
+    for nombre, sub in seleccion.hijos.items():
+        if nombre in seleccion.expandir and nombre in expandibles:
+            hijo = import_string(expandibles[nombre])
+        else:
+            campo = clase_serializer().fields.get(nombre)
+            if isinstance(campo, serializers.ListSerializer):
+                campo = campo.child
+            if not isinstance(campo, serializers.BaseSerializer):
+                continue
+            hijo = type(campo)
+        modelos |= modelos_expandidos(hijo, sub)
+    return modelos
+
+
+def _lookup_columna(modelo, ruta):
+    """
+    Traduce un ``source`` DRF (``fk_madre.nombre``) a (lookup de only(),
+    relación para select_related). Retorna None si no es una columna.
+    """
+    partes = ruta.split('.')
+    lookup, relacion = [], []
+    for i, parte in enumerate(partes):
+        if parte.startswith('get_') and parte.endswith('_display'):
+            parte = parte[len('get_'):-len('_display')]
+        try:
+            campo = modelo._meta.get_field(parte)
+        except FieldDoesNotExist:
+            return None
+        if campo.is_relation and not campo.concrete:
+            return None  # relación inversa: no es una columna
+        lookup.append(parte)
+        if campo.is_relation and i < len(partes) - 1:
+            relacion.append(parte)
+            modelo = campo.related_model
+    return '__'.join(lookup), '__'.join(relacion)
+
+
+def podar_queryset(queryset, serializer):
+    """
+    Recorta un queryset a lo que usa un serializer ya podado.
+
+    - ``only()`` con las columnas de los campos restantes (si todos los campos
+      calculados declaran sus dependencias)
+    - ``select_related`` solo de las relaciones que se leen
+    - ``prefetch_related`` solo de las relaciones que siguen en la respuesta
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    modelo = queryset.model
+    columnas = {modelo._meta.pk.name}
+    relaciones = set()
+    relaciones_completas = set()
+    inversas = set()
+    usar_only = True
+
+    for nombre, campo in serializer.fields.items():
+        if campo.write_only:
+            continue
+        if isinstance(campo, serializers.SerializerMethodField):
+            dependencias = serializer.dependencias_calculados.get(nombre) \
+                if isinstance(serializer, CamposDinamicosMixin) else None
+            if dependencias is None:
+                usar_only = False
+                continue
+            fuentes = dependencias
+        elif isinstance(campo, serializers.BaseSerializer):
+            # Objeto anidado: relación hacia adelante (select_related completo)
+            # o inversa (prefetch)
+            raiz = campo.source.split('.')[0]
+            try:
+                campo_modelo = modelo._meta.get_field(raiz)
+            except FieldDoesNotExist:
+                usar_only = False
+                continue
+            if campo_modelo.concrete:
+                columnas.add(raiz)
+                relaciones_completas.add(raiz)
+            else:
+                inversas.add(campo_modelo.get_accessor_name() if hasattr(campo_modelo, 'get_accessor_name') else raiz)
+            continue
+        else:
+            fuentes = [campo.source]
+
+        for fuente in fuentes:
+            if fuente == '*':
+                usar_only = False
+                continue
+            resultado = _lookup_columna(modelo, fuente)
+            if resultado is None:
+                usar_only = False
+                continue
+            lookup, relacion = resultado
+            columnas.add(lookup)
+            if relacion:
+                relaciones.add(relacion)
+                # La FK que se atraviesa también debe cargarse
+                columnas.add(relacion.split('__')[0])
+
+    queryset = queryset.select_related(None)
+    if relaciones | relaciones_completas:
+        queryset = queryset.select_related(*(relaciones | relaciones_completas))
+
+    prefetch = [
+        p for p in queryset._prefetch_related_lookups
+        if (getattr(p, 'prefetch_through', p)).split('__')[0] in inversas
+    ]
+    queryset = queryset.prefetch_related(None)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    if usar_only and not relaciones_completas:
+        queryset = queryset.only(*columnas)
+    return queryset
+
+
+class CamposDinamicosViewMixin:
+    """
+    Mixin para ViewSets: en ``list``, ``retrieve`` y ``exportar`` recorta el
+    queryset según ``?fields=``/``?omit=``/``?expand=`` (ver ``podar_queryset``).
+    """
+    acciones_campos_dinamicos = ('list', 'retrieve', 'exportar')
+
+    def obtener_seleccion_campos(self):
+        if self.action not in self.acciones_campos_dinamicos:
+            return None
+        return seleccion_desde_request(self.request)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.obtener_seleccion_campos() is None:
+            return queryset
+        return podar_queryset(queryset, self.get_serializer())
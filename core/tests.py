@@ -322,3 +322,601 @@ class RolPermisoTest(TestCase):
         
         with self.assertRaises(Exception):
             RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+
+
+class RespuestaCacheadaTest(APITestCase):
+    """Tests para la caché de respuestas invalidada por señales"""
+
+    def setUp(self):
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+
+        lectura = Permiso.objects.create(codigo_permiso='alert:read', categoria='alerts')
+        resolver = Permiso.objects.create(codigo_permiso='alert:resolve', categoria='alerts')
+        self.rol_supervisor = Rol.objects.create(nombre_rol='supervisor_jefe')
+        self.rol_enfermero = Rol.objects.create(nombre_rol='enfermero')
+        self.rol_sin_alertas = Rol.objects.create(nombre_rol='administrativo')
+        RolPermiso.objects.create(fk_rol=self.rol_supervisor, fk_permiso=lectura)
+        RolPermiso.objects.create(fk_rol=self.rol_supervisor, fk_permiso=resolver)
+        RolPermiso.objects.create(fk_rol=self.rol_enfermero, fk_permiso=lectura)
+
+        self.supervisor = Usuario.objects.create_user(
+            run='15000000-9', email='sup@hospital.com', password='testpass123',
+            nombre_completo='Supervisor', fk_rol=self.rol_supervisor
+        )
+        self.enfermero = Usuario.objects.create_user(
+            run='16000000-7', email='enf@hospital.com', password='testpass123',
+            nombre_completo='Enfermero', fk_rol=self.rol_enfermero
+        )
+        self.administrativo = Usuario.objects.create_user(
+            run='17000000-5', email='adm@hospital.com', password='testpass123',
+            nombre_completo='Administrativo', fk_rol=self.rol_sin_alertas
+        )
+
+    def _crear_alerta(self, tipo='DATO_INCOMPLETO'):
+        from alerts.models import AlertaSistema
+        return AlertaSistema.objects.create(
+            fk_usuario_genera=self.supervisor, tipo_alerta=tipo,
+            nivel_gravedad='ALTA', entidad_origen='parto'
+        )
+
+    def test_hit_despues_de_miss(self):
+        """La segunda lectura idéntica se sirve desde caché"""
+        self._crear_alerta()
+        self.client.force_authenticate(self.supervisor)
+        primera = self.client.get('/api/alerts/alertas/')
+        segunda = self.client.get('/api/alerts/alertas/')
+        self.assertEqual(primera['X-Cache'], 'MISS')
+        self.assertEqual(segunda['X-Cache'], 'HIT')
+        self.assertEqual(primera.data, segunda.data)
+
+    def test_parametros_normalizados(self):
+        """El orden de los parámetros de consulta no cambia la clave"""
+        self.client.force_authenticate(self.supervisor)
+        self.client.get('/api/alerts/alertas/?page=1&ordering=id_alerta')
+        response = self.client.get('/api/alerts/alertas/?ordering=id_alerta&page=1')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_invalidacion_por_senal(self):
+        """Crear o eliminar una alerta invalida el listado cacheado"""
+        alerta = self._crear_alerta()
+        self.client.force_authenticate(self.supervisor)
+        self.client.get('/api/alerts/alertas/')
+
+        self._crear_alerta('CRITICA')
+        response = self.client.get('/api/alerts/alertas/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 2)
+
+        alerta.delete()
+        response = self.client.get('/api/alerts/alertas/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 1)
+
+    def test_invalidacion_por_dependencia(self):
+        """Modificar un modelo dependiente (Usuario) invalida el listado"""
+        self._crear_alerta()
+        self.client.force_authenticate(self.supervisor)
+        self.client.get('/api/alerts/alertas/')
+
+        self.supervisor.nombre_completo = 'Supervisor Renombrado'
+        self.supervisor.save()
+        response = self.client.get('/api/alerts/alertas/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['usuario_genera_nombre'], 'Supervisor Renombrado')
+
+    def test_no_comparte_entre_conjuntos_de_permisos(self):
+        """Roles con permisos distintos no comparten entradas de caché"""
+        self._crear_alerta()
+        self.client.force_authenticate(self.supervisor)
+        self.client.get('/api/alerts/alertas/')
+
+        self.client.force_authenticate(self.enfermero)
+        response = self.client.get('/api/alerts/alertas/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_sin_permiso_no_recibe_cache(self):
+        """Un usuario sin permiso recibe 403 aunque exista la respuesta en caché"""
+        self._crear_alerta()
+        self.client.force_authenticate(self.supervisor)
+        self.client.get('/api/alerts/alertas/')
+
+        self.client.force_authenticate(self.administrativo)
+        response = self.client.get('/api/alerts/alertas/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_estadisticas(self):
+        """Los contadores reflejan aciertos y fallos por endpoint"""
+        from core.cache import obtener_estadisticas
+        self.client.force_authenticate(self.supervisor)
+        self.client.get('/api/alerts/alertas/')
+        self.client.get('/api/alerts/alertas/')
+        self.client.get('/api/alerts/alertas/')
+        estadisticas = obtener_estadisticas(['alerta-sistema'])['alerta-sistema']
+        self.assertEqual(estadisticas['hits'], 2)
+        self.assertEqual(estadisticas['misses'], 1)
+        self.assertAlmostEqual(estadisticas['hit_ratio'], 0.6667)
+
+
+class CamposDinamicosTest(APITestCase):
+    """Tests para ?fields=, ?omit= y ?expand= con poda del queryset"""
+
+    def setUp(self):
+        from datetime import date
+        from decimal import Decimal
+        from django.utils import timezone
+        from catalogs.models import CatNacionalidad, CatTipoParto, CatComplicacionParto
+        from maternity.models import MadrePaciente, Parto, PartoComplicacion, PartoAnestesia
+        from neonatology.models import RecienNacido
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+
+        # supervisor_jefe: el detalle de parto valida turno para otros roles
+        rol = Rol.objects.create(nombre_rol='supervisor_jefe')
+        for codigo in ('maternity:mother:read', 'maternity:delivery:read', 'neonatal:rn:read', 'neonatal:rn:create'):
+            permiso = Permiso.objects.create(codigo_permiso=codigo, categoria='test')
+            RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        self.usuario = Usuario.objects.create_user(
+            run='15000000-9', email='medico@hospital.com', password='testpass123',
+            nombre_completo='Dra. Rosa Muñoz', fk_rol=rol
+        )
+        self.madre = MadrePaciente.objects.create(
+            run='11111111-1', nombre='Ana', apellido_paterno='Pérez', apellido_materno='Silva',
+            fecha_nacimiento=date(1990, 1, 1),
+            fk_nacionalidad=CatNacionalidad.objects.create(nombre='Chilena'),
+        )
+        self.parto = Parto.objects.create(
+            fk_madre=self.madre, fk_tipo_parto=CatTipoParto.objects.create(nombre='Vaginal'),
+            fk_profesional_responsable=self.usuario, fecha_parto=timezone.now(),
+        )
+        PartoComplicacion.objects.create(
+            fk_parto=self.parto, fk_complicacion=CatComplicacionParto.objects.create(nombre='HPP')
+        )
+        PartoAnestesia.objects.create(fk_parto=self.parto, tipo_anestesia='epidural')
+        self.rn = RecienNacido.objects.create(
+            fk_parto=self.parto, sexo='F', peso_gramos=3200, talla_cm=Decimal('49.50')
+        )
+        self.client.force_authenticate(self.usuario)
+
+    def _sql(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response, ' '.join(q['sql'] for q in consultas)
+
+    def test_fields_en_listado_rapido(self):
+        """?fields= en un listado rápido entrega solo esas claves"""
+        response = self.client.get('/api/maternity/partos/?fields=id_parto,fecha_parto,madre_run')
+        self.assertEqual(list(response.data['results'][0]), ['id_parto', 'madre_run', 'fecha_parto'])
+        self.assertEqual(response.data['results'][0]['madre_run'], '11111111-1')
+
+        from maternity.serializers import MadrePacienteSerializer
+        response = self.client.get('/api/maternity/madres/?fields=edad')
+        self.assertEqual(response.data['results'][0], {'edad': MadrePacienteSerializer().get_edad(self.madre)})
+
+    def test_omit_evita_prefetch(self):
+        """?omit= de relaciones anidadas no consulta esas tablas"""
+        url = f'/api/maternity/partos/{self.parto.pk}/'
+        response, sql = self._sql(url)
+        self.assertIn('"parto_anestesia"."fk_parto" IN', sql)
+        response, sql = self._sql(url + '?omit=anestesias,complicaciones')
+        self.assertNotIn('anestesias', response.data)
+        self.assertNotIn('"parto_anestesia"."fk_parto" IN', sql)
+        self.assertNotIn('"parto_complicacion"."fk_parto" IN', sql)
+        self.assertIn('tuvo_complicaciones', response.data)
+
+    def test_fields_anidados(self):
+        """a.b selecciona campos del serializer anidado"""
+        response = self.client.get(
+            f'/api/maternity/partos/{self.parto.pk}/?fields=id_parto,complicaciones.complicacion_nombre'
+        )
+        self.assertEqual(response.data, {
+            'id_parto': self.parto.pk,
+            'complicaciones': [{'complicacion_nombre': 'HPP'}],
+        })
+
+    def test_only_recorta_columnas(self):
+        """Las columnas no pedidas no se leen de la base de datos"""
+        response, sql = self._sql('/api/neonatology/recien-nacidos/?fields=id_rn,peso_gramos,madre_nombre')
+        self.assertEqual(response.data['results'][0], {'id_rn': self.rn.pk, 'peso_gramos': 3200, 'madre_nombre': 'Ana'})
+        self.assertNotIn('talla_cm', sql)
+        self.assertNotIn('"parto"."horas_trabajo_parto"', sql)
+
+    def test_expand(self):
+        """?expand= reemplaza el id por el objeto serializado"""
+        response = self.client.get(f'/api/neonatology/recien-nacidos/{self.rn.pk}/?expand=fk_parto')
+        self.assertEqual(response.data['fk_parto']['id_parto'], self.parto.pk)
+        self.assertEqual(response.data['fk_parto']['madre_run'], '11111111-1')
+
+    def test_expand_invalida_cache_por_catalogo(self):
+        """Editar un catálogo que lee una relación expandida invalida la respuesta cacheada"""
+        url = '/api/maternity/partos/?expand=fk_madre'
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        nacionalidad = self.madre.fk_nacionalidad
+        nacionalidad.nombre = 'Peruana'
+        nacionalidad.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['fk_madre']['nacionalidad_nombre'], 'Peruana')
+
+        url = '/api/neonatology/recien-nacidos/?expand=fk_parto'
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        tipo = self.parto.fk_tipo_parto
+        tipo.nombre = 'Cesárea'
+        tipo.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['fk_parto']['tipo_parto_nombre'], 'Cesárea')
+
+    def test_campo_desconocido_400(self):
+        response = self.client.get('/api/maternity/partos/?fields=id_parto,inexistente')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get('/api/maternity/partos/?expand=horas_trabajo_parto')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_escritura_no_se_poda(self):
+        """En POST el serializer es completo aunque venga ?fields="""
+        response = self.client.post(
+            '/api/neonatology/recien-nacidos/?fields=id_rn',
+            {'fk_parto': self.parto.pk, 'sexo': 'M', 'peso_gramos': 3000, 'talla_cm': '48.00'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertIn('peso_gramos', response.data)
+
+
+class RendererRapidoTest(TestCase):
+    """Tests para JSONRapidoRenderer/JSONRapidoParser (orjson)"""
+
+    def _datos(self):
+        import uuid
+        from datetime import date, datetime, time, timedelta
+        from decimal import Decimal
+        from django.utils import timezone
+        from django.utils.translation import gettext_lazy
+        return {
+            'talla_cm': Decimal('49.50'),
+            'fecha': date(2024, 3, 1),
+            'fecha_hora': timezone.make_aware(datetime(2024, 3, 1, 10, 30, 15, 123456)),
+            'hora': time(8, 15, 0, 500000),
+            'duracion': timedelta(hours=2),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'texto': 'Ñuñoa\u2028ok\u2029',
+            'lazy': gettext_lazy('Activo'),
+            1: 'clave numérica',
+            'grande': 2 ** 70,
+            'lista': [1, None, True, 1.5],
+        }
+
+    def test_misma_salida_que_drf(self):
+        """Los bytes son idénticos a los del JSONRenderer de DRF"""
+        from rest_framework.renderers import JSONRenderer
+        from .renderers import JSONRapidoRenderer
+        datos = self._datos()
+        esperado = JSONRenderer().render(datos)
+        self.assertEqual(JSONRapidoRenderer().render(datos), esperado)
+        del datos['grande']  # sin el entero de 70 bits se usa orjson
+        self.assertEqual(JSONRapidoRenderer().render(datos), JSONRenderer().render(datos))
+
+    def test_floats(self):
+        """Floats comunes y exponenciales salen como en DRF; NaN/Infinity como null"""
+        from rest_framework.renderers import JSONRenderer
+        from .renderers import JSONRapidoRenderer
+        for valor in (0.1, -2.5, 1234.5678, 1e16, 1.5e-7, -3.2e-12, 1e300):
+            datos = {'valor': valor, 'texto': 'sin exponente'}
+            self.assertEqual(JSONRapidoRenderer().render(datos), JSONRenderer().render(datos), valor)
+        self.assertEqual(JSONRapidoRenderer().render({'ids': ['1e5', 'a2e9']}), JSONRenderer().render({'ids': ['1e5', 'a2e9']}))
+        self.assertEqual(JSONRapidoRenderer().render({'a': float('nan'), 'b': float('inf')}), b'{"a":null,"b":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({'a': float('nan')})
+
+    def test_sin_orjson_usa_drf(self):
+        """Sin orjson instalado se usa la implementación de DRF"""
+        from unittest import mock
+        from rest_framework.renderers import JSONRenderer
+        from . import renderers
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertEqual(renderers.JSONRapidoRenderer().render(self._datos()), JSONRenderer().render(self._datos()))
+
+    def test_indentacion_usa_drf(self):
+        """Con indent se respeta el formato de DRF"""
+        from rest_framework.renderers import JSONRenderer
+        from .renderers import JSONRapidoRenderer
+        datos = {'a': [1, 2]}
+        self.assertEqual(
+            JSONRapidoRenderer().render(datos, 'application/json; indent=4'),
+            JSONRenderer().render(datos, 'application/json; indent=4'),
+        )
+
+    def test_parser(self):
+        """El parser lee UTF-8 y rechaza JSON inválido o NaN"""
+        import io
+        from rest_framework.exceptions import ParseError
+        from .renderers import JSONRapidoParser
+        parser = JSONRapidoParser()
+        self.assertEqual(
+            parser.parse(io.BytesIO('{"nombre": "Ñandú", "talla_cm": "49.50"}'.encode())),
+            {'nombre': 'Ñandú', 'talla_cm': '49.50'},
+        )
+        for invalido in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(invalido))
+
+
+class CompresionMiddlewareTest(TestCase):
+    """Tests para la compresión negociada de respuestas"""
+
+    def _responder(self, contenido, accept_encoding, tipo='application/json', **settings_extra):
+        from django.http import HttpResponse
+        from django.test import RequestFactory, override_settings
+        from .middleware import CompresionMiddleware
+        request = RequestFactory().get('/api/maternity/partos/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        with override_settings(**settings_extra):
+            middleware = CompresionMiddleware(lambda r: HttpResponse(contenido, content_type=tipo))
+            return middleware(request)
+
+    def test_gzip_sobre_umbral(self):
+        """Respuestas grandes se comprimen con gzip y Vary: Accept-Encoding"""
+        import gzip
+        from unittest import mock
+        from . import middleware
+        contenido = b'{"partos": [' + b'{"id_parto": 1, "tipo": "vaginal"},' * 200 + b'{}]}'
+        with mock.patch.object(middleware, 'brotli', None):
+            response = self._responder(contenido, 'gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), contenido)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+    def test_bajo_umbral_o_no_aceptado(self):
+        """No se comprime bajo el umbral, si el cliente no lo acepta o si el tipo no es texto"""
+        contenido = b'{"id_parto": 1}' * 100
+        casos = [
+            ('gzip', {'API_COMPRESION_MINIMO': 10_000}, 'application/json'),
+            ('gzip;q=0, identity', {}, 'application/json'),
+            ('*;q=1, gzip;q=0, br;q=0', {}, 'application/json'),
+            ('', {}, 'application/json'),
+            ('gzip', {}, 'image/png'),
+        ]
+        for accept, extra, tipo in casos:
+            with self.subTest(accept=accept, tipo=tipo):
+                response = self._responder(contenido, accept, tipo, **extra)
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(response.content, contenido)
+
+    def test_html_y_fuera_de_api(self):
+        """HTML (páginas con token CSRF) y rutas fuera de /api/ no se comprimen"""
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from .middleware import CompresionMiddleware
+        contenido = b'<input name="csrfmiddlewaretoken" value="x">' * 100
+        response = self._responder(contenido, 'gzip', 'text/html; charset=utf-8')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        request = RequestFactory().get('/admin/', HTTP_ACCEPT_ENCODING='gzip')
+        response = CompresionMiddleware(lambda r: HttpResponse(b'{"a": 1}' * 500, content_type='application/json'))(request)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_brotli(self):
+        """Con brotli instalado y aceptado se prefiere br"""
+        from . import middleware
+        if middleware.brotli is None:
+            self.skipTest('brotli no está instalado')
+        contenido = b'{"id_parto": 1}' * 200
+        response = self._responder(contenido, 'gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(middleware.brotli.decompress(response.content), contenido)
+
+    def test_streaming(self):
+        """Las respuestas en streaming se comprimen por partes"""
+        import gzip
+        from django.http import StreamingHttpResponse
+        from django.test import RequestFactory
+        from unittest import mock
+        from . import middleware
+        partes = [b'{"id_rn": %d}\n' % i for i in range(500)]
+        request = RequestFactory().get('/api/neonatology/recien-nacidos/exportar/', HTTP_ACCEPT_ENCODING='gzip')
+        with mock.patch.object(middleware, 'brotli', None):
+            response = middleware.CompresionMiddleware(
+                lambda r: StreamingHttpResponse(iter(partes), content_type='application/octet-stream')
+            )(request)
+        # application/octet-stream no está en la lista: se entrega tal cual
+        self.assertFalse(response.has_header('Content-Encoding'))
+        with mock.patch.object(middleware, 'brotli', None):
+            response = middleware.CompresionMiddleware(
+                lambda r: StreamingHttpResponse(iter(partes), content_type='application/x-ndjson')
+            )(request)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(partes))
+
+    def test_api_comprimida(self):
+        """Un endpoint de la API responde comprimido de extremo a extremo"""
+        import gzip
+        import json
+        from unittest import mock
+        from . import middleware
+        admin = Usuario.objects.create_superuser(run='11111111-1', email='admin@test.cl', password='x')
+        for i in range(40):
+            Rol.objects.create(nombre_rol=f'rol_{i}', descripcion='Rol de prueba ' * 5)
+        client = APIClient()
+        client.force_authenticate(admin)
+        with mock.patch.object(middleware, 'brotli', None):
+            response = client.get('/api/roles/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.content))['count'], 40)
+
+
+class SemillasTest(TestCase):
+    """Tests de la carga declarativa de RBAC y catálogos"""
+
+    def setUp(self):
+        from .cache import obtener_cache
+        obtener_cache().clear()
+
+    def test_rbac_idempotente(self):
+        """La segunda carga no escribe: una consulta por tabla"""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .management.commands.load_rbac_system import PERMISOS, PERMISOS_POR_ROL
+
+        call_command('load_rbac_system', stdout=StringIO())
+        self.assertEqual(Permiso.objects.count(), len(PERMISOS))
+        self.assertEqual(RolPermiso.objects.count(), sum(len(c) for c in PERMISOS_POR_ROL.values()))
+
+        with CaptureQueriesContext(connection) as consultas:
+            call_command('load_rbac_system', stdout=StringIO())
+        escrituras = [c['sql'] for c in consultas if not c['sql'].startswith(('SELECT', 'SAVEPOINT', 'RELEASE'))]
+        self.assertEqual(escrituras, [])
+        # Permisos, roles, rol-permiso y los dos mapas de ids de las asignaciones
+        self.assertEqual(sum(c['sql'].startswith('SELECT') for c in consultas), 5)
+
+    def test_rbac_reconcilia(self):
+        """Corrige campos cambiados, reactiva permisos y desactiva los que sobran"""
+        from io import StringIO
+        from django.core.management import call_command
+        call_command('load_rbac_system', stdout=StringIO())
+        Permiso.objects.filter(codigo_permiso='alert:read').update(nombre_permiso='Otro', activo=False)
+        Permiso.objects.create(codigo_permiso='legacy:x', nombre_permiso='Legado', descripcion='-', categoria='core')
+        medico = Rol.objects.get(nombre_rol='medico')
+        RolPermiso.objects.filter(fk_rol=medico, fk_permiso__codigo_permiso='alert:read').delete()
+        extra = RolPermiso.objects.create(fk_rol=medico, fk_permiso=Permiso.objects.get(codigo_permiso='alert:resolve'))
+
+        salida = StringIO()
+        call_command('load_rbac_system', stdout=salida)
+        self.assertIn('core.Permiso: 1 actualizados, 1 desactivados', salida.getvalue())
+        alerta = Permiso.objects.get(codigo_permiso='alert:read')
+        self.assertEqual((alerta.nombre_permiso, alerta.activo), ('Visualizar Alertas', True))
+        self.assertFalse(Permiso.objects.get(codigo_permiso='legacy:x').activo)
+        self.assertTrue(RolPermiso.objects.filter(fk_rol=medico, fk_permiso=alerta).exists())
+        # Asignaciones extra se conservan salvo con --podar
+        self.assertTrue(RolPermiso.objects.filter(pk=extra.pk).exists())
+        call_command('load_rbac_system', '--podar', stdout=StringIO())
+        self.assertFalse(RolPermiso.objects.filter(pk=extra.pk).exists())
+
+    def test_invalida_cache(self):
+        """Las escrituras masivas invalidan las respuestas cacheadas del modelo"""
+        from .cache import obtener_generaciones
+        from .seeding import Semilla, sembrar
+        antes = obtener_generaciones(['core.rol'])
+        sembrar(Semilla(Rol, ['nombre_rol'], [{'nombre_rol': 'medico', 'descripcion': 'Médico'}]))
+        despues = obtener_generaciones(['core.rol'])
+        self.assertNotEqual(antes, despues)
+        sembrar(Semilla(Rol, ['nombre_rol'], [{'nombre_rol': 'medico', 'descripcion': 'Médico'}]))
+        self.assertEqual(obtener_generaciones(['core.rol']), despues)
+
+    def test_catalogos_desde_csv(self):
+        """cargar_catalogos usa la lista del módulo o un CSV, y valida las filas"""
+        import os
+        import tempfile
+        from io import StringIO
+        from django.core.management import call_command
+        from django.core.management.base import CommandError
+        from catalogs.models import CatNacionalidad, CatRobson
+        from catalogs.semillas import NACIONALIDADES
+
+        call_command('cargar_catalogos', stdout=StringIO())
+        self.assertEqual(CatNacionalidad.objects.count(), len(NACIONALIDADES))
+        self.assertEqual(CatRobson.objects.count(), 10)
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write('nombre\nChilena\nNeerlandesa\n')
+        self.addCleanup(os.remove, f.name)
+        salida = StringIO()
+        call_command('cargar_catalogos', 'nacionalidades', '--csv', f'nacionalidades={f.name}', stdout=salida)
+        self.assertIn('1 creados', salida.getvalue())
+        # Las que no están en el CSV se conservan: las referencian registros clínicos
+        self.assertEqual(CatNacionalidad.objects.count(), len(NACIONALIDADES) + 1)
+
+        with open(f.name, 'w', encoding='utf-8') as archivo:
+            archivo.write('nombre\n' + 'x' * 200 + '\n')
+        with self.assertRaises(CommandError):
+            call_command('cargar_catalogos', '--csv', f'nacionalidades={f.name}', stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('cargar_catalogos', 'salas', stdout=StringIO())
+
+
+class IdempotenciaTest(APITestCase):
+    """Tests de la cabecera Idempotency-Key en escrituras"""
+
+    url = '/api/maternity/madres/'
+
+    def setUp(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from catalogs.models import CatNacionalidad
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        self.admin = Usuario.objects.create_superuser(run='11111111-1', email='admin@test.cl', password='x')
+        self.otro = Usuario.objects.create_superuser(run='15000000-9', email='otro@test.cl', password='x')
+        self.tokens = {u.pk: str(RefreshToken.for_user(u).access_token) for u in (self.admin, self.otro)}
+
+    def madre(self, run='16000000-7'):
+        return {
+            'run': run, 'nombre': 'Ana', 'apellido_paterno': 'Rojas', 'apellido_materno': 'Soto',
+            'fecha_nacimiento': '1990-01-01', 'fk_nacionalidad': self.nacionalidad.pk,
+        }
+
+    def post(self, datos, clave='tablet-1', usuario=None):
+        cabeceras = {'HTTP_AUTHORIZATION': f'Bearer {self.tokens[(usuario or self.admin).pk]}'}
+        if clave is not None:
+            cabeceras['HTTP_IDEMPOTENCY_KEY'] = clave
+        return self.client.post(self.url, datos, format='json', **cabeceras)
+
+    def test_reintento_repite_la_respuesta_sin_ejecutar(self):
+        from compliance.models import TrazaMovimiento
+        from maternity.models import MadrePaciente
+        primera = self.post(self.madre())
+        self.assertEqual(primera.status_code, status.HTTP_201_CREATED)
+        trazas = TrazaMovimiento.objects.count()
+
+        reintento = self.post(self.madre())
+        self.assertEqual(reintento.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(reintento.content, primera.content)
+        self.assertEqual(reintento['Content-Type'], primera['Content-Type'])
+        self.assertEqual(reintento['Idempotent-Replayed'], 'true')
+        self.assertEqual(MadrePaciente.objects.count(), 1)
+        self.assertEqual(TrazaMovimiento.objects.count(), trazas)
+
+        # Misma clave con otro cuerpo: 422; la clave es por usuario
+        self.assertEqual(self.post(self.madre('17000000-5')).status_code, 422)
+        self.assertEqual(self.post(self.madre('17000000-5'), usuario=self.otro).status_code, status.HTTP_201_CREATED)
+        # Sin clave no hay protección contra duplicados
+        self.assertEqual(self.post(self.madre('18000000-3'), clave=None).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.post(self.madre('18000000-3'), clave=None).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_en_proceso_vencidas_y_errores(self):
+        from datetime import timedelta
+        from django.test import override_settings
+        from django.utils import timezone
+        from core.idempotencia import purgar_vencidas
+        from core.models import ClaveIdempotencia
+
+        # Un 400 se guarda: el reintento recibe el mismo error
+        invalida = self.post({'run': 'x'}, clave='invalida')
+        self.assertEqual(invalida.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post({'run': 'x'}, clave='invalida')['Idempotent-Replayed'], 'true')
+        # Sin credenciales no se reserva nada
+        self.client.post(self.url, self.madre(), format='json', HTTP_IDEMPOTENCY_KEY='anonima')
+        self.assertFalse(ClaveIdempotencia.objects.filter(clave='anonima').exists())
+
+        # Duplicado concurrente que no termina a tiempo: 409
+        primera = self.post(self.madre())
+        ClaveIdempotencia.objects.filter(clave='tablet-1').update(estado=ClaveIdempotencia.EN_PROCESO)
+        with override_settings(IDEMPOTENCIA_ESPERA=0):
+            response = self.post(self.madre())
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn('Retry-After', response)
+
+        # Vencida: se vuelve a ejecutar (el RUN ya existe) y se purga
+        ClaveIdempotencia.objects.filter(clave='tablet-1').update(fecha_expiracion=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(primera.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.post(self.madre()).status_code, status.HTTP_400_BAD_REQUEST)
+        ClaveIdempotencia.objects.update(fecha_expiracion=timezone.now() - timedelta(seconds=1))
+        total = ClaveIdempotencia.objects.count()
+        self.assertEqual(purgar_vencidas(), total)
+        self.assertFalse(ClaveIdempotencia.objects.exists())
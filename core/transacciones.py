@@ -0,0 +1,35 @@
+"""
+Transacciones de las escrituras de la API.
+
+Las peticiones corren en autocommit (sin ``ATOMIC_REQUESTS``): una lectura,
+un listado o una exportación en streaming no abren una transacción que dure
+toda la petición. Solo las escrituras se envuelven en ``transaction.atomic()``,
+y ahí debe quedar todo lo que tiene que confirmarse junto con el cambio: las
+señales ``post_save``/``post_delete`` que agregan el registro de cambios de la
+sincronización (``sync.cambios``) y el evento de la outbox (``sync.outbox``).
+
+La transacción cubre solo el guardado: el bloqueo del contador de secuencias
+(``ContadorCambios``) se libera antes de serializar la respuesta y de que
+``AuditoriaMiddleware`` escriba la traza.
+
+Las acciones que escriben fuera de ``perform_*`` (registro de parto,
+acciones masivas de alertas, sincronización) abren su propia transacción.
+"""
+from django.db import transaction
+
+
+class EscrituraAtomicaMixin:
+    # perform_create/perform_update/perform_destroy dentro de una transacción. Sin docstring:
+    # drf-spectacular lo tomaría como descripción de las vistas que no declaran la suya.
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            super().perform_create(serializer)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            super().perform_update(serializer)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            super().perform_destroy(instance)
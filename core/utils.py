@@ -1,3 +1,21 @@
+def calcular_dv(cuerpo) -> str:
+    """Dígito verificador (módulo 11) del cuerpo de un RUN: '0'-'9' o 'k'."""
+    suma = 0
+    multiplicador = 2
+    
+    for d in reversed(str(cuerpo)):
+        suma += int(d) * multiplicador
+        multiplicador = 2 if multiplicador == 7 else multiplicador + 1
+    
+    dv = 11 - suma % 11
+    
+    if dv == 11:
+        return "0"
+    if dv == 10:
+        return "k"
+    return str(dv)
+
+
 def validar_run(run_completo: str) -> bool:
     try:
         run = run_completo.lower().replace(".", "").replace("-", "")
@@ -11,24 +29,7 @@ def validar_run(run_completo: str) -> bool:
         if not cuerpo.isdigit():
             return False
         
-        suma = 0
-        multiplicador = 2
-        
-        for d in reversed(cuerpo):
-            suma += int(d) * multiplicador
-            multiplicador = 2 if multiplicador == 7 else multiplicador + 1
-        
-        resto = suma % 11
-        dv = 11 - resto
-        
-        if dv == 11:
-            dv = "0"
-        elif dv == 10:
-            dv = "k"
-        else:
-            dv = str(dv)
-        
-        return dv_ingresado == dv
+        return dv_ingresado == calcular_dv(cuerpo)
     except:
         return False
 
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
     MadrePaciente, Embarazo, Parto, PartoComplicacion,
-    PartoAnestesia, IVEAtencion, IVEAcompanamiento, AltaAnticonceptivo
+    PartoAnestesia, IVEAtencion, IVEAcompanamiento, AltaAnticonceptivo, DiscrepanciaRobson
 )
 
 
@@ -106,12 +106,15 @@ class PartoAdmin(admin.ModelAdmin):
     list_display = ('id_parto', 'madre_nombre', 'tipo_parto', 'complicaciones_display', 'horas_trabajo_parto', 'fecha_parto')
     search_fields = ('fk_madre__run', 'fk_madre__nombre')
     list_filter = ('fk_tipo_parto', 'fecha_parto', 'fecha_registro')
-    readonly_fields = ('fecha_registro', 'fecha_actualizacion', 'tuvo_complicaciones')
+    readonly_fields = ('fecha_registro', 'fecha_actualizacion', 'tuvo_complicaciones', 'fk_robson_calculado')
     inlines = [PartoComplicacionInline, PartoAnestesiaInline]
     fieldsets = (
         ('Información del Parto', {
             'fields': ('fk_madre', 'fk_tipo_parto', 'fk_clasificacion_robson', 'fecha_parto')
         }),
+        ('Clasificación de Robson', {
+            'fields': ('es_parto_multiple', 'presentacion', 'inicio_trabajo_parto', 'cesareas_previas', 'fk_robson_calculado')
+        }),
         ('Profesional', {
             'fields': ('fk_profesional_responsable',)
         }),
@@ -124,6 +127,9 @@ class PartoAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).con_indicadores().select_related('fk_madre', 'fk_tipo_parto')
+    
     def madre_nombre(self, obj):
         return obj.fk_madre.nombre_completo()
     madre_nombre.short_description = 'Madre'
@@ -133,7 +139,7 @@ class PartoAdmin(admin.ModelAdmin):
     tipo_parto.short_description = 'Tipo de Parto'
     
     def complicaciones_display(self, obj):
-        count = obj.complicaciones.count()
+        count = obj.cantidad_complicaciones()
         if count == 0:
             return format_html('<span style="color: green;">✓ Sin complicaciones</span>')
         return format_html(
@@ -249,4 +255,13 @@ class PartoAnestesiaAdmin(admin.ModelAdmin):
     
     def parto_id(self, obj):
         return obj.fk_parto.id_parto
-    parto_id.short_description = 'Parto'
\ No newline at end of file
+    parto_id.short_description = 'Parto'
+
+
+@admin.register(DiscrepanciaRobson)
+class DiscrepanciaRobsonAdmin(admin.ModelAdmin):
+    """Partos cuyo grupo de Robson manual difiere del calculado (recalcular_robson)."""
+    list_display = ('fk_parto', 'fk_robson_manual', 'fk_robson_calculado', 'fecha_deteccion')
+    list_filter = ('fk_robson_manual', 'fk_robson_calculado')
+    search_fields = ('fk_parto__fk_madre__run',)
+    readonly_fields = ('fk_parto', 'fk_robson_manual', 'fk_robson_calculado', 'fecha_deteccion')
@@ -0,0 +1,160 @@
+"""
+Edad gestacional calculada a partir de la FUM (``Embarazo.fecha_ultima_menstruacion``).
+
+``Embarazo.semana_obstetrica`` es la semana informada al registrar el
+embarazo y deja de ser correcta al día siguiente. La edad gestacional
+vigente se calcula al leer: semanas cumplidas entre la FUM y hoy (regla de
+Naegele, ``(hoy - fum) // 7``).
+
+Solo un embarazo en curso tiene edad gestacional: la FUM no es futura, no
+pasaron más de ``robson.SEMANAS_MAXIMAS`` semanas desde ella y la madre no
+tiene un parto desde esa FUM (``embarazo_terminado``). Para los demás la edad
+gestacional, el trimestre y la viabilidad son None, en lugar de una cuenta de
+semanas que sigue creciendo (o negativa).
+
+Un rango de semanas equivale a un rango de fechas de FUM, así que los
+filtros (``rango_fum``) y los cortes de trimestre y viabilidad
+(``anotaciones``) se expresan como comparaciones de la FUM con fechas
+constantes: usan el índice de ``fecha_ultima_menstruacion`` y no aplican
+aritmética de fechas fila por fila. Solo el número de semanas
+(``SemanasDesdeFUM``) se calcula en SQL. El parto posterior se busca con un
+``EXISTS`` sobre los partos de la madre (índice de ``parto.fk_madre``).
+"""
+from datetime import date, timedelta
+
+from django.db.models import BooleanField, Case, DateField, Exists, F, Func, IntegerField, OuterRef, Q, Value, When
+
+from .robson import SEMANAS_MAXIMAS
+
+# Mismos cortes que Embarazo.obtener_trimestre() y Embarazo.es_embarazo_viables()
+SEMANAS_PRIMER_TRIMESTRE = 12
+SEMANAS_SEGUNDO_TRIMESTRE = 27
+SEMANAS_VIABILIDAD = 20
+
+
+def hoy_local():
+    # Misma fecha de referencia que la edad de la madre (MadrePacienteSerializer.get_edad)
+    return date.today()
+
+
+def semanas_desde(fecha_ultima_menstruacion, hoy=None):
+    """Semanas cumplidas desde la FUM (None si no hay FUM)."""
+    if fecha_ultima_menstruacion is None:
+        return None
+    return ((hoy or hoy_local()) - fecha_ultima_menstruacion).days // 7
+
+
+def semanas_vigentes(fecha_ultima_menstruacion, hoy=None):
+    """
+    Semanas cumplidas si la FUM corresponde a un embarazo que puede estar en
+    curso (entre 0 y ``SEMANAS_MAXIMAS``); None si no hay FUM, si es futura o
+    si es demasiado antigua. El parto posterior se revisa aparte.
+    """
+    semanas = semanas_desde(fecha_ultima_menstruacion, hoy)
+    if semanas is None or not 0 <= semanas <= SEMANAS_MAXIMAS:
+        return None
+    return semanas
+
+
+def trimestre(semanas):
+    if semanas is None:
+        return None
+    if semanas <= SEMANAS_PRIMER_TRIMESTRE:
+        return 1
+    if semanas <= SEMANAS_SEGUNDO_TRIMESTRE:
+        return 2
+    return 3
+
+
+def fum_para_semanas(semanas, hoy=None):
+    """FUM más reciente con la que hoy se tienen ``semanas`` cumplidas."""
+    return (hoy or hoy_local()) - timedelta(weeks=semanas)
+
+
+def rango_fum(desde=None, hasta=None, hoy=None):
+    """
+    Lookups sobre la FUM equivalentes a ``desde <= semanas <= hasta``
+    (ambos inclusivos). El rango se acota a ``0..SEMANAS_MAXIMAS``: None deja
+    el extremo en ese límite, no abierto.
+
+    Returns:
+        dict: Argumentos para ``filter()``
+    """
+    hoy = hoy or hoy_local()
+    desde = max(desde or 0, 0)
+    hasta = SEMANAS_MAXIMAS if hasta is None else min(hasta, SEMANAS_MAXIMAS)
+    return {
+        'fecha_ultima_menstruacion__lte': fum_para_semanas(desde, hoy),
+        'fecha_ultima_menstruacion__gt': fum_para_semanas(hasta + 1, hoy),
+    }
+
+
+def embarazo_terminado():
+    """``EXISTS`` de un parto de la madre en la fecha de la FUM o después."""
+    from .models import Parto
+    return Exists(Parto.objects.filter(
+        fk_madre=OuterRef('fk_madre'), fecha_parto__date__gte=OuterRef('fecha_ultima_menstruacion'),
+    ))
+
+
+def no_vigente(hoy=None):
+    """Condición de los embarazos sin edad gestacional (ver ``semanas_vigentes``)."""
+    hoy = hoy or hoy_local()
+    return (
+        Q(fecha_ultima_menstruacion__isnull=True)
+        | Q(fecha_ultima_menstruacion__gt=hoy)
+        | Q(fecha_ultima_menstruacion__lte=fum_para_semanas(SEMANAS_MAXIMAS + 1, hoy))
+        | Q(embarazo_terminado())
+    )
+
+
+class SemanasDesdeFUM(Func):
+    """Semanas cumplidas entre una fecha y ``hoy``, redondeadas hacia abajo como ``semanas_desde``."""
+    output_field = IntegerField()
+    # fecha - fecha es la cantidad de días (PostgreSQL, Oracle)
+    arg_joiner = ' - '
+    template = 'CAST(FLOOR((%(expressions)s) / 7.0) AS INTEGER)'
+
+    def __init__(self, campo='fecha_ultima_menstruacion', hoy=None, **extra):
+        super().__init__(Value(hoy or hoy_local(), output_field=DateField()), F(campo), **extra)
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, arg_joiner=', ', template='CAST(FLOOR(DATEDIFF(%(expressions)s) / 7) AS SIGNED)', **extra_context,
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        dias, params = self.as_sql(
+            compiler, connection, arg_joiner=') - julianday(',
+            template='CAST(julianday(%(expressions)s) AS INTEGER)', **extra_context,
+        )
+        # SQLite no garantiza FLOOR: división entera ajustada para días negativos (FUM futura)
+        return f'(({dias}) - ((({dias}) %% 7) + 7) %% 7) / 7', params * 2
+
+
+def anotaciones(hoy=None):
+    """
+    Expresiones de ``semanas_gestacion``, ``trimestre`` y ``viable`` para
+    ``annotate()``, con los mismos resultados que los métodos de ``Embarazo``.
+    """
+    hoy = hoy or hoy_local()
+    return {
+        'semanas_gestacion': Case(
+            When(no_vigente(hoy), then=Value(None)),
+            default=SemanasDesdeFUM(hoy=hoy),
+            output_field=IntegerField(),
+        ),
+        'trimestre': Case(
+            When(no_vigente(hoy), then=Value(None)),
+            When(fecha_ultima_menstruacion__gt=fum_para_semanas(SEMANAS_PRIMER_TRIMESTRE + 1, hoy), then=Value(1)),
+            When(fecha_ultima_menstruacion__gt=fum_para_semanas(SEMANAS_SEGUNDO_TRIMESTRE + 1, hoy), then=Value(2)),
+            default=Value(3),
+            output_field=IntegerField(),
+        ),
+        'viable': Case(
+            When(no_vigente(hoy), then=Value(None)),
+            When(fecha_ultima_menstruacion__lte=fum_para_semanas(SEMANAS_VIABILIDAD, hoy), then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+    }
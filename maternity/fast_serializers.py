@@ -0,0 +1,47 @@
+"""
+Serializadores rápidos (basados en ``.values()``) para los listados de
+maternidad. Reproducen exactamente la salida de los serializers de
+``maternity.serializers``; ver ``core.fast_serializers``.
+"""
+from datetime import date
+
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+from core.fast_serializers import SerializadorValores
+from .edad_gestacional import anotaciones as anotaciones_edad_gestacional
+from .serializers import MadrePacienteSerializer, EmbarazoSerializer, PartoSerializer
+
+
+class MadrePacienteValores(SerializadorValores):
+    """Listado de madres: nombre completo en SQL, edad en una pasada por columna."""
+    serializer_class = MadrePacienteSerializer
+    anotaciones = {
+        'nombre_completo': Concat(
+            'nombre', Value(' '), 'apellido_paterno', Value(' '), 'apellido_materno'
+        ),
+    }
+    columnas_requeridas = {'edad': ['fecha_nacimiento']}
+
+    def columna_edad(self, filas):
+        """Misma regla que MadrePacienteSerializer.get_edad, con 'hoy' calculado una vez."""
+        hoy = date.today()
+        return [
+            hoy.year - f.year - ((hoy.month, hoy.day) < (f.month, f.day))
+            for f in (fila['fecha_nacimiento'] for fila in filas)
+        ]
+
+
+class EmbarazoValores(SerializadorValores):
+    """Listado de embarazos: edad gestacional, trimestre y viabilidad calculados en SQL desde la FUM."""
+    serializer_class = EmbarazoSerializer
+
+    @property
+    def anotaciones(self):
+        # Se arman por listado: dependen de la fecha de hoy
+        return anotaciones_edad_gestacional()
+
+
+class PartoValores(SerializadorValores):
+    """Listado de partos: madre, tipo de parto y profesional vía JOIN en la misma consulta."""
+    serializer_class = PartoSerializer
@@ -0,0 +1,91 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from catalogs.models import CatNacionalidad, CatTipoParto
+from core.models import Usuario
+from maternity.fast_serializers import MadrePacienteValores, EmbarazoValores, PartoValores
+from maternity.models import MadrePaciente, Embarazo, Parto
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara filas/segundo de los serializers DRF y de los serializadores rápidos (.values()) '
+        'de madres, embarazos y partos. Los datos de prueba se crean en una transacción que se revierte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanos', default='50,500,5000', help='Cantidades de filas separadas por coma')
+        parser.add_argument('--repeticiones', type=int, default=3, help='Se informa el mejor tiempo de N')
+
+    def handle(self, *args, **options):
+        tamanos = sorted(int(t) for t in options['tamanos'].split(','))
+        with transaction.atomic():
+            self._crear_datos(tamanos[-1])
+            self._medir(tamanos, options['repeticiones'])
+            # Los datos de prueba no se guardan
+            transaction.set_rollback(True)
+
+    def _crear_datos(self, n):
+        nacionalidad = CatNacionalidad.objects.create(nombre='Bench')
+        tipo_parto = CatTipoParto.objects.create(nombre='Bench')
+        profesional = Usuario.objects.filter(is_active=True).first() or Usuario.objects.create_user(
+            run='19000000-1', email='bench@hospital.local', password=None, nombre_completo='Bench'
+        )
+        hoy = date.today()
+        MadrePaciente.objects.bulk_create([
+            MadrePaciente(
+                run=f'{80000000 + i}-B', nombre=f'Madre{i}', apellido_paterno='Bench',
+                apellido_materno='Prueba', fecha_nacimiento=date(1980 + i % 25, 1 + i % 12, 1 + i % 28),
+                fk_nacionalidad=nacionalidad,
+            )
+            for i in range(n)
+        ], batch_size=1000)
+        madres = list(MadrePaciente.objects.filter(fk_nacionalidad=nacionalidad).only('id_madre'))
+        Embarazo.objects.bulk_create([
+            Embarazo(
+                fk_madre=madre, paridad=0, semana_obstetrica=i % 43,
+                fecha_ultima_menstruacion=hoy - timedelta(weeks=i % 43),
+            )
+            for i, madre in enumerate(madres)
+        ], batch_size=1000)
+        ahora = timezone.now()
+        Parto.objects.bulk_create([
+            Parto(
+                fk_madre=madre, fk_tipo_parto=tipo_parto, fk_profesional_responsable=profesional,
+                fecha_parto=ahora - timedelta(hours=i), horas_trabajo_parto=i % 24,
+            )
+            for i, madre in enumerate(madres)
+        ], batch_size=1000)
+
+    def _mejor_tiempo(self, funcion, repeticiones):
+        mejor = None
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion()
+            duracion = time.perf_counter() - inicio
+            mejor = duracion if mejor is None else min(mejor, duracion)
+        return mejor
+
+    def _medir(self, tamanos, repeticiones):
+        casos = [
+            ('madres', MadrePaciente, MadrePacienteValores()),
+            ('embarazos', Embarazo, EmbarazoValores()),
+            ('partos', Parto, PartoValores()),
+        ]
+        self.stdout.write(f"{'Listado':<12} {'Filas':>6} {'DRF filas/s':>14} {'Rápido filas/s':>16} {'Mejora':>8}")
+        for nombre, modelo, rapido in casos:
+            for n in tamanos:
+                queryset = modelo.objects.all()
+                t_drf = self._mejor_tiempo(
+                    lambda: rapido.serializer_class(queryset[:n], many=True).data, repeticiones
+                )
+                t_rapido = self._mejor_tiempo(
+                    lambda: rapido.serializar(rapido.preparar(queryset)[:n]), repeticiones
+                )
+                self.stdout.write(
+                    f'{nombre:<12} {n:>6} {n / t_drf:>14,.0f} {n / t_rapido:>16,.0f} {t_drf / t_rapido:>7.1f}x'
+                )
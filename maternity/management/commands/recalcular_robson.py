@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.cache import invalidar_modelo
+from maternity.models import Parto
+from maternity.robson import TAMANO_LOTE, recalcular_robson
+
+
+class Command(BaseCommand):
+    help = (
+        'Calcula el grupo de Robson de todos los partos (o de un rango de fechas) por lotes y registra las '
+        'discrepancias con el grupo ingresado a mano. Se puede volver a ejecutar: solo actualiza los partos '
+        'cuyo grupo cambió.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help='Solo partos desde esta fecha (YYYY-MM-DD)')
+        parser.add_argument('--hasta', help='Solo partos hasta esta fecha, inclusive (YYYY-MM-DD)')
+        parser.add_argument('--tamano-lote', type=int, default=TAMANO_LOTE, help='Partos por lote')
+
+    def handle(self, *args, **options):
+        queryset = Parto.objects.all()
+        if options['desde']:
+            queryset = queryset.filter(fecha_parto__date__gte=options['desde'])
+        if options['hasta']:
+            queryset = queryset.filter(fecha_parto__date__lte=options['hasta'])
+
+        inicio = time.perf_counter()
+        resumen = recalcular_robson(queryset, tamano_lote=max(1, options['tamano_lote']))
+        segundos = time.perf_counter() - inicio
+        # Los UPDATE por lote no emiten señales: se invalida la caché de respuestas a mano
+        invalidar_modelo(Parto)
+
+        sin_datos = resumen['procesados'] - resumen['clasificados']
+        self.stdout.write(self.style.SUCCESS(
+            f"{resumen['procesados']} partos procesados en {segundos:.1f} s: {resumen['clasificados']} clasificados, "
+            f"{resumen['actualizados']} actualizados, {resumen['discrepancias']} discrepancias con el grupo manual"
+        ))
+        if sin_datos:
+            self.stdout.write(self.style.WARNING(
+                f'{sin_datos} partos sin datos suficientes (presentación, inicio del trabajo de parto, '
+                'cesáreas previas o embarazo asociado)'
+            ))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogs', '0001_initial'),
+        ('maternity', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parto',
+            index=models.Index(fields=['fecha_parto'], name='parto_fecha_p_033409_idx'),
+        ),
+    ]
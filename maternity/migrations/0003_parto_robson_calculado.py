@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogs', '0001_initial'),
+        ('maternity', '0002_parto_fecha_parto_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parto',
+            name='cesareas_previas',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Cantidad de cesáreas anteriores', null=True),
+        ),
+        migrations.AddField(
+            model_name='parto',
+            name='fk_robson_calculado',
+            field=models.ForeignKey(blank=True, db_column='fk_robson_calculado', editable=False, help_text='Grupo de Robson calculado (maternity/robson.py)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='catalogs.catrobson'),
+        ),
+        migrations.AddField(
+            model_name='parto',
+            name='inicio_trabajo_parto',
+            field=models.CharField(blank=True, choices=[('espontaneo', 'Espontáneo'), ('inducido', 'Inducido'), ('cesarea_electiva', 'Cesárea antes del trabajo de parto')], help_text='Inicio del trabajo de parto (cesárea_electiva: cesárea antes del trabajo de parto)', max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='parto',
+            name='presentacion',
+            field=models.CharField(blank=True, choices=[('cefalica', 'Cefálica'), ('podalica', 'Podálica'), ('transversa', 'Transversa u oblicua')], help_text='Presentación fetal al parto', max_length=20, null=True),
+        ),
+        migrations.CreateModel(
+            name='DiscrepanciaRobson',
+            fields=[
+                ('fk_parto', models.OneToOneField(db_column='fk_parto', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='discrepancia_robson', serialize=False, to='maternity.parto')),
+                ('fecha_deteccion', models.DateTimeField(auto_now_add=True)),
+                ('fk_robson_calculado', models.ForeignKey(db_column='fk_robson_calculado', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='catalogs.catrobson')),
+                ('fk_robson_manual', models.ForeignKey(db_column='fk_robson_manual', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='catalogs.catrobson')),
+            ],
+            options={
+                'verbose_name': 'Discrepancia Robson',
+                'verbose_name_plural': 'Discrepancias Robson',
+                'db_table': 'parto_discrepancia_robson',
+            },
+        ),
+    ]
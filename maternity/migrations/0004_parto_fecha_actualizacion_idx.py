@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogs', '0001_initial'),
+        ('maternity', '0003_parto_robson_calculado'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='parto',
+            index=models.Index(fields=['fecha_actualizacion'], name='parto_fecha_a_32ed92_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogs', '0001_initial'),
+        ('maternity', '0004_parto_fecha_actualizacion_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='embarazo',
+            index=models.Index(fields=['-fecha_registro'], name='embarazo_registro_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='madrepaciente',
+            index=models.Index(fields=['-fecha_registro'], name='madre_registro_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parto',
+            index=models.Index(fields=['fk_tipo_parto', '-fecha_parto'], name='parto_tipo_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:48
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maternity', '0005_indices_listados'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='embarazo',
+            name='semana_obstetrica',
+            field=models.IntegerField(help_text='Semana de gestación al registro (la vigente se calcula desde la FUM)', validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(42)]),
+        ),
+        migrations.AddIndex(
+            model_name='embarazo',
+            index=models.Index(fields=['fecha_ultima_menstruacion'], name='embarazo_fum_idx'),
+        ),
+    ]
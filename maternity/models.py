@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from catalogs.models import CatNacionalidad, CatPuebloOriginario, CatComplicacionParto, CatRobson, CatTipoParto
@@ -33,6 +35,7 @@ class MadrePaciente(models.Model):
         indexes = [
             models.Index(fields=['run']),
             models.Index(fields=['nombre', 'apellido_paterno']),
+            models.Index(fields=['-fecha_registro'], name='madre_registro_idx'),
         ]
     
     def __str__(self):
@@ -58,6 +61,23 @@ class MadrePaciente(models.Model):
         super().save(*args, **kwargs)
 
 
+class EmbarazoQuerySet(models.QuerySet):
+    """QuerySet de Embarazo con la edad gestacional calculada desde la FUM (maternity/edad_gestacional.py)."""
+
+    def con_edad_gestacional(self, hoy=None):
+        """Anota semanas_gestacion, trimestre y viable a la fecha ``hoy`` (por defecto, hoy)."""
+        from .edad_gestacional import anotaciones
+        return self.annotate(**anotaciones(hoy))
+
+    def por_semanas(self, desde=None, hasta=None, hoy=None):
+        """
+        Embarazos en curso con ``desde <= semanas <= hasta`` hoy: un rango de
+        FUM (usa el índice) sin los embarazos que ya terminaron en un parto.
+        """
+        from .edad_gestacional import embarazo_terminado, rango_fum
+        return self.filter(~embarazo_terminado(), **rango_fum(desde, hasta, hoy))
+
+
 class Embarazo(models.Model):
     """Modelo para gestionar embarazos de madres pacientes."""
     
@@ -67,39 +87,107 @@ class Embarazo(models.Model):
     control_prenatal = models.BooleanField(default=True, help_text="¿Asistió a control prenatal?")
     fecha_ultima_menstruacion = models.DateField(help_text="Fecha de última menstruación")
     semana_obstetrica = models.IntegerField(
-        help_text="Semana de gestación",
+        help_text="Semana de gestación al registro (la vigente se calcula desde la FUM)",
         validators=[MinValueValidator(0), MaxValueValidator(42)]
     )
     riesgo_obstetrico = models.CharField(max_length=50, blank=True, null=True, help_text="Clasificación de riesgo")
     fecha_registro = models.DateTimeField(auto_now_add=True, help_text="Fecha de registro")
     fecha_actualizacion = models.DateTimeField(auto_now=True, help_text="Última actualización")
     
+    objects = EmbarazoQuerySet.as_manager()
+    
     class Meta:
         db_table = 'embarazo'
         verbose_name = 'Embarazo'
         verbose_name_plural = 'Embarazos'
         ordering = ['-fecha_registro']
         unique_together = ('fk_madre', 'fecha_ultima_menstruacion')
+        indexes = [
+            models.Index(fields=['-fecha_registro'], name='embarazo_registro_idx'),
+            # Filtros por edad gestacional (?semanas_desde=/?semanas_hasta=), traducidos a rangos de FUM
+            models.Index(fields=['fecha_ultima_menstruacion'], name='embarazo_fum_idx'),
+        ]
     
     def __str__(self):
         return f"Embarazo {self.id_embarazo} - {self.fk_madre.nombre} ({self.semana_obstetrica}s)"
     
+    def edad_gestacional(self, hoy=None):
+        """
+        Semanas cumplidas desde la FUM a la fecha ``hoy`` (por defecto, hoy),
+        o None si el embarazo no está en curso (FUM futura o de hace más de
+        SEMANAS_MAXIMAS semanas, o un parto de la madre desde la FUM).
+
+        Usa la anotación de EmbarazoQuerySet.con_edad_gestacional() si existe.
+        """
+        from .edad_gestacional import semanas_vigentes
+        if hoy is None and hasattr(self, 'semanas_gestacion'):
+            return self.semanas_gestacion
+        semanas = semanas_vigentes(self.fecha_ultima_menstruacion, hoy)
+        if semanas is None or self.termino_en_parto():
+            return None
+        return semanas
+
+    def termino_en_parto(self):
+        """Indica si la madre tiene un parto en la fecha de la FUM o después."""
+        if not hasattr(self, '_termino_en_parto'):
+            self._termino_en_parto = Parto.objects.filter(
+                fk_madre_id=self.fk_madre_id, fecha_parto__date__gte=self.fecha_ultima_menstruacion,
+            ).exists()
+        return self._termino_en_parto
+    
     def obtener_trimestre(self):
         """Retorna el trimestre actual del embarazo."""
-        if self.semana_obstetrica is None:
-            return None
-        if self.semana_obstetrica <= 12:
-            return 1
-        elif self.semana_obstetrica <= 27:
-            return 2
-        else:
-            return 3
+        from .edad_gestacional import trimestre
+        return trimestre(self.edad_gestacional())
     
     def es_embarazo_viables(self):
         """Verifica si es un embarazo viable (>= 20 semanas)."""
-        if self.semana_obstetrica is None:
+        from .edad_gestacional import SEMANAS_VIABILIDAD
+        semanas = self.edad_gestacional()
+        if semanas is None:
             return None
-        return self.semana_obstetrica >= 20
+        return semanas >= SEMANAS_VIABILIDAD
+
+
+class PartoQuerySet(models.QuerySet):
+    """QuerySet de Parto con indicadores anotados para listados sin N+1."""
+
+    def con_indicadores(self):
+        """
+        Anota por parto, como subconsultas correlacionadas (sin multiplicar filas):
+
+        - tiene_complicaciones: Exists() sobre parto_complicacion
+        - total_complicaciones / total_anestesias: cantidades (0 si no hay)
+        """
+        def contar(modelo):
+            return Coalesce(
+                Subquery(
+                    modelo.objects.filter(fk_parto=OuterRef('pk'))
+                    .order_by().values('fk_parto')
+                    .annotate(total=Count('*')).values('total'),
+                    output_field=models.IntegerField(),
+                ),
+                0,
+            )
+
+        return self.annotate(
+            tiene_complicaciones=Exists(PartoComplicacion.objects.filter(fk_parto=OuterRef('pk'))),
+            total_complicaciones=contar(PartoComplicacion),
+            total_anestesias=contar(PartoAnestesia),
+        )
+
+    def con_detalle(self):
+        """
+        Indicadores + relaciones que usa PartoDetailSerializer, en un número
+        fijo de consultas sin importar cuántos partos se serialicen.
+        """
+        return self.con_indicadores().select_related(
+            'fk_madre', 'fk_tipo_parto', 'fk_profesional_responsable', 'fk_clasificacion_robson',
+            'fk_robson_calculado',
+        ).prefetch_related(
+            models.Prefetch('complicaciones', queryset=PartoComplicacion.objects.select_related('fk_complicacion')),
+            'anestesias',
+        )
 
 
 class Parto(models.Model):
@@ -110,6 +198,16 @@ class Parto(models.Model):
         ('cesarea', 'Cesárea'),
         ('instrumental', 'Parto Instrumental'),
     ]
+    PRESENTACION_CHOICES = [
+        ('cefalica', 'Cefálica'),
+        ('podalica', 'Podálica'),
+        ('transversa', 'Transversa u oblicua'),
+    ]
+    INICIO_TRABAJO_PARTO_CHOICES = [
+        ('espontaneo', 'Espontáneo'),
+        ('inducido', 'Inducido'),
+        ('cesarea_electiva', 'Cesárea antes del trabajo de parto'),
+    ]
     
     id_parto = models.AutoField(primary_key=True)
     fk_madre = models.ForeignKey(MadrePaciente, on_delete=models.CASCADE, db_column='fk_madre', related_name='partos', help_text="Madre paciente")
@@ -120,6 +218,18 @@ class Parto(models.Model):
         CatRobson, on_delete=models.PROTECT, null=True, blank=True, 
         db_column='fk_clasificacion_robson', help_text="Clasificación de Robson"
     )
+    presentacion = models.CharField(
+        max_length=20, choices=PRESENTACION_CHOICES, null=True, blank=True, help_text="Presentación fetal al parto"
+    )
+    inicio_trabajo_parto = models.CharField(
+        max_length=20, choices=INICIO_TRABAJO_PARTO_CHOICES, null=True, blank=True,
+        help_text="Inicio del trabajo de parto (cesárea_electiva: cesárea antes del trabajo de parto)"
+    )
+    cesareas_previas = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Cantidad de cesáreas anteriores")
+    fk_robson_calculado = models.ForeignKey(
+        CatRobson, on_delete=models.PROTECT, null=True, blank=True, editable=False, related_name='+',
+        db_column='fk_robson_calculado', help_text="Grupo de Robson calculado (maternity/robson.py)"
+    )
     fk_profesional_responsable = models.ForeignKey(Usuario, on_delete=models.PROTECT, db_column='fk_profesional_responsable', help_text="Profesional responsable del parto")
     plan_de_parto = models.BooleanField(default=False, help_text="¿Existe plan de parto?")
     libertad_movimiento = models.BooleanField(default=False, help_text="¿Tuvo libertad de movimiento?")
@@ -129,18 +239,75 @@ class Parto(models.Model):
     fecha_registro = models.DateTimeField(auto_now_add=True, help_text="Fecha de registro")
     fecha_actualizacion = models.DateTimeField(auto_now=True, help_text="Última actualización")
     
+    objects = PartoQuerySet.as_manager()
+    
     class Meta:
         db_table = 'parto'
         verbose_name = 'Parto'
         verbose_name_plural = 'Partos'
         ordering = ['-fecha_parto']
+        indexes = [
+            models.Index(fields=['fecha_parto']),
+            models.Index(fields=['fecha_actualizacion']),
+            # ?fk_tipo_parto= abarca un tercio de la tabla: sin este índice se ordena
+            # todo ese tercio para devolver una página (?fk_madre= son pocas filas
+            # por madre y le basta el índice de la FK)
+            models.Index(fields=['fk_tipo_parto', '-fecha_parto'], name='parto_tipo_fecha_idx'),
+        ]
     
     def __str__(self):
         return f"Parto {self.id_parto} - {self.fk_madre.nombre} - {self.fecha_parto.strftime('%Y-%m-%d')}"
     
     def tuvo_complicaciones(self):
-        """Verifica si el parto tuvo complicaciones registradas."""
+        """
+        Verifica si el parto tuvo complicaciones registradas.
+
+        Usa la anotación de PartoQuerySet.con_indicadores() o las complicaciones
+        ya precargadas cuando existen; si no, consulta la base de datos.
+        """
+        anotado = getattr(self, 'tiene_complicaciones', None)
+        if anotado is not None:
+            return bool(anotado)
+        precargadas = getattr(self, '_prefetched_objects_cache', {}).get('complicaciones')
+        if precargadas is not None:
+            return len(precargadas) > 0
         return self.complicaciones.exists()
+    
+    def cantidad_complicaciones(self):
+        """Cantidad de complicaciones (anotada por con_indicadores() si está disponible)."""
+        anotado = getattr(self, 'total_complicaciones', None)
+        if anotado is not None:
+            return anotado
+        return self.complicaciones.count()
+    
+    def save(self, *args, **kwargs):
+        """Calcula el grupo de Robson y actualiza la discrepancia con el grupo manual."""
+        from .robson import catalogo_robson, grupo_para_parto, sincronizar_discrepancias
+
+        grupo = grupo_para_parto(self)
+        anterior = self.fk_robson_calculado_id
+        self.fk_robson_calculado_id = catalogo_robson()[grupo] if grupo is not None else None
+        nuevo = self._state.adding
+        super().save(*args, **kwargs)
+        # Sin grupo calculado no puede haber discrepancia; se limpia solo si antes la pudo haber
+        if self.fk_robson_calculado_id is not None or (not nuevo and anterior is not None):
+            sincronizar_discrepancias([(self.pk, self.fk_clasificacion_robson_id, self.fk_robson_calculado_id)])
+
+
+class DiscrepanciaRobson(models.Model):
+    """Parto cuyo grupo de Robson ingresado a mano difiere del calculado."""
+    fk_parto = models.OneToOneField(Parto, on_delete=models.CASCADE, primary_key=True, db_column='fk_parto', related_name='discrepancia_robson')
+    fk_robson_manual = models.ForeignKey(CatRobson, on_delete=models.PROTECT, db_column='fk_robson_manual', related_name='+')
+    fk_robson_calculado = models.ForeignKey(CatRobson, on_delete=models.PROTECT, db_column='fk_robson_calculado', related_name='+')
+    fecha_deteccion = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'parto_discrepancia_robson'
+        verbose_name = 'Discrepancia Robson'
+        verbose_name_plural = 'Discrepancias Robson'
+
+    def __str__(self):
+        return f"Parto {self.fk_parto_id}: manual {self.fk_robson_manual_id} / calculado {self.fk_robson_calculado_id}"
 
 
 class PartoComplicacion(models.Model):
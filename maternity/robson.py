@@ -0,0 +1,229 @@
+"""
+Clasificación de Robson (10 grupos, OMS 2017) calculada a partir del registro.
+
+Variables y su origen:
+
+- paridad: ``Embarazo.paridad`` (0 = nulípara)
+- cicatriz uterina: ``Parto.cesareas_previas``
+- número de fetos: ``Parto.es_parto_multiple``
+- presentación: ``Parto.presentacion``
+- inicio del trabajo de parto: ``Parto.inicio_trabajo_parto``
+- edad gestacional: semanas entre ``Embarazo.fecha_ultima_menstruacion`` y
+  ``Parto.fecha_parto`` (si el resultado no es plausible, ``semana_obstetrica``)
+
+El embarazo de un parto es el de la madre con la FUM más reciente que sea
+anterior al parto y esté dentro de ``SEMANAS_MAXIMAS`` semanas.
+
+El grupo calculado se guarda en ``Parto.fk_robson_calculado`` al guardar el
+parto y, para la historia completa, con ``manage.py recalcular_robson``, que
+clasifica por lotes (una consulta de partos, una de embarazos y un UPDATE por
+grupo en cada lote). Cuando el grupo ingresado a mano
+(``fk_clasificacion_robson``) no coincide con el calculado se registra una
+``DiscrepanciaRobson``.
+"""
+from bisect import bisect_right
+
+from django.db import transaction
+from django.utils import timezone
+
+GRUPOS_ROBSON = {
+    1: 'Nulíparas, embarazo único, cefálica, ≥37 semanas, trabajo de parto espontáneo',
+    2: 'Nulíparas, embarazo único, cefálica, ≥37 semanas, inducción o cesárea antes del trabajo de parto',
+    3: 'Multíparas sin cesárea previa, embarazo único, cefálica, ≥37 semanas, trabajo de parto espontáneo',
+    4: 'Multíparas sin cesárea previa, embarazo único, cefálica, ≥37 semanas, inducción o cesárea antes del trabajo de parto',
+    5: 'Con al menos una cesárea previa, embarazo único, cefálica, ≥37 semanas',
+    6: 'Nulíparas, embarazo único, podálica',
+    7: 'Multíparas, embarazo único, podálica (incluye cesárea previa)',
+    8: 'Embarazos múltiples (incluye cesárea previa)',
+    9: 'Embarazo único en situación transversa u oblicua (incluye cesárea previa)',
+    10: 'Embarazo único, cefálica, <37 semanas (incluye cesárea previa)',
+}
+
+SEMANAS_TERMINO = 37
+SEMANAS_MINIMAS = 20
+SEMANAS_MAXIMAS = 45
+
+TAMANO_LOTE = 2000
+
+
+def clasificar_robson(*, paridad, cesareas_previas, es_parto_multiple, presentacion, inicio_trabajo_parto, semanas):
+    """
+    Grupo de Robson (1 a 10), o ``None`` si faltan datos para decidirlo.
+    Solo se exigen los datos que el grupo necesita: un embarazo múltiple es
+    grupo 8 sin importar el resto, y una cesárea previa en un parto de
+    término, único y cefálico es grupo 5 aunque falte la paridad.
+    """
+    if es_parto_multiple:
+        return 8
+    if presentacion is None:
+        return None
+    if presentacion == 'transversa':
+        return 9
+    if presentacion == 'podalica':
+        if paridad is None:
+            return None
+        return 6 if paridad == 0 else 7
+    if semanas is None:
+        return None
+    if semanas < SEMANAS_TERMINO:
+        return 10
+    if cesareas_previas is None:
+        return None
+    if cesareas_previas > 0:
+        return 5
+    if paridad is None or inicio_trabajo_parto is None:
+        return None
+    espontaneo = inicio_trabajo_parto == 'espontaneo'
+    if paridad == 0:
+        return 1 if espontaneo else 2
+    return 3 if espontaneo else 4
+
+
+def dia_local(fecha_hora):
+    """Fecha calendario local de un datetime (los de ``values()`` vienen en UTC)."""
+    return timezone.localdate(fecha_hora) if timezone.is_aware(fecha_hora) else fecha_hora.date()
+
+
+def semanas_gestacion(fecha_ultima_menstruacion, semana_obstetrica, fecha_parto):
+    """Semanas cumplidas al parto según la FUM (o ``semana_obstetrica`` si no es plausible)."""
+    semanas = (dia_local(fecha_parto) - fecha_ultima_menstruacion).days // 7
+    if SEMANAS_MINIMAS <= semanas <= SEMANAS_MAXIMAS:
+        return semanas
+    return semana_obstetrica
+
+
+def catalogo_robson():
+    """{grupo: id_robson} de ``CatRobson``; crea los grupos que falten."""
+    from catalogs.models import CatRobson
+
+    ids = {}
+    for id_robson, grupo in CatRobson.objects.filter(grupo__in=[str(g) for g in GRUPOS_ROBSON]).values_list('id_robson', 'grupo'):
+        ids.setdefault(int(grupo), id_robson)
+    faltantes = [g for g in GRUPOS_ROBSON if g not in ids]
+    for grupo in faltantes:
+        ids[grupo] = CatRobson.objects.create(grupo=str(grupo), descripcion=GRUPOS_ROBSON[grupo]).id_robson
+    return ids
+
+
+class EmbarazosPorMadre:
+    """Embarazos de un conjunto de madres, ordenados por FUM, para buscar el de cada parto."""
+
+    def __init__(self, ids_madres):
+        from .models import Embarazo
+
+        self.por_madre = {}
+        filas = (
+            Embarazo.objects.filter(fk_madre__in=set(ids_madres))
+            .order_by('fk_madre', 'fecha_ultima_menstruacion')
+            .values_list('fk_madre', 'fecha_ultima_menstruacion', 'paridad', 'semana_obstetrica')
+        )
+        for fk_madre, fum, paridad, semana in filas:
+            self.por_madre.setdefault(fk_madre, []).append((fum, paridad, semana))
+        self.fums = {madre: [e[0] for e in embarazos] for madre, embarazos in self.por_madre.items()}
+
+    def para(self, fk_madre, fecha_parto):
+        """(paridad, semanas al parto) del embarazo que terminó en ``fecha_parto``, o (None, None)."""
+        fums = self.fums.get(fk_madre)
+        if not fums:
+            return None, None
+        posicion = bisect_right(fums, dia_local(fecha_parto)) - 1
+        if posicion < 0:
+            return None, None
+        fum, paridad, semana = self.por_madre[fk_madre][posicion]
+        if (dia_local(fecha_parto) - fum).days > SEMANAS_MAXIMAS * 7:
+            return None, None
+        return paridad, semanas_gestacion(fum, semana, fecha_parto)
+
+
+def grupo_para_parto(parto, embarazos=None):
+    """Grupo de Robson de un parto (instancia o fila ``values()``)."""
+    valor = parto.get if isinstance(parto, dict) else lambda campo: getattr(parto, campo)
+    if embarazos is None:
+        embarazos = EmbarazosPorMadre([valor('fk_madre_id')])
+    paridad, semanas = embarazos.para(valor('fk_madre_id'), valor('fecha_parto'))
+    return clasificar_robson(
+        paridad=paridad,
+        cesareas_previas=valor('cesareas_previas'),
+        es_parto_multiple=valor('es_parto_multiple'),
+        presentacion=valor('presentacion'),
+        inicio_trabajo_parto=valor('inicio_trabajo_parto'),
+        semanas=semanas,
+    )
+
+
+def sincronizar_discrepancias(partos):
+    """
+    Deja en ``DiscrepanciaRobson`` exactamente los partos (de la lista de
+    tuplas ``(id_parto, id_robson_manual, id_robson_calculado)``) en que el
+    grupo manual y el calculado difieren. Se comparan los grupos, no los ids:
+    el catálogo puede tener más de una fila por grupo. Retorna cuántas hay.
+    """
+    from catalogs.models import CatRobson
+    from .models import DiscrepanciaRobson
+
+    comparables = [p for p in partos if p[1] is not None and p[2] is not None and p[1] != p[2]]
+    grupos = {}
+    if comparables:
+        ids = {p[1] for p in comparables} | {p[2] for p in comparables}
+        grupos = dict(CatRobson.objects.filter(pk__in=ids).values_list('id_robson', 'grupo'))
+    discrepancias = [
+        DiscrepanciaRobson(fk_parto_id=id_parto, fk_robson_manual_id=manual, fk_robson_calculado_id=calculado)
+        for id_parto, manual, calculado in comparables
+        if grupos.get(manual, '').strip().lower() != grupos.get(calculado, '').strip().lower()
+    ]
+    DiscrepanciaRobson.objects.filter(fk_parto_id__in=[p[0] for p in partos]).delete()
+    DiscrepanciaRobson.objects.bulk_create(discrepancias)
+    return len(discrepancias)
+
+
+def recalcular_robson(queryset=None, tamano_lote=TAMANO_LOTE):
+    """
+    Clasifica todos los partos de ``queryset`` por lotes de ``tamano_lote``
+    (recorridos por ``id_parto``) y actualiza ``fk_robson_calculado`` y las
+    discrepancias.
+
+    Returns:
+        dict con procesados, clasificados, actualizados y discrepancias
+    """
+    from sync.cambios import registrar_cambios
+    from sync.outbox import ACTUALIZAR, registrar_eventos
+    from .models import Parto
+
+    queryset = queryset if queryset is not None else Parto.objects.all()
+    campos = (
+        'id_parto', 'fk_madre_id', 'fecha_parto', 'es_parto_multiple', 'presentacion', 'inicio_trabajo_parto',
+        'cesareas_previas', 'fk_clasificacion_robson_id', 'fk_robson_calculado_id',
+    )
+    catalogo = catalogo_robson()
+    resumen = {'procesados': 0, 'clasificados': 0, 'actualizados': 0, 'discrepancias': 0}
+    ultimo_id = 0
+    while True:
+        filas = list(queryset.filter(id_parto__gt=ultimo_id).order_by('id_parto').values(*campos)[:tamano_lote])
+        if not filas:
+            return resumen
+        ultimo_id = filas[-1]['id_parto']
+        embarazos = EmbarazosPorMadre(fila['fk_madre_id'] for fila in filas)
+
+        cambios = {}
+        estado = []
+        for fila in filas:
+            grupo = grupo_para_parto(fila, embarazos)
+            calculado = catalogo[grupo] if grupo is not None else None
+            if calculado != fila['fk_robson_calculado_id']:
+                cambios.setdefault(calculado, []).append(fila['id_parto'])
+            estado.append((fila['id_parto'], fila['fk_clasificacion_robson_id'], calculado))
+            resumen['clasificados'] += grupo is not None
+
+        with transaction.atomic():
+            # Un UPDATE por grupo, no uno por parto (fecha_actualizacion avisa al cubo de indicadores)
+            for calculado, ids in cambios.items():
+                Parto.objects.filter(id_parto__in=ids).update(
+                    fk_robson_calculado_id=calculado, fecha_actualizacion=timezone.now(),
+                )
+            # Sin señales: las tablets y las integraciones se enteran por el registro de cambios y la outbox
+            actualizados = [id_parto for ids in cambios.values() for id_parto in ids]
+            registrar_cambios(Parto, actualizados)
+            registrar_eventos(Parto, Parto.objects.filter(id_parto__in=actualizados), ACTUALIZAR)
+            resumen['discrepancias'] += sincronizar_discrepancias(estado)
+        resumen['procesados'] += len(filas)
+        resumen['actualizados'] += sum(len(ids) for ids in cambios.values())
@@ -1,12 +1,21 @@
 from rest_framework import serializers
+from core.sparse_fields import CamposDinamicosMixin
 from .models import (
     MadrePaciente, Embarazo, Parto, PartoComplicacion, 
     PartoAnestesia, IVEAtencion, IVEAcompanamiento, AltaAnticonceptivo
 )
 
 
-class MadrePacienteSerializer(serializers.ModelSerializer):
+class MadrePacienteSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador para modelo MadrePaciente con campos relacionados."""
+    campos_expandibles = {
+        'fk_nacionalidad': 'catalogs.serializers.CatNacionalidadSerializer',
+        'fk_pueblo_originario': 'catalogs.serializers.CatPuebloOriginarioSerializer',
+    }
+    dependencias_calculados = {
+        'edad': ['fecha_nacimiento'],
+        'nombre_completo': ['nombre', 'apellido_paterno', 'apellido_materno'],
+    }
     nacionalidad_nombre = serializers.CharField(source='fk_nacionalidad.nombre', read_only=True)
     pueblo_originario_nombre = serializers.CharField(source='fk_pueblo_originario.nombre', read_only=True)
     edad = serializers.SerializerMethodField()
@@ -35,10 +44,17 @@ class MadrePacienteSerializer(serializers.ModelSerializer):
         return obj.nombre_completo()
 
 
-class EmbarazoSerializer(serializers.ModelSerializer):
+class EmbarazoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador para modelo Embarazo con datos de madre."""
+    campos_expandibles = {'fk_madre': 'maternity.serializers.MadrePacienteSerializer'}
+    dependencias_calculados = {
+        'semanas_gestacion': ['fecha_ultima_menstruacion'],
+        'trimestre': ['fecha_ultima_menstruacion'],
+        'viable': ['fecha_ultima_menstruacion'],
+    }
     madre_nombre = serializers.CharField(source='fk_madre.nombre', read_only=True)
     madre_run = serializers.CharField(source='fk_madre.run', read_only=True)
+    semanas_gestacion = serializers.SerializerMethodField()
     trimestre = serializers.SerializerMethodField()
     viable = serializers.SerializerMethodField()
     
@@ -46,11 +62,15 @@ class EmbarazoSerializer(serializers.ModelSerializer):
         model = Embarazo
         fields = [
             'id_embarazo', 'fk_madre', 'madre_nombre', 'madre_run',
-            'fecha_ultima_menstruacion', 'semana_obstetrica', 'trimestre',
+            'fecha_ultima_menstruacion', 'semana_obstetrica', 'semanas_gestacion', 'trimestre',
             'viable', 'fecha_registro', 'fecha_actualizacion'
         ]
         read_only_fields = ['fecha_registro', 'fecha_actualizacion']
     
+    def get_semanas_gestacion(self, obj):
+        """Retorna semanas cumplidas hoy según la FUM."""
+        return obj.edad_gestacional()
+    
     def get_trimestre(self, obj):
         """Retorna trimestre actual."""
         return obj.obtener_trimestre()
@@ -60,8 +80,9 @@ class EmbarazoSerializer(serializers.ModelSerializer):
         return obj.es_embarazo_viables()
 
 
-class PartoComplicacionSerializer(serializers.ModelSerializer):
+class PartoComplicacionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador para complicaciones de parto."""
+    campos_expandibles = {'fk_complicacion': 'catalogs.serializers.CatComplicacionPartoSerializer'}
     complicacion_nombre = serializers.CharField(source='fk_complicacion.nombre', read_only=True)
     
     class Meta:
@@ -73,7 +94,7 @@ class PartoComplicacionSerializer(serializers.ModelSerializer):
         read_only_fields = ['fecha_registro']
 
 
-class PartoAnestesiaSerializer(serializers.ModelSerializer):
+class PartoAnestesiaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador para anestesia de parto."""
     tipo_anestesia_display = serializers.CharField(source='get_tipo_anestesia_display', read_only=True)
     
@@ -86,13 +107,21 @@ class PartoAnestesiaSerializer(serializers.ModelSerializer):
         read_only_fields = ['fecha_registro']
 
 
-class PartoDetailSerializer(serializers.ModelSerializer):
+class PartoDetailSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador detallado para Parto con complicaciones y anestesias anidadas."""
+    campos_expandibles = {
+        'fk_madre': 'maternity.serializers.MadrePacienteSerializer',
+        'fk_tipo_parto': 'catalogs.serializers.CatTipoPartoSerializer',
+        'fk_clasificacion_robson': 'catalogs.serializers.CatRobsonSerializer',
+    }
+    # Usa la anotación de PartoQuerySet.con_indicadores(), no columnas propias
+    dependencias_calculados = {'tuvo_complicaciones': []}
     madre_nombre = serializers.CharField(source='fk_madre.nombre', read_only=True)
     madre_run = serializers.CharField(source='fk_madre.run', read_only=True)
     tipo_parto_nombre = serializers.CharField(source='fk_tipo_parto.nombre', read_only=True)
     profesional_nombre = serializers.CharField(source='fk_profesional_responsable.nombre_completo', read_only=True)
     clasificacion_robson_grupo = serializers.CharField(source='fk_clasificacion_robson.grupo', read_only=True)
+    robson_calculado_grupo = serializers.CharField(source='fk_robson_calculado.grupo', read_only=True)
     complicaciones = PartoComplicacionSerializer( many=True, read_only=True)
     anestesias = PartoAnestesiaSerializer(many=True, read_only=True)
     tuvo_complicaciones = serializers.SerializerMethodField()
@@ -103,6 +132,8 @@ class PartoDetailSerializer(serializers.ModelSerializer):
             'id_parto', 'fk_madre', 'madre_nombre', 'madre_run',
             'fk_tipo_parto', 'tipo_parto_nombre', 'fk_profesional_responsable',
             'profesional_nombre', 'fk_clasificacion_robson', 'clasificacion_robson_grupo',
+            'es_parto_multiple', 'presentacion', 'inicio_trabajo_parto', 'cesareas_previas',
+            'fk_robson_calculado', 'robson_calculado_grupo',
             'horas_trabajo_parto', 'complicaciones', 'anestesias', 'tuvo_complicaciones',
             'fecha_parto', 'fecha_registro', 'fecha_actualizacion'
         ]
@@ -113,8 +144,12 @@ class PartoDetailSerializer(serializers.ModelSerializer):
         return obj.tuvo_complicaciones()
 
 
-class PartoSerializer(serializers.ModelSerializer):
+class PartoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador para Parto (sin nidación de complicaciones)."""
+    campos_expandibles = {
+        'fk_madre': 'maternity.serializers.MadrePacienteSerializer',
+        'fk_tipo_parto': 'catalogs.serializers.CatTipoPartoSerializer',
+    }
     madre_nombre = serializers.CharField(source='fk_madre.nombre', read_only=True)
     madre_run = serializers.CharField(source='fk_madre.run', read_only=True)
     tipo_parto_nombre = serializers.CharField(source='fk_tipo_parto.nombre', read_only=True)
@@ -126,12 +161,14 @@ class PartoSerializer(serializers.ModelSerializer):
             'id_parto', 'fk_madre', 'madre_nombre', 'madre_run',
             'fk_tipo_parto', 'tipo_parto_nombre', 'fk_profesional_responsable',
             'profesional_nombre', 'horas_trabajo_parto',
+            'es_parto_multiple', 'presentacion', 'inicio_trabajo_parto', 'cesareas_previas',
+            'fk_clasificacion_robson', 'fk_robson_calculado',
             'fecha_parto', 'fecha_registro', 'fecha_actualizacion'
         ]
         read_only_fields = ['fecha_registro', 'fecha_actualizacion']
 
 
-class IVEAcompanamientoSerializer(serializers.ModelSerializer):
+class IVEAcompanamientoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador para acompañamiento de IVE."""
     tipo_profesional_display = serializers.CharField(source='get_tipo_profesional_display', read_only=True)
     
@@ -144,8 +181,9 @@ class IVEAcompanamientoSerializer(serializers.ModelSerializer):
         read_only_fields = ['fecha_atencion']
 
 
-class IVEAtencionDetailSerializer(serializers.ModelSerializer):
+class IVEAtencionDetailSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador detallado para IVE con acompañamientos anidados."""
+    campos_expandibles = {'fk_madre': 'maternity.serializers.MadrePacienteSerializer'}
     madre_nombre = serializers.CharField(source='fk_madre.nombre', read_only=True)
     madre_run = serializers.CharField(source='fk_madre.run', read_only=True)
     acompañamientos = IVEAcompanamientoSerializer(many=True, read_only=True)
@@ -160,7 +198,7 @@ class IVEAtencionDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['fecha_atencion']
 
 
-class IVEAtencionSerializer(serializers.ModelSerializer):
+class IVEAtencionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador para IVE (sin nidación de acompañamientos)."""
     madre_nombre = serializers.CharField(source='fk_madre.nombre', read_only=True)
     madre_run = serializers.CharField(source='fk_madre.run', read_only=True)
@@ -174,7 +212,7 @@ class IVEAtencionSerializer(serializers.ModelSerializer):
         read_only_fields = ['fecha_atencion']
 
 
-class AltaAnticonceptivoSerializer(serializers.ModelSerializer):
+class AltaAnticonceptivoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializador para Alta con Anticonceptivo."""
     tipo_alta_display = serializers.CharField(source='get_tipo_alta_display', read_only=True)
     metodo_display = serializers.CharField(source='get_fk_metodo_anticonceptivo_display', read_only=True)
@@ -189,7 +227,7 @@ class AltaAnticonceptivoSerializer(serializers.ModelSerializer):
         read_only_fields = ['fecha_registro']
 
 
-class IVEAtencionSerializer(serializers.ModelSerializer):
+class IVEAtencionSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     madre_nombre = serializers.CharField(source='fk_madre.nombre', read_only=True)
     madre_run = serializers.CharField(source='fk_madre.run', read_only=True)
     
@@ -198,7 +236,7 @@ class IVEAtencionSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class IVEAcompanamientoSerializer(serializers.ModelSerializer):
+class IVEAcompanamientoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     ive_id = serializers.IntegerField(source='fk_ive_atencion.id_ive_atencion', read_only=True)
     
     class Meta:
@@ -206,7 +244,7 @@ class IVEAcompanamientoSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class AltaAnticonceptivoSerializer(serializers.ModelSerializer):
+class AltaAnticonceptivoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     class Meta:
         model = AltaAnticonceptivo
         fields = '__all__'
\ No newline at end of file
@@ -4,6 +4,7 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 from datetime import date, datetime, timedelta
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 from .models import (
     MadrePaciente, Embarazo, Parto, PartoComplicacion,
@@ -154,6 +155,72 @@ class EmbarazoTestCase(TestCase):
         )
         self.assertTrue(embarazo_viable.es_embarazo_viables())
 
+    def test_edad_gestacional_desde_fum(self):
+        """La edad gestacional sale de la FUM, no de la semana informada al registrar."""
+        embarazo = Embarazo.objects.create(
+            fk_madre=self.madre, fecha_ultima_menstruacion=date.today() - timedelta(weeks=30, days=6),
+            semana_obstetrica=10, paridad=0,
+        )
+        self.assertEqual(embarazo.edad_gestacional(), 30)
+        self.assertEqual(embarazo.obtener_trimestre(), 3)
+        self.assertTrue(embarazo.es_embarazo_viables())
+        self.assertEqual(embarazo.edad_gestacional(hoy=date.today() + timedelta(days=1)), 31)
+
+    def test_embarazo_no_vigente(self):
+        """FUM antigua, FUM futura o parto posterior a la FUM: sin edad gestacional, trimestre ni viabilidad."""
+        hoy = date.today()
+        antigua = Embarazo.objects.create(
+            fk_madre=self.madre, fecha_ultima_menstruacion=hoy - timedelta(weeks=60), semana_obstetrica=10, paridad=0,
+        )
+        futura = Embarazo.objects.create(
+            fk_madre=self.madre, fecha_ultima_menstruacion=hoy + timedelta(days=10), semana_obstetrica=0, paridad=0,
+        )
+        for embarazo in (antigua, futura):
+            self.assertIsNone(embarazo.edad_gestacional())
+            self.assertIsNone(embarazo.obtener_trimestre())
+            self.assertIsNone(embarazo.es_embarazo_viables())
+
+        en_curso = Embarazo.objects.create(
+            fk_madre=self.madre, fecha_ultima_menstruacion=hoy - timedelta(weeks=39), semana_obstetrica=30, paridad=0,
+        )
+        self.assertEqual(en_curso.edad_gestacional(), 39)
+        Parto.objects.create(
+            fk_madre=self.madre, fk_tipo_parto=CatTipoParto.objects.create(nombre='Vaginal'),
+            fk_profesional_responsable=Usuario.objects.create_user(run='15000000-9', password='x'),
+            fecha_parto=timezone.now() - timedelta(days=1),
+        )
+        self.assertIsNone(Embarazo.objects.get(pk=en_curso.pk).edad_gestacional())
+        # La FUM futura es posterior al parto: sigue sin edad gestacional por ser futura
+        anotados = {e.pk: e for e in Embarazo.objects.con_edad_gestacional()}
+        for embarazo in (antigua, futura, en_curso):
+            self.assertIsNone(anotados[embarazo.pk].semanas_gestacion)
+            self.assertIsNone(anotados[embarazo.pk].trimestre)
+            self.assertIsNone(anotados[embarazo.pk].viable)
+        self.assertFalse(Embarazo.objects.por_semanas().exists())
+
+    def test_anotacion_igual_al_calculo_en_python(self):
+        """con_edad_gestacional() y por_semanas() coinciden con los métodos del modelo en cada borde."""
+        hoy = date.today()
+        for dias in (-8, -1, 0, 6, 7, 90, 91, 139, 140, 195, 196, 300, 321, 322, 400):
+            Embarazo.objects.create(
+                fk_madre=self.madre, fecha_ultima_menstruacion=hoy - timedelta(days=dias),
+                semana_obstetrica=0, paridad=0,
+            )
+        for embarazo in Embarazo.objects.con_edad_gestacional():
+            esperado = Embarazo.objects.get(pk=embarazo.pk)
+            self.assertEqual(embarazo.semanas_gestacion, esperado.edad_gestacional())
+            self.assertEqual(embarazo.trimestre, esperado.obtener_trimestre())
+            self.assertEqual(embarazo.viable, esperado.es_embarazo_viables())
+
+        for desde, hasta in ((None, 0), (1, 19), (20, None), (13, 27), (28, 28), (None, None), (45, 60)):
+            filtrados = {e.pk for e in Embarazo.objects.por_semanas(desde, hasta)}
+            esperados = {
+                e.pk for e in Embarazo.objects.all()
+                if e.edad_gestacional() is not None
+                and (desde is None or e.edad_gestacional() >= desde) and (hasta is None or e.edad_gestacional() <= hasta)
+            }
+            self.assertEqual(filtrados, esperados, (desde, hasta))
+
 
 class PartoTestCase(TestCase):
     """Pruebas para modelo Parto."""
@@ -422,3 +489,304 @@ class AltaAnticonceptivoTestCase(TestCase):
             esterilizacion_quirurgica=True
         )
         self.assertTrue(alta.esterilizacion_quirurgica)
+
+
+class ListaRapidaContratoTestCase(APITestCase):
+    """Contrato: los listados rápidos (.values()) son idénticos byte a byte a los serializers."""
+
+    def setUp(self):
+        from core.models import Rol, Permiso, RolPermiso
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        self.pueblo = CatPuebloOriginario.objects.create(nombre='Mapuche')
+        self.tipo_parto = CatTipoParto.objects.create(nombre='Vaginal')
+        rol = Rol.objects.create(nombre_rol='medico')
+        for codigo in ('maternity:mother:read', 'maternity:delivery:read'):
+            permiso = Permiso.objects.create(codigo_permiso=codigo, categoria='maternity')
+            RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        self.usuario = Usuario.objects.create_user(
+            run='15000000-9', email='medico@hospital.com', password='testpass123',
+            nombre_completo='Dra. Rosa Muñoz', fk_rol=rol
+        )
+
+        hoy = date.today()
+        # Cumpleaños hoy, mañana y ayer para cubrir el borde del cálculo de edad
+        nacimientos = [
+            date(hoy.year - 30, hoy.month, min(hoy.day, 28)),
+            date(1990, 2, 28), date(1985, 12, 31), date(2000, 1, 1),
+        ]
+        self.madres = []
+        for i, nacimiento in enumerate(nacimientos):
+            self.madres.append(MadrePaciente.objects.create(
+                run=f'1000000{i}-{i}', nombre=f'Madre{i}', apellido_paterno='Pérez',
+                apellido_materno='Núñez', fecha_nacimiento=nacimiento,
+                fk_nacionalidad=self.nacionalidad,
+                fk_pueblo_originario=self.pueblo if i % 2 else None,
+            ))
+        # Semanas en los bordes de trimestre y viabilidad
+        for i, semana in enumerate([0, 12, 13, 19, 20, 27, 28, 42]):
+            Embarazo.objects.create(
+                fk_madre=self.madres[i % 4], paridad=0, semana_obstetrica=semana,
+                fecha_ultima_menstruacion=hoy - timedelta(weeks=semana, days=i),
+            )
+        # Partos de hace 24 semanas: terminan los embarazos con FUM anterior (semanas 27 y 28)
+        for i, horas in enumerate([0, 5.5, 12.25]):
+            Parto.objects.create(
+                fk_madre=self.madres[i], fk_tipo_parto=self.tipo_parto,
+                fk_profesional_responsable=self.usuario, horas_trabajo_parto=horas,
+                fecha_parto=timezone.now() - timedelta(weeks=24, days=i, microseconds=123456),
+            )
+
+    def _assert_identico(self, serializador_rapido, queryset):
+        from rest_framework.renderers import JSONRenderer
+        esperado = serializador_rapido.serializer_class(queryset, many=True).data
+        obtenido = serializador_rapido.serializar(serializador_rapido.preparar(queryset))
+        self.assertEqual(JSONRenderer().render(obtenido), JSONRenderer().render(esperado))
+
+    def test_madres_identico(self):
+        from .fast_serializers import MadrePacienteValores
+        self._assert_identico(MadrePacienteValores(), MadrePaciente.objects.all())
+
+    def test_embarazos_identico(self):
+        from .fast_serializers import EmbarazoValores
+        self._assert_identico(EmbarazoValores(), Embarazo.objects.all())
+
+    def test_partos_identico(self):
+        from .fast_serializers import PartoValores
+        self._assert_identico(PartoValores(), Parto.objects.all())
+
+    def test_filtro_por_semanas(self):
+        """?semanas_desde=/?semanas_hasta= filtran por la edad gestacional de hoy en la ruta rápida."""
+        self.client.force_authenticate(self.usuario)
+        response = self.client.get('/api/maternity/embarazos/', {'semanas_desde': 20, 'semanas_hasta': 28})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([e['semanas_gestacion'] for e in response.data['results']], [20])
+        self.assertEqual({e['viable'] for e in response.data['results']}, {True})
+        response = self.client.get('/api/maternity/embarazos/', {'ordering': 'fecha_ultima_menstruacion'})
+        self.assertEqual(
+            [e['semanas_gestacion'] for e in response.data['results']], [43, None, None, 20, 19, 13, 12, 0],
+        )
+        response = self.client.get('/api/maternity/embarazos/', {'semanas_desde': 'treinta'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_endpoint_lista_usa_ruta_rapida(self):
+        """El listado paginado es igual al serializer y usa consultas constantes."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .serializers import PartoSerializer
+        self.client.force_authenticate(self.usuario)
+
+        response = self.client.get('/api/maternity/partos/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(
+            list(response.data['results']),
+            list(PartoSerializer(Parto.objects.all(), many=True).data),
+        )
+
+        with CaptureQueriesContext(connection) as pocas:
+            self.client.get('/api/maternity/partos/?page=1')
+        for i in range(10):
+            Parto.objects.create(
+                fk_madre=self.madres[i % 4], fk_tipo_parto=self.tipo_parto,
+                fk_profesional_responsable=self.usuario, fecha_parto=timezone.now(),
+            )
+        with CaptureQueriesContext(connection) as muchas:
+            self.client.get('/api/maternity/partos/?page=1&ordering=fecha_parto')
+        self.assertEqual(len(muchas), len(pocas))
+
+
+class PartoIndicadoresTestCase(APITestCase):
+    """Indicadores de complicaciones anotados en lugar de exists() por fila."""
+
+    def setUp(self):
+        from core.models import Rol, Permiso, RolPermiso
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        self.tipo_parto = CatTipoParto.objects.create(nombre='Vaginal')
+        self.hpp = CatComplicacionParto.objects.create(nombre='HPP')
+        self.preeclampsia = CatComplicacionParto.objects.create(nombre='Preeclampsia')
+        rol = Rol.objects.create(nombre_rol='medico')
+        permiso = Permiso.objects.create(codigo_permiso='maternity:mother:read', categoria='maternity')
+        RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        self.usuario = Usuario.objects.create_user(
+            run='15000000-9', email='medico@hospital.com', password='testpass123',
+            nombre_completo='Dra. Rosa Muñoz', fk_rol=rol
+        )
+        self.madre = MadrePaciente.objects.create(
+            run='11111111-1', nombre='Ana', apellido_paterno='Pérez', apellido_materno='Silva',
+            fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=self.nacionalidad,
+        )
+
+    def _crear_parto(self, complicaciones=(), anestesias=()):
+        parto = Parto.objects.create(
+            fk_madre=self.madre, fk_tipo_parto=self.tipo_parto,
+            fk_profesional_responsable=self.usuario, fecha_parto=timezone.now(),
+        )
+        for complicacion in complicaciones:
+            PartoComplicacion.objects.create(fk_parto=parto, fk_complicacion=complicacion)
+        for tipo in anestesias:
+            PartoAnestesia.objects.create(fk_parto=parto, tipo_anestesia=tipo)
+        return parto
+
+    def test_anotaciones(self):
+        """con_indicadores() anota flag y cantidades sin duplicar filas."""
+        con = self._crear_parto([self.hpp, self.preeclampsia], ['epidural'])
+        sin = self._crear_parto()
+        partos = {p.pk: p for p in Parto.objects.con_indicadores()}
+        self.assertEqual(len(partos), 2)
+        self.assertTrue(partos[con.pk].tiene_complicaciones)
+        self.assertEqual(partos[con.pk].total_complicaciones, 2)
+        self.assertEqual(partos[con.pk].total_anestesias, 1)
+        self.assertFalse(partos[sin.pk].tiene_complicaciones)
+        self.assertEqual(partos[sin.pk].total_complicaciones, 0)
+
+    def test_metodo_usa_anotacion(self):
+        """tuvo_complicaciones() no consulta cuando el queryset trae la anotación."""
+        self._crear_parto([self.hpp])
+        parto = Parto.objects.con_indicadores().get()
+        with self.assertNumQueries(0):
+            self.assertTrue(parto.tuvo_complicaciones())
+            self.assertEqual(parto.cantidad_complicaciones(), 1)
+        # Sin anotación mantiene el comportamiento anterior
+        self.assertTrue(Parto.objects.get().tuvo_complicaciones())
+
+    def test_partos_de_madre_consultas_constantes(self):
+        """GET /madres/{id}/partos/ usa las mismas consultas con 1 o 5 partos."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        self.client.force_authenticate(self.usuario)
+        url = f'/api/maternity/madres/{self.madre.pk}/partos/'
+
+        self._crear_parto([self.hpp], ['epidural'])
+        with CaptureQueriesContext(connection) as uno:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for _ in range(4):
+            self._crear_parto([self.hpp, self.preeclampsia], ['local', 'epidural'])
+        self._crear_parto()
+        with CaptureQueriesContext(connection) as seis:
+            response = self.client.get(url)
+        self.assertEqual(len(seis), len(uno))
+        self.assertEqual(len(response.data), 6)
+        self.assertEqual(sum(p['tuvo_complicaciones'] for p in response.data), 5)
+        nombres = {c['complicacion_nombre'] for p in response.data for c in p['complicaciones']}
+        self.assertEqual(nombres, {'HPP', 'Preeclampsia'})
+
+
+class RobsonTestCase(TestCase):
+    """Pruebas de la clasificación de Robson calculada."""
+
+    def setUp(self):
+        nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        self.tipo_parto = CatTipoParto.objects.create(nombre='Vaginal')
+        self.profesional = Usuario.objects.create_user(run='15000000-9', password='x', nombre_completo='Matrona')
+        self.fecha_parto = timezone.make_aware(datetime(2024, 6, 15, 10))
+        self.madres = [
+            MadrePaciente.objects.create(
+                run=f'{20000000 + i}-K', nombre=f'Madre{i}', apellido_paterno='Rojas', apellido_materno='Soto',
+                fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=nacionalidad,
+            )
+            for i in range(4)
+        ]
+
+    def crear_parto(self, madre, paridad=0, semanas=39, **datos):
+        Embarazo.objects.create(
+            fk_madre=madre, paridad=paridad, semana_obstetrica=12,
+            fecha_ultima_menstruacion=self.fecha_parto.date() - timedelta(weeks=semanas, days=2),
+        )
+        return Parto.objects.create(
+            fk_madre=madre, fk_tipo_parto=self.tipo_parto, fk_profesional_responsable=self.profesional,
+            fecha_parto=self.fecha_parto, **datos,
+        )
+
+    def test_clasificador(self):
+        from .robson import clasificar_robson
+        casos = [
+            # (paridad, cesáreas previas, múltiple, presentación, inicio, semanas) -> grupo
+            ((0, 0, False, 'cefalica', 'espontaneo', 39), 1),
+            ((0, 0, False, 'cefalica', 'inducido', 40), 2),
+            ((0, 0, False, 'cefalica', 'cesarea_electiva', 38), 2),
+            ((2, 0, False, 'cefalica', 'espontaneo', 39), 3),
+            ((1, 0, False, 'cefalica', 'inducido', 37), 4),
+            ((1, 1, False, 'cefalica', 'espontaneo', 39), 5),
+            ((None, 1, False, 'cefalica', None, 38), 5),
+            ((0, None, False, 'podalica', None, 39), 6),
+            ((3, 1, False, 'podalica', None, 33), 7),
+            ((None, None, True, None, None, None), 8),
+            ((1, 2, False, 'transversa', None, 30), 9),
+            ((0, 1, False, 'cefalica', 'espontaneo', 34), 10),
+            ((0, None, False, 'cefalica', 'espontaneo', 39), None),
+            ((None, 0, False, 'cefalica', 'espontaneo', 39), None),
+            ((0, 0, False, None, 'espontaneo', 39), None),
+        ]
+        for (paridad, cesareas, multiple, presentacion, inicio, semanas), grupo in casos:
+            with self.subTest(grupo=grupo, presentacion=presentacion):
+                self.assertEqual(clasificar_robson(
+                    paridad=paridad, cesareas_previas=cesareas, es_parto_multiple=multiple,
+                    presentacion=presentacion, inicio_trabajo_parto=inicio, semanas=semanas,
+                ), grupo)
+
+    def test_calcula_al_guardar(self):
+        """El grupo se calcula al crear el parto, con la edad gestacional de la FUM"""
+        parto = self.crear_parto(self.madres[0], paridad=0, semanas=35, presentacion='cefalica',
+                                 inicio_trabajo_parto='espontaneo', cesareas_previas=0)
+        self.assertEqual(parto.fk_robson_calculado.grupo, '10')
+        parto.presentacion = 'podalica'
+        parto.save()
+        parto.refresh_from_db()
+        self.assertEqual(parto.fk_robson_calculado.grupo, '6')
+
+        sin_datos = Parto.objects.create(
+            fk_madre=self.madres[1], fk_tipo_parto=self.tipo_parto, fk_profesional_responsable=self.profesional,
+            fecha_parto=self.fecha_parto,
+        )
+        self.assertIsNone(sin_datos.fk_robson_calculado)
+
+    def test_recalcular_por_lotes(self):
+        """El comando clasifica la historia por lotes y registra discrepancias con el grupo manual"""
+        from io import StringIO
+        from django.core.management import call_command
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .models import DiscrepanciaRobson
+        from .robson import catalogo_robson
+
+        grupos = catalogo_robson()
+        datos = dict(presentacion='cefalica', inicio_trabajo_parto='espontaneo', cesareas_previas=0)
+        partos = [
+            self.crear_parto(self.madres[0], paridad=0, **datos),
+            self.crear_parto(self.madres[1], paridad=2, **datos),
+            self.crear_parto(self.madres[2], paridad=0, **datos),
+            self.crear_parto(self.madres[3], paridad=0),
+        ]
+        # Historia cargada sin pasar por save(): grupo manual, sin grupo calculado
+        Parto.objects.filter(pk=partos[0].pk).update(fk_clasificacion_robson_id=grupos[1])
+        Parto.objects.filter(pk=partos[1].pk).update(fk_clasificacion_robson_id=grupos[1])
+        Parto.objects.update(fk_robson_calculado=None)
+        DiscrepanciaRobson.objects.all().delete()
+
+        salida = StringIO()
+        with CaptureQueriesContext(connection) as consultas:
+            call_command('recalcular_robson', tamano_lote=2, stdout=salida)
+        self.assertIn('4 partos procesados', salida.getvalue())
+        self.assertIn('1 partos sin datos', salida.getvalue())
+        self.assertEqual(
+            list(Parto.objects.order_by('pk').values_list('fk_robson_calculado__grupo', flat=True)),
+            ['1', '3', '1', None],
+        )
+        discrepancia = DiscrepanciaRobson.objects.get()
+        self.assertEqual(discrepancia.fk_parto_id, partos[1].pk)
+        self.assertEqual(discrepancia.fk_robson_calculado_id, grupos[3])
+        # Sin UPDATE por parto: a lo más uno por grupo y lote
+        self.assertLessEqual(sum(q['sql'].startswith('UPDATE "parto"') for q in consultas), 3)
+
+        # Segunda corrida: nada que actualizar
+        salida = StringIO()
+        call_command('recalcular_robson', stdout=salida)
+        self.assertIn('0 actualizados', salida.getvalue())
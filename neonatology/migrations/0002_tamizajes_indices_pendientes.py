@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('neonatology', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rntamizajeauditivo',
+            index=models.Index(fields=['fk_rn', 'es_retamizaje'], name='rn_tamizaje_fk_rn_9c1065_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rntamizajecardiopatia',
+            index=models.Index(fields=['fk_rn', 'fecha_hora_tamizaje'], name='rn_tamizaje_fk_rn_68042c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rntamizajemetabolico',
+            index=models.Index(fields=['fk_rn', 'es_segunda_muestra'], name='rn_tamizaje_fk_rn_1826c4_idx'),
+        ),
+    ]
@@ -53,6 +53,8 @@ class RNTamizajeMetabolico(models.Model):
         db_table = 'rn_tamizaje_metabolico'
         verbose_name = 'Tamizaje Metabólico RN'
         verbose_name_plural = 'Tamizajes Metabólicos RN'
+        # Apoyan el anti-join de la lista de tamizajes pendientes (neonatology.tamizajes)
+        indexes = [models.Index(fields=['fk_rn', 'es_segunda_muestra'])]
     
     def __str__(self):
         return f"Tamizaje Metabólico {self.id_tamizaje_metabolico} - RN {self.fk_rn.id_rn}"
@@ -70,6 +72,8 @@ class RNTamizajeAuditivo(models.Model):
         db_table = 'rn_tamizaje_auditivo'
         verbose_name = 'Tamizaje Auditivo RN'
         verbose_name_plural = 'Tamizajes Auditivos RN'
+        # Apoyan el anti-join de la lista de tamizajes pendientes (neonatology.tamizajes)
+        indexes = [models.Index(fields=['fk_rn', 'es_retamizaje'])]
     
     def __str__(self):
         return f"Tamizaje Auditivo {self.id_tamizaje_auditivo} - RN {self.fk_rn.id_rn}"
@@ -87,6 +91,8 @@ class RNTamizajeCardiopatia(models.Model):
         db_table = 'rn_tamizaje_cardiopatia'
         verbose_name = 'Tamizaje Cardiopatía RN'
         verbose_name_plural = 'Tamizajes Cardiopatías RN'
+        # Apoyan el anti-join de la lista de tamizajes pendientes (neonatology.tamizajes)
+        indexes = [models.Index(fields=['fk_rn', 'fecha_hora_tamizaje'])]
     
     def __str__(self):
         return f"Tamizaje Cardiopatía {self.id_tamizaje_cardiopatia} - RN {self.fk_rn.id_rn}"
@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from core.sparse_fields import CamposDinamicosMixin
 from .models import RecienNacido, RNAtencionInmediata, RNTamizajeMetabolico, RNTamizajeAuditivo, RNTamizajeCardiopatia, RNEgreso
 
 
-class RecienNacidoSerializer(serializers.ModelSerializer):
+class RecienNacidoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {'fk_parto': 'maternity.serializers.PartoSerializer'}
+    
     parto_id = serializers.IntegerField(source='fk_parto.id_parto', read_only=True)
     madre_nombre = serializers.CharField(source='fk_parto.fk_madre.nombre', read_only=True)
     
@@ -11,7 +14,9 @@ class RecienNacidoSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class RNAtencionInmediataSerializer(serializers.ModelSerializer):
+class RNAtencionInmediataSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {'fk_rn': 'neonatology.serializers.RecienNacidoSerializer'}
+    
     rn_id = serializers.IntegerField(source='fk_rn.id_rn', read_only=True)
     profesional_nombre = serializers.CharField(source='fk_profesional_registra.nombre_completo', read_only=True)
     
@@ -20,7 +25,9 @@ class RNAtencionInmediataSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class RNTamizajeMetabolicoSerializer(serializers.ModelSerializer):
+class RNTamizajeMetabolicoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {'fk_rn': 'neonatology.serializers.RecienNacidoSerializer'}
+    
     rn_id = serializers.IntegerField(source='fk_rn.id_rn', read_only=True)
     
     class Meta:
@@ -28,7 +35,9 @@ class RNTamizajeMetabolicoSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class RNTamizajeAuditivoSerializer(serializers.ModelSerializer):
+class RNTamizajeAuditivoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {'fk_rn': 'neonatology.serializers.RecienNacidoSerializer'}
+    
     rn_id = serializers.IntegerField(source='fk_rn.id_rn', read_only=True)
     
     class Meta:
@@ -36,7 +45,9 @@ class RNTamizajeAuditivoSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class RNTamizajeCardiopatiaSerializer(serializers.ModelSerializer):
+class RNTamizajeCardiopatiaSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {'fk_rn': 'neonatology.serializers.RecienNacidoSerializer'}
+    
     rn_id = serializers.IntegerField(source='fk_rn.id_rn', read_only=True)
     
     class Meta:
@@ -44,9 +55,31 @@ class RNTamizajeCardiopatiaSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class RNEgresoSerializer(serializers.ModelSerializer):
+class RNEgresoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
+    campos_expandibles = {'fk_rn': 'neonatology.serializers.RecienNacidoSerializer'}
+    
     rn_id = serializers.IntegerField(source='fk_rn.id_rn', read_only=True)
     
     class Meta:
         model = RNEgreso
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class TamizajePendienteSerializer(serializers.Serializer):
+    """Fila de la lista de trabajo de tamizajes pendientes (neonatology.tamizajes)."""
+    id_rn = serializers.IntegerField()
+    fk_parto = serializers.IntegerField()
+    madre_run = serializers.CharField()
+    madre_nombre = serializers.CharField()
+    sexo = serializers.CharField()
+    peso_gramos = serializers.IntegerField()
+    fecha_parto = serializers.DateTimeField()
+    horas_desde_parto = serializers.IntegerField()
+    vence = serializers.DateTimeField()
+    estado = serializers.ChoiceField(choices=['pendiente', 'vencido'])
+
+
+class ResumenTamizajePendienteSerializer(serializers.Serializer):
+    descripcion = serializers.CharField()
+    pendientes = serializers.IntegerField()
+    vencidos = serializers.IntegerField()
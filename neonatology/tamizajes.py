@@ -0,0 +1,149 @@
+"""
+Lista de trabajo de tamizajes neonatales pendientes.
+
+Para cada tipo de tamizaje se define desde cuántas horas después del parto
+corresponde tomarlo (``desde_horas``) y cuándo pasa a estar vencido
+(``vence_horas``). Los recién nacidos pendientes se obtienen con una sola
+consulta por tipo: un anti-join (``NOT EXISTS``) contra la tabla del tamizaje,
+apoyado en los índices ``(fk_rn, es_segunda_muestra)``,
+``(fk_rn, es_retamizaje)``, ``(fk_rn, fecha_hora_tamizaje)`` y en
+``parto.fecha_parto``. El estado (pendiente/vencido) se calcula en SQL.
+
+Solo se consideran los partos de los últimos ``TAMIZAJES_VENTANA_DIAS`` días:
+un tamizaje que falta desde hace más tiempo ya no se va a tomar en la unidad,
+y el rango acotado sobre ``parto.fecha_parto`` evita que el anti-join recorra
+todo el historial de nacimientos.
+
+Se excluyen los recién nacidos fallecidos (``tipo_muerte`` informado).
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from .models import RecienNacido, RNTamizajeMetabolico, RNTamizajeAuditivo, RNTamizajeCardiopatia
+
+ReglaTamizaje = namedtuple('ReglaTamizaje', ['descripcion', 'desde_horas', 'vence_horas'])
+
+REGLAS_TAMIZAJE = {
+    'metabolico': ReglaTamizaje('Primera muestra de tamizaje metabólico', 40, 7 * 24),
+    'metabolico_segunda': ReglaTamizaje('Segunda muestra metabólica (RN bajo 2000 g)', 7 * 24, 15 * 24),
+    'auditivo': ReglaTamizaje('Tamizaje auditivo', 24, 30 * 24),
+    'auditivo_retamizaje': ReglaTamizaje('Retamizaje auditivo (primer tamizaje no pasa)', 7 * 24, 30 * 24),
+    'cardiopatia': ReglaTamizaje('Tamizaje de cardiopatías congénitas (oximetría)', 24, 48),
+}
+
+ESTADOS = ('pendiente', 'vencido')
+
+# Peso bajo el cual se requiere segunda muestra metabólica
+PESO_SEGUNDA_MUESTRA = 2000
+
+# Resultado auditivo que no requiere retamizaje
+RESULTADO_AUDITIVO_NORMAL = 'pasa'
+
+
+def _condicion_pendiente(tipo):
+    """Expresión que identifica a los RN a los que les falta el tamizaje ``tipo``."""
+    rn = OuterRef('pk')
+    metabolico = RNTamizajeMetabolico.objects.filter(fk_rn=rn)
+    auditivo = RNTamizajeAuditivo.objects.filter(fk_rn=rn)
+
+    if tipo == 'metabolico':
+        return ~Exists(metabolico.filter(es_segunda_muestra=False))
+    if tipo == 'metabolico_segunda':
+        return (
+            Q(peso_gramos__lt=PESO_SEGUNDA_MUESTRA)
+            & Exists(metabolico.filter(es_segunda_muestra=False))
+            & ~Exists(metabolico.filter(es_segunda_muestra=True))
+        )
+    if tipo == 'auditivo':
+        return ~Exists(auditivo.filter(es_retamizaje=False))
+    if tipo == 'auditivo_retamizaje':
+        no_pasa = (
+            ~Q(oido_derecho_resultado__iexact=RESULTADO_AUDITIVO_NORMAL)
+            | ~Q(oido_izquierdo_resultado__iexact=RESULTADO_AUDITIVO_NORMAL)
+        )
+        return Exists(auditivo.filter(no_pasa, es_retamizaje=False)) & ~Exists(auditivo.filter(es_retamizaje=True))
+    if tipo == 'cardiopatia':
+        return ~Exists(RNTamizajeCardiopatia.objects.filter(fk_rn=rn))
+    raise KeyError(tipo)
+
+
+def _recien_nacidos_pendientes(tipo, ahora):
+    """RN vivos de la ventana a los que les falta el tamizaje ``tipo`` y ya corresponde tomarlo."""
+    regla = REGLAS_TAMIZAJE[tipo]
+    return RecienNacido.objects.filter(
+        Q(tipo_muerte__isnull=True) | Q(tipo_muerte=''),
+        _condicion_pendiente(tipo),
+        fk_parto__fecha_parto__gt=ahora - timedelta(days=settings.TAMIZAJES_VENTANA_DIAS),
+        fk_parto__fecha_parto__lte=ahora - timedelta(hours=regla.desde_horas),
+    )
+
+
+def tamizajes_pendientes(tipo, ahora=None, estado=None):
+    """
+    Recién nacidos a los que les falta el tamizaje ``tipo`` y ya corresponde
+    tomarlo, del más antiguo al más reciente (partos dentro de
+    ``TAMIZAJES_VENTANA_DIAS``).
+
+    Args:
+        tipo: Clave de ``REGLAS_TAMIZAJE``
+        ahora: Momento de referencia (por defecto, ahora)
+        estado: 'pendiente', 'vencido' o None para ambos
+
+    Returns:
+        QuerySet de diccionarios con el RN, la madre, la fecha del parto,
+        ``vence`` y ``estado``
+    """
+    regla = REGLAS_TAMIZAJE[tipo]
+    ahora = ahora or timezone.now()
+    limite_vencido = ahora - timedelta(hours=regla.vence_horas)
+
+    queryset = _recien_nacidos_pendientes(tipo, ahora)
+    if estado == 'vencido':
+        queryset = queryset.filter(fk_parto__fecha_parto__lte=limite_vencido)
+    elif estado == 'pendiente':
+        queryset = queryset.filter(fk_parto__fecha_parto__gt=limite_vencido)
+
+    return queryset.annotate(
+        fecha_parto=F('fk_parto__fecha_parto'),
+        madre_run=F('fk_parto__fk_madre__run'),
+        madre_nombre=F('fk_parto__fk_madre__nombre'),
+        estado=Case(
+            When(fk_parto__fecha_parto__lte=limite_vencido, then=Value('vencido')),
+            default=Value('pendiente'),
+        ),
+    ).values(
+        'id_rn', 'fk_parto', 'madre_run', 'madre_nombre', 'sexo', 'peso_gramos', 'fecha_parto', 'estado',
+    ).order_by('fecha_parto', 'id_rn')
+
+
+def completar_plazos(filas, tipo, ahora=None):
+    """Agrega ``horas_desde_parto`` y ``vence`` a las filas de una página."""
+    regla = REGLAS_TAMIZAJE[tipo]
+    ahora = ahora or timezone.now()
+    plazo = timedelta(hours=regla.vence_horas)
+    for fila in filas:
+        fila['horas_desde_parto'] = int((ahora - fila['fecha_parto']).total_seconds() // 3600)
+        fila['vence'] = fila['fecha_parto'] + plazo
+    return filas
+
+
+def resumen_pendientes(ahora=None):
+    """Cantidad de pendientes y vencidos por tipo (una consulta por tipo)."""
+    ahora = ahora or timezone.now()
+    resumen = {}
+    for tipo, regla in REGLAS_TAMIZAJE.items():
+        limite_vencido = ahora - timedelta(hours=regla.vence_horas)
+        conteo = _recien_nacidos_pendientes(tipo, ahora).aggregate(
+            total=Count('pk'),
+            vencidos=Count('pk', filter=Q(fk_parto__fecha_parto__lte=limite_vencido)),
+        )
+        resumen[tipo] = {
+            'descripcion': regla.descripcion,
+            'pendientes': conteo['total'] - conteo['vencidos'],
+            'vencidos': conteo['vencidos'],
+        }
+    return resumen
@@ -1,3 +1,133 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.models import Usuario, Rol, Permiso, RolPermiso
+from maternity.models import CatNacionalidad, CatTipoParto, MadrePaciente, Parto
+from .models import RecienNacido, RNTamizajeMetabolico, RNTamizajeAuditivo, RNTamizajeCardiopatia
+from .tamizajes import tamizajes_pendientes, resumen_pendientes
+
+
+class TamizajesPendientesTestCase(APITestCase):
+    """Tests de la lista de trabajo de tamizajes neonatales"""
+
+    def setUp(self):
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+        rol = Rol.objects.create(nombre_rol='matrona_neo')
+        permiso = Permiso.objects.create(codigo_permiso='neonatal:rn:read', categoria='neonatal')
+        RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        self.usuario = Usuario.objects.create_user(
+            run='15000000-9', email='neo@hospital.com', password='x', nombre_completo='Matrona', fk_rol=rol,
+        )
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        self.tipo_parto = CatTipoParto.objects.create(nombre='Vaginal')
+        self.ahora = timezone.now()
+        self.client.force_authenticate(self.usuario)
+
+    def crear_rn(self, horas, peso=3200, tipo_muerte=None):
+        """RN nacido hace ``horas`` horas."""
+        madre = MadrePaciente.objects.create(
+            run=f'{20000000 + MadrePaciente.objects.count()}-K', nombre='Ana', apellido_paterno='Rojas',
+            apellido_materno='Soto', fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=self.nacionalidad,
+        )
+        parto = Parto.objects.create(
+            fk_madre=madre, fk_tipo_parto=self.tipo_parto, fk_profesional_responsable=self.usuario,
+            fecha_parto=self.ahora - timedelta(hours=horas),
+        )
+        return RecienNacido.objects.create(
+            fk_parto=parto, sexo='F', peso_gramos=peso, talla_cm=Decimal('49.00'), tipo_muerte=tipo_muerte,
+        )
+
+    def ids(self, tipo, **kwargs):
+        return [fila['id_rn'] for fila in tamizajes_pendientes(tipo, ahora=self.ahora, **kwargs)]
+
+    def test_ventana_de_partos(self):
+        """Los partos anteriores a TAMIZAJES_VENTANA_DIAS no aparecen ni se cuentan"""
+        from django.test import override_settings
+        reciente = self.crear_rn(horas=24 * 20)
+        self.crear_rn(horas=24 * 40)
+
+        with override_settings(TAMIZAJES_VENTANA_DIAS=30):
+            self.assertEqual(self.ids('auditivo'), [reciente.pk])
+            self.assertEqual(self.ids('metabolico', estado='vencido'), [reciente.pk])
+            resumen = resumen_pendientes(ahora=self.ahora)
+        self.assertEqual(resumen['metabolico']['vencidos'], 1)
+        self.assertEqual(resumen['auditivo']['pendientes'], 1)
+
+    def test_metabolico_pendiente_y_vencido(self):
+        """Aparecen desde las 40 h, vencen a los 7 días y salen al registrar la muestra"""
+        muy_reciente = self.crear_rn(horas=10)
+        pendiente = self.crear_rn(horas=48)
+        vencido = self.crear_rn(horas=24 * 8)
+        tomado = self.crear_rn(horas=60)
+        self.crear_rn(horas=60, tipo_muerte='neonatal')
+        RNTamizajeMetabolico.objects.create(fk_rn=tomado, fecha_muestra=self.ahora.date())
+
+        filas = list(tamizajes_pendientes('metabolico', ahora=self.ahora))
+        self.assertEqual([f['id_rn'] for f in filas], [vencido.pk, pendiente.pk])
+        self.assertEqual([f['estado'] for f in filas], ['vencido', 'pendiente'])
+        self.assertNotIn(muy_reciente.pk, self.ids('metabolico'))
+        self.assertEqual(self.ids('metabolico', estado='vencido'), [vencido.pk])
+
+    def test_segunda_muestra_y_retamizaje(self):
+        """Segunda muestra solo bajo 2000 g; retamizaje solo si el primer auditivo no pasa"""
+        prematuro = self.crear_rn(horas=24 * 8, peso=1800)
+        termino = self.crear_rn(horas=24 * 8, peso=3400)
+        for rn in (prematuro, termino):
+            RNTamizajeMetabolico.objects.create(fk_rn=rn, fecha_muestra=self.ahora.date())
+        self.assertEqual(self.ids('metabolico_segunda'), [prematuro.pk])
+
+        RNTamizajeAuditivo.objects.create(fk_rn=prematuro, oido_derecho_resultado='refiere',
+                                          oido_izquierdo_resultado='pasa')
+        RNTamizajeAuditivo.objects.create(fk_rn=termino, oido_derecho_resultado='Pasa',
+                                          oido_izquierdo_resultado='pasa')
+        self.assertEqual(self.ids('auditivo'), [])
+        self.assertEqual(self.ids('auditivo_retamizaje'), [prematuro.pk])
+        RNTamizajeAuditivo.objects.create(fk_rn=prematuro, oido_derecho_resultado='pasa',
+                                          oido_izquierdo_resultado='pasa', es_retamizaje=True)
+        self.assertEqual(self.ids('auditivo_retamizaje'), [])
+
+    def test_una_consulta_por_tipo(self):
+        """La lista es una sola consulta con NOT EXISTS, sin importar cuántos RN haya"""
+        for horas in (30, 50, 70):
+            self.crear_rn(horas=horas)
+        with CaptureQueriesContext(connection) as consultas:
+            filas = list(tamizajes_pendientes('cardiopatia', ahora=self.ahora))
+        self.assertEqual(len(filas), 3)
+        self.assertEqual(len(consultas), 1)
+        self.assertIn('NOT EXISTS', consultas[0]['sql'])
+
+        RNTamizajeCardiopatia.objects.create(fk_rn_id=filas[0]['id_rn'], fecha_hora_tamizaje=self.ahora,
+                                             saturacion_mano_derecha=98, saturacion_pie=97)
+        resumen = resumen_pendientes(ahora=self.ahora)
+        self.assertEqual(resumen['cardiopatia']['pendientes'] + resumen['cardiopatia']['vencidos'], 2)
+        self.assertEqual(resumen['cardiopatia']['vencidos'], 1)
+
+    def test_endpoint_paginado(self):
+        """GET /tamizajes-pendientes/?tipo= pagina y calcula el plazo"""
+        rn = self.crear_rn(horas=50)
+        response = self.client.get('/api/neonatology/tamizajes-pendientes/', {'tipo': 'metabolico'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        fila = response.data['results'][0]
+        self.assertEqual(fila['id_rn'], rn.pk)
+        self.assertEqual(fila['horas_desde_parto'], 50)
+        self.assertEqual(fila['estado'], 'pendiente')
+
+        response = self.client.get('/api/neonatology/tamizajes-pendientes/resumen/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['metabolico']['pendientes'], 1)
+
+    def test_tipo_invalido(self):
+        """Sin ?tipo= válido responde 400"""
+        response = self.client.get('/api/neonatology/tamizajes-pendientes/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('tipo', response.data)
+        response = self.client.get('/api/neonatology/tamizajes-pendientes/', {'tipo': 'auditivo', 'estado': 'x'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import ReporteREM, ReporteREMDetalle
+from .models import ReporteREM, ReporteREMDetalle, CuboPartos
 
 admin.site.register(ReporteREM)
-admin.site.register(ReporteREMDetalle)
\ No newline at end of file
+admin.site.register(ReporteREMDetalle)
+
+
+@admin.register(CuboPartos)
+class CuboPartosAdmin(admin.ModelAdmin):
+    list_display = ['mes', 'fk_robson', 'fk_tipo_parto', 'fk_profesional', 'partos', 'cesareas']
+    list_filter = ['mes']
+    readonly_fields = ['mes', 'fk_robson', 'fk_tipo_parto', 'fk_profesional', 'partos', 'cesareas']
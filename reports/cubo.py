@@ -0,0 +1,238 @@
+"""
+Cubo de indicadores de parto (tasa de cesáreas por grupo de Robson).
+
+``CuboPartos`` guarda, por cada combinación de mes, grupo de Robson, tipo de
+parto y profesional responsable, la cantidad de partos y de cesáreas. Es el
+grano más fino que piden los tableros: cualquier corte (por trimestre, por
+grupo, por profesional...) se obtiene sumando celdas del cubo, cuyo tamaño
+depende de la cantidad de combinaciones y no de la cantidad de partos.
+
+- Grupo de Robson: el calculado (``fk_robson_calculado``) o, si no se pudo
+  calcular, el ingresado a mano.
+- Cesárea: tipo de parto del catálogo cuyo nombre empieza con "ces", o inicio
+  del trabajo de parto ``cesarea_electiva``.
+
+Refresco incremental (``manage.py refrescar_cubo_partos``): solo se
+recalculan los meses con cambios, que salen de dos fuentes:
+
+- ``MesPendienteCubo``: las señales de ``Parto`` marcan el mes al guardar o
+  borrar (y el mes anterior si cambió la fecha del parto).
+- ``Parto.fecha_actualizacion`` posterior al último refresco, para las
+  actualizaciones masivas que no emiten señales (``update()``).
+
+``consultar_cubo`` agrega las celdas por período (mes, trimestre, año o
+total) y por cualquier combinación de dimensiones, y agrega a cada fila la
+tasa de cesáreas, el tamaño relativo del grupo y su contribución a la tasa
+global del período (tabla de Robson de la OMS).
+"""
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, DateField, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncMonth, TruncQuarter, TruncYear
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+# Holgura sobre el último refresco: cubre partos guardados justo antes de que
+# terminara el refresco anterior pero confirmados después
+MARGEN_REFRESCO = timedelta(minutes=5)
+
+# Meses recalculados por consulta
+MESES_POR_LOTE = 24
+
+GRANOS = {
+    'mes': F('mes'),
+    'trimestre': TruncQuarter('mes'),
+    'anio': TruncYear('mes'),
+    'total': None,
+}
+
+# Dimensión: columnas de salida y su expresión sobre CuboPartos
+DIMENSIONES = {
+    'robson': {'robson': F('fk_robson__grupo')},
+    'tipo_parto': {'tipo_parto': F('fk_tipo_parto'), 'tipo_parto_nombre': F('fk_tipo_parto__nombre')},
+    'profesional': {'profesional': F('fk_profesional'), 'profesional_nombre': F('fk_profesional__nombre_completo')},
+}
+
+CONDICION_CESAREA = Q(fk_tipo_parto__nombre__istartswith='ces') | Q(inicio_trabajo_parto='cesarea_electiva')
+
+
+def mes_de(fecha_hora):
+    """Primer día del mes (hora local) de un datetime."""
+    dia = timezone.localdate(fecha_hora) if timezone.is_aware(fecha_hora) else fecha_hora.date()
+    return dia.replace(day=1)
+
+
+def _siguiente_mes(mes):
+    return date(mes.year + (mes.month == 12), mes.month % 12 + 1, 1)
+
+
+def _inicio_local(dia):
+    return timezone.make_aware(datetime.combine(dia, datetime.min.time()))
+
+
+def marcar_meses(meses):
+    """Marca ``meses`` (fechas de primer día) para el próximo refresco."""
+    from .models import MesPendienteCubo
+
+    MesPendienteCubo.objects.bulk_create(
+        [MesPendienteCubo(mes=mes) for mes in set(meses)], ignore_conflicts=True,
+    )
+
+
+def _celdas(partos):
+    """Celdas del cubo (filas ``values()``) de los partos del queryset."""
+    return (
+        partos.order_by()
+        .annotate(
+            mes=TruncMonth('fecha_parto', output_field=DateField(), tzinfo=timezone.get_current_timezone()),
+            robson=Coalesce('fk_robson_calculado', 'fk_clasificacion_robson', output_field=IntegerField()),
+            cesarea=Case(When(CONDICION_CESAREA, then=Value(1)), default=Value(0), output_field=IntegerField()),
+        )
+        .values('mes', 'robson', 'fk_tipo_parto', 'fk_profesional_responsable')
+        .annotate(partos=Count('id_parto'), cesareas=Sum('cesarea'))
+    )
+
+
+def _recalcular(partos, borrar):
+    """Reemplaza las celdas que cubre ``borrar`` por las calculadas de ``partos``."""
+    from .models import CuboPartos
+
+    borrar.delete()
+    celdas = [
+        CuboPartos(
+            mes=fila['mes'], fk_robson_id=fila['robson'], fk_tipo_parto_id=fila['fk_tipo_parto'],
+            fk_profesional_id=fila['fk_profesional_responsable'], partos=fila['partos'], cesareas=fila['cesareas'],
+        )
+        for fila in _celdas(partos)
+    ]
+    CuboPartos.objects.bulk_create(celdas, batch_size=1000)
+    return len(celdas)
+
+
+def refrescar_cubo(completo=False):
+    """
+    Recalcula los meses con cambios desde el último refresco (todo el cubo
+    con ``completo`` o en el primer refresco).
+
+    Returns:
+        dict con meses recalculados (``None`` si fue completo) y celdas escritas
+    """
+    from core.cache import invalidar_modelo
+    from maternity.models import Parto
+    from .models import CuboPartos, EstadoCuboPartos, MesPendienteCubo
+
+    inicio = timezone.now()
+    with transaction.atomic():
+        estado, _ = EstadoCuboPartos.objects.select_for_update().get_or_create(pk=1)
+        completo = completo or estado.ultima_actualizacion is None
+        pendientes = set(MesPendienteCubo.objects.values_list('mes', flat=True))
+        if completo:
+            meses = None
+            celdas = _recalcular(Parto.objects.all(), CuboPartos.objects.all())
+        else:
+            cambiados = Parto.objects.filter(
+                fecha_actualizacion__gte=estado.ultima_actualizacion - MARGEN_REFRESCO,
+            ).values_list('fecha_parto', flat=True)
+            meses = sorted(pendientes | {mes_de(fecha) for fecha in cambiados})
+            celdas = 0
+            for i in range(0, len(meses), MESES_POR_LOTE):
+                lote = meses[i:i + MESES_POR_LOTE]
+                rangos = Q()
+                for mes in lote:
+                    rangos |= Q(fecha_parto__gte=_inicio_local(mes), fecha_parto__lt=_inicio_local(_siguiente_mes(mes)))
+                celdas += _recalcular(Parto.objects.filter(rangos), CuboPartos.objects.filter(mes__in=lote))
+        # Solo se borran las marcas leídas: las que llegaron durante el refresco quedan para el siguiente
+        MesPendienteCubo.objects.filter(mes__in=pendientes).delete()
+        estado.ultima_actualizacion = inicio
+        estado.save(update_fields=['ultima_actualizacion'])
+    invalidar_modelo(CuboPartos)
+    return {'meses': meses, 'celdas': celdas}
+
+
+def _fecha_anterior(sender, instance, **kwargs):
+    if instance.pk is not None and not instance._state.adding:
+        instance._fecha_parto_cubo = (
+            sender.objects.filter(pk=instance.pk).values_list('fecha_parto', flat=True).first()
+        )
+
+
+def _marcar_guardado(sender, instance, **kwargs):
+    meses = [mes_de(instance.fecha_parto)]
+    anterior = getattr(instance, '_fecha_parto_cubo', None)
+    if anterior is not None:
+        meses.append(mes_de(anterior))
+    marcar_meses(meses)
+
+
+def _marcar_borrado(sender, instance, **kwargs):
+    marcar_meses([mes_de(instance.fecha_parto)])
+
+
+def conectar_senales():
+    """Conecta las señales de ``Parto`` que marcan meses (se llama desde ReportsConfig.ready)."""
+    from maternity.models import Parto
+
+    pre_save.connect(_fecha_anterior, sender=Parto, dispatch_uid='reports.cubo.pre_save')
+    post_save.connect(_marcar_guardado, sender=Parto, dispatch_uid='reports.cubo.post_save')
+    post_delete.connect(_marcar_borrado, sender=Parto, dispatch_uid='reports.cubo.post_delete')
+
+
+def _porcentaje(parte, total):
+    return round(100 * parte / total, 1) if total else None
+
+
+def _orden(fila):
+    grupo = fila.get('robson')
+    return (
+        fila.get('periodo') or date.min,
+        (int(grupo), '') if grupo is not None and grupo.isdigit() else (99, grupo or ''),
+        fila.get('tipo_parto') or 0,
+        fila.get('profesional') or 0,
+    )
+
+
+def consultar_cubo(grano='mes', agrupar=(), desde=None, hasta=None, robson=None, tipo_parto=None, profesional=None):
+    """
+    Partos y cesáreas del cubo por ``grano`` y por las dimensiones de
+    ``agrupar``. ``desde`` y ``hasta`` son meses (fechas, ambos inclusivos);
+    ``robson`` filtra por grupo ("1" a "10"), los demás filtros por id.
+
+    Returns:
+        lista de dicts con periodo (salvo grano total), las columnas de cada
+        dimensión, partos, cesareas, tasa_cesarea, tamano_relativo y
+        contribucion (porcentajes)
+    """
+    from .models import CuboPartos
+
+    celdas = CuboPartos.objects.all()
+    if desde is not None:
+        celdas = celdas.filter(mes__gte=desde.replace(day=1))
+    if hasta is not None:
+        celdas = celdas.filter(mes__lte=hasta)
+    if robson is not None:
+        celdas = celdas.filter(fk_robson__grupo=robson)
+    if tipo_parto is not None:
+        celdas = celdas.filter(fk_tipo_parto=tipo_parto)
+    if profesional is not None:
+        celdas = celdas.filter(fk_profesional=profesional)
+
+    columnas = {}
+    if GRANOS[grano] is not None:
+        columnas['periodo'] = GRANOS[grano]
+    for dimension in agrupar:
+        columnas.update(DIMENSIONES[dimension])
+    filas = list(
+        celdas.order_by().values(**columnas).annotate(partos=Sum('partos'), cesareas=Sum('cesareas'))
+        if columnas else [celdas.aggregate(partos=Coalesce(Sum('partos'), 0), cesareas=Coalesce(Sum('cesareas'), 0))]
+    )
+
+    partos_periodo = {}
+    for fila in filas:
+        partos_periodo[fila.get('periodo')] = partos_periodo.get(fila.get('periodo'), 0) + fila['partos']
+    for fila in filas:
+        total = partos_periodo[fila.get('periodo')]
+        fila['tasa_cesarea'] = _porcentaje(fila['cesareas'], fila['partos'])
+        fila['tamano_relativo'] = _porcentaje(fila['partos'], total)
+        fila['contribucion'] = _porcentaje(fila['cesareas'], total)
+    return sorted(filas, key=_orden)
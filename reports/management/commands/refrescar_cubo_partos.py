@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reports.cubo import refrescar_cubo
+
+
+class Command(BaseCommand):
+    help = (
+        'Refresca el cubo de indicadores de parto: recalcula solo los meses con partos creados, modificados '
+        'o eliminados desde el último refresco (o todo el cubo con --completo).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--completo', action='store_true', help='Reconstruye el cubo completo')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        resultado = refrescar_cubo(completo=options['completo'])
+        segundos = time.perf_counter() - inicio
+        meses = resultado['meses']
+        alcance = 'cubo completo' if meses is None else f'{len(meses)} meses'
+        self.stdout.write(self.style.SUCCESS(
+            f'Cubo de partos refrescado ({alcance}, {resultado["celdas"]} celdas) en {segundos:.2f} s'
+        ))
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogs', '0001_initial'),
+        ('reports', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstadoCuboPartos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ultima_actualizacion', models.DateTimeField(null=True)),
+            ],
+            options={
+                'verbose_name': 'Estado del cubo de partos',
+                'verbose_name_plural': 'Estado del cubo de partos',
+                'db_table': 'reporte_cubo_estado',
+            },
+        ),
+        migrations.CreateModel(
+            name='MesPendienteCubo',
+            fields=[
+                ('mes', models.DateField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'verbose_name': 'Mes pendiente del cubo',
+                'verbose_name_plural': 'Meses pendientes del cubo',
+                'db_table': 'reporte_cubo_mes_pendiente',
+            },
+        ),
+        migrations.CreateModel(
+            name='CuboPartos',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mes', models.DateField(help_text='Primer día del mes (hora local)')),
+                ('partos', models.PositiveIntegerField()),
+                ('cesareas', models.PositiveIntegerField()),
+                ('fk_profesional', models.ForeignKey(db_column='fk_profesional', on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('fk_robson', models.ForeignKey(db_column='fk_robson', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalogs.catrobson')),
+                ('fk_tipo_parto', models.ForeignKey(db_column='fk_tipo_parto', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalogs.cattipoparto')),
+            ],
+            options={
+                'verbose_name': 'Celda del cubo de partos',
+                'verbose_name_plural': 'Cubo de partos',
+                'db_table': 'reporte_cubo_partos',
+                'indexes': [models.Index(fields=['mes'], name='reporte_cub_mes_b9d212_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_cubo_partos'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reporterem',
+            index=models.Index(fields=['-fecha_generacion'], name='reporte_rem_generacion_idx'),
+        ),
+    ]
@@ -16,6 +16,7 @@ class ReporteREM(models.Model):
         verbose_name = 'Reporte REM'
         verbose_name_plural = 'Reportes REM'
         ordering = ['-fecha_generacion']
+        indexes = [models.Index(fields=['-fecha_generacion'], name='reporte_rem_generacion_idx')]
     
     def __str__(self):
         return f"Reporte {self.id_reporte} - {self.tipo_reporte} ({self.estado})"
@@ -33,4 +34,51 @@ class ReporteREMDetalle(models.Model):
         unique_together = ('fk_reporte', 'nombre_variable_rem')
     
     def __str__(self):
-        return f"Detalle Reporte {self.fk_reporte.id_reporte} - {self.nombre_variable_rem}"
\ No newline at end of file
+        return f"Detalle Reporte {self.fk_reporte.id_reporte} - {self.nombre_variable_rem}"
+
+class CuboPartos(models.Model):
+    """
+    Cubo de indicadores de parto (reports/cubo.py): cantidad de partos y
+    cesáreas por mes, grupo de Robson, tipo de parto y profesional.
+    """
+    mes = models.DateField(help_text="Primer día del mes (hora local)")
+    fk_robson = models.ForeignKey('catalogs.CatRobson', on_delete=models.CASCADE, null=True, db_column='fk_robson', related_name='+')
+    fk_tipo_parto = models.ForeignKey('catalogs.CatTipoParto', on_delete=models.CASCADE, db_column='fk_tipo_parto', related_name='+')
+    fk_profesional = models.ForeignKey(Usuario, on_delete=models.CASCADE, db_column='fk_profesional', related_name='+')
+    partos = models.PositiveIntegerField()
+    cesareas = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = 'reporte_cubo_partos'
+        verbose_name = 'Celda del cubo de partos'
+        verbose_name_plural = 'Cubo de partos'
+        indexes = [models.Index(fields=['mes'])]
+
+    def __str__(self):
+        return f"{self.mes:%Y-%m} robson {self.fk_robson_id} tipo {self.fk_tipo_parto_id}: {self.cesareas}/{self.partos}"
+
+
+class MesPendienteCubo(models.Model):
+    """Mes del cubo de partos que debe recalcularse (un parto del mes cambió)."""
+    mes = models.DateField(primary_key=True)
+
+    class Meta:
+        db_table = 'reporte_cubo_mes_pendiente'
+        verbose_name = 'Mes pendiente del cubo'
+        verbose_name_plural = 'Meses pendientes del cubo'
+
+    def __str__(self):
+        return f"{self.mes:%Y-%m}"
+
+
+class EstadoCuboPartos(models.Model):
+    """Fila única con la fecha del último refresco del cubo de partos."""
+    ultima_actualizacion = models.DateTimeField(null=True)
+
+    class Meta:
+        db_table = 'reporte_cubo_estado'
+        verbose_name = 'Estado del cubo de partos'
+        verbose_name_plural = 'Estado del cubo de partos'
+
+    def __str__(self):
+        return f"Cubo de partos actualizado al {self.ultima_actualizacion}"
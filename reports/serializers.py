@@ -15,4 +15,25 @@ class ReporteREMSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReporteREM
         fields = '__all__'
-        read_only_fields = ['fecha_generacion']
\ No newline at end of file
+        read_only_fields = ['fecha_generacion']
+
+class IndicadorPartoSerializer(serializers.Serializer):
+    """Una fila de /indicadores-partos/. Solo se incluyen las dimensiones pedidas en "agrupar"."""
+    periodo = serializers.DateField(required=False)
+    robson = serializers.CharField(required=False, help_text='Grupo de Robson (null: sin clasificar)')
+    tipo_parto = serializers.IntegerField(required=False)
+    tipo_parto_nombre = serializers.CharField(required=False)
+    profesional = serializers.IntegerField(required=False)
+    profesional_nombre = serializers.CharField(required=False)
+    partos = serializers.IntegerField()
+    cesareas = serializers.IntegerField()
+    tasa_cesarea = serializers.FloatField(help_text='Cesáreas / partos (%)')
+    tamano_relativo = serializers.FloatField(help_text='Partos del grupo / partos del período (%)')
+    contribucion = serializers.FloatField(help_text='Cesáreas del grupo / partos del período (%)')
+
+
+class IndicadoresPartosSerializer(serializers.Serializer):
+    grano = serializers.CharField()
+    agrupar = serializers.ListField(child=serializers.CharField())
+    actualizado = serializers.DateTimeField(allow_null=True, help_text='Último refresco del cubo')
+    resultados = IndicadorPartoSerializer(many=True)
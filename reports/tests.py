@@ -1,3 +1,123 @@
-from django.test import TestCase
+from datetime import date, datetime
 
-# Create your tests here.
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from catalogs.models import CatRobson
+from core.models import Usuario, Rol, Permiso, RolPermiso
+from maternity.models import CatNacionalidad, CatTipoParto, MadrePaciente, Parto
+from .cubo import consultar_cubo, refrescar_cubo
+from .models import CuboPartos, MesPendienteCubo
+
+
+class CuboPartosTestCase(APITestCase):
+    """Tests del cubo de indicadores de parto"""
+
+    def setUp(self):
+        from core.cache import obtener_cache
+        obtener_cache().clear()
+        rol = Rol.objects.create(nombre_rol='supervisor')
+        permiso = Permiso.objects.create(codigo_permiso='report:generate_rem', categoria='reports')
+        RolPermiso.objects.create(fk_rol=rol, fk_permiso=permiso)
+        self.profesional = Usuario.objects.create_user(
+            run='15000000-9', email='sup@hospital.com', password='x', nombre_completo='Supervisora', fk_rol=rol,
+        )
+        self.otro_profesional = Usuario.objects.create_user(run='16000000-7', password='x', nombre_completo='Matrón')
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+        self.vaginal = CatTipoParto.objects.create(nombre='Vaginal')
+        self.cesarea = CatTipoParto.objects.create(nombre='Cesárea')
+        self.robson = {grupo: CatRobson.objects.create(grupo=str(grupo), descripcion=f'Grupo {grupo}') for grupo in (1, 5)}
+        self.client.force_authenticate(self.profesional)
+
+    def crear_parto(self, fecha, tipo, robson=None, profesional=None, **datos):
+        madre = MadrePaciente.objects.create(
+            run=f'{20000000 + MadrePaciente.objects.count()}-K', nombre='Ana', apellido_paterno='Rojas',
+            apellido_materno='Soto', fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=self.nacionalidad,
+        )
+        return Parto.objects.create(
+            fk_madre=madre, fk_tipo_parto=tipo, fk_profesional_responsable=profesional or self.profesional,
+            fecha_parto=timezone.make_aware(datetime(*fecha, 10)),
+            fk_clasificacion_robson=self.robson[robson] if robson else None, **datos,
+        )
+
+    def test_refresco_completo_y_corte_por_robson(self):
+        """El cubo suma partos y cesáreas; la tasa y la contribución salen por grupo"""
+        self.crear_parto((2024, 1, 10), self.vaginal, robson=1)
+        self.crear_parto((2024, 1, 20), self.cesarea, robson=1)
+        self.crear_parto((2024, 1, 25), self.cesarea, robson=5)
+        self.crear_parto((2024, 2, 5), self.vaginal, robson=1, inicio_trabajo_parto='cesarea_electiva')
+        refrescar_cubo()
+
+        filas = consultar_cubo('mes', ['robson'])
+        self.assertEqual(
+            [(f['periodo'], f['robson'], f['partos'], f['cesareas']) for f in filas],
+            [(date(2024, 1, 1), '1', 2, 1), (date(2024, 1, 1), '5', 1, 1), (date(2024, 2, 1), '1', 1, 1)],
+        )
+        self.assertEqual(filas[0]['tasa_cesarea'], 50.0)
+        self.assertEqual(filas[0]['tamano_relativo'], 66.7)
+        self.assertEqual(filas[1]['contribucion'], 33.3)
+
+        total = consultar_cubo('total')
+        self.assertEqual((total[0]['partos'], total[0]['cesareas'], total[0]['tasa_cesarea']), (4, 3, 75.0))
+
+    def test_refresco_incremental(self):
+        """Solo se recalculan los meses con cambios, incluido el mes que deja un parto movido"""
+        self.crear_parto((2024, 1, 10), self.vaginal)
+        movido = self.crear_parto((2024, 2, 10), self.cesarea)
+        borrado = self.crear_parto((2024, 3, 10), self.cesarea)
+        refrescar_cubo()
+        self.assertFalse(MesPendienteCubo.objects.exists())
+
+        movido.fecha_parto = timezone.make_aware(datetime(2024, 1, 15, 10))
+        movido.save()
+        borrado.delete()
+        resultado = refrescar_cubo()
+        self.assertEqual(resultado['meses'], [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)])
+        self.assertEqual(
+            list(CuboPartos.objects.order_by('mes', 'fk_tipo_parto').values_list('mes', 'partos', 'cesareas')),
+            [(date(2024, 1, 1), 1, 0), (date(2024, 1, 1), 1, 1)],
+        )
+
+        # Actualizaciones masivas (sin señales) se detectan por fecha_actualizacion
+        Parto.objects.filter(pk=movido.pk).update(fk_tipo_parto=self.vaginal, fecha_actualizacion=timezone.now())
+        self.assertEqual(refrescar_cubo()['meses'], [date(2024, 1, 1)])
+        self.assertEqual(consultar_cubo('total')[0]['cesareas'], 0)
+
+    def test_consulta_no_depende_de_la_historia(self):
+        """Consultar el cubo es una sola consulta sobre celdas, sin leer partos"""
+        for dia in range(1, 6):
+            self.crear_parto((2024, 4, dia), self.vaginal, robson=1, profesional=self.otro_profesional)
+        refrescar_cubo()
+        self.assertEqual(CuboPartos.objects.count(), 1)
+        with CaptureQueriesContext(connection) as consultas:
+            filas = consultar_cubo('trimestre', ['profesional', 'tipo_parto'], robson='1')
+        self.assertEqual(len(consultas), 1)
+        self.assertNotIn('"parto"', consultas[0]['sql'])
+        self.assertEqual(filas[0]['periodo'], date(2024, 4, 1))
+        self.assertEqual(filas[0]['profesional_nombre'], 'Matrón')
+        self.assertEqual(filas[0]['tipo_parto_nombre'], 'Vaginal')
+
+    def test_endpoint(self):
+        """GET /indicadores-partos/ corta por dimensiones y valida los parámetros"""
+        self.crear_parto((2024, 5, 3), self.cesarea, robson=5)
+        self.crear_parto((2024, 6, 3), self.vaginal, robson=1)
+        refrescar_cubo()
+
+        response = self.client.get('/api/reports/indicadores-partos/', {
+            'grano': 'anio', 'agrupar': 'robson', 'desde': '2024-06', 'hasta': '2024-12',
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data['actualizado'])
+        self.assertEqual(len(response.data['resultados']), 1)
+        fila = response.data['resultados'][0]
+        self.assertEqual((fila['periodo'], fila['robson'], fila['partos']), ('2024-01-01', '1', 1))
+        self.assertNotIn('profesional', fila)
+
+        response = self.client.get('/api/reports/indicadores-partos/', {'agrupar': 'robson,sala'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('agrupar', response.data)
+        response = self.client.get('/api/reports/indicadores-partos/', {'grano': 'semana', 'desde': '2024'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
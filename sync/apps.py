@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'sync'
+
+    def ready(self):
+        from . import cambios, outbox
+        cambios.conectar_senales()
+        outbox.conectar_senales()
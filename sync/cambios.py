@@ -0,0 +1,186 @@
+"""
+Registro de cambios para la sincronización de tablets sin conexión.
+
+Cada alta, modificación o borrado de un modelo de maternidad o neonatología
+asigna una secuencia nueva, monótona y global a la fila ``CambioRegistro``
+del registro (una por registro; los borrados quedan como lápidas). Un
+cliente guarda la última secuencia que recibió como token y pide solo lo
+posterior:
+
+    SELECT ... FROM sync_cambio WHERE secuencia > :token ORDER BY secuencia
+
+La secuencia sale de la fila de ``ContadorCambios``, que se bloquea
+(``SELECT ... FOR UPDATE``) hasta el commit de la transacción que escribe,
+igual que la cabeza de la cadena de auditoría. Así las secuencias se hacen
+visibles en orden: un cliente que leyó hasta N no puede perder después un
+cambio con secuencia menor que se confirmó más tarde.
+
+Las señales cubren ``save()``/``delete()``. Las escrituras masivas que no
+emiten señales (``update()``, ``bulk_create()``) deben llamar a
+``registrar_cambios`` con los ids afectados; tras una carga masiva sin
+registrar, ``manage.py reconciliar_sync`` lo corrige.
+"""
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+# Modelos cuyos cambios se registran, por nombre de recurso (el de su ruta en la API)
+MODELOS_SINCRONIZADOS = {
+    'madres': 'maternity.MadrePaciente',
+    'embarazos': 'maternity.Embarazo',
+    'partos': 'maternity.Parto',
+    'partos-complicaciones': 'maternity.PartoComplicacion',
+    'partos-anestesias': 'maternity.PartoAnestesia',
+    'ive-atenciones': 'maternity.IVEAtencion',
+    'ive-acompanamientos': 'maternity.IVEAcompanamiento',
+    'altas-anticonceptivos': 'maternity.AltaAnticonceptivo',
+    'recien-nacidos': 'neonatology.RecienNacido',
+    'atenciones-inmediatas': 'neonatology.RNAtencionInmediata',
+    'tamizajes-metabolicos': 'neonatology.RNTamizajeMetabolico',
+    'tamizajes-auditivos': 'neonatology.RNTamizajeAuditivo',
+    'tamizajes-cardiopatias': 'neonatology.RNTamizajeCardiopatia',
+    'egresos': 'neonatology.RNEgreso',
+}
+
+TAMANO_LOTE = 1000
+
+
+def registrar_cambios(modelo, ids, eliminado=False):
+    """
+    Asigna una secuencia nueva a cada registro de ``ids``.
+
+    Args:
+        modelo: Clase del modelo
+        ids: Claves primarias modificadas (o borradas)
+        eliminado: True si los registros se borraron (lápidas)
+    """
+    from .models import CambioRegistro, ContadorCambios
+
+    ids = sorted(set(ids))
+    if not ids:
+        return
+    etiqueta = modelo._meta.label_lower
+    ahora = timezone.now()
+    with transaction.atomic():
+        contador, _ = ContadorCambios.objects.select_for_update().get_or_create(pk=1)
+        secuencia = contador.ultima_secuencia
+        for inicio in range(0, len(ids), TAMANO_LOTE):
+            lote = ids[inicio:inicio + TAMANO_LOTE]
+            existentes = dict(
+                CambioRegistro.objects.filter(modelo=etiqueta, id_registro__in=lote).values_list('id_registro', 'pk')
+            )
+            nuevos, actualizados = [], []
+            for id_registro in lote:
+                secuencia += 1
+                cambio = CambioRegistro(
+                    pk=existentes.get(id_registro), secuencia=secuencia, modelo=etiqueta,
+                    id_registro=id_registro, eliminado=eliminado, fecha_cambio=ahora,
+                )
+                (actualizados if cambio.pk else nuevos).append(cambio)
+            # Las secuencias nuevas son mayores que todas las existentes: no chocan con el índice único
+            CambioRegistro.objects.bulk_update(actualizados, ['secuencia', 'eliminado', 'fecha_cambio'])
+            CambioRegistro.objects.bulk_create(nuevos)
+        ContadorCambios.objects.filter(pk=1).update(ultima_secuencia=secuencia)
+
+
+def bloquear_contador():
+    """
+    Toma el bloqueo del contador hasta el fin de la transacción en curso.
+
+    Quien compara secuencias antes de escribir (detección de conflictos) lo
+    toma primero: ningún otro cambio puede registrarse entre la comparación
+    y la escritura, y el orden de bloqueo es el mismo que en
+    ``registrar_cambios`` (contador, luego filas).
+    """
+    from .models import ContadorCambios
+
+    ContadorCambios.objects.select_for_update().get_or_create(pk=1)
+
+
+def secuencias_de(modelo, ids):
+    """{id_registro: (secuencia, eliminado)} de los registros de ``ids`` con cambios registrados."""
+    from .models import CambioRegistro
+
+    return {
+        id_registro: (secuencia, eliminado)
+        for id_registro, secuencia, eliminado in CambioRegistro.objects.filter(
+            modelo=modelo._meta.label_lower, id_registro__in=list(ids),
+        ).values_list('id_registro', 'secuencia', 'eliminado')
+    }
+
+
+def estado_contador():
+    """(última secuencia asignada, secuencia purgada)."""
+    from .models import ContadorCambios
+
+    contador = ContadorCambios.objects.filter(pk=1).values_list('ultima_secuencia', 'secuencia_purgada').first()
+    return contador or (0, 0)
+
+
+def purgar_lapidas(dias):
+    """
+    Borra las lápidas de más de ``dias`` días. Un cliente con un token
+    anterior a la mayor secuencia purgada ya no puede enterarse de esos
+    borrados y debe resincronizar desde cero.
+
+    Returns:
+        int: Lápidas borradas
+    """
+    from .models import CambioRegistro, ContadorCambios
+
+    limite = timezone.now() - timedelta(days=dias)
+    with transaction.atomic():
+        contador, _ = ContadorCambios.objects.select_for_update().get_or_create(pk=1)
+        lapidas = CambioRegistro.objects.filter(eliminado=True, fecha_cambio__lt=limite)
+        ultima = lapidas.order_by('-secuencia').values_list('secuencia', flat=True).first()
+        if ultima is None:
+            return 0
+        borradas, _ = lapidas.delete()
+        ContadorCambios.objects.filter(pk=1).update(secuencia_purgada=max(contador.secuencia_purgada, ultima))
+    return borradas
+
+
+def reconciliar():
+    """
+    Registra los registros que no tienen cambio (cargas masivas sin
+    ``registrar_cambios``) y las lápidas de los que ya no existen.
+
+    Returns:
+        dict: {etiqueta: (registrados, lápidas)} de los modelos con diferencias
+    """
+    from .models import CambioRegistro
+
+    resultado = {}
+    for etiqueta in MODELOS_SINCRONIZADOS.values():
+        modelo = apps.get_model(etiqueta)
+        actuales = set(modelo.objects.values_list('pk', flat=True).iterator())
+        registrados = dict(
+            CambioRegistro.objects.filter(modelo=modelo._meta.label_lower)
+            .values_list('id_registro', 'eliminado').iterator()
+        )
+        faltantes = [i for i in actuales if registrados.get(i, True)]
+        borrados = [i for i, eliminado in registrados.items() if not eliminado and i not in actuales]
+        registrar_cambios(modelo, faltantes)
+        registrar_cambios(modelo, borrados, eliminado=True)
+        if faltantes or borrados:
+            resultado[modelo._meta.label_lower] = (len(faltantes), len(borrados))
+    return resultado
+
+
+def _registrar_guardado(sender, instance, raw=False, **kwargs):
+    if not raw:
+        registrar_cambios(sender, [instance.pk])
+
+
+def _registrar_borrado(sender, instance, **kwargs):
+    registrar_cambios(sender, [instance.pk], eliminado=True)
+
+
+def conectar_senales():
+    for etiqueta in MODELOS_SINCRONIZADOS.values():
+        modelo = apps.get_model(etiqueta)
+        post_save.connect(_registrar_guardado, sender=modelo, dispatch_uid=f'sync_guardado_{etiqueta}')
+        post_delete.connect(_registrar_borrado, sender=modelo, dispatch_uid=f'sync_borrado_{etiqueta}')
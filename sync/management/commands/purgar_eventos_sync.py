@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from sync.outbox import purgar_eventos
+
+
+class Command(BaseCommand):
+    help = (
+        'Borra los eventos de la outbox con más de --dias días que todos los consumidores registrados ya '
+        'confirmaron. Un consumidor que deja de confirmar detiene la purga.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=30, help='Antigüedad mínima de los eventos a borrar')
+
+    def handle(self, *args, **options):
+        borrados = purgar_eventos(max(0, options['dias']))
+        self.stdout.write(self.style.SUCCESS(f'✓ {borrados} eventos borrados'))
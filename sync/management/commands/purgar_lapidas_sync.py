@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from sync.cambios import purgar_lapidas
+
+
+class Command(BaseCommand):
+    help = (
+        'Borra las lápidas (registros eliminados) de la sincronización con más de --dias días. '
+        'Las tablets con un token anterior a la última lápida purgada reciben 410 y resincronizan desde cero.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dias', type=int, default=90, help='Antigüedad mínima de las lápidas a borrar')
+
+    def handle(self, *args, **options):
+        borradas = purgar_lapidas(max(0, options['dias']))
+        self.stdout.write(self.style.SUCCESS(f'✓ {borradas} lápidas borradas'))
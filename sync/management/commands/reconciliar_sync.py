@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from sync.cambios import reconciliar
+
+
+class Command(BaseCommand):
+    help = (
+        'Registra en la sincronización los registros creados o borrados sin pasar por save()/delete() '
+        '(cargas masivas, generar_dataset): los que faltan reciben una secuencia nueva y los que ya no '
+        'existen quedan como lápidas.'
+    )
+
+    def handle(self, *args, **options):
+        resultado = reconciliar()
+        for etiqueta, (registrados, lapidas) in resultado.items():
+            self.stdout.write(f'  {etiqueta:<36} {registrados:>10,} registrados {lapidas:>8,} lápidas')
+        self.stdout.write(self.style.SUCCESS(
+            '✓ Registro de cambios al día' + ('' if resultado else ' (sin diferencias)')
+        ))
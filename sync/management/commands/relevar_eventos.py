@@ -0,0 +1,66 @@
+import json
+import time
+import urllib.error
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from sync.outbox import confirmar_offset, leer_eventos, offset_de
+
+
+class Command(BaseCommand):
+    help = (
+        'Reenvía en orden los eventos de la outbox posteriores al offset de --consumidor: por lotes a --url '
+        '(POST JSON {"eventos": [...]}) o como NDJSON a la salida estándar. El offset se confirma después '
+        'de entregar cada lote, así que ante un corte el siguiente envío repite a lo sumo un lote '
+        '(entrega al menos una vez: el destino debe ignorar secuencias ya recibidas).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--consumidor', required=True, help='Nombre del consumidor cuyo offset se usa y confirma')
+        parser.add_argument('--url', help='Endpoint que recibe los lotes (por defecto, salida estándar)')
+        parser.add_argument('--lote', type=int, default=500, help='Eventos por lote')
+        parser.add_argument('--seguir', action='store_true', help='No termina: espera eventos nuevos')
+        parser.add_argument('--intervalo', type=float, default=5, help='Segundos entre consultas con --seguir')
+        parser.add_argument('--timeout', type=float, default=30, help='Segundos de espera por cada POST a --url')
+
+    def handle(self, *args, **options):
+        consumidor = options['consumidor']
+        lote = max(1, options['lote'])
+        enviados = 0
+        while True:
+            pagina = leer_eventos(offset_de(consumidor), lote)
+            if pagina['eventos']:
+                try:
+                    self.entregar(pagina['eventos'], options)
+                except (urllib.error.URLError, OSError) as e:
+                    if not options['seguir']:
+                        raise CommandError(f'No se pudo entregar el lote desde {pagina["desde"]}: {e}')
+                    self.stderr.write(f'Entrega fallida ({e}); se reintenta en {options["intervalo"]} s')
+                    time.sleep(options['intervalo'])
+                    continue
+                confirmar_offset(consumidor, pagina['siguiente'])
+                enviados += len(pagina['eventos'])
+            if pagina['hay_mas']:
+                continue
+            if not options['seguir']:
+                break
+            time.sleep(options['intervalo'])
+
+        if options['url']:
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ {enviados:,} eventos entregados a {consumidor} (offset {offset_de(consumidor)})'
+            ))
+
+    def entregar(self, eventos, options):
+        if not options['url']:
+            for evento in eventos:
+                self.stdout.write(json.dumps(evento, cls=DjangoJSONEncoder, ensure_ascii=False))
+            return
+        cuerpo = json.dumps({'eventos': eventos}, cls=DjangoJSONEncoder).encode()
+        peticion = urllib.request.Request(
+            options['url'], data=cuerpo, method='POST', headers={'Content-Type': 'application/json'},
+        )
+        with urllib.request.urlopen(peticion, timeout=options['timeout']) as respuesta:
+            respuesta.read()
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:16
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorCambios',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ultima_secuencia', models.BigIntegerField(default=0)),
+                ('secuencia_purgada', models.BigIntegerField(default=0, help_text='Mayor secuencia de las lápidas purgadas: tokens anteriores requieren resincronizar')),
+            ],
+            options={
+                'verbose_name': 'Contador de Cambios',
+                'db_table': 'sync_contador',
+            },
+        ),
+        migrations.CreateModel(
+            name='CambioRegistro',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('secuencia', models.BigIntegerField(unique=True)),
+                ('modelo', models.CharField(help_text='Etiqueta del modelo, ej. maternity.parto', max_length=60)),
+                ('id_registro', models.BigIntegerField()),
+                ('eliminado', models.BooleanField(default=False)),
+                ('fecha_cambio', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Cambio de Registro',
+                'verbose_name_plural': 'Cambios de Registros',
+                'db_table': 'sync_cambio',
+                'constraints': [models.UniqueConstraint(fields=('modelo', 'id_registro'), name='sync_cambio_registro_uniq')],
+            },
+        ),
+    ]
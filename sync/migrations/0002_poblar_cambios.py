@@ -0,0 +1,48 @@
+from django.db import migrations
+from django.utils import timezone
+
+# Copia de sync.cambios.MODELOS_SINCRONIZADOS al crear la migración
+MODELOS = (
+    'maternity.MadrePaciente', 'maternity.Embarazo', 'maternity.Parto', 'maternity.PartoComplicacion',
+    'maternity.PartoAnestesia', 'maternity.IVEAtencion', 'maternity.IVEAcompanamiento',
+    'maternity.AltaAnticonceptivo', 'neonatology.RecienNacido', 'neonatology.RNAtencionInmediata',
+    'neonatology.RNTamizajeMetabolico', 'neonatology.RNTamizajeAuditivo', 'neonatology.RNTamizajeCardiopatia',
+    'neonatology.RNEgreso',
+)
+
+TAMANO_LOTE = 5000
+
+
+def poblar_cambios(apps, schema_editor):
+    """Un cambio por cada registro existente: el primer token (0) los entrega todos."""
+    CambioRegistro = apps.get_model('sync', 'CambioRegistro')
+    ContadorCambios = apps.get_model('sync', 'ContadorCambios')
+    ahora = timezone.now()
+    secuencia = 0
+    for etiqueta in MODELOS:
+        modelo = apps.get_model(etiqueta)
+        pk = modelo._meta.pk.attname
+        lote = []
+        for id_registro in modelo.objects.order_by(pk).values_list(pk, flat=True).iterator():
+            secuencia += 1
+            lote.append(CambioRegistro(
+                secuencia=secuencia, modelo=etiqueta.lower(), id_registro=id_registro, fecha_cambio=ahora,
+            ))
+            if len(lote) == TAMANO_LOTE:
+                CambioRegistro.objects.bulk_create(lote)
+                lote = []
+        CambioRegistro.objects.bulk_create(lote)
+    ContadorCambios.objects.update_or_create(pk=1, defaults={'ultima_secuencia': secuencia})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+        ('maternity', '0005_indices_listados'),
+        ('neonatology', '0002_tamizajes_indices_pendientes'),
+    ]
+
+    operations = [
+        migrations.RunPython(poblar_cambios, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:26
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0002_poblar_cambios'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoCambio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('secuencia', models.BigIntegerField(unique=True)),
+                ('modelo', models.CharField(help_text='Etiqueta del modelo, ej. maternity.parto', max_length=60)),
+                ('id_registro', models.BigIntegerField()),
+                ('operacion', models.CharField(choices=[('crear', 'Crear'), ('actualizar', 'Actualizar'), ('eliminar', 'Eliminar')], max_length=10)),
+                ('datos', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Columnas del registro tras el cambio (null en un borrado)', null=True)),
+                ('fecha_evento', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Evento de Cambio',
+                'verbose_name_plural': 'Eventos de Cambio',
+                'db_table': 'sync_evento',
+            },
+        ),
+        migrations.CreateModel(
+            name='OffsetConsumidor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('consumidor', models.CharField(max_length=100, unique=True)),
+                ('ultima_secuencia', models.BigIntegerField(default=0)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Offset de Consumidor',
+                'verbose_name_plural': 'Offsets de Consumidores',
+                'db_table': 'sync_consumidor',
+            },
+        ),
+    ]
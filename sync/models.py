@@ -0,0 +1,93 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class ContadorCambios(models.Model):
+    """Última secuencia de cambios asignada (una sola fila, pk=1)."""
+    ultima_secuencia = models.BigIntegerField(default=0)
+    secuencia_purgada = models.BigIntegerField(
+        default=0, help_text="Mayor secuencia de las lápidas purgadas: tokens anteriores requieren resincronizar"
+    )
+
+    class Meta:
+        db_table = 'sync_contador'
+        verbose_name = 'Contador de Cambios'
+
+    def __str__(self):
+        return f"Cambios hasta {self.ultima_secuencia}"
+
+
+class CambioRegistro(models.Model):
+    """
+    Último cambio de cada registro sincronizado.
+
+    Hay una fila por registro: cada cambio le asigna una secuencia nueva, de
+    modo que leer ``secuencia > token`` entrega cada registro modificado una
+    sola vez. Un registro borrado queda como lápida (``eliminado=True``).
+    """
+    secuencia = models.BigIntegerField(unique=True)
+    modelo = models.CharField(max_length=60, help_text="Etiqueta del modelo, ej. maternity.parto")
+    id_registro = models.BigIntegerField()
+    eliminado = models.BooleanField(default=False)
+    fecha_cambio = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'sync_cambio'
+        verbose_name = 'Cambio de Registro'
+        verbose_name_plural = 'Cambios de Registros'
+        constraints = [
+            models.UniqueConstraint(fields=['modelo', 'id_registro'], name='sync_cambio_registro_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.modelo} #{self.id_registro} en {self.secuencia}"
+
+
+class EventoCambio(models.Model):
+    """
+    Evento de la bandeja de salida (outbox): una fila por cada alta,
+    modificación o borrado, escrita en la misma transacción que el cambio.
+
+    Es un registro que solo crece (a diferencia de ``CambioRegistro``, que
+    guarda solo el último cambio de cada registro): las integraciones lo leen
+    por ``secuencia`` en lugar de volver a consultar tablas completas.
+    """
+    OPERACIONES = [
+        ('crear', 'Crear'),
+        ('actualizar', 'Actualizar'),
+        ('eliminar', 'Eliminar'),
+    ]
+
+    secuencia = models.BigIntegerField(unique=True)
+    modelo = models.CharField(max_length=60, help_text="Etiqueta del modelo, ej. maternity.parto")
+    id_registro = models.BigIntegerField()
+    operacion = models.CharField(max_length=10, choices=OPERACIONES)
+    datos = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder,
+        help_text="Columnas del registro tras el cambio (null en un borrado)",
+    )
+    fecha_evento = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'sync_evento'
+        verbose_name = 'Evento de Cambio'
+        verbose_name_plural = 'Eventos de Cambio'
+
+    def __str__(self):
+        return f"{self.operacion} {self.modelo} #{self.id_registro} en {self.secuencia}"
+
+
+class OffsetConsumidor(models.Model):
+    """Última secuencia de eventos que confirmó procesar cada consumidor."""
+    consumidor = models.CharField(max_length=100, unique=True)
+    ultima_secuencia = models.BigIntegerField(default=0)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'sync_consumidor'
+        verbose_name = 'Offset de Consumidor'
+        verbose_name_plural = 'Offsets de Consumidores'
+
+    def __str__(self):
+        return f"{self.consumidor} hasta {self.ultima_secuencia}"
@@ -0,0 +1,175 @@
+"""
+Bandeja de salida (outbox) de eventos de cambio para integraciones
+(reporte regional de salud, data warehouse).
+
+Cada alta, modificación o borrado de un modelo de maternidad, neonatología
+o alertas agrega un ``EventoCambio`` con las columnas del registro. El
+evento se escribe desde ``post_save``/``post_delete``, es decir, en la misma
+transacción que el cambio: las escrituras de la API corren en
+``transaction.atomic()`` (``core.transacciones.EscrituraAtomicaMixin`` o la
+transacción propia de cada acción), y un cambio que se revierte no deja
+evento. Fuera de la API (comandos, shell) el guardado debe envolverse en
+``transaction.atomic()`` para conservar esa garantía.
+
+La secuencia sale del mismo contador bloqueado que el registro de cambios
+de la sincronización (ver ``sync.cambios``), así que los eventos se hacen
+visibles en orden: un consumidor que leyó hasta N no puede perder después
+un evento con secuencia menor.
+
+Cada consumidor guarda su avance en ``OffsetConsumidor`` y lo confirma tras
+procesar un lote (entrega "al menos una vez"). ``manage.py relevar_eventos``
+los reenvía a un endpoint HTTP o a la salida estándar, y
+``GET /api/sync/eventos/`` los entrega por páginas.
+
+Las escrituras masivas que no emiten señales (``update()``,
+``bulk_create()``) deben llamar a ``registrar_eventos`` con las instancias
+afectadas.
+
+``registrar_eventos`` emite ``eventos_registrados`` (sender: el modelo) para
+quien necesite reaccionar en el mismo proceso sin esperar a leer la tabla,
+como el flujo de alertas en vivo (``alerts/difusion.py``).
+"""
+from datetime import timedelta
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Min
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .cambios import MODELOS_SINCRONIZADOS, TAMANO_LOTE
+
+# Modelos que publican eventos: los sincronizados más las alertas
+MODELOS_CON_EVENTOS = [*MODELOS_SINCRONIZADOS.values(), 'alerts.AlertaSistema']
+
+CREAR, ACTUALIZAR, ELIMINAR = 'crear', 'actualizar', 'eliminar'
+
+# Argumento: eventos (lista de EventoCambio, aún sin confirmar)
+eventos_registrados = Signal()
+
+
+def datos_evento(instancia):
+    """Columnas del registro (``attname``: valor), sin relaciones anidadas."""
+    return {campo.attname: campo.value_from_object(instancia) for campo in instancia._meta.concrete_fields}
+
+
+def registrar_eventos(modelo, instancias, operacion):
+    """
+    Agrega un evento por instancia, con secuencias consecutivas.
+
+    Args:
+        modelo: Clase del modelo
+        instancias: Registros creados, actualizados o borrados (con su pk)
+        operacion: 'crear', 'actualizar' o 'eliminar'
+    """
+    from .models import ContadorCambios, EventoCambio
+
+    etiqueta = modelo._meta.label_lower
+    ahora = timezone.now()
+    with transaction.atomic():
+        contador, _ = ContadorCambios.objects.select_for_update().get_or_create(pk=1)
+        secuencia = contador.ultima_secuencia
+        eventos = []
+        for instancia in instancias:
+            secuencia += 1
+            eventos.append(EventoCambio(
+                secuencia=secuencia, modelo=etiqueta, id_registro=instancia.pk, operacion=operacion,
+                datos=None if operacion == ELIMINAR else datos_evento(instancia), fecha_evento=ahora,
+            ))
+        if not eventos:
+            return
+        EventoCambio.objects.bulk_create(eventos, batch_size=TAMANO_LOTE)
+        ContadorCambios.objects.filter(pk=1).update(ultima_secuencia=secuencia)
+    eventos_registrados.send(sender=modelo, eventos=eventos)
+
+
+def leer_eventos(desde, limite, modelos=None):
+    """
+    Eventos posteriores a la secuencia ``desde``, en orden.
+
+    Args:
+        desde: Última secuencia ya procesada
+        limite: Máximo de eventos
+        modelos: Etiquetas de modelo a incluir (None: todos)
+
+    Returns:
+        dict: desde, siguiente (secuencia a confirmar), hay_mas y eventos
+    """
+    from .models import EventoCambio
+
+    queryset = EventoCambio.objects.filter(secuencia__gt=desde).order_by('secuencia')
+    if modelos is not None:
+        queryset = queryset.filter(modelo__in=modelos)
+    eventos = list(queryset.values(
+        'secuencia', 'modelo', 'id_registro', 'operacion', 'datos', 'fecha_evento',
+    )[:limite + 1])
+    hay_mas = len(eventos) > limite
+    eventos = eventos[:limite]
+    return {
+        'desde': desde,
+        'siguiente': eventos[-1]['secuencia'] if eventos else desde,
+        'hay_mas': hay_mas,
+        'eventos': eventos,
+    }
+
+
+def offset_de(consumidor):
+    """Última secuencia confirmada por ``consumidor`` (0 si es nuevo)."""
+    from .models import OffsetConsumidor
+
+    return OffsetConsumidor.objects.filter(consumidor=consumidor).values_list('ultima_secuencia', flat=True).first() or 0
+
+
+def confirmar_offset(consumidor, secuencia):
+    """
+    Registra que ``consumidor`` procesó los eventos hasta ``secuencia``. El
+    offset nunca retrocede: una confirmación repetida o atrasada no hace
+    que se vuelvan a entregar eventos ya procesados.
+
+    Returns:
+        OffsetConsumidor: Offset vigente del consumidor
+    """
+    from .models import OffsetConsumidor
+
+    with transaction.atomic():
+        offset, _ = OffsetConsumidor.objects.select_for_update().get_or_create(consumidor=consumidor)
+        if secuencia > offset.ultima_secuencia:
+            offset.ultima_secuencia = secuencia
+            offset.save(update_fields=['ultima_secuencia', 'fecha_actualizacion'])
+    return offset
+
+
+def purgar_eventos(dias):
+    """
+    Borra los eventos de más de ``dias`` días que todos los consumidores
+    registrados ya confirmaron. Sin consumidores registrados no borra nada.
+
+    Returns:
+        int: Eventos borrados
+    """
+    from .models import EventoCambio, OffsetConsumidor
+
+    minimo = OffsetConsumidor.objects.aggregate(minimo=Min('ultima_secuencia'))['minimo']
+    if minimo is None:
+        return 0
+    borrados, _ = EventoCambio.objects.filter(
+        secuencia__lte=minimo, fecha_evento__lt=timezone.now() - timedelta(days=dias),
+    ).delete()
+    return borrados
+
+
+def _evento_guardado(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        registrar_eventos(sender, [instance], CREAR if created else ACTUALIZAR)
+
+
+def _evento_borrado(sender, instance, **kwargs):
+    registrar_eventos(sender, [instance], ELIMINAR)
+
+
+def conectar_senales():
+    for etiqueta in MODELOS_CON_EVENTOS:
+        modelo = apps.get_model(etiqueta)
+        post_save.connect(_evento_guardado, sender=modelo, dispatch_uid=f'outbox_guardado_{etiqueta}')
+        post_delete.connect(_evento_borrado, sender=modelo, dispatch_uid=f'outbox_borrado_{etiqueta}')
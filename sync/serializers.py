@@ -0,0 +1,100 @@
+from rest_framework import serializers
+
+from .cambios import MODELOS_SINCRONIZADOS
+
+MAXIMO_CAMBIOS_POR_LOTE = 500
+
+OPERACIONES = ['crear', 'actualizar', 'eliminar']
+
+ESTADOS = ['aplicado', 'conflicto', 'invalido', 'denegado', 'no_encontrado']
+
+
+class CambioSalienteSerializer(serializers.Serializer):
+    """Un registro modificado desde el token del cliente."""
+    secuencia = serializers.IntegerField()
+    recurso = serializers.CharField()
+    id = serializers.IntegerField()
+    eliminado = serializers.BooleanField(help_text='Lápida: el registro se borró')
+    datos = serializers.JSONField(allow_null=True, help_text='Registro como en el listado de su recurso')
+
+
+class PaginaCambiosSerializer(serializers.Serializer):
+    token = serializers.IntegerField(help_text='Enviar como ?token= en la siguiente llamada')
+    hay_mas = serializers.BooleanField()
+    cambios = CambioSalienteSerializer(many=True)
+
+
+class CambioEntranteSerializer(serializers.Serializer):
+    """Una escritura hecha sin conexión."""
+    recurso = serializers.ChoiceField(choices=list(MODELOS_SINCRONIZADOS))
+    operacion = serializers.ChoiceField(choices=OPERACIONES)
+    id = serializers.IntegerField(required=False, help_text='Registro a actualizar o eliminar')
+    base = serializers.IntegerField(
+        required=False, min_value=0,
+        help_text='Secuencia del registro que vio el cliente; si el servidor tiene una posterior hay conflicto',
+    )
+    id_cliente = serializers.CharField(
+        required=False, max_length=100,
+        help_text='Id temporal de un registro creado; otros cambios del lote lo referencian como "$id_cliente"',
+    )
+    datos = serializers.DictField(required=False, default=dict)
+
+    def validate(self, data):
+        if data['operacion'] != 'crear':
+            faltantes = {campo: 'Requerido para actualizar o eliminar' for campo in ('id', 'base') if campo not in data}
+            if faltantes:
+                raise serializers.ValidationError(faltantes)
+        return data
+
+
+class LoteCambiosSerializer(serializers.Serializer):
+    cambios = serializers.ListField(
+        child=CambioEntranteSerializer(), min_length=1, max_length=MAXIMO_CAMBIOS_POR_LOTE,
+    )
+
+
+class ResultadoCambioSerializer(serializers.Serializer):
+    estado = serializers.ChoiceField(choices=ESTADOS)
+    recurso = serializers.CharField()
+    id = serializers.IntegerField(required=False, allow_null=True)
+    id_cliente = serializers.CharField(required=False)
+    secuencia = serializers.IntegerField(required=False, help_text='Secuencia del registro tras aplicar el cambio')
+    datos = serializers.JSONField(
+        required=False, allow_null=True,
+        help_text='Registro en el servidor (aplicado o en conflicto; null si se eliminó)',
+    )
+    errores = serializers.JSONField(required=False)
+
+
+class ResultadoLoteSerializer(serializers.Serializer):
+    aplicados = serializers.IntegerField()
+    resultados = ResultadoCambioSerializer(many=True)
+
+
+class EventoSerializer(serializers.Serializer):
+    """Evento de la bandeja de salida."""
+    secuencia = serializers.IntegerField()
+    modelo = serializers.CharField(help_text='Etiqueta del modelo, ej. maternity.parto')
+    id_registro = serializers.IntegerField()
+    operacion = serializers.ChoiceField(choices=OPERACIONES)
+    datos = serializers.JSONField(allow_null=True, help_text='Columnas del registro tras el cambio (null al eliminar)')
+    fecha_evento = serializers.DateTimeField()
+
+
+class PaginaEventosSerializer(serializers.Serializer):
+    desde = serializers.IntegerField()
+    siguiente = serializers.IntegerField(help_text='Secuencia a confirmar tras procesar la página')
+    hay_mas = serializers.BooleanField()
+    eventos = EventoSerializer(many=True)
+
+
+class ConfirmacionOffsetSerializer(serializers.Serializer):
+    consumidor = serializers.CharField(max_length=100)
+    secuencia = serializers.IntegerField(min_value=0, help_text='Última secuencia procesada')
+
+
+class OffsetConsumidorSerializer(serializers.Serializer):
+    consumidor = serializers.CharField()
+    ultima_secuencia = serializers.IntegerField()
+    pendientes = serializers.IntegerField(help_text='Eventos posteriores a su offset')
+    fecha_actualizacion = serializers.DateTimeField(allow_null=True)
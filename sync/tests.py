@@ -0,0 +1,161 @@
+import json
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+
+from catalogs.models import CatNacionalidad, CatTipoParto
+from core.models import Usuario
+from maternity.models import Embarazo, MadrePaciente, Parto
+from .cambios import purgar_lapidas, reconciliar
+from .models import CambioRegistro, ContadorCambios, EventoCambio, OffsetConsumidor
+from .outbox import confirmar_offset, purgar_eventos
+
+
+class RegistroCambiosTest(TestCase):
+    """Tests del registro de cambios de la sincronización"""
+
+    def setUp(self):
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+
+    def crear_madre(self, run='11111111-1'):
+        return MadrePaciente.objects.create(
+            run=run, nombre='Ana', apellido_paterno='Rojas', apellido_materno='Soto',
+            fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=self.nacionalidad,
+        )
+
+    def cambio(self, instancia):
+        return CambioRegistro.objects.get(modelo=instancia._meta.label_lower, id_registro=instancia.pk)
+
+    def test_una_fila_por_registro_con_secuencia_creciente(self):
+        """Cada guardado mueve el registro al final; el borrado deja una lápida"""
+        madre = self.crear_madre()
+        otra = self.crear_madre('15000000-9')
+        primera = self.cambio(madre).secuencia
+        self.assertGreater(self.cambio(otra).secuencia, primera)
+
+        madre.nombre = 'Ana María'
+        madre.save()
+        self.assertGreater(self.cambio(madre).secuencia, self.cambio(otra).secuencia)
+        self.assertEqual(CambioRegistro.objects.filter(modelo='maternity.madrepaciente').count(), 2)
+
+        # El borrado en cascada también deja lápidas de los hijos
+        embarazo = Embarazo.objects.create(
+            fk_madre=madre, paridad=0, fecha_ultima_menstruacion=date(2024, 1, 1), semana_obstetrica=30,
+        )
+        id_madre = madre.pk
+        madre.delete()
+        self.assertTrue(self.cambio(embarazo).eliminado)
+        self.assertTrue(CambioRegistro.objects.get(modelo='maternity.madrepaciente', id_registro=id_madre).eliminado)
+        # El contador es compartido con la outbox: la última secuencia es la del último evento
+        self.assertEqual(
+            ContadorCambios.objects.get(pk=1).ultima_secuencia,
+            max(CambioRegistro.objects.order_by('-secuencia').first().secuencia,
+                EventoCambio.objects.order_by('-secuencia').first().secuencia),
+        )
+
+    def test_escrituras_masivas(self):
+        """recalcular_robson registra sus UPDATE; reconciliar corrige cargas sin registrar"""
+        from maternity.robson import recalcular_robson
+        madre = self.crear_madre()
+        Embarazo.objects.create(fk_madre=madre, paridad=0, fecha_ultima_menstruacion=date(2024, 1, 1), semana_obstetrica=39)
+        profesional = Usuario.objects.create_user(run='16000000-7', password='x', nombre_completo='Matrona')
+        parto = Parto.objects.create(
+            fk_madre=madre, fk_tipo_parto=CatTipoParto.objects.create(nombre='Vaginal'),
+            fk_profesional_responsable=profesional, fecha_parto=timezone.make_aware(datetime(2024, 10, 1, 10)),
+            presentacion='cefalica', inicio_trabajo_parto='espontaneo', cesareas_previas=0,
+        )
+        Parto.objects.filter(pk=parto.pk).update(fk_robson_calculado=None)
+        antes = self.cambio(parto).secuencia
+        recalcular_robson()
+        self.assertGreater(self.cambio(parto).secuencia, antes)
+
+        CambioRegistro.objects.filter(modelo='maternity.madrepaciente').delete()
+        CambioRegistro.objects.create(secuencia=10 ** 9, modelo='maternity.parto', id_registro=999)
+        self.assertEqual(reconciliar(), {'maternity.madrepaciente': (1, 0), 'maternity.parto': (0, 1)})
+        self.assertFalse(self.cambio(madre).eliminado)
+        self.assertTrue(CambioRegistro.objects.get(modelo='maternity.parto', id_registro=999).eliminado)
+        self.assertEqual(reconciliar(), {})
+
+    def test_purgar_lapidas(self):
+        """Purgar lápidas antiguas avanza la secuencia purgada"""
+        madre = self.crear_madre()
+        madre.delete()
+        lapida = CambioRegistro.objects.get(eliminado=True)
+        self.assertEqual(purgar_lapidas(dias=30), 0)
+        CambioRegistro.objects.filter(pk=lapida.pk).update(fecha_cambio=timezone.now() - timedelta(days=31))
+        self.assertEqual(purgar_lapidas(dias=30), 1)
+        self.assertEqual(ContadorCambios.objects.get(pk=1).secuencia_purgada, lapida.secuencia)
+
+
+class OutboxTest(TestCase):
+    """Tests de la bandeja de salida de eventos"""
+
+    def setUp(self):
+        self.nacionalidad = CatNacionalidad.objects.create(nombre='Chilena')
+
+    def crear_madre(self, run='11111111-1'):
+        return MadrePaciente.objects.create(
+            run=run, nombre='Ana', apellido_paterno='Rojas', apellido_materno='Soto',
+            fecha_nacimiento=date(1990, 1, 1), fk_nacionalidad=self.nacionalidad,
+        )
+
+    def test_un_evento_por_cambio_en_la_misma_transaccion(self):
+        """Alta, modificación y borrado dejan un evento cada uno; un cambio revertido no deja evento"""
+        madre = self.crear_madre()
+        madre.nombre = 'Ana María'
+        madre.save()
+        id_madre = madre.pk
+        madre.delete()
+        eventos = list(EventoCambio.objects.filter(modelo='maternity.madrepaciente').order_by('secuencia'))
+        self.assertEqual([e.operacion for e in eventos], ['crear', 'actualizar', 'eliminar'])
+        self.assertEqual({e.id_registro for e in eventos}, {id_madre})
+        self.assertEqual(eventos[1].datos['nombre'], 'Ana María')
+        self.assertEqual(eventos[1].datos['fecha_nacimiento'], '1990-01-01')
+        self.assertEqual(eventos[1].datos['fk_nacionalidad_id'], self.nacionalidad.pk)
+        self.assertIsNone(eventos[2].datos)
+
+        total = EventoCambio.objects.count()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.crear_madre('15000000-9')
+            raise RuntimeError()
+        self.assertEqual(EventoCambio.objects.count(), total)
+
+    def test_secuencia_compartida_con_la_sincronizacion(self):
+        """Eventos y registro de cambios avanzan el mismo contador, sin repetir secuencias"""
+        madre = self.crear_madre()
+        cambio = CambioRegistro.objects.get(modelo='maternity.madrepaciente', id_registro=madre.pk)
+        evento = EventoCambio.objects.get(modelo='maternity.madrepaciente', id_registro=madre.pk)
+        self.assertNotEqual(cambio.secuencia, evento.secuencia)
+        self.assertEqual(ContadorCambios.objects.get(pk=1).ultima_secuencia, max(cambio.secuencia, evento.secuencia))
+
+    def test_offsets_y_purga(self):
+        """El offset no retrocede y solo se purga lo que todos los consumidores confirmaron"""
+        self.crear_madre()
+        self.crear_madre('15000000-9')
+        primera, segunda = EventoCambio.objects.order_by('secuencia').values_list('secuencia', flat=True)
+        EventoCambio.objects.update(fecha_evento=timezone.now() - timedelta(days=60))
+        self.assertEqual(purgar_eventos(dias=30), 0)
+
+        self.assertEqual(confirmar_offset('dwh', segunda).ultima_secuencia, segunda)
+        self.assertEqual(confirmar_offset('dwh', primera).ultima_secuencia, segunda)
+        confirmar_offset('regional', primera)
+        self.assertEqual(purgar_eventos(dias=30), 1)
+        self.assertEqual(list(EventoCambio.objects.values_list('secuencia', flat=True)), [segunda])
+
+    def test_relevar_eventos(self):
+        """El relay escribe NDJSON en orden y confirma el offset; la segunda corrida no repite"""
+        self.crear_madre()
+        self.crear_madre('15000000-9')
+        salida = StringIO()
+        call_command('relevar_eventos', consumidor='dwh', lote=1, stdout=salida)
+        eventos = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+        self.assertEqual([e['datos']['run'] for e in eventos], ['11111111-1', '15000000-9'])
+        self.assertEqual(OffsetConsumidor.objects.get(consumidor='dwh').ultima_secuencia, eventos[-1]['secuencia'])
+
+        salida = StringIO()
+        call_command('relevar_eventos', consumidor='dwh', stdout=salida)
+        self.assertEqual(salida.getvalue(), '')